@@ -0,0 +1,256 @@
+import asyncio
+import random
+import time
+from collections import Counter
+from decimal import Decimal
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from src.apps.layouts.schemas import (
+    LayoutRackLevelTemplateSchema,
+    LayoutRackTemplateSchema,
+    LayoutSectionInputSchema,
+)
+from src.apps.layouts.services import provision_section_layout
+from src.apps.products.services.product_services import create_product
+from src.apps.rack_level_slots.models import RackLevelSlot
+from src.apps.rack_levels.models import RackLevel
+from src.apps.rack_levels.services import add_single_stock_to_rack_level
+from src.apps.racks.models import Rack
+from src.apps.receptions.services import create_reception
+from src.apps.sections.models import Section
+from src.apps.stocks.models import Stock
+from src.apps.stocks.schemas.stock_schemas import (
+    StockRackLevelInputSchema,
+    StockWaitingRoomInputSchema,
+)
+from src.apps.users.services.user_services import create_user_base
+from src.apps.waiting_rooms.models import WaitingRoom
+from src.apps.waiting_rooms.services import (
+    add_single_stock_to_waiting_room,
+    create_waiting_room,
+)
+from src.apps.warehouse.services import create_warehouse
+from src.core.exceptions import ServiceException
+from src.core.factory.product_factory import ProductInputSchemaFactory
+from src.core.factory.reception_factory import (
+    ReceptionInputSchemaFactory,
+    ReceptionProductInputSchemaFactory,
+)
+from src.core.factory.user_factory import UserInputSchemaFactory
+from src.core.factory.waiting_room_factory import WaitingRoomInputSchemaFactory
+from src.core.factory.warehouse_factory import WarehouseInputSchemaFactory
+from src.database.db_connection import Base
+from src.settings.alembic import *
+from src.settings.db_settings import DatabaseSettings
+
+STOCKS = 40
+WAITING_ROOMS = 2
+RACK_LEVELS = 2
+SLOTS_PER_LEVEL = 15
+MOVES = 400
+CONCURRENCY = 50
+
+
+def build_layout_input() -> LayoutSectionInputSchema:
+    rack_level = LayoutRackLevelTemplateSchema(
+        description="stress level",
+        max_weight=Decimal(1000),
+        max_slots=SLOTS_PER_LEVEL,
+        quantity=RACK_LEVELS,
+    )
+    rack = LayoutRackTemplateSchema(
+        rack_name="stress rack",
+        max_weight=Decimal(1000 * RACK_LEVELS),
+        max_levels=RACK_LEVELS,
+        rack_levels=[rack_level],
+    )
+    return LayoutSectionInputSchema(
+        section_name="stress section",
+        max_weight=Decimal(1000 * RACK_LEVELS),
+        max_racks=1,
+        racks=[rack],
+    )
+
+
+async def seed(engine: AsyncEngine) -> tuple[str, list[str], list[str], list[str]]:
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        await create_warehouse(
+            session,
+            WarehouseInputSchemaFactory().generate(
+                max_sections=1, max_waiting_rooms=WAITING_ROOMS
+            ),
+        )
+        await provision_section_layout(session, build_layout_input())
+        waiting_rooms = [
+            await create_waiting_room(
+                session,
+                WaitingRoomInputSchemaFactory().generate(
+                    max_stocks=STOCKS, max_weight=Decimal(10000)
+                ),
+                testing=True,
+            )
+            for _ in range(WAITING_ROOMS)
+        ]
+
+        user = await create_user_base(
+            session, UserInputSchemaFactory().generate(is_staff=True)
+        )
+        session.add(user)
+        await session.commit()
+
+        product = await create_product(
+            session, ProductInputSchemaFactory().generate(weight=Decimal(1))
+        )
+        reception = await create_reception(
+            session,
+            ReceptionInputSchemaFactory().generate(
+                products_data=[
+                    ReceptionProductInputSchemaFactory().generate(
+                        product_id=product.id,
+                        waiting_room_id=waiting_rooms[number % WAITING_ROOMS].id,
+                    )
+                    for number in range(STOCKS)
+                ]
+            ),
+            user.id,
+        )
+        rack_level_ids = await session.scalars(select(RackLevel.id))
+
+        return (
+            user.id,
+            [stock.id for stock in reception.stocks],
+            [waiting_room.id for waiting_room in waiting_rooms],
+            rack_level_ids.all(),
+        )
+
+
+async def move_stock(
+    engine: AsyncEngine,
+    semaphore: asyncio.Semaphore,
+    user_id: str,
+    stock_id: str,
+    waiting_room_ids: list[str],
+    rack_level_ids: list[str],
+    outcomes: Counter,
+) -> None:
+    async with semaphore, AsyncSession(engine, expire_on_commit=False) as session:
+        try:
+            if random.random() < 0.5:
+                await add_single_stock_to_waiting_room(
+                    session,
+                    random.choice(waiting_room_ids),
+                    StockWaitingRoomInputSchema(id=stock_id),
+                    user_id,
+                )
+            else:
+                await add_single_stock_to_rack_level(
+                    session,
+                    random.choice(rack_level_ids),
+                    StockRackLevelInputSchema(id=stock_id),
+                    user_id,
+                )
+            outcomes["moved"] += 1
+        except ServiceException as exception:
+            outcomes[type(exception).__name__] += 1
+
+
+async def check_counters(engine: AsyncEngine) -> list[str]:
+    errors = []
+    async with AsyncSession(engine) as session:
+        stocks = (await session.scalars(select(Stock))).unique().all()
+
+        slot_usage = Counter(
+            stock.rack_level_slot_id for stock in stocks if stock.rack_level_slot_id
+        )
+        errors.extend(
+            f"slot {slot_id} holds {amount} stocks"
+            for slot_id, amount in slot_usage.items()
+            if amount > 1
+        )
+
+        for waiting_room in (await session.scalars(select(WaitingRoom))).all():
+            stored = [
+                stock for stock in stocks if stock.waiting_room_id == waiting_room.id
+            ]
+            if waiting_room.occupied_slots != len(stored) or (
+                waiting_room.current_stock_weight
+                != sum(stock.weight for stock in stored)
+            ):
+                errors.append(f"waiting room {waiting_room.id} counters drifted")
+
+        slots = (await session.scalars(select(RackLevelSlot))).unique().all()
+        level_of_slot = {slot.id: slot.rack_level_id for slot in slots}
+        level_weight, level_slots = Counter(), Counter()
+        for stock in stocks:
+            if stock.rack_level_slot_id:
+                level_id = level_of_slot[stock.rack_level_slot_id]
+                level_weight[level_id] += stock.weight
+                level_slots[level_id] += 1
+
+        for rack_level in (await session.scalars(select(RackLevel))).unique().all():
+            if rack_level.occupied_slots != level_slots[rack_level.id] or (
+                rack_level.occupied_weight != level_weight[rack_level.id]
+            ):
+                errors.append(f"rack level {rack_level.id} counters drifted")
+
+        stored_weight = sum(level_weight.values())
+        for rack in (await session.scalars(select(Rack))).unique().all():
+            if rack.occupied_weight != stored_weight:
+                errors.append(f"rack {rack.id} counters drifted")
+        for section in (await session.scalars(select(Section))).unique().all():
+            if section.occupied_weight != stored_weight:
+                errors.append(f"section {section.id} counters drifted")
+
+    return errors
+
+
+async def run() -> None:
+    settings = DatabaseSettings(TESTING=True)
+    engine = create_async_engine(settings.postgres_url, poolclass=NullPool)
+
+    user_id, stock_ids, waiting_room_ids, rack_level_ids = await seed(engine)
+
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    outcomes = Counter()
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(
+            move_stock(
+                engine,
+                semaphore,
+                user_id,
+                random.choice(stock_ids),
+                waiting_room_ids,
+                rack_level_ids,
+                outcomes,
+            )
+            for _ in range(MOVES)
+        )
+    )
+    elapsed = time.perf_counter() - start
+
+    errors = await check_counters(engine)
+    await engine.dispose()
+
+    print(f"{MOVES} concurrent moves finished in {elapsed:.3f}s: {dict(outcomes)}")
+    if errors:
+        raise SystemExit("\n".join(errors))
+    print("capacity counters are consistent")
+
+
+def main() -> None:
+    sync_settings = DatabaseSettings(ASYNC=False, TESTING=True)
+    sync_engine = create_engine(sync_settings.postgres_url)
+    Base.metadata.drop_all(sync_engine)
+    Base.metadata.create_all(sync_engine)
+    try:
+        asyncio.run(run())
+    finally:
+        Base.metadata.drop_all(sync_engine)
+
+
+if __name__ == "__main__":
+    main()
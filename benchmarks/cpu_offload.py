@@ -0,0 +1,58 @@
+import asyncio
+import statistics
+import time
+
+from src.core.utils.crypt import hash_password, verify_password, verify_user_password
+from src.core.utils.offload import cpu_offloader
+
+LOGINS = 32
+TICK = 0.005
+
+
+async def inline_login(password: str, password_hash: str) -> bool:
+    return verify_password(password, password_hash)
+
+
+async def measure_loop_lag(done: asyncio.Event) -> list[float]:
+    lags = []
+    while not done.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - start - TICK)
+    return lags
+
+
+async def run_burst(login, password_hash: str) -> tuple[float, list[float]]:
+    done = asyncio.Event()
+    ticker = asyncio.create_task(measure_loop_lag(done))
+    await asyncio.sleep(TICK * 2)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(login("password", password_hash) for _ in range(LOGINS)))
+    elapsed = time.perf_counter() - start
+
+    done.set()
+    return elapsed, await ticker
+
+
+def report(name: str, elapsed: float, lags: list[float]) -> None:
+    lags = sorted(lag * 1000 for lag in lags)
+    print(
+        f"{name:>10} | {LOGINS} logins in {elapsed:6.3f}s | "
+        f"loop lag p50 {statistics.median(lags):8.2f}ms | "
+        f"p99 {lags[int(len(lags) * 0.99)]:8.2f}ms | max {lags[-1]:8.2f}ms"
+    )
+
+
+async def main() -> None:
+    password_hash = hash_password("password")
+
+    report("inline", *await run_burst(inline_login, password_hash))
+    cpu_offloader.reset_metrics()
+    report("offloaded", *await run_burst(verify_user_password, password_hash))
+    print(cpu_offloader.get_metrics())
+    cpu_offloader.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,79 @@
+import argparse
+import statistics
+import time
+import uuid
+
+import numpy as np
+
+from src.apps.inventory.history import StockLocations
+
+DAYS = 365
+CHECKPOINTS_PER_DAY = 4
+
+
+def generate_movements(
+    stocks: int, movements_per_day: int, rng: np.random.Generator
+) -> list[tuple[list, list, list]]:
+    stock_ids = np.array(sorted(str(uuid.uuid4()) for _ in range(stocks)))
+    waiting_rooms = [str(uuid.uuid4()) for _ in range(20)]
+    slots = [str(uuid.uuid4()) for _ in range(stocks)]
+
+    periods = []
+    per_period = movements_per_day // CHECKPOINTS_PER_DAY
+    for _ in range(DAYS * CHECKPOINTS_PER_DAY):
+        moved = np.sort(rng.choice(stock_ids, per_period))
+        to_waiting_room = rng.random(per_period) < 0.3
+        periods.append(
+            (
+                moved.tolist(),
+                [
+                    waiting_rooms[index] if in_room else None
+                    for index, in_room in zip(
+                        rng.integers(0, len(waiting_rooms), per_period),
+                        to_waiting_room,
+                    )
+                ],
+                [
+                    None if in_room else slots[index]
+                    for index, in_room in zip(
+                        rng.integers(0, len(slots), per_period), to_waiting_room
+                    )
+                ],
+            )
+        )
+    return periods
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay a year of stock movements")
+    parser.add_argument("--stocks", type=int, default=50_000)
+    parser.add_argument("--movements-per-day", type=int, default=4_000)
+    arguments = parser.parse_args()
+    periods = generate_movements(
+        arguments.stocks, arguments.movements_per_day, np.random.default_rng(7)
+    )
+
+    start = time.perf_counter()
+    checkpoints = [StockLocations.from_lists([], [], [])]
+    for period in periods:
+        checkpoints.append(checkpoints[-1].replay(*period))
+    print(
+        f"{len(periods)} checkpoints over {DAYS} days built in "
+        f"{time.perf_counter() - start:6.3f}s, "
+        f"{len(checkpoints[-1])} stocks in the last one"
+    )
+
+    timings = []
+    for index in np.random.default_rng(11).integers(0, len(periods), 50):
+        start = time.perf_counter()
+        checkpoints[index].replay(*periods[index])
+        timings.append(time.perf_counter() - start)
+    timings = sorted(timing * 1000 for timing in timings)
+    print(
+        f"as-of from nearest checkpoint | p50 {statistics.median(timings):8.2f}ms | "
+        f"max {timings[-1]:8.2f}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import asyncio
+import time
+from decimal import Decimal
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from src.apps.layouts.schemas import (
+    LayoutRackLevelTemplateSchema,
+    LayoutRackTemplateSchema,
+    LayoutSectionInputSchema,
+)
+from src.apps.layouts.services import provision_section_layout
+from src.apps.warehouse.models import Warehouse
+from src.database.db_connection import Base
+from src.settings.alembic import *
+from src.settings.db_settings import DatabaseSettings
+
+RACKS = 20
+LEVELS_PER_RACK = 10
+SLOTS_PER_LEVEL = 50
+
+
+def build_layout_input() -> LayoutSectionInputSchema:
+    rack_level = LayoutRackLevelTemplateSchema(
+        description="benchmark level",
+        max_weight=Decimal(500),
+        max_slots=SLOTS_PER_LEVEL,
+        quantity=LEVELS_PER_RACK,
+    )
+    rack = LayoutRackTemplateSchema(
+        rack_name="benchmark rack",
+        max_weight=Decimal(500 * LEVELS_PER_RACK),
+        max_levels=LEVELS_PER_RACK,
+        quantity=RACKS,
+        rack_levels=[rack_level],
+    )
+    return LayoutSectionInputSchema(
+        section_name="benchmark section",
+        max_weight=Decimal(500 * LEVELS_PER_RACK * RACKS),
+        max_racks=RACKS,
+        racks=[rack],
+    )
+
+
+async def run() -> None:
+    settings = DatabaseSettings(TESTING=True)
+    engine = create_async_engine(settings.postgres_url, poolclass=NullPool)
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        session.add(
+            Warehouse(warehouse_name="benchmark", max_sections=1, max_waiting_rooms=1)
+        )
+        await session.commit()
+
+        layout_input = build_layout_input()
+        start = time.perf_counter()
+        result = await provision_section_layout(session, layout_input)
+        elapsed = time.perf_counter() - start
+
+    await engine.dispose()
+    print(
+        f"provisioned {result.racks_amount} racks, {result.rack_levels_amount} levels, "
+        f"{result.rack_level_slots_amount} slots in {elapsed:.3f}s"
+    )
+
+
+def main() -> None:
+    sync_settings = DatabaseSettings(ASYNC=False, TESTING=True)
+    sync_engine = create_engine(sync_settings.postgres_url)
+    Base.metadata.drop_all(sync_engine)
+    Base.metadata.create_all(sync_engine)
+    try:
+        asyncio.run(run())
+    finally:
+        Base.metadata.drop_all(sync_engine)
+
+
+if __name__ == "__main__":
+    main()
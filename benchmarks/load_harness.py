@@ -0,0 +1,426 @@
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Optional
+
+import httpx
+import uvicorn
+from fastapi import Request
+from sqlalchemy import event, func, select, update
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.local_database import check_local_database
+from main import app
+from src.apps.products.models import Product
+from src.apps.rack_level_slots.models import RackLevelSlot
+from src.apps.rack_levels.models import RackLevel
+from src.apps.stocks.models import Stock
+from src.apps.users.models import User
+from src.apps.waiting_rooms.models import WaitingRoom
+from src.core.utils.crypt import passwd_context
+from src.database.db_connection import ReadOnlySession, ReadOnlySyncSession
+from src.dependencies.get_db import get_db, get_read_db
+from src.settings.alembic import *
+from src.settings.db_settings import DatabaseSettings
+
+LOAD_PASSWORD = "load-harness-password"
+SCENARIO_HEADER = "X-Load-Scenario"
+SCENARIO_KEY = "load_scenario"
+POOL_SIZE = 20_000
+PRODUCTS_PER_RECEPTION = 3
+PAGE_SIZE = 50
+HISTOGRAM_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+DEFAULT_MIX = "move_stock=5,create_reception=1,list_stocks=3,stock_history=1"
+
+
+class LoadPools:
+    def __init__(
+        self,
+        waiting_room_stock_ids: list[str],
+        free_rack_level_slot_ids: list[str],
+        waiting_room_ids: list[str],
+        product_ids: list[str],
+        available_stocks: int,
+    ) -> None:
+        self.waiting_room_stock_ids = waiting_room_stock_ids
+        self.free_rack_level_slot_ids = free_rack_level_slot_ids
+        self.waiting_room_ids = waiting_room_ids
+        self.product_ids = product_ids
+        self.last_page = max(available_stocks // PAGE_SIZE, 1)
+
+
+class EndpointStats:
+    def __init__(self) -> None:
+        self.latencies = []
+        self.statuses = Counter()
+        self.errors = 0
+        self.statements = 0
+
+    def record(self, latency: float, status: Optional[int]) -> None:
+        self.latencies.append(latency)
+        self.statuses[status or "failed"] += 1
+        if status is None or status >= 400:
+            self.errors += 1
+
+    def summary(self, elapsed: float) -> dict:
+        latencies = sorted(latency * 1000 for latency in self.latencies)
+        if not (requests := len(latencies)):
+            return {"requests": 0}
+        percentiles = (
+            statistics.quantiles(latencies, n=100, method="inclusive")
+            if requests > 1
+            else latencies * 99
+        )
+        return {
+            "requests": requests,
+            "rps": requests / elapsed,
+            "error_rate": self.errors / requests,
+            "statuses": {str(status): count for status, count in self.statuses.items()},
+            "p50": percentiles[49],
+            "p90": percentiles[89],
+            "p99": percentiles[98],
+            "max": latencies[-1],
+            "histogram": dict(Counter(get_bucket(latency) for latency in latencies)),
+            "statements_per_request": self.statements / requests,
+        }
+
+
+def get_bucket(latency: float) -> str:
+    for bucket in HISTOGRAM_BUCKETS:
+        if latency <= bucket:
+            return f"<={bucket}ms"
+    return f">{HISTOGRAM_BUCKETS[-1]}ms"
+
+
+def build_move_stock(
+    client: httpx.AsyncClient, pools: LoadPools, rng: random.Random
+) -> httpx.Request:
+    if not (pools.waiting_room_stock_ids and pools.free_rack_level_slot_ids):
+        raise LookupError("no waiting room stocks or free slots left to move")
+    move = {
+        "stock_id": pools.waiting_room_stock_ids.pop(),
+        "rack_level_slot_id": pools.free_rack_level_slot_ids.pop(),
+    }
+    return client.build_request("PATCH", "stocks/move", json={"moves": [move]})
+
+
+def build_create_reception(
+    client: httpx.AsyncClient, pools: LoadPools, rng: random.Random
+) -> httpx.Request:
+    waiting_room_id = rng.choice(pools.waiting_room_ids)
+    products_data = [
+        {
+            "product_id": product_id,
+            "product_count": rng.randint(1, 3),
+            "waiting_room_id": waiting_room_id,
+        }
+        for product_id in rng.sample(pools.product_ids, PRODUCTS_PER_RECEPTION)
+    ]
+    return client.build_request(
+        "POST", "receptions/", json={"products_data": products_data}
+    )
+
+
+def build_list_stocks(
+    client: httpx.AsyncClient, pools: LoadPools, rng: random.Random
+) -> httpx.Request:
+    params = {
+        "page": rng.randint(1, pools.last_page),
+        "size": PAGE_SIZE,
+        "sort": "weight__desc,created_at__asc",
+    }
+    return client.build_request("GET", "stocks/", params=params)
+
+
+def build_stock_history(
+    client: httpx.AsyncClient, pools: LoadPools, rng: random.Random
+) -> httpx.Request:
+    params = {"size": PAGE_SIZE, "sort": "moved_at__desc"}
+    return client.build_request("GET", "user-stocks/", params=params)
+
+
+SCENARIOS: dict[str, Callable[..., httpx.Request]] = {
+    "move_stock": build_move_stock,
+    "create_reception": build_create_reception,
+    "list_stocks": build_list_stocks,
+    "stock_history": build_stock_history,
+}
+
+
+def parse_mix(mix: str) -> dict[str, int]:
+    weights = {}
+    for entry in mix.split(","):
+        name, _, weight = entry.partition("=")
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"unknown scenario {name}")
+        weights[name] = int(weight or 1)
+    return weights
+
+
+async def prepare_users(session: AsyncSession, users: int) -> list[str]:
+    # seeded users have no password, so the load users get a known one
+    emails = (
+        await session.scalars(
+            select(User.email)
+            .where(User.is_active == True, User.can_move_stocks == True)
+            .order_by(User.is_staff.desc(), User.email)
+            .limit(users)
+        )
+    ).all()
+    await session.execute(
+        update(User)
+        .where(User.email.in_(emails))
+        .values(password=passwd_context.hash(LOAD_PASSWORD), has_password_set=True)
+    )
+    await session.commit()
+    return emails
+
+
+async def load_pools(session: AsyncSession) -> LoadPools:
+    available = Stock.is_issued == False
+    waiting_room_stock_ids = await session.scalars(
+        select(Stock.id)
+        .where(available, Stock.waiting_room_id != None)
+        .order_by(Stock.id)
+        .limit(POOL_SIZE)
+    )
+    free_rack_level_slot_ids = await session.scalars(
+        select(RackLevelSlot.id)
+        .join(RackLevel, RackLevel.id == RackLevelSlot.rack_level_id)
+        .outerjoin(Stock, Stock.rack_level_slot_id == RackLevelSlot.id)
+        .where(
+            RackLevelSlot.is_active == True,
+            RackLevel.available_slots > 0,
+            Stock.id == None,
+        )
+        .order_by(RackLevelSlot.id)
+        .limit(POOL_SIZE)
+    )
+    waiting_room_ids = await session.scalars(
+        select(WaitingRoom.id).where(
+            WaitingRoom.available_slots >= PRODUCTS_PER_RECEPTION
+        )
+    )
+    product_ids = await session.scalars(
+        select(Product.id).order_by(Product.id).limit(POOL_SIZE)
+    )
+    available_stocks = await session.scalar(
+        select(func.count()).select_from(Stock).where(available)
+    )
+    return LoadPools(
+        waiting_room_stock_ids.all(),
+        free_rack_level_slot_ids.all(),
+        waiting_room_ids.all(),
+        product_ids.all(),
+        available_stocks,
+    )
+
+
+def override_db_sessions(engine: AsyncEngine, stats: dict[str, EndpointStats]) -> None:
+    session_factory = sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        bind=engine,
+        expire_on_commit=False,
+        class_=AsyncSession,
+    )
+    read_only_session_factory = sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        bind=engine.execution_options(isolation_level="AUTOCOMMIT"),
+        expire_on_commit=False,
+        class_=ReadOnlySession,
+        sync_session_class=ReadOnlySyncSession,
+    )
+
+    # every request session tags the connection it begins on with the scenario
+    # name sent by the harness, so statements are counted per endpoint
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        if (name := conn.info.get(SCENARIO_KEY)) in stats:
+            stats[name].statements += 1
+
+    def tag_session(session: AsyncSession, request: Request) -> None:
+        @event.listens_for(session.sync_session, "after_begin")
+        def tag_connection(session, transaction, connection):
+            connection.info[SCENARIO_KEY] = request.headers.get(SCENARIO_HEADER)
+
+    async def override_get_db(request: Request) -> AsyncSession:
+        async with session_factory() as session:
+            tag_session(session, request)
+            yield session
+            await session.commit()
+
+    async def override_get_read_db(request: Request) -> AsyncSession:
+        async with read_only_session_factory() as session:
+            tag_session(session, request)
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_read_db
+
+
+async def log_in(client: httpx.AsyncClient, email: str) -> dict[str, str]:
+    response = await client.post(
+        "users/login", json={"email": email, "password": LOAD_PASSWORD}
+    )
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def run_worker(
+    client: httpx.AsyncClient,
+    headers: dict[str, str],
+    pools: LoadPools,
+    weights: dict[str, int],
+    stats: dict[str, EndpointStats],
+    deadline: float,
+    rng: random.Random,
+) -> None:
+    names, scenario_weights = list(weights), list(weights.values())
+    while time.perf_counter() < deadline:
+        name = rng.choices(names, scenario_weights)[0]
+        start = time.perf_counter()
+        try:
+            request = SCENARIOS[name](client, pools, rng)
+            request.headers.update({**headers, SCENARIO_HEADER: name})
+            status = (await client.send(request)).status_code
+        except (httpx.HTTPError, LookupError):
+            status = None
+        stats[name].record(time.perf_counter() - start, status)
+
+
+async def start_server(port: int) -> tuple[uvicorn.Server, asyncio.Task]:
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        if task.done():
+            task.result()
+        await asyncio.sleep(0.05)
+    return server, task
+
+
+async def run_load(arguments: argparse.Namespace) -> dict:
+    settings = DatabaseSettings(TESTING=True)
+    check_local_database(settings)
+    engine = create_async_engine(
+        settings.postgres_url,
+        pool_size=arguments.concurrency,
+        max_overflow=arguments.concurrency,
+    )
+    stats = {name: EndpointStats() for name in arguments.mix}
+    override_db_sessions(engine, stats)
+
+    async with AsyncSession(engine) as session:
+        emails = await prepare_users(session, arguments.users)
+        pools = await load_pools(session)
+    if not emails:
+        raise SystemExit("The test database is empty, seed it first with make seed")
+
+    server = None
+    if arguments.mode == "uvicorn":
+        server, server_task = await start_server(arguments.port)
+        client = httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{arguments.port}/api/",
+            limits=httpx.Limits(max_connections=arguments.concurrency),
+            timeout=arguments.timeout,
+        )
+    else:
+        client = httpx.AsyncClient(
+            app=app, base_url="http://localhost:8000/api/", timeout=arguments.timeout
+        )
+
+    try:
+        headers = [await log_in(client, email) for email in emails]
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(
+                run_worker(
+                    client,
+                    headers[worker % len(headers)],
+                    pools,
+                    arguments.mix,
+                    stats,
+                    start + arguments.duration,
+                    random.Random(arguments.seed + worker),
+                )
+                for worker in range(arguments.concurrency)
+            )
+        )
+        elapsed = time.perf_counter() - start
+    finally:
+        await client.aclose()
+        if server:
+            server.should_exit = True
+            await server_task
+        app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(get_read_db, None)
+        await engine.dispose()
+
+    return {
+        "metadata": {
+            "mode": arguments.mode,
+            "concurrency": arguments.concurrency,
+            "duration": elapsed,
+            "mix": arguments.mix,
+            "seed": arguments.seed,
+        },
+        "endpoints": {
+            name: endpoint_stats.summary(elapsed)
+            for name, endpoint_stats in stats.items()
+        },
+    }
+
+
+def print_report(results: dict) -> None:
+    for name, summary in results["endpoints"].items():
+        if not summary["requests"]:
+            print(f"{name:>18} | no requests")
+            continue
+        print(
+            f"{name:>18} | {summary['requests']:7} requests | "
+            f"{summary['rps']:8.1f} rps | {summary['error_rate'] * 100:5.1f}% errors | "
+            f"p50 {summary['p50']:8.2f}ms | p90 {summary['p90']:8.2f}ms | "
+            f"p99 {summary['p99']:8.2f}ms | "
+            f"{summary['statements_per_request']:5.1f} statements/request"
+        )
+        print(
+            f"{'':>18} | "
+            + " ".join(
+                f"{bucket}: {count}" for bucket, count in summary["histogram"].items()
+            )
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Replay a weighted endpoint mix against the seeded test database"
+    )
+    parser.add_argument("--mode", choices=("asgi", "uvicorn"), default="asgi")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path)
+    arguments = parser.parse_args()
+
+    results = asyncio.run(run_load(arguments))
+    print_report(results)
+    if arguments.output:
+        arguments.output.parent.mkdir(parents=True, exist_ok=True)
+        arguments.output.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
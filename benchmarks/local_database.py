@@ -0,0 +1,11 @@
+from src.settings.db_settings import DatabaseSettings
+
+LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1", "db"}
+
+
+def check_local_database(settings: DatabaseSettings) -> None:
+    if settings.POSTGRES_HOST not in LOCAL_HOSTS:
+        raise SystemExit(
+            f"The benchmarks run against a local Postgres only, "
+            f"got POSTGRES_HOST={settings.POSTGRES_HOST}"
+        )
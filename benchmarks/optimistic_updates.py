@@ -0,0 +1,135 @@
+import asyncio
+import time
+from collections import Counter
+from decimal import Decimal
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from src.apps.waiting_rooms.models import WaitingRoom
+from src.apps.waiting_rooms.schemas import WaitingRoomUpdateSchema
+from src.apps.waiting_rooms.services import (
+    create_waiting_room,
+    get_single_waiting_room,
+    update_single_waiting_room,
+)
+from src.apps.warehouse.services import create_warehouse
+from src.core.exceptions import StaleVersionException
+from src.core.factory.waiting_room_factory import WaitingRoomInputSchemaFactory
+from src.core.factory.warehouse_factory import WarehouseInputSchemaFactory
+from src.core.utils.locking import LockSet, lock_rows
+from src.database.db_connection import Base
+from src.settings.alembic import *
+from src.settings.db_settings import DatabaseSettings
+
+WORKERS = 20
+UPDATES_PER_WORKER = 25
+CONTENTION_LEVELS = {"hot row": 1, "spread": WORKERS}
+
+
+async def seed(engine: AsyncEngine) -> list[str]:
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        await create_warehouse(
+            session,
+            WarehouseInputSchemaFactory().generate(
+                max_sections=1, max_waiting_rooms=WORKERS
+            ),
+        )
+        waiting_rooms = [
+            await create_waiting_room(
+                session,
+                WaitingRoomInputSchemaFactory().generate(
+                    max_stocks=10, max_weight=Decimal(1000)
+                ),
+                testing=True,
+            )
+            for _ in range(WORKERS)
+        ]
+    return [waiting_room.id for waiting_room in waiting_rooms]
+
+
+async def optimistic_worker(
+    engine: AsyncEngine, worker: int, waiting_room_id: str, outcomes: Counter
+) -> None:
+    for number in range(UPDATES_PER_WORKER):
+        update_data = WaitingRoomUpdateSchema(name=f"worker {worker} update {number}")
+        while True:
+            async with AsyncSession(engine, expire_on_commit=False) as session:
+                waiting_room = await get_single_waiting_room(session, waiting_room_id)
+                try:
+                    await update_single_waiting_room(
+                        session, update_data, waiting_room_id, waiting_room.version_id
+                    )
+                except StaleVersionException:
+                    outcomes["conflicts"] += 1
+                    continue
+            outcomes["updates"] += 1
+            break
+
+
+async def pessimistic_worker(
+    engine: AsyncEngine, worker: int, waiting_room_id: str, outcomes: Counter
+) -> None:
+    for number in range(UPDATES_PER_WORKER):
+        update_data = WaitingRoomUpdateSchema(name=f"worker {worker} update {number}")
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            await lock_rows(session, LockSet().add(WaitingRoom, waiting_room_id))
+            await update_single_waiting_room(session, update_data, waiting_room_id)
+        outcomes["updates"] += 1
+
+
+async def measure(
+    engine: AsyncEngine, worker_function, waiting_room_ids: list[str]
+) -> tuple[float, Counter]:
+    outcomes = Counter()
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(
+            worker_function(
+                engine,
+                worker,
+                waiting_room_ids[worker % len(waiting_room_ids)],
+                outcomes,
+            )
+            for worker in range(WORKERS)
+        )
+    )
+    return time.perf_counter() - start, outcomes
+
+
+async def run() -> None:
+    settings = DatabaseSettings(TESTING=True)
+    engine = create_async_engine(settings.postgres_url, poolclass=NullPool)
+    waiting_room_ids = await seed(engine)
+
+    for contention, rooms_amount in CONTENTION_LEVELS.items():
+        for strategy, worker_function in (
+            ("optimistic", optimistic_worker),
+            ("pessimistic", pessimistic_worker),
+        ):
+            elapsed, outcomes = await measure(
+                engine, worker_function, waiting_room_ids[:rooms_amount]
+            )
+            print(
+                f"{contention:>8} | {strategy:>11} | "
+                f"{outcomes['updates'] / elapsed:8.1f} updates/s | "
+                f"{outcomes['conflicts']} conflicts"
+            )
+
+    await engine.dispose()
+
+
+def main() -> None:
+    sync_settings = DatabaseSettings(ASYNC=False, TESTING=True)
+    sync_engine = create_engine(sync_settings.postgres_url)
+    Base.metadata.drop_all(sync_engine)
+    Base.metadata.create_all(sync_engine)
+    try:
+        asyncio.run(run())
+    finally:
+        Base.metadata.drop_all(sync_engine)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import random
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from src.apps.putaway.services import CapacitySnapshot
+
+SECTIONS = 10
+RACKS_PER_SECTION = 20
+LEVELS_PER_RACK = 25
+WAITING_ROOMS = 20
+PRODUCTS = 500
+STORED_STOCKS = 20000
+BATCH_SIZES = (1, 100, 1000)
+ROUNDS = 20
+
+
+def build_snapshot() -> CapacitySnapshot:
+    racks = [
+        SimpleNamespace(
+            id=f"rack-{section}-{rack}",
+            section_id=f"section-{section}",
+            occupied_weight=random.uniform(0, 5000),
+            max_weight=10000,
+        )
+        for section in range(SECTIONS)
+        for rack in range(RACKS_PER_SECTION)
+    ]
+    rack_levels = [
+        SimpleNamespace(
+            id=f"{rack.id}-level-{level}",
+            rack_id=rack.id,
+            available_weight=random.uniform(0, 400),
+            available_slots=random.randint(0, 10),
+            max_weight=400,
+        )
+        for rack in racks
+        for level in range(LEVELS_PER_RACK)
+    ]
+    waiting_rooms = [
+        SimpleNamespace(
+            id=f"waiting-room-{number}",
+            available_stock_weight=random.uniform(0, 2000),
+            available_slots=random.randint(0, 50),
+            max_weight=2000,
+        )
+        for number in range(WAITING_ROOMS)
+    ]
+    rack_level_slots = [
+        SimpleNamespace(id=f"{rack_level.id}-slot", rack_level_id=rack_level.id)
+        for rack_level in rack_levels
+    ]
+    stocks = [
+        SimpleNamespace(
+            product_id=f"product-{random.randrange(PRODUCTS)}",
+            waiting_room_id=None,
+            rack_level_slot_id=random.choice(rack_level_slots).id,
+        )
+        for _ in range(STORED_STOCKS)
+    ]
+    return CapacitySnapshot(racks, rack_levels, waiting_rooms, rack_level_slots, stocks)
+
+
+def measure(snapshot: CapacitySnapshot, batch_size: int) -> float:
+    weights = np.random.uniform(1, 100, batch_size)
+    product_ids = [f"product-{random.randrange(PRODUCTS)}" for _ in range(batch_size)]
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        scores = snapshot.score(weights, product_ids)
+        snapshot.rank(scores, limit=3)
+        snapshot.assign(scores, weights)
+    return (time.perf_counter() - start) / ROUNDS
+
+
+def main() -> None:
+    start = time.perf_counter()
+    snapshot = build_snapshot()
+    print(
+        f"snapshot of {len(snapshot)} locations built in "
+        f"{(time.perf_counter() - start) * 1000:.1f}ms"
+    )
+    for batch_size in BATCH_SIZES:
+        elapsed = measure(snapshot, batch_size)
+        print(f"{batch_size:>5} stocks | {elapsed * 1000:8.2f}ms per batch")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,896 @@
+import argparse
+import asyncio
+import datetime as dt
+import random
+import time
+import uuid
+from decimal import Decimal
+from typing import Iterator, Optional
+
+import asyncpg
+import numpy as np
+from pydantic import BaseModel, confloat, conint
+from sqlalchemy import create_engine
+
+from src.apps.inventory.models import ProductInventory, ProductSectionInventory
+from src.apps.issues.models import Issue
+from src.apps.products.models import (
+    Category,
+    Product,
+    category_product_association_table,
+)
+from src.apps.rack_level_slots.models import RackLevelSlot
+from src.apps.rack_levels.models import RackLevel
+from src.apps.racks.models import Rack
+from src.apps.receptions.models import Reception
+from src.apps.sections.models import Section
+from src.apps.stocks.models import Stock, UserStock
+from src.apps.users.models import User
+from src.apps.waiting_rooms.models import WaitingRoom
+from src.apps.warehouse.models import Warehouse
+from src.core.factory.category_factory import CategoryInputSchemaFactory
+from src.core.factory.product_factory import ProductInputSchemaFactory
+from src.core.factory.rack_factory import RackInputSchemaFactory
+from src.core.factory.rack_level_factory import RackLevelInputSchemaFactory
+from src.core.factory.section_factory import SectionInputSchemaFactory
+from src.core.factory.user_factory import UserInputSchemaFactory
+from src.core.factory.waiting_room_factory import WaitingRoomInputSchemaFactory
+from src.core.factory.warehouse_factory import WarehouseInputSchemaFactory
+from src.core.utils.faker import set_product_count
+from src.core.utils.partitioning import get_partition_statements
+from src.database.db_connection import Base
+from src.settings.alembic import *
+from src.settings.db_settings import DatabaseSettings
+
+NO_LOCATION = -1
+SEEDED_FROM = dt.datetime(2024, 1, 1)
+SEEDED_PERIOD = dt.timedelta(days=365)
+MOVE_INTERVAL = dt.timedelta(hours=6)
+
+
+class WarehouseSeedScale(BaseModel):
+    stocks: conint(ge=1) = 1_000_000
+    rack_level_slots: conint(ge=1) = 100_000
+    movements: conint(ge=0) = 10_000_000
+    products: conint(ge=1) = 10_000
+    categories: conint(ge=1) = 50
+    users: conint(ge=1) = 100
+    waiting_rooms: conint(ge=1) = 50
+    stocks_per_document: conint(ge=1) = 20
+    slot_fill_ratio: confloat(ge=0, le=1) = 0.8
+    waiting_room_ratio: confloat(ge=0, le=1) = 0.05
+
+
+class WarehouseSeeder:
+    def __init__(self, scale: WarehouseSeedScale, seed: int) -> None:
+        # the factories and src.core.utils.faker draw from the global generator
+        random.seed(seed)
+        self.scale = scale
+        self.rng = np.random.default_rng(seed)
+        self.id_generator = random.Random(seed)
+        self.tables: list[tuple[str, list[str], list[tuple]]] = []
+
+    def new_id(self) -> str:
+        return str(uuid.UUID(int=self.id_generator.getrandbits(128), version=4))
+
+    def seeded_at(self, position: int, amount: int) -> dt.datetime:
+        return SEEDED_FROM + SEEDED_PERIOD * position / max(amount, 1)
+
+    def add_table(self, model: Base, columns: list[str], records: list[tuple]) -> None:
+        table = getattr(model, "__table__", model)
+        self.tables.append((table.name, columns, records))
+
+    def build_users(self) -> None:
+        factory = UserInputSchemaFactory()
+        records = []
+        self.user_ids = [self.new_id() for _ in range(self.scale.users)]
+        for index, user_id in enumerate(self.user_ids):
+            user = factory.generate(
+                email=f"seed.user.{index}@warehouse.ms",
+                birth_date=dt.date(1970, 1, 1) + dt.timedelta(days=index * 97 % 12000),
+                employment_date=dt.date(2020, 1, 1)
+                + dt.timedelta(days=index * 13 % 1400),
+            )
+            is_staff = index == 0
+            records.append(
+                (
+                    user_id,
+                    user.first_name,
+                    user.last_name,
+                    user.email,
+                    user.birth_date,
+                    user.employment_date,
+                    True,
+                    is_staff,
+                    is_staff,
+                    True,
+                    True,
+                    True,
+                    self.seeded_at(index, self.scale.users),
+                )
+            )
+        self.add_table(
+            User,
+            [
+                "id",
+                "first_name",
+                "last_name",
+                "email",
+                "birth_date",
+                "employment_date",
+                "is_active",
+                "is_superuser",
+                "is_staff",
+                "can_move_stocks",
+                "can_recept_stocks",
+                "can_issue_stocks",
+                "created_at",
+            ],
+            records,
+        )
+
+    def build_layout(self) -> None:
+        section_factory = SectionInputSchemaFactory()
+        rack_factory = RackInputSchemaFactory()
+        rack_level_factory = RackLevelInputSchemaFactory()
+
+        sections, racks, rack_levels, slots = [], [], [], []
+        level_racks, level_max_weights, slot_levels = [], [], []
+        rack_sections = []
+        while len(slots) < self.scale.rack_level_slots:
+            section_id = self.new_id()
+            section = section_factory.generate()
+            section_reserved_weight, racks_amount = Decimal(0), 0
+            for _ in range(section.max_racks):
+                if len(slots) >= self.scale.rack_level_slots:
+                    break
+                rack_id = self.new_id()
+                rack = rack_factory.generate(section_id=section_id)
+                rack_reserved_weight, levels_amount = Decimal(0), 0
+                for rack_level_number in range(1, rack.max_levels + 1):
+                    if len(slots) >= self.scale.rack_level_slots:
+                        break
+                    levels_amount += 1
+                    rack_level_id = self.new_id()
+                    rack_level = rack_level_factory.generate(
+                        rack_id=rack_id, rack_level_number=rack_level_number
+                    )
+                    level_racks.append(len(racks))
+                    level_max_weights.append(int(rack_level.max_weight))
+                    rack_levels.append(
+                        [
+                            rack_level_id,
+                            rack_level_number,
+                            rack_level.description,
+                            rack_level.max_weight,
+                            rack_level.max_slots,
+                            rack_id,
+                        ]
+                    )
+                    rack_reserved_weight += rack_level.max_weight
+                    for slot_number in range(1, rack_level.max_slots + 1):
+                        slot_levels.append(len(rack_levels) - 1)
+                        slots.append(
+                            (
+                                self.new_id(),
+                                slot_number,
+                                f"rack level {rack_level_number} | slot #{slot_number}",
+                                True,
+                                rack_level_id,
+                            )
+                        )
+                rack_sections.append(len(sections))
+                racks.append(
+                    [
+                        rack_id,
+                        rack.rack_name,
+                        max(rack.max_weight, rack_reserved_weight),
+                        rack.max_levels,
+                        levels_amount,
+                        rack_reserved_weight,
+                        section_id,
+                    ]
+                )
+                section_reserved_weight += racks[-1][2]
+                racks_amount += 1
+            sections.append(
+                [
+                    section_id,
+                    section.section_name,
+                    max(section.max_weight, section_reserved_weight),
+                    section.max_racks,
+                    racks_amount,
+                    section_reserved_weight,
+                ]
+            )
+
+        self.sections, self.racks, self.rack_levels = sections, racks, rack_levels
+        self.rack_level_slots = slots
+        self.level_racks = np.array(level_racks, dtype=np.int64)
+        self.level_max_weights = np.array(level_max_weights, dtype=np.int64)
+        self.rack_sections = np.array(rack_sections, dtype=np.int64)
+        self.slot_levels = np.array(slot_levels, dtype=np.int64)
+
+    def build_catalog(self) -> None:
+        category_factory = CategoryInputSchemaFactory()
+        self.category_ids = [self.new_id() for _ in range(self.scale.categories)]
+        self.add_table(
+            Category,
+            ["id", "name", "created_at"],
+            [
+                (
+                    category_id,
+                    category_factory.generate(name=f"category {index}").name,
+                    SEEDED_FROM,
+                )
+                for index, category_id in enumerate(self.category_ids)
+            ],
+        )
+
+        product_factory = ProductInputSchemaFactory()
+        self.product_ids, self.product_weights = [], []
+        products, associations = [], []
+        for index in range(self.scale.products):
+            product_id = self.new_id()
+            product = product_factory.generate()
+            self.product_ids.append(product_id)
+            self.product_weights.append(int(product.weight))
+            products.append(
+                (
+                    product_id,
+                    f"{product.name[:60]} #{index}",
+                    product.wholesale_price,
+                    0,
+                    product.description[:300],
+                    product.weight,
+                    False,
+                    SEEDED_FROM,
+                )
+            )
+            associations.append(
+                (self.category_ids[index % len(self.category_ids)], product_id)
+            )
+        self.add_table(
+            Product,
+            [
+                "id",
+                "name",
+                "wholesale_price",
+                "amount_in_goods",
+                "description",
+                "weight",
+                "legacy_product",
+                "created_at",
+            ],
+            products,
+        )
+        self.add_table(
+            category_product_association_table,
+            ["category_id", "product_id"],
+            associations,
+        )
+
+    def place_stocks(self) -> None:
+        stocks = self.scale.stocks
+        self.stock_products = self.rng.integers(0, self.scale.products, stocks)
+        self.stock_counts = np.array(
+            [set_product_count() for _ in range(stocks)], dtype=np.int64
+        )
+        self.stock_weights = (
+            np.array(self.product_weights, dtype=np.int64)[self.stock_products]
+            * self.stock_counts
+        )
+        self.stock_slots = np.full(stocks, NO_LOCATION, dtype=np.int64)
+        self.stock_waiting_rooms = np.full(stocks, NO_LOCATION, dtype=np.int64)
+
+        queue = self.rng.permutation(stocks)
+        level_free_weights = self.level_max_weights.copy()
+        slots_to_fill = int(len(self.rack_level_slots) * self.scale.slot_fill_ratio)
+        position = 0
+        for slot in self.rng.permutation(len(self.rack_level_slots))[:slots_to_fill]:
+            if position == stocks:
+                break
+            stock, level = queue[position], self.slot_levels[slot]
+            # a slot whose rack level cannot take the next stock stays empty
+            if self.stock_weights[stock] <= level_free_weights[level]:
+                level_free_weights[level] -= self.stock_weights[stock]
+                self.stock_slots[stock] = slot
+                position += 1
+
+        waiting_room_stocks = queue[
+            position : position + int(stocks * self.scale.waiting_room_ratio)
+        ]
+        self.stock_waiting_rooms[waiting_room_stocks] = np.arange(
+            len(waiting_room_stocks)
+        ) % (self.scale.waiting_rooms)
+        self.stock_issued = (self.stock_slots == NO_LOCATION) & (
+            self.stock_waiting_rooms == NO_LOCATION
+        )
+
+    def build_storage(self) -> None:
+        placed = self.stock_slots != NO_LOCATION
+        placed_levels = self.slot_levels[self.stock_slots[placed]]
+        level_weights = np.bincount(
+            placed_levels,
+            weights=self.stock_weights[placed],
+            minlength=len(self.rack_levels),
+        ).astype(np.int64)
+        level_slots = np.bincount(placed_levels, minlength=len(self.rack_levels))
+        rack_weights = np.bincount(
+            self.level_racks, weights=level_weights, minlength=len(self.racks)
+        ).astype(np.int64)
+        section_weights = np.bincount(
+            self.rack_sections, weights=rack_weights, minlength=len(self.sections)
+        ).astype(np.int64)
+
+        self.add_table(
+            Section,
+            [
+                "id",
+                "section_name",
+                "max_weight",
+                "available_weight",
+                "occupied_weight",
+                "reserved_weight",
+                "weight_to_reserve",
+                "max_racks",
+                "available_racks",
+                "occupied_racks",
+                "warehouse_id",
+                "created_at",
+                "version_id",
+            ],
+            [
+                (
+                    section_id,
+                    name,
+                    max_weight,
+                    max_weight - int(section_weights[index]),
+                    Decimal(int(section_weights[index])),
+                    reserved_weight,
+                    max_weight - reserved_weight,
+                    max_racks,
+                    max_racks - racks_amount,
+                    racks_amount,
+                    self.warehouse_id,
+                    SEEDED_FROM,
+                    1,
+                )
+                for index, (
+                    section_id,
+                    name,
+                    max_weight,
+                    max_racks,
+                    racks_amount,
+                    reserved_weight,
+                ) in enumerate(self.sections)
+            ],
+        )
+        self.add_table(
+            Rack,
+            [
+                "id",
+                "rack_name",
+                "max_weight",
+                "available_weight",
+                "occupied_weight",
+                "max_levels",
+                "available_levels",
+                "occupied_levels",
+                "reserved_weight",
+                "weight_to_reserve",
+                "section_id",
+                "created_at",
+                "version_id",
+            ],
+            [
+                (
+                    rack_id,
+                    name,
+                    max_weight,
+                    max_weight - int(rack_weights[index]),
+                    Decimal(int(rack_weights[index])),
+                    max_levels,
+                    max_levels - levels_amount,
+                    levels_amount,
+                    reserved_weight,
+                    max_weight - reserved_weight,
+                    section_id,
+                    SEEDED_FROM,
+                    1,
+                )
+                for index, (
+                    rack_id,
+                    name,
+                    max_weight,
+                    max_levels,
+                    levels_amount,
+                    reserved_weight,
+                    section_id,
+                ) in enumerate(self.racks)
+            ],
+        )
+        self.add_table(
+            RackLevel,
+            [
+                "id",
+                "rack_level_number",
+                "description",
+                "max_weight",
+                "available_weight",
+                "occupied_weight",
+                "max_slots",
+                "available_slots",
+                "occupied_slots",
+                "active_slots",
+                "inactive_slots",
+                "rack_id",
+                "created_at",
+                "version_id",
+            ],
+            [
+                (
+                    rack_level_id,
+                    number,
+                    description,
+                    max_weight,
+                    max_weight - int(level_weights[index]),
+                    Decimal(int(level_weights[index])),
+                    max_slots,
+                    max_slots - int(level_slots[index]),
+                    int(level_slots[index]),
+                    max_slots,
+                    0,
+                    rack_id,
+                    SEEDED_FROM,
+                    1,
+                )
+                for index, (
+                    rack_level_id,
+                    number,
+                    description,
+                    max_weight,
+                    max_slots,
+                    rack_id,
+                ) in enumerate(self.rack_levels)
+            ],
+        )
+        self.add_table(
+            RackLevelSlot,
+            [
+                "id",
+                "rack_level_slot_number",
+                "description",
+                "is_active",
+                "rack_level_id",
+                "warehouse_id",
+            ],
+            [slot + (self.warehouse_id,) for slot in self.rack_level_slots],
+        )
+
+        waiting_room_factory = WaitingRoomInputSchemaFactory()
+        in_waiting_room = self.stock_waiting_rooms != NO_LOCATION
+        room_slots = np.bincount(
+            self.stock_waiting_rooms[in_waiting_room],
+            minlength=self.scale.waiting_rooms,
+        )
+        room_weights = np.bincount(
+            self.stock_waiting_rooms[in_waiting_room],
+            weights=self.stock_weights[in_waiting_room],
+            minlength=self.scale.waiting_rooms,
+        ).astype(np.int64)
+        self.waiting_room_ids, waiting_rooms = [], []
+        for index in range(self.scale.waiting_rooms):
+            waiting_room = waiting_room_factory.generate()
+            max_stocks = int(room_slots[index]) + waiting_room.max_stocks
+            max_weight = int(room_weights[index]) + waiting_room.max_weight
+            self.waiting_room_ids.append(self.new_id())
+            waiting_rooms.append(
+                (
+                    self.waiting_room_ids[-1],
+                    waiting_room.name,
+                    max_stocks,
+                    max_weight,
+                    int(room_slots[index]),
+                    max_stocks - int(room_slots[index]),
+                    Decimal(int(room_weights[index])),
+                    max_weight - int(room_weights[index]),
+                    self.warehouse_id,
+                    SEEDED_FROM,
+                    1,
+                )
+            )
+        self.add_table(
+            WaitingRoom,
+            [
+                "id",
+                "name",
+                "max_stocks",
+                "max_weight",
+                "occupied_slots",
+                "available_slots",
+                "current_stock_weight",
+                "available_stock_weight",
+                "warehouse_id",
+                "created_at",
+                "version_id",
+            ],
+            waiting_rooms,
+        )
+
+    def build_warehouse(self) -> None:
+        self.warehouse_id = self.new_id()
+        warehouse = WarehouseInputSchemaFactory().generate(
+            max_sections=len(self.sections), max_waiting_rooms=self.scale.waiting_rooms
+        )
+        self.add_table(
+            Warehouse,
+            [
+                "id",
+                "warehouse_name",
+                "max_sections",
+                "available_sections",
+                "occupied_sections",
+                "max_waiting_rooms",
+                "available_waiting_rooms",
+                "occupied_waiting_rooms",
+                "created_at",
+                "version_id",
+            ],
+            [
+                (
+                    self.warehouse_id,
+                    warehouse.warehouse_name,
+                    warehouse.max_sections,
+                    0,
+                    warehouse.max_sections,
+                    warehouse.max_waiting_rooms,
+                    0,
+                    warehouse.max_waiting_rooms,
+                    SEEDED_FROM,
+                    1,
+                )
+            ],
+        )
+
+    def build_documents(self) -> None:
+        per_document = self.scale.stocks_per_document
+        self.stock_receptions = self.rng.permutation(self.scale.stocks) // per_document
+        receptions_amount = int(self.stock_receptions.max()) + 1
+        self.reception_ids = [self.new_id() for _ in range(receptions_amount)]
+        self.reception_dates = [
+            self.seeded_at(index, receptions_amount)
+            for index in range(receptions_amount)
+        ]
+
+        issued = np.flatnonzero(self.stock_issued)
+        self.stock_issues = np.full(self.scale.stocks, NO_LOCATION, dtype=np.int64)
+        self.stock_issues[issued] = self.rng.permutation(len(issued)) // per_document
+        issues_amount = (len(issued) + per_document - 1) // per_document
+        self.issue_ids = [self.new_id() for _ in range(issues_amount)]
+
+        for model, document_ids, date_column in (
+            (Reception, self.reception_ids, "reception_date"),
+            (Issue, self.issue_ids, "issue_date"),
+        ):
+            document_users = self.rng.integers(0, len(self.user_ids), len(document_ids))
+            self.add_table(
+                model,
+                ["id", date_column, "description", "user_id", "created_at"],
+                [
+                    (
+                        document_id,
+                        self.seeded_at(index, len(document_ids)),
+                        f"seeded {model.__tablename__} #{index}",
+                        self.user_ids[document_users[index]],
+                        self.seeded_at(index, len(document_ids)),
+                    )
+                    for index, document_id in enumerate(document_ids)
+                ],
+            )
+
+    def get_location(self, location: int) -> tuple[Optional[str], Optional[str]]:
+        if location < len(self.rack_level_slots):
+            return None, self.rack_level_slots[location][0]
+        return self.waiting_room_ids[location - len(self.rack_level_slots)], None
+
+    def get_stock_location(self, stock: int) -> int:
+        if self.stock_slots[stock] != NO_LOCATION:
+            return int(self.stock_slots[stock])
+        return len(self.rack_level_slots) + int(self.stock_waiting_rooms[stock])
+
+    def build_stocks(self) -> None:
+        self.stock_ids = [self.new_id() for _ in range(self.scale.stocks)]
+
+        def generate_stocks() -> Iterator[tuple]:
+            for stock, stock_id in enumerate(self.stock_ids):
+                issue = int(self.stock_issues[stock])
+                waiting_room_id, rack_level_slot_id = None, None
+                if not self.stock_issued[stock]:
+                    waiting_room_id, rack_level_slot_id = self.get_location(
+                        self.get_stock_location(stock)
+                    )
+                yield (
+                    stock_id,
+                    Decimal(int(self.stock_weights[stock])),
+                    self.product_ids[self.stock_products[stock]],
+                    self.reception_ids[self.stock_receptions[stock]],
+                    self.issue_ids[issue] if issue != NO_LOCATION else None,
+                    waiting_room_id,
+                    int(self.stock_counts[stock]),
+                    bool(self.stock_issued[stock]),
+                    rack_level_slot_id,
+                    self.warehouse_id,
+                    self.reception_dates[self.stock_receptions[stock]],
+                )
+
+        self.add_table(
+            Stock,
+            [
+                "id",
+                "weight",
+                "product_id",
+                "reception_id",
+                "issue_id",
+                "waiting_room_id",
+                "product_count",
+                "is_issued",
+                "rack_level_slot_id",
+                "warehouse_id",
+                "created_at",
+            ],
+            generate_stocks(),
+        )
+
+    def build_movements(self) -> None:
+        stocks = self.scale.stocks
+        required = stocks + int(self.stock_issued.sum())
+        extra_moves = max(self.scale.movements - required, 0)
+        stock_moves = np.bincount(
+            self.rng.integers(0, stocks, extra_moves), minlength=stocks
+        )
+        locations_amount = len(self.rack_level_slots) + self.scale.waiting_rooms
+        # issued stocks left from a random location, the others end where they are
+        route_locations = self.rng.integers(
+            0, locations_amount, extra_moves + int(self.stock_issued.sum())
+        )
+        users = self.rng.integers(0, len(self.user_ids), required + extra_moves)
+
+        def generate_movements() -> Iterator[tuple]:
+            route_position, user_position = 0, 0
+            for stock, stock_id in enumerate(self.stock_ids):
+                moves = int(stock_moves[stock])
+                route = [
+                    int(location)
+                    for location in route_locations[
+                        route_position : route_position + moves
+                    ]
+                ]
+                route_position += moves
+                if self.stock_issued[stock]:
+                    route.append(int(route_locations[route_position]))
+                    route_position += 1
+                else:
+                    route.append(self.get_stock_location(stock))
+
+                moved_at = self.reception_dates[self.stock_receptions[stock]]
+                source = (None, None)
+                for step, location in enumerate(route):
+                    target = self.get_location(location)
+                    yield (
+                        self.new_id(),
+                        self.warehouse_id,
+                        self.user_ids[users[user_position]],
+                        stock_id,
+                        moved_at + MOVE_INTERVAL * step,
+                        source[0],
+                        target[0],
+                        None,
+                        (
+                            self.reception_ids[self.stock_receptions[stock]]
+                            if not step
+                            else None
+                        ),
+                        target[1],
+                        source[1],
+                    )
+                    source = target
+                    user_position += 1
+
+                if self.stock_issued[stock]:
+                    yield (
+                        self.new_id(),
+                        self.warehouse_id,
+                        self.user_ids[users[user_position]],
+                        stock_id,
+                        moved_at + MOVE_INTERVAL * len(route),
+                        source[0],
+                        None,
+                        self.issue_ids[self.stock_issues[stock]],
+                        None,
+                        None,
+                        source[1],
+                    )
+                    user_position += 1
+
+        self.add_table(
+            UserStock,
+            [
+                "id",
+                "warehouse_id",
+                "user_id",
+                "stock_id",
+                "moved_at",
+                "from_waiting_room_id",
+                "to_waiting_room_id",
+                "issue_id",
+                "reception_id",
+                "to_rack_level_slot_id",
+                "from_rack_level_slot_id",
+            ],
+            generate_movements(),
+        )
+
+    def build_inventory(self) -> None:
+        # the counters the services keep up to date, summed over stored stocks
+        counted_at = SEEDED_FROM + SEEDED_PERIOD
+        stored = ~self.stock_issued
+        in_waiting_rooms = self.stock_waiting_rooms != NO_LOCATION
+        in_racks = self.stock_slots != NO_LOCATION
+        on_hand_counts, waiting_room_counts, rack_counts = (
+            np.bincount(
+                self.stock_products[stocks],
+                weights=self.stock_counts[stocks],
+                minlength=self.scale.products,
+            ).astype(np.int64)
+            for stocks in (stored, in_waiting_rooms, in_racks)
+        )
+        self.add_table(
+            ProductInventory,
+            [
+                "product_id",
+                "on_hand_count",
+                "waiting_room_count",
+                "rack_count",
+                "updated_at",
+            ],
+            [
+                (
+                    self.product_ids[product],
+                    int(on_hand_counts[product]),
+                    int(waiting_room_counts[product]),
+                    int(rack_counts[product]),
+                    counted_at,
+                )
+                for product in np.flatnonzero(on_hand_counts)
+            ],
+        )
+
+        stock_sections = self.rack_sections[
+            self.level_racks[self.slot_levels[self.stock_slots[in_racks]]]
+        ]
+        keys, positions = np.unique(
+            self.stock_products[in_racks] * len(self.sections) + stock_sections,
+            return_inverse=True,
+        )
+        section_counts = np.bincount(
+            positions, weights=self.stock_counts[in_racks], minlength=len(keys)
+        ).astype(np.int64)
+        self.add_table(
+            ProductSectionInventory,
+            ["product_id", "section_id", "rack_count"],
+            [
+                (
+                    self.product_ids[key // len(self.sections)],
+                    self.sections[key % len(self.sections)][0],
+                    int(rack_count),
+                )
+                for key, rack_count in zip(keys, section_counts)
+            ],
+        )
+
+    def build(self) -> None:
+        self.build_users()
+        self.build_layout()
+        self.build_catalog()
+        self.place_stocks()
+        self.build_warehouse()
+        self.build_storage()
+        self.build_documents()
+        self.build_stocks()
+        self.build_inventory()
+        self.build_movements()
+
+    def get_load_order(self) -> list[tuple[str, list[str], list[tuple]]]:
+        # parents go first so the foreign keys hold while copying
+        order = [
+            User.__tablename__,
+            Warehouse.__tablename__,
+            Section.__tablename__,
+            Rack.__tablename__,
+            RackLevel.__tablename__,
+            RackLevelSlot.__tablename__,
+            WaitingRoom.__tablename__,
+            Category.__tablename__,
+            Product.__tablename__,
+            category_product_association_table.name,
+            Reception.__tablename__,
+            Issue.__tablename__,
+            Stock.__tablename__,
+            ProductInventory.__tablename__,
+            ProductSectionInventory.__tablename__,
+            UserStock.__tablename__,
+        ]
+        return sorted(self.tables, key=lambda table: order.index(table[0]))
+
+    async def copy_tables(self, connection: asyncpg.Connection) -> dict[str, int]:
+        loaded = {}
+        # the seeded history is copied into the warehouse's own partition
+        for statement in get_partition_statements(self.warehouse_id):
+            await connection.execute(statement)
+        for table_name, columns, records in self.get_load_order():
+            result = await connection.copy_records_to_table(
+                table_name, records=records, columns=columns
+            )
+            loaded[table_name] = int(result.split()[-1])
+        return loaded
+
+    async def load(self, dsn: str) -> dict[str, int]:
+        connection = await asyncpg.connect(dsn)
+        try:
+            async with connection.transaction():
+                loaded = await self.copy_tables(connection)
+            await connection.execute("ANALYZE")
+        finally:
+            await connection.close()
+        return loaded
+
+
+async def seed_warehouse(
+    dsn: str, scale: WarehouseSeedScale, seed: int = 0
+) -> dict[str, int]:
+    seeder = WarehouseSeeder(scale, seed)
+    seeder.build()
+    return await seeder.load(dsn)
+
+
+def reset_database(sync_url: str) -> None:
+    sync_engine = create_engine(sync_url)
+    Base.metadata.drop_all(sync_engine)
+    Base.metadata.create_all(sync_engine)
+    sync_engine.dispose()
+
+
+def parse_scale() -> tuple[WarehouseSeedScale, int]:
+    parser = argparse.ArgumentParser(
+        description="Seed the test database with a synthetic warehouse"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    for field in WarehouseSeedScale.__fields__.values():
+        parser.add_argument(
+            f"--{field.name.replace('_', '-')}",
+            dest=field.name,
+            type=type(field.default),
+            default=field.default,
+        )
+    arguments = vars(parser.parse_args())
+    seed = arguments.pop("seed")
+    return WarehouseSeedScale(**arguments), seed
+
+
+def main() -> None:
+    scale, seed = parse_scale()
+    settings = DatabaseSettings(ASYNC=False, TESTING=True)
+    reset_database(settings.postgres_url)
+
+    start = time.perf_counter()
+    loaded = asyncio.run(seed_warehouse(settings.postgres_url, scale, seed))
+    elapsed = time.perf_counter() - start
+
+    for table_name, rows in loaded.items():
+        print(f"{table_name:>36} | {rows:>10} rows")
+    print(f"seeded in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,400 @@
+import argparse
+import asyncio
+import datetime as dt
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+from pydantic import BaseModel
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from benchmarks.local_database import check_local_database
+from benchmarks.seed_warehouse import WarehouseSeedScale, reset_database, seed_warehouse
+from src.apps.issues.schemas import StockIssueInputSchema
+from src.apps.issues.services import create_issue
+from src.apps.products.models import Product
+from src.apps.rack_levels.models import RackLevel
+from src.apps.rack_levels.services import (
+    add_single_stock_to_rack_level,
+    create_rack_level,
+)
+from src.apps.racks.models import Rack
+from src.apps.receptions.services import create_reception
+from src.apps.stocks.models import Stock
+from src.apps.stocks.schemas.stock_schemas import (
+    StockOutputSchema,
+    StockRackLevelInputSchema,
+)
+from src.apps.stocks.services.stock_services import get_multiple_stocks
+from src.apps.stocks.services.user_stock_services import get_multiple_user_stocks
+from src.apps.users.models import User
+from src.apps.waiting_rooms.models import WaitingRoom
+from src.core.factory.issue_factory import IssueInputSchemaFactory
+from src.core.factory.rack_level_factory import RackLevelInputSchemaFactory
+from src.core.factory.reception_factory import (
+    ReceptionInputSchemaFactory,
+    ReceptionProductInputSchemaFactory,
+)
+from src.core.pagination.models import PageParams
+from src.core.utils.orm import if_exists
+from src.settings.alembic import *
+from src.settings.db_settings import DatabaseSettings
+
+SUITE_SCALE = WarehouseSeedScale(
+    stocks=100_000, rack_level_slots=20_000, movements=1_000_000, products=2_000
+)
+DEFAULT_OUTPUT = Path(__file__).parent / "results" / "services.json"
+DEFAULT_THRESHOLD = 0.2
+DOCUMENT_STOCKS = 10
+PAGE_SIZE = 50
+
+Scenario = Callable[[AsyncSession, "SuiteFixtures"], Awaitable[Callable]]
+
+
+class SuiteFixtures(BaseModel):
+    user_id: str
+    product_ids: list[str]
+    waiting_room_id: str
+    waiting_room_stock_id: str
+    stored_stock_ids: list[str]
+    rack_level_id: str
+    rack_id: str
+    available_stocks: int
+
+
+class StatementCounter:
+    def __init__(self, engine: AsyncEngine) -> None:
+        self.statements = 0
+        event.listen(engine.sync_engine, "before_cursor_execute", self.count)
+
+    def count(self, *args: Any) -> None:
+        self.statements += 1
+
+
+async def load_fixtures(session: AsyncSession) -> SuiteFixtures:
+    available = Stock.is_issued == False
+    return SuiteFixtures(
+        user_id=await session.scalar(select(User.id).where(User.is_staff == True)),
+        product_ids=(
+            await session.scalars(
+                select(Product.id).order_by(Product.id).limit(DOCUMENT_STOCKS)
+            )
+        ).all(),
+        waiting_room_id=await session.scalar(
+            select(WaitingRoom.id).order_by(WaitingRoom.available_slots.desc())
+        ),
+        waiting_room_stock_id=await session.scalar(
+            select(Stock.id)
+            .where(available, Stock.waiting_room_id != None)
+            .order_by(Stock.id)
+        ),
+        stored_stock_ids=(
+            await session.scalars(
+                select(Stock.id)
+                .where(available, Stock.rack_level_slot_id != None)
+                .order_by(Stock.id)
+                .limit(DOCUMENT_STOCKS)
+            )
+        ).all(),
+        rack_level_id=await session.scalar(
+            select(RackLevel.id)
+            .where(RackLevel.available_slots > 0)
+            .order_by(RackLevel.available_weight.desc(), RackLevel.id)
+        ),
+        rack_id=await session.scalar(select(Rack.id).order_by(Rack.id)),
+        available_stocks=await session.scalar(
+            select(func.count()).select_from(Stock).where(available)
+        ),
+    )
+
+
+async def create_reception_scenario(
+    session: AsyncSession, fixtures: SuiteFixtures
+) -> Callable:
+    reception_input = ReceptionInputSchemaFactory().generate(
+        products_data=[
+            ReceptionProductInputSchemaFactory().generate(
+                product_id=product_id,
+                product_count=2,
+                waiting_room_id=fixtures.waiting_room_id,
+            )
+            for product_id in fixtures.product_ids
+        ]
+    )
+    return lambda: create_reception(session, reception_input, fixtures.user_id)
+
+
+async def create_issue_scenario(
+    session: AsyncSession, fixtures: SuiteFixtures
+) -> Callable:
+    issue_input = IssueInputSchemaFactory().generate(
+        stock_ids=[
+            StockIssueInputSchema(id=stock_id) for stock_id in fixtures.stored_stock_ids
+        ]
+    )
+    return lambda: create_issue(session, issue_input, fixtures.user_id)
+
+
+async def add_stock_to_rack_level_scenario(
+    session: AsyncSession, fixtures: SuiteFixtures
+) -> Callable:
+    return lambda: add_single_stock_to_rack_level(
+        session,
+        fixtures.rack_level_id,
+        StockRackLevelInputSchema(id=fixtures.waiting_room_stock_id),
+        fixtures.user_id,
+    )
+
+
+async def filter_and_sort_stocks_scenario(
+    session: AsyncSession, fixtures: SuiteFixtures
+) -> Callable:
+    return lambda: get_multiple_stocks(
+        session,
+        PageParams(size=PAGE_SIZE),
+        schema=StockOutputSchema,
+        query_params=[
+            ("weight__gt", "10"),
+            ("product_count__ge", "3"),
+            ("sort", "weight__desc,created_at__asc"),
+        ],
+    )
+
+
+async def paginate_deep_offset_scenario(
+    session: AsyncSession, fixtures: SuiteFixtures
+) -> Callable:
+    last_page = max(fixtures.available_stocks // PAGE_SIZE, 1)
+    return lambda: get_multiple_stocks(
+        session, PageParams(page=last_page, size=PAGE_SIZE)
+    )
+
+
+async def stock_history_scenario(
+    session: AsyncSession, fixtures: SuiteFixtures
+) -> Callable:
+    return lambda: get_multiple_user_stocks(
+        session,
+        PageParams(size=PAGE_SIZE),
+        user_id=fixtures.user_id,
+        query_params=[("sort", "moved_at__desc")],
+    )
+
+
+async def create_rack_level_scenario(
+    session: AsyncSession, fixtures: SuiteFixtures
+) -> Callable:
+    # seeded racks are full, so one of them gets room for an extra level
+    rack = await if_exists(Rack, "id", fixtures.rack_id, session)
+    rack.max_levels += 1
+    rack.available_levels += 1
+    rack.max_weight += Decimal(200)
+    rack.weight_to_reserve += Decimal(200)
+    session.add(rack)
+    await session.commit()
+
+    rack_level_input = RackLevelInputSchemaFactory().generate(
+        rack_id=rack.id, rack_level_number=rack.max_levels, max_weight=Decimal(150)
+    )
+    return lambda: create_rack_level(session, rack_level_input)
+
+
+SCENARIOS: dict[str, Scenario] = {
+    "create_reception": create_reception_scenario,
+    "create_issue": create_issue_scenario,
+    "add_single_stock_to_rack_level": add_stock_to_rack_level_scenario,
+    "get_multiple_stocks_filtered_sorted": filter_and_sort_stocks_scenario,
+    "paginate_deep_offset": paginate_deep_offset_scenario,
+    "get_multiple_user_stocks": stock_history_scenario,
+    "create_rack_level": create_rack_level_scenario,
+}
+
+
+async def run_once(
+    engine: AsyncEngine,
+    counter: StatementCounter,
+    scenario: Scenario,
+    fixtures: SuiteFixtures,
+    trace_memory: bool = False,
+) -> tuple[float, int, int]:
+    # every run is rolled back, so all of them see the same seeded dataset
+    async with engine.connect() as connection:
+        await connection.begin()
+        await connection.begin_nested()
+        session = AsyncSession(connection, expire_on_commit=False)
+
+        @event.listens_for(session.sync_session, "after_transaction_end")
+        def restart_savepoint(session, transaction):
+            if not connection.closed and not connection.in_nested_transaction():
+                connection.sync_connection.begin_nested()
+
+        service = await scenario(session, fixtures)
+        if trace_memory:
+            tracemalloc.start()
+        counter.statements = 0
+        start = time.perf_counter()
+        await service()
+        elapsed = time.perf_counter() - start
+        statements = counter.statements
+        peak_memory = 0
+        if trace_memory:
+            peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+        await session.close()
+        await connection.rollback()
+    return elapsed, statements, peak_memory
+
+
+async def measure_scenario(
+    engine: AsyncEngine,
+    counter: StatementCounter,
+    scenario: Scenario,
+    fixtures: SuiteFixtures,
+    repeat: int,
+) -> dict[str, float]:
+    await run_once(engine, counter, scenario, fixtures)
+    timings = []
+    for _ in range(repeat):
+        elapsed, statements, _ = await run_once(engine, counter, scenario, fixtures)
+        timings.append(elapsed)
+    _, _, peak_memory = await run_once(
+        engine, counter, scenario, fixtures, trace_memory=True
+    )
+    return {
+        "wall_time": statistics.median(timings),
+        "wall_time_min": min(timings),
+        "statements": statements,
+        "peak_memory": peak_memory,
+    }
+
+
+async def run_suite(
+    settings: DatabaseSettings, repeat: int, selected: list[str]
+) -> dict[str, dict]:
+    engine = create_async_engine(settings.postgres_url, poolclass=NullPool)
+    counter = StatementCounter(engine)
+    async with AsyncSession(engine) as session:
+        fixtures = await load_fixtures(session)
+
+    results = {}
+    for name in selected:
+        results[name] = await measure_scenario(
+            engine, counter, SCENARIOS[name], fixtures, repeat
+        )
+        print(
+            f"{name:>36} | {results[name]['wall_time'] * 1000:9.2f}ms | "
+            f"{results[name]['statements']:4} statements | "
+            f"{results[name]['peak_memory'] / 1024:9.1f}KiB"
+        )
+    await engine.dispose()
+    return results
+
+
+def compare_results(
+    baseline: dict, current: dict, threshold: float = DEFAULT_THRESHOLD
+) -> list[str]:
+    regressions = []
+    for name, baseline_result in baseline["scenarios"].items():
+        if (current_result := current["scenarios"].get(name)) is None:
+            continue
+        # statement counts are deterministic, any extra query is a regression
+        for metric, tolerance in (
+            ("wall_time", threshold),
+            ("peak_memory", threshold),
+            ("statements", 0),
+        ):
+            before, after = baseline_result[metric], current_result[metric]
+            if after > before * (1 + tolerance):
+                change = (after - before) / before * 100 if before else float("inf")
+                regressions.append(
+                    f"{name}: {metric} {before:.6g} -> {after:.6g} (+{change:.1f}%)"
+                )
+    return regressions
+
+
+def load_results(path: Path) -> dict:
+    return json.loads(Path(path).read_text())
+
+
+def run_command(arguments: argparse.Namespace) -> None:
+    settings = DatabaseSettings(TESTING=True)
+    sync_settings = DatabaseSettings(ASYNC=False, TESTING=True)
+    check_local_database(settings)
+
+    if not arguments.skip_seed:
+        reset_database(sync_settings.postgres_url)
+        asyncio.run(
+            seed_warehouse(sync_settings.postgres_url, SUITE_SCALE, arguments.seed)
+        )
+
+    scenarios = asyncio.run(
+        run_suite(settings, arguments.repeat, arguments.scenario or list(SCENARIOS))
+    )
+    results = {
+        "metadata": {
+            "created_at": dt.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "seed": arguments.seed,
+            "scale": SUITE_SCALE.dict(),
+            "repeat": arguments.repeat,
+        },
+        "scenarios": scenarios,
+    }
+    arguments.output.parent.mkdir(parents=True, exist_ok=True)
+    arguments.output.write_text(json.dumps(results, indent=2))
+    print(f"results saved to {arguments.output}")
+
+    if arguments.baseline:
+        report(load_results(arguments.baseline), results, arguments.threshold)
+
+
+def report(baseline: dict, current: dict, threshold: float) -> None:
+    if regressions := compare_results(baseline, current, threshold):
+        raise SystemExit("regressions found:\n" + "\n".join(regressions))
+    print("no regressions found")
+
+
+def compare_command(arguments: argparse.Namespace) -> None:
+    report(
+        load_results(arguments.baseline),
+        load_results(arguments.current),
+        arguments.threshold,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Service level benchmark suite")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="seed the test database and measure")
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--skip-seed", action="store_true")
+    run_parser.add_argument("--repeat", type=int, default=5)
+    run_parser.add_argument(
+        "--scenario", action="append", choices=list(SCENARIOS), default=None
+    )
+    run_parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    run_parser.add_argument("--baseline", type=Path)
+    run_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    run_parser.set_defaults(handler=run_command)
+
+    compare_parser = commands.add_parser("compare", help="compare two result files")
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("current", type=Path)
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    compare_parser.set_defaults(handler=compare_command)
+
+    arguments = parser.parse_args()
+    arguments.handler(arguments)
+
+
+if __name__ == "__main__":
+    main()
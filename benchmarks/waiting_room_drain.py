@@ -0,0 +1,55 @@
+import random
+import time
+from decimal import Decimal
+from types import SimpleNamespace
+
+from src.apps.stocks.services.stock_drain_services import pack_stocks_into_rack_levels
+
+STOCKS = 5000
+RACK_LEVELS = 12500
+SLOTS_PER_LEVEL = 4
+ROUNDS = 5
+
+
+def build_input() -> tuple[list, list, list]:
+    stocks = [
+        SimpleNamespace(
+            id=f"stock-{number}",
+            weight=Decimal(random.randint(1, 50)),
+            waiting_room_id=f"waiting-room-{number % 10}",
+        )
+        for number in range(STOCKS)
+    ]
+    rack_levels = [
+        SimpleNamespace(
+            id=f"level-{number}",
+            available_weight=Decimal(random.randint(0, 150)),
+            available_slots=SLOTS_PER_LEVEL,
+        )
+        for number in range(RACK_LEVELS)
+    ]
+    rack_level_slots = [
+        SimpleNamespace(id=f"{rack_level.id}-slot-{slot}", rack_level_id=rack_level.id)
+        for rack_level in rack_levels
+        for slot in range(SLOTS_PER_LEVEL)
+    ]
+    return stocks, rack_levels, rack_level_slots
+
+
+def main() -> None:
+    stocks, rack_levels, rack_level_slots = build_input()
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        assignments, unassigned_stock_ids = pack_stocks_into_rack_levels(
+            stocks, rack_levels, rack_level_slots
+        )
+    elapsed = (time.perf_counter() - start) / ROUNDS
+    print(
+        f"{STOCKS} stocks into {len(rack_level_slots)} slots planned in "
+        f"{elapsed * 1000:.1f}ms: {len(assignments)} assigned, "
+        f"{len(unassigned_stock_ids)} unassigned"
+    )
+
+
+if __name__ == "__main__":
+    main()
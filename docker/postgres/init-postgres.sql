@@ -1,2 +1,4 @@
 CREATE DATABASE test;
-GRANT ALL PRIVILEGES ON DATABASE test TO postgres;
\ No newline at end of file
+GRANT ALL PRIVILEGES ON DATABASE test TO postgres;
+CREATE DATABASE test_replica;
+GRANT ALL PRIVILEGES ON DATABASE test_replica TO postgres;
\ No newline at end of file
@@ -0,0 +1,47 @@
+import datetime as dt
+
+from sqlalchemy import Column, Index, Integer, String, text
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.sql.sqltypes import DateTime
+
+from src.core.utils.utils import generate_uuid
+from src.database.db_connection import Base
+
+EMAIL_PENDING = "pending"
+EMAIL_SENT = "sent"
+EMAIL_FAILED = "failed"
+
+
+class EmailOutbox(Base):
+    __tablename__ = "email_outbox"
+    id = Column(
+        String,
+        primary_key=True,
+        unique=True,
+        nullable=False,
+        index=True,
+        default=generate_uuid,
+    )
+    subject = Column(String, nullable=False)
+    recipients = Column(ARRAY(String), nullable=False)
+    template_name = Column(String, nullable=False)
+    template_body = Column(JSONB, nullable=False)
+    status = Column(
+        String(length=10),
+        nullable=False,
+        default=EMAIL_PENDING,
+        server_default=EMAIL_PENDING,
+    )
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    last_error = Column(String, nullable=True)
+    available_at = Column(DateTime, nullable=False, default=dt.datetime.now)
+    sent_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=dt.datetime.now, nullable=True)
+
+    __table_args__ = (
+        Index(
+            "ix_email_outbox_pending",
+            "available_at",
+            postgresql_where=text(f"status = '{EMAIL_PENDING}'"),
+        ),
+    )
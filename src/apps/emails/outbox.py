@@ -0,0 +1,243 @@
+import asyncio
+import datetime as dt
+import logging
+import time
+from email.message import EmailMessage
+from functools import lru_cache
+from typing import Callable, Optional
+
+import aiosmtplib
+from jinja2 import Environment, FileSystemLoader, TemplateError, select_autoescape
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.apps.emails.models import EMAIL_FAILED, EMAIL_PENDING, EMAIL_SENT, EmailOutbox
+from src.database.db_connection import async_session
+from src.settings.email_settings import EmailSettings
+from src.settings.outbox_settings import OutboxSettings
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache
+def get_template_environment(template_folder: str) -> Environment:
+    # compiled templates are cached by the environment, so it is built once
+    return Environment(
+        loader=FileSystemLoader(template_folder),
+        autoescape=select_autoescape(["html"]),
+        auto_reload=False,
+    )
+
+
+def render_email(email: EmailOutbox, email_settings: EmailSettings) -> EmailMessage:
+    template = get_template_environment(email_settings.TEMPLATE_FOLDER).get_template(
+        email.template_name
+    )
+    message = EmailMessage()
+    message["Subject"] = email.subject
+    message["From"] = email_settings.MAIL_FROM
+    message["To"] = ", ".join(email.recipients)
+    message.set_content(template.render(**email.template_body), subtype="html")
+    return message
+
+
+class SMTPConnection:
+    def __init__(self, email_settings: EmailSettings) -> None:
+        self.email_settings = email_settings
+        self.client: Optional[aiosmtplib.SMTP] = None
+        self.last_used_at = 0.0
+
+    async def connect(self) -> aiosmtplib.SMTP:
+        client = aiosmtplib.SMTP(
+            hostname=self.email_settings.MAIL_SERVER,
+            port=self.email_settings.MAIL_PORT,
+            use_tls=self.email_settings.MAIL_SSL,
+            validate_certs=self.email_settings.VALIDATE_CERTS,
+        )
+        await client.connect()
+        if self.email_settings.MAIL_TLS:
+            await client.starttls()
+        if self.email_settings.USE_CREDENTIALS:
+            await client.login(
+                self.email_settings.MAIL_USERNAME, self.email_settings.MAIL_PASSWORD
+            )
+        return client
+
+    async def send(self, message: EmailMessage) -> None:
+        if self.client is None or not self.client.is_connected:
+            self.client = await self.connect()
+        try:
+            await self.client.send_message(message)
+        except aiosmtplib.SMTPServerDisconnected:
+            self.client = None
+            raise
+        self.last_used_at = time.monotonic()
+
+    async def close(self) -> None:
+        if self.client is not None and self.client.is_connected:
+            try:
+                await self.client.quit()
+            except aiosmtplib.SMTPException:
+                self.client.close()
+        self.client = None
+
+
+class EmailOutboxWorker:
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        email_settings: EmailSettings,
+        outbox_settings: OutboxSettings,
+    ) -> None:
+        self.session_factory = session_factory
+        self.email_settings = email_settings
+        self.outbox_settings = outbox_settings
+        self.connection = SMTPConnection(email_settings)
+        self.next_send_at = 0.0
+        self.stopping = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+    async def throttle(self) -> None:
+        if (delay := self.next_send_at - time.monotonic()) > 0:
+            await asyncio.sleep(delay)
+        self.next_send_at = (
+            max(self.next_send_at, time.monotonic())
+            + 1 / self.outbox_settings.OUTBOX_RATE_LIMIT
+        )
+
+    def get_retry_values(self, email: EmailOutbox, error: Exception) -> dict:
+        values = {"attempts": email.attempts + 1, "last_error": str(error)}
+        if values["attempts"] >= self.outbox_settings.OUTBOX_MAX_ATTEMPTS:
+            return {**values, "status": EMAIL_FAILED}
+        delay = self.outbox_settings.OUTBOX_RETRY_DELAY * 2**email.attempts
+        return {
+            **values,
+            "available_at": dt.datetime.now() + dt.timedelta(seconds=delay),
+        }
+
+    async def deliver(self, email: EmailOutbox) -> dict:
+        try:
+            message = render_email(email, self.email_settings)
+        except TemplateError as error:
+            return {
+                "attempts": email.attempts + 1,
+                "last_error": str(error),
+                "status": EMAIL_FAILED,
+            }
+
+        await self.throttle()
+        try:
+            await self.connection.send(message)
+        except (aiosmtplib.SMTPException, OSError) as error:
+            return self.get_retry_values(email, error)
+        return {
+            "attempts": email.attempts + 1,
+            "status": EMAIL_SENT,
+            "sent_at": dt.datetime.now(),
+        }
+
+    async def claim_batch(self, session: AsyncSession) -> list[EmailOutbox]:
+        # claimed rows are leased rather than kept locked while they are sent,
+        # other workers skip them until the lease runs out and the emails of
+        # a crashed worker are claimed again afterwards
+        emails = await session.scalars(
+            select(EmailOutbox)
+            .where(
+                EmailOutbox.status == EMAIL_PENDING,
+                EmailOutbox.available_at <= dt.datetime.now(),
+            )
+            .order_by(EmailOutbox.available_at)
+            .limit(self.outbox_settings.OUTBOX_BATCH_SIZE)
+            .with_for_update(skip_locked=True)
+        )
+        emails = emails.all()
+        leased_until = dt.datetime.now() + dt.timedelta(
+            seconds=self.outbox_settings.OUTBOX_LEASE_TIMEOUT
+        )
+        for email in emails:
+            email.available_at = leased_until
+            session.add(email)
+        await session.commit()
+        return emails
+
+    async def process_batch(self, session: AsyncSession) -> int:
+        emails = await self.claim_batch(session)
+        for email in emails:
+            values = await self.deliver(email)
+            # a worker whose lease ran out does not overwrite the next claim
+            await session.execute(
+                update(EmailOutbox)
+                .where(
+                    EmailOutbox.id == email.id,
+                    EmailOutbox.available_at == email.available_at,
+                )
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+        return len(emails)
+
+    async def run(self) -> None:
+        while not self.stopping.is_set():
+            try:
+                async with self.session_factory() as session:
+                    processed = await self.process_batch(session)
+            except Exception:
+                logger.exception("Email outbox batch failed")
+                processed = 0
+            if processed == self.outbox_settings.OUTBOX_BATCH_SIZE:
+                continue
+
+            idle_for = time.monotonic() - self.connection.last_used_at
+            if idle_for > self.outbox_settings.OUTBOX_IDLE_TIMEOUT:
+                await self.connection.close()
+            try:
+                await asyncio.wait_for(
+                    self.stopping.wait(), self.outbox_settings.OUTBOX_POLL_INTERVAL
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        self.stopping.clear()
+        self.task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        self.stopping.set()
+        if self.task is not None:
+            await self.task
+            self.task = None
+        await self.connection.close()
+
+
+email_outbox_worker: Optional[EmailOutboxWorker] = None
+
+
+async def start_email_outbox_worker() -> None:
+    global email_outbox_worker
+    outbox_settings = OutboxSettings()
+    if not outbox_settings.OUTBOX_WORKER_ENABLED:
+        return
+    email_outbox_worker = EmailOutboxWorker(
+        async_session, EmailSettings(), outbox_settings
+    )
+    email_outbox_worker.start()
+
+
+async def stop_email_outbox_worker() -> None:
+    global email_outbox_worker
+    if email_outbox_worker is not None:
+        await email_outbox_worker.stop()
+        email_outbox_worker = None
+
+
+async def main() -> None:
+    worker = EmailOutboxWorker(async_session, EmailSettings(), OutboxSettings())
+    try:
+        await worker.run()
+    finally:
+        await worker.connection.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
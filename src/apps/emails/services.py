@@ -1,20 +1,14 @@
-from fastapi import BackgroundTasks
-from fastapi_mail import ConnectionConfig
-from pydantic import BaseSettings, EmailStr
+from pydantic import BaseModel, EmailStr
 from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.apps.emails.models import EmailOutbox
 from src.apps.emails.schemas import EmailSchema
 from src.apps.jwt.schemas import ConfirmationTokenSchema
 from src.apps.users.models import User
 from src.core.exceptions import DoesNotExist, IsOccupied, ServiceException
-from src.core.utils.email import confirm_token, generate_confirm_token, send_email
+from src.core.utils.email import confirm_token, generate_confirm_token
 from src.core.utils.orm import if_exists
-from src.settings.email_settings import EmailSettings
-
-
-def email_config(settings: BaseSettings = EmailSettings):
-    return ConnectionConfig(**settings().dict())
 
 
 async def retrieve_email_from_token(session: AsyncSession, token: str) -> str:
@@ -23,9 +17,21 @@ async def retrieve_email_from_token(session: AsyncSession, token: str) -> str:
     return current_email
 
 
-async def send_activation_email(
-    email: EmailStr, session: AsyncSession, background_tasks: BackgroundTasks
-) -> None:
+async def enqueue_email(
+    session: AsyncSession, schema: EmailSchema, body_schema: BaseModel
+) -> EmailOutbox:
+    email = EmailOutbox(
+        subject=schema.email_subject,
+        recipients=list(schema.receivers),
+        template_name=schema.template_name,
+        template_body=body_schema.dict(),
+    )
+    session.add(email)
+    await session.flush()
+    return email
+
+
+async def send_activation_email(email: EmailStr, session: AsyncSession) -> None:
     email_schema = EmailSchema(
         email_subject="Activate your account",
         receivers=(email,),
@@ -33,6 +39,4 @@ async def send_activation_email(
     )
     token = await generate_confirm_token([email])
     body_schema = ConfirmationTokenSchema(token=token)
-    await send_email(
-        email_schema, body_schema, background_tasks, settings=email_config()
-    )
+    await enqueue_email(session, email_schema, body_schema)
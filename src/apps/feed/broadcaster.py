@@ -0,0 +1,101 @@
+import asyncio
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from src.apps.feed.schemas import RESYNC, FeedEvent, FeedFilter
+from src.core.invalidation.backends import get_postgres_listener
+from src.settings.db_settings import DatabaseSettings
+from src.settings.feed_settings import FeedSettings, settings
+
+
+class FeedSubscription:
+    def __init__(
+        self,
+        feed_filter: FeedFilter,
+        queue_size: int,
+        warehouse_id: Optional[str] = None,
+    ) -> None:
+        self.feed_filter = feed_filter
+        # unlike the filter, the warehouse scope can not be changed by clients
+        self.warehouse_id = warehouse_id
+        self.queue: asyncio.Queue[FeedEvent] = asyncio.Queue(maxsize=queue_size)
+
+    def push(self, event: FeedEvent) -> None:
+        if not self.feed_filter.matches(event):
+            return
+        if event.kind != RESYNC and self.warehouse_id not in (
+            None,
+            event.warehouse_id,
+        ):
+            return
+        if self.queue.full():
+            # a client that can not keep up drops its backlog instead of
+            # holding back the others, it reloads its view once it catches up
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            event = FeedEvent(kind=RESYNC)
+        self.queue.put_nowait(event)
+
+    async def get(self) -> FeedEvent:
+        return await self.queue.get()
+
+
+class FeedBroadcaster:
+    def __init__(self, dsn: str, feed_settings: FeedSettings) -> None:
+        self.dsn = dsn
+        self.feed_settings = feed_settings
+        self.subscriptions: set[FeedSubscription] = set()
+        self.task: Optional[asyncio.Task] = None
+
+    @contextmanager
+    def subscribe(
+        self, feed_filter: FeedFilter, warehouse_id: Optional[str] = None
+    ) -> Iterator[FeedSubscription]:
+        subscription = FeedSubscription(
+            feed_filter, self.feed_settings.FEED_QUEUE_SIZE, warehouse_id
+        )
+        self.subscriptions.add(subscription)
+        try:
+            yield subscription
+        finally:
+            self.subscriptions.discard(subscription)
+
+    def dispatch(self, event: FeedEvent) -> None:
+        for subscription in list(self.subscriptions):
+            subscription.push(event)
+
+    async def listen(self) -> None:
+        # the connection shared with the invalidation bus receives every event
+        # and the broadcaster fans it out to the subscribed clients
+        listener = get_postgres_listener(
+            self.dsn, self.feed_settings.FEED_RECONNECT_DELAY
+        )
+        await listener.listen(
+            self.feed_settings.FEED_CHANNEL,
+            lambda payload: self.dispatch(FeedEvent.parse_raw(payload)),
+            lambda: self.dispatch(FeedEvent(kind=RESYNC)),
+        )
+
+    def start(self) -> None:
+        self.task = asyncio.create_task(self.listen())
+
+    async def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+
+feed_broadcaster = FeedBroadcaster(DatabaseSettings(ASYNC=False).postgres_url, settings)
+
+
+async def start_feed_broadcaster() -> None:
+    if settings.FEED_ENABLED:
+        feed_broadcaster.start()
+
+
+async def stop_feed_broadcaster() -> None:
+    await feed_broadcaster.stop()
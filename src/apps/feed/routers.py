@@ -0,0 +1,128 @@
+import asyncio
+from typing import AsyncIterator, Optional
+
+from fastapi import Depends, Query, Request, WebSocket, status
+from fastapi.responses import StreamingResponse
+from fastapi.routing import APIRouter
+from fastapi_jwt_auth import AuthJWT
+from fastapi_jwt_auth.exceptions import AuthJWTException
+from pydantic import ValidationError
+
+from src.apps.feed.broadcaster import FeedSubscription, feed_broadcaster
+from src.apps.feed.schemas import FeedFilter
+from src.apps.users.models import User
+from src.core.exceptions import ServiceException
+from src.core.permissions import get_user_warehouse_id
+from src.database.db_connection import get_read_only_engine, read_only_session
+from src.dependencies.user import authenticate_user, get_authenticated_user
+from src.settings.feed_settings import settings
+
+feed_router = APIRouter(prefix="/feed", tags=["feed"])
+
+
+def get_feed_filter(
+    warehouse_id: list[str] = Query([]),
+    section_id: list[str] = Query([]),
+    waiting_room_id: list[str] = Query([]),
+) -> FeedFilter:
+    return FeedFilter(
+        warehouse_ids=warehouse_id,
+        section_ids=section_id,
+        waiting_room_ids=waiting_room_id,
+    )
+
+
+async def get_feed_warehouse_scope(
+    feed_filter: FeedFilter = Depends(get_feed_filter),
+    request_user: User = Depends(authenticate_user),
+) -> Optional[str]:
+    warehouse_ids = {
+        await get_user_warehouse_id(request_user, warehouse_id)
+        for warehouse_id in feed_filter.warehouse_ids or [None]
+    }
+    # several requested warehouses are only left to the filter
+    return warehouse_ids.pop() if len(warehouse_ids) == 1 else None
+
+
+async def stream_server_sent_events(
+    request: Request, feed_filter: FeedFilter, warehouse_id: Optional[str]
+) -> AsyncIterator[str]:
+    with feed_broadcaster.subscribe(feed_filter, warehouse_id) as subscription:
+        while not await request.is_disconnected():
+            try:
+                event = await asyncio.wait_for(
+                    subscription.get(), settings.FEED_KEEPALIVE_INTERVAL
+                )
+            except asyncio.TimeoutError:
+                # keeps proxies from closing an idle stream
+                yield ": keepalive\n\n"
+                continue
+            yield f"event: {event.kind}\ndata: {event.json()}\n\n"
+
+
+@feed_router.get("/events", status_code=status.HTTP_200_OK)
+async def get_feed_events(
+    request: Request,
+    feed_filter: FeedFilter = Depends(get_feed_filter),
+    request_user: User = Depends(authenticate_user),
+    warehouse_id: Optional[str] = Depends(get_feed_warehouse_scope),
+) -> StreamingResponse:
+    return StreamingResponse(
+        stream_server_sent_events(request, feed_filter, warehouse_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def send_feed_events(
+    websocket: WebSocket, subscription: FeedSubscription
+) -> None:
+    while True:
+        event = await subscription.get()
+        await websocket.send_text(event.json())
+
+
+async def receive_feed_filters(
+    websocket: WebSocket, subscription: FeedSubscription
+) -> None:
+    # clients narrow or widen their subscription by sending a new filter
+    while True:
+        try:
+            subscription.feed_filter = FeedFilter.parse_raw(
+                await websocket.receive_text()
+            )
+        except ValidationError as error:
+            await websocket.send_json({"error": error.errors()})
+
+
+@feed_router.websocket("/ws")
+async def get_feed_websocket(
+    websocket: WebSocket,
+    token: str = Query(...),
+    feed_filter: FeedFilter = Depends(get_feed_filter),
+    auth_jwt: AuthJWT = Depends(),
+) -> None:
+    try:
+        auth_jwt.jwt_required("websocket", token=token)
+        async with read_only_session(bind=await get_read_only_engine()) as session:
+            request_user = await get_authenticated_user(
+                session, auth_jwt.get_jwt_subject()
+            )
+        warehouse_id = await get_feed_warehouse_scope(feed_filter, request_user)
+    except (AuthJWTException, ServiceException):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    with feed_broadcaster.subscribe(feed_filter, warehouse_id) as subscription:
+        tasks = [
+            asyncio.create_task(send_feed_events(websocket, subscription)),
+            asyncio.create_task(receive_feed_filters(websocket, subscription)),
+        ]
+        try:
+            # the connection is over once the client leaves or a send fails
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,44 @@
+from typing import Optional
+
+from pydantic import BaseModel, validator
+
+STOCK_MOVED = "stock_moved"
+CAPACITY_CHANGED = "capacity_changed"
+SLOT_TOGGLED = "slot_toggled"
+# sent when events could have been missed (the listener reconnected or the
+# client could not keep up), clients have to reload what they display
+RESYNC = "resync"
+
+FEED_EVENT_KINDS = {STOCK_MOVED, CAPACITY_CHANGED, SLOT_TOGGLED, RESYNC}
+
+
+class FeedEvent(BaseModel):
+    kind: str
+    entity: Optional[str]
+    ids: list[str] = []
+    warehouse_id: Optional[str]
+    section_id: Optional[str]
+    waiting_room_id: Optional[str]
+
+    @validator("kind")
+    def validate_kind(cls, kind: str) -> str:
+        if kind not in FEED_EVENT_KINDS:
+            raise ValueError(f"Unknown feed event kind: {kind}")
+        return kind
+
+
+class FeedFilter(BaseModel):
+    warehouse_ids: list[str] = []
+    section_ids: list[str] = []
+    waiting_room_ids: list[str] = []
+
+    def matches(self, event: FeedEvent) -> bool:
+        if event.kind == RESYNC:
+            return True
+        if not (self.warehouse_ids or self.section_ids or self.waiting_room_ids):
+            return True
+        return (
+            event.warehouse_id in self.warehouse_ids
+            or event.section_id in self.section_ids
+            or event.waiting_room_id in self.waiting_room_ids
+        )
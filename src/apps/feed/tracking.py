@@ -0,0 +1,176 @@
+from collections import defaultdict
+from typing import Any, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session, attributes
+
+from src.apps.feed.schemas import CAPACITY_CHANGED, SLOT_TOGGLED, STOCK_MOVED, FeedEvent
+from src.apps.inventory.capacity import CAPACITY_SOURCES, get_counters
+from src.apps.rack_level_slots.models import RackLevelSlot
+from src.apps.rack_levels.models import RackLevel
+from src.apps.racks.models import Rack
+from src.apps.sections.models import Section
+from src.apps.stocks.models import Stock
+from src.apps.waiting_rooms.models import WaitingRoom
+from src.apps.warehouse.models import Warehouse
+from src.settings.feed_settings import settings
+
+# (warehouse_id, section_id, waiting_room_id) the subscribers filter by
+Scope = tuple[Optional[str], Optional[str], Optional[str]]
+# (kind, entity, entity_id, model locating the change, its id)
+FeedChange = tuple[str, str, str, Any, str]
+
+STOCK_LOCATION_ATTRIBUTES = ("waiting_room_id", "rack_level_slot_id", "is_issued")
+CAPACITY_ATTRIBUTES = {
+    model: get_counters(source()) for model, source in CAPACITY_SOURCES.items()
+}
+SECTION_PATH = (
+    (RackLevelSlot, RackLevel, RackLevelSlot.rack_level_id),
+    (RackLevel, Rack, RackLevel.rack_id),
+    (Rack, Section, Rack.section_id),
+)
+
+
+def has_changes(instance: Any, keys: Any) -> bool:
+    return any(attributes.get_history(instance, key).has_changes() for key in keys)
+
+
+def get_previous_value(instance: Any, key: str) -> Any:
+    history = attributes.get_history(instance, key)
+    if not history.has_changes():
+        return getattr(instance, key)
+    # a value replacing None has no deleted counterpart in the history
+    return history.deleted[0] if history.deleted else None
+
+
+def get_stock_changes(stock: Stock, new: bool) -> list[FeedChange]:
+    locations = {(stock.waiting_room_id, stock.rack_level_slot_id)}
+    if not new:
+        locations.add(
+            (
+                get_previous_value(stock, "waiting_room_id"),
+                get_previous_value(stock, "rack_level_slot_id"),
+            )
+        )
+    changes = []
+    for waiting_room_id, rack_level_slot_id in locations:
+        if waiting_room_id is not None:
+            changes.append(
+                (
+                    STOCK_MOVED,
+                    Stock.__tablename__,
+                    stock.id,
+                    WaitingRoom,
+                    waiting_room_id,
+                )
+            )
+        if rack_level_slot_id is not None:
+            changes.append(
+                (
+                    STOCK_MOVED,
+                    Stock.__tablename__,
+                    stock.id,
+                    RackLevelSlot,
+                    rack_level_slot_id,
+                )
+            )
+    return changes
+
+
+def collect_feed_changes(session: Session) -> list[FeedChange]:
+    # the session still holds the state from before the flush, so the history
+    # of every attribute tells where a stock came from
+    changes = []
+    for instance in [*session.new, *session.dirty]:
+        new = instance in session.new
+        model = type(instance)
+        if model is Stock and (new or has_changes(instance, STOCK_LOCATION_ATTRIBUTES)):
+            changes += get_stock_changes(instance, new)
+        elif (
+            model is RackLevelSlot and not new and has_changes(instance, ["is_active"])
+        ):
+            changes.append(
+                (SLOT_TOGGLED, model.__tablename__, instance.id, model, instance.id)
+            )
+        elif model in CAPACITY_ATTRIBUTES and (
+            new or has_changes(instance, CAPACITY_ATTRIBUTES[model])
+        ):
+            changes.append(
+                (CAPACITY_CHANGED, model.__tablename__, instance.id, model, instance.id)
+            )
+    return changes
+
+
+def get_scopes(connection: Connection, model: Any, ids: set[str]) -> dict[str, Scope]:
+    if model is Warehouse:
+        return {warehouse_id: (warehouse_id, None, None) for warehouse_id in ids}
+    if model is WaitingRoom:
+        rows = connection.execute(
+            select(WaitingRoom.id, WaitingRoom.warehouse_id).where(
+                WaitingRoom.id.in_(ids)
+            )
+        )
+        return {row.id: (row.warehouse_id, None, row.id) for row in rows}
+
+    query = select(model.id, Section.warehouse_id, Section.id.label("section_id"))
+    query, current = query.select_from(model), model
+    for child, parent, foreign_key in SECTION_PATH:
+        if current is child:
+            query, current = query.join(parent, parent.id == foreign_key), parent
+    rows = connection.execute(query.where(model.id.in_(ids)))
+    return {row.id: (row.warehouse_id, row.section_id, None) for row in rows}
+
+
+def get_feed_events(
+    connection: Connection, changes: list[FeedChange], max_ids: int
+) -> list[FeedEvent]:
+    located_ids = defaultdict(set)
+    for *_, model, located_id in changes:
+        located_ids[model].add(located_id)
+    scopes = {
+        (model, located_id): scope
+        for model, ids in located_ids.items()
+        for located_id, scope in get_scopes(connection, model, ids).items()
+    }
+
+    grouped_ids = defaultdict(set)
+    for kind, entity, entity_id, model, located_id in changes:
+        if (scope := scopes.get((model, located_id))) is not None:
+            grouped_ids[(kind, entity, scope)].add(entity_id)
+
+    events = []
+    for (kind, entity, scope), ids in grouped_ids.items():
+        warehouse_id, section_id, waiting_room_id = scope
+        ids = sorted(ids)
+        # notification payloads are limited, large batches are split
+        for start in range(0, len(ids), max_ids):
+            events.append(
+                FeedEvent(
+                    kind=kind,
+                    entity=entity,
+                    ids=ids[start : start + max_ids],
+                    warehouse_id=warehouse_id,
+                    section_id=section_id,
+                    waiting_room_id=waiting_room_id,
+                )
+            )
+    return events
+
+
+def publish_feed_changes(session: Session) -> None:
+    if not settings.FEED_ENABLED or not (changes := collect_feed_changes(session)):
+        return
+    connection = session.connection()
+    events = get_feed_events(connection, changes, settings.FEED_EVENT_MAX_IDS)
+    if events:
+        # notifications are queued by the transaction and delivered on commit
+        # only, so subscribers never see changes that were rolled back
+        connection.execute(
+            select(
+                *[
+                    func.pg_notify(settings.FEED_CHANNEL, event.json())
+                    for event in events
+                ]
+            )
+        )
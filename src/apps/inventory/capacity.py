@@ -0,0 +1,378 @@
+import argparse
+import asyncio
+import logging
+from typing import Any, Callable, Optional
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from src.apps.inventory.schemas import CapacityDriftSchema, CapacityReconciliationSchema
+from src.apps.rack_level_slots.models import RackLevelSlot
+from src.apps.rack_levels.models import RackLevel
+from src.apps.racks.models import Rack
+from src.apps.sections.models import Section
+from src.apps.stocks.models import Stock
+from src.apps.waiting_rooms.models import WaitingRoom
+from src.apps.warehouse.models import Warehouse
+from src.core.invalidation.bus import invalidation_bus
+from src.core.invalidation.events import RACK_LEVEL_CAPACITY_CHANGED
+from src.database.db_connection import async_session
+from src.settings.inventory_settings import InventorySettings
+
+logger = logging.getLogger(__name__)
+
+# keeps scheduled reconciliations of several worker processes from overlapping
+CAPACITY_LOCK_KEY = 4_501_246
+
+
+def restrict(query: Select, column: Any, entity_ids: Optional[list[str]]) -> Select:
+    if entity_ids is None:
+        return query
+    return query.where(column.in_(entity_ids))
+
+
+def get_slot_stocks(group_column: Any, entity_ids: Optional[list[str]]) -> Any:
+    # stocks placed in rack level slots, summed up per rack level, rack or section
+    query = (
+        select(
+            group_column.label("entity_id"),
+            func.count(Stock.id).label("stocks"),
+            func.sum(Stock.weight).label("weight"),
+        )
+        .select_from(Stock)
+        .join(RackLevelSlot, RackLevelSlot.id == Stock.rack_level_slot_id)
+        .join(RackLevel, RackLevel.id == RackLevelSlot.rack_level_id)
+        .join(Rack, Rack.id == RackLevel.rack_id)
+        .where(Stock.is_issued == False)
+        .group_by(group_column)
+    )
+    return restrict(query, group_column, entity_ids).subquery()
+
+
+def get_children(
+    parent_column: Any, entity_ids: Optional[list[str]], *columns: Any
+) -> Any:
+    query = select(
+        parent_column.label("entity_id"), func.count().label("children"), *columns
+    ).group_by(parent_column)
+    return restrict(query, parent_column, entity_ids).subquery()
+
+
+def get_warehouse_capacity(entity_ids: Optional[list[str]] = None) -> Select:
+    sections = get_children(Section.warehouse_id, entity_ids)
+    waiting_rooms = get_children(WaitingRoom.warehouse_id, entity_ids)
+    occupied_sections = func.coalesce(sections.c.children, 0)
+    occupied_waiting_rooms = func.coalesce(waiting_rooms.c.children, 0)
+    query = (
+        select(
+            Warehouse.id,
+            (Warehouse.max_sections - occupied_sections).label("available_sections"),
+            occupied_sections.label("occupied_sections"),
+            (Warehouse.max_waiting_rooms - occupied_waiting_rooms).label(
+                "available_waiting_rooms"
+            ),
+            occupied_waiting_rooms.label("occupied_waiting_rooms"),
+        )
+        .select_from(Warehouse)
+        .outerjoin(sections, sections.c.entity_id == Warehouse.id)
+        .outerjoin(waiting_rooms, waiting_rooms.c.entity_id == Warehouse.id)
+    )
+    return restrict(query, Warehouse.id, entity_ids)
+
+
+def get_section_capacity(entity_ids: Optional[list[str]] = None) -> Select:
+    stocks = get_slot_stocks(Rack.section_id, entity_ids)
+    racks = get_children(
+        Rack.section_id, entity_ids, func.sum(Rack.max_weight).label("reserved")
+    )
+    occupied_weight = func.coalesce(stocks.c.weight, 0)
+    reserved_weight = func.coalesce(racks.c.reserved, 0)
+    occupied_racks = func.coalesce(racks.c.children, 0)
+    query = (
+        select(
+            Section.id,
+            (Section.max_weight - occupied_weight).label("available_weight"),
+            occupied_weight.label("occupied_weight"),
+            reserved_weight.label("reserved_weight"),
+            (Section.max_weight - reserved_weight).label("weight_to_reserve"),
+            (Section.max_racks - occupied_racks).label("available_racks"),
+            occupied_racks.label("occupied_racks"),
+        )
+        .select_from(Section)
+        .outerjoin(stocks, stocks.c.entity_id == Section.id)
+        .outerjoin(racks, racks.c.entity_id == Section.id)
+    )
+    return restrict(query, Section.id, entity_ids)
+
+
+def get_rack_capacity(entity_ids: Optional[list[str]] = None) -> Select:
+    stocks = get_slot_stocks(RackLevel.rack_id, entity_ids)
+    rack_levels = get_children(
+        RackLevel.rack_id, entity_ids, func.sum(RackLevel.max_weight).label("reserved")
+    )
+    occupied_weight = func.coalesce(stocks.c.weight, 0)
+    reserved_weight = func.coalesce(rack_levels.c.reserved, 0)
+    occupied_levels = func.coalesce(rack_levels.c.children, 0)
+    query = (
+        select(
+            Rack.id,
+            (Rack.max_weight - occupied_weight).label("available_weight"),
+            occupied_weight.label("occupied_weight"),
+            reserved_weight.label("reserved_weight"),
+            (Rack.max_weight - reserved_weight).label("weight_to_reserve"),
+            (Rack.max_levels - occupied_levels).label("available_levels"),
+            occupied_levels.label("occupied_levels"),
+        )
+        .select_from(Rack)
+        .outerjoin(stocks, stocks.c.entity_id == Rack.id)
+        .outerjoin(rack_levels, rack_levels.c.entity_id == Rack.id)
+    )
+    return restrict(query, Rack.id, entity_ids)
+
+
+def get_rack_level_capacity(entity_ids: Optional[list[str]] = None) -> Select:
+    stocks = get_slot_stocks(RackLevelSlot.rack_level_id, entity_ids)
+    slots = get_children(
+        RackLevelSlot.rack_level_id,
+        entity_ids,
+        func.count().filter(RackLevelSlot.is_active == True).label("active"),
+    )
+    occupied_weight = func.coalesce(stocks.c.weight, 0)
+    occupied_slots = func.coalesce(stocks.c.stocks, 0)
+    active_slots = func.coalesce(slots.c.active, 0)
+    query = (
+        select(
+            RackLevel.id,
+            (RackLevel.max_weight - occupied_weight).label("available_weight"),
+            occupied_weight.label("occupied_weight"),
+            (active_slots - occupied_slots).label("available_slots"),
+            occupied_slots.label("occupied_slots"),
+            active_slots.label("active_slots"),
+            (func.coalesce(slots.c.children, 0) - active_slots).label("inactive_slots"),
+        )
+        .select_from(RackLevel)
+        .outerjoin(stocks, stocks.c.entity_id == RackLevel.id)
+        .outerjoin(slots, slots.c.entity_id == RackLevel.id)
+    )
+    return restrict(query, RackLevel.id, entity_ids)
+
+
+def get_waiting_room_capacity(entity_ids: Optional[list[str]] = None) -> Select:
+    stocks = restrict(
+        select(
+            Stock.waiting_room_id.label("entity_id"),
+            func.count(Stock.id).label("stocks"),
+            func.sum(Stock.weight).label("weight"),
+        )
+        .where(Stock.is_issued == False)
+        .group_by(Stock.waiting_room_id),
+        Stock.waiting_room_id,
+        entity_ids,
+    ).subquery()
+    occupied_slots = func.coalesce(stocks.c.stocks, 0)
+    current_stock_weight = func.coalesce(stocks.c.weight, 0)
+    query = (
+        select(
+            WaitingRoom.id,
+            (WaitingRoom.max_stocks - occupied_slots).label("available_slots"),
+            occupied_slots.label("occupied_slots"),
+            current_stock_weight.label("current_stock_weight"),
+            (WaitingRoom.max_weight - current_stock_weight).label(
+                "available_stock_weight"
+            ),
+        )
+        .select_from(WaitingRoom)
+        .outerjoin(stocks, stocks.c.entity_id == WaitingRoom.id)
+    )
+    return restrict(query, WaitingRoom.id, entity_ids)
+
+
+# every capacity counter recomputed from the rows it summarizes
+CAPACITY_SOURCES: dict[Any, Callable[[Optional[list[str]]], Select]] = {
+    Warehouse: get_warehouse_capacity,
+    Section: get_section_capacity,
+    Rack: get_rack_capacity,
+    RackLevel: get_rack_level_capacity,
+    WaitingRoom: get_waiting_room_capacity,
+}
+
+
+def get_counters(query: Select) -> list[str]:
+    return [column for column in query.selected_columns.keys() if column != "id"]
+
+
+async def find_capacity_drift(
+    session: AsyncSession, model: Any, entity_ids: Optional[list[str]] = None
+) -> list[dict]:
+    query = CAPACITY_SOURCES[model](entity_ids)
+    counters, actual = get_counters(query), query.subquery()
+    stored = model.__table__
+    result = await session.execute(
+        select(
+            stored.c.id,
+            *[stored.c[counter].label(f"stored_{counter}") for counter in counters],
+            *[actual.c[counter].label(f"actual_{counter}") for counter in counters],
+        )
+        .select_from(stored)
+        .join(actual, actual.c.id == stored.c.id)
+        .where(or_(*[stored.c[counter] != actual.c[counter] for counter in counters]))
+        .order_by(stored.c.id)
+    )
+    return [dict(row._mapping) for row in result]
+
+
+def get_capacity_drift_output(
+    model: Any, rows: list[dict]
+) -> list[CapacityDriftSchema]:
+    counters = get_counters(CAPACITY_SOURCES[model]())
+    return [
+        CapacityDriftSchema(
+            entity=model.__tablename__,
+            entity_id=row["id"],
+            counter=counter,
+            stored=row[f"stored_{counter}"],
+            actual=row[f"actual_{counter}"],
+        )
+        for row in rows
+        for counter in counters
+        if row[f"stored_{counter}"] != row[f"actual_{counter}"]
+    ]
+
+
+async def repair_capacity_drift(
+    session: AsyncSession, model: Any, entity_ids: list[str], batch_size: int
+) -> None:
+    entity_ids = sorted(entity_ids)
+    stored = model.__table__
+    for start in range(0, len(entity_ids), batch_size):
+        batch = entity_ids[start : start + batch_size]
+        # the rows stay locked for one batch only, movements touching them
+        # wait until the recomputed counters are committed and then apply
+        # their own changes on top of them
+        await session.execute(
+            select(stored.c.id)
+            .where(stored.c.id.in_(batch))
+            .order_by(stored.c.id)
+            .with_for_update()
+        )
+        query = CAPACITY_SOURCES[model](batch)
+        counters, actual = get_counters(query), query.subquery()
+        # bumping the version makes writers holding stale copies retry
+        await session.execute(
+            update(stored)
+            .where(stored.c.id == actual.c.id)
+            .values(
+                version_id=stored.c.version_id + 1,
+                **{counter: actual.c[counter] for counter in counters},
+            )
+        )
+        if model is RackLevel:
+            await invalidation_bus.publish(session, RACK_LEVEL_CAPACITY_CHANGED, *batch)
+        await session.commit()
+
+
+async def reconcile_capacity(
+    session: AsyncSession, repair: bool = False, batch_size: int = 100
+) -> CapacityReconciliationSchema:
+    drift = {
+        model: await find_capacity_drift(session, model) for model in CAPACITY_SOURCES
+    }
+    await session.commit()
+
+    if repair:
+        for model, rows in drift.items():
+            await repair_capacity_drift(
+                session, model, [row["id"] for row in rows], batch_size
+            )
+
+    return CapacityReconciliationSchema(
+        drift=[
+            drift_output
+            for model, rows in drift.items()
+            for drift_output in get_capacity_drift_output(model, rows)
+        ],
+        repaired=repair,
+    )
+
+
+async def run_capacity_reconciliation(
+    session_factory: Callable[[], AsyncSession],
+    inventory_settings: InventorySettings,
+) -> Optional[CapacityReconciliationSchema]:
+    async with session_factory() as lock_session:
+        if not await lock_session.scalar(
+            select(func.pg_try_advisory_xact_lock(CAPACITY_LOCK_KEY))
+        ):
+            return None
+        async with session_factory() as session:
+            result = await reconcile_capacity(
+                session,
+                inventory_settings.CAPACITY_RECONCILIATION_REPAIR,
+                inventory_settings.CAPACITY_REPAIR_BATCH_SIZE,
+            )
+        await lock_session.rollback()
+
+    for drift in result.drift:
+        logger.warning(
+            "Capacity drift in %s %s: %s stored %s, actual %s",
+            drift.entity,
+            drift.entity_id,
+            drift.counter,
+            drift.stored,
+            drift.actual,
+        )
+    return result
+
+
+capacity_scheduler: Optional[AsyncIOScheduler] = None
+
+
+async def start_capacity_reconciliation() -> None:
+    global capacity_scheduler
+    inventory_settings = InventorySettings()
+    if not inventory_settings.CAPACITY_RECONCILIATION_ENABLED:
+        return
+    capacity_scheduler = AsyncIOScheduler()
+    capacity_scheduler.add_job(
+        run_capacity_reconciliation,
+        "interval",
+        seconds=inventory_settings.CAPACITY_RECONCILIATION_INTERVAL,
+        args=[async_session, inventory_settings],
+        max_instances=1,
+        coalesce=True,
+    )
+    capacity_scheduler.start()
+
+
+async def stop_capacity_reconciliation() -> None:
+    global capacity_scheduler
+    if capacity_scheduler is not None:
+        capacity_scheduler.shutdown(wait=False)
+        capacity_scheduler = None
+
+
+async def reconcile_capacity_counters(repair: bool) -> CapacityReconciliationSchema:
+    async with async_session() as session:
+        return await reconcile_capacity(
+            session, repair, InventorySettings().CAPACITY_REPAIR_BATCH_SIZE
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Reconcile capacity counters")
+    parser.add_argument("--repair", action="store_true")
+    arguments = parser.parse_args()
+
+    result = asyncio.run(reconcile_capacity_counters(arguments.repair))
+    for drift in result.drift:
+        print(
+            f"{drift.entity} {drift.entity_id}: {drift.counter} "
+            f"stored {drift.stored}, actual {drift.actual}"
+        )
+    print(f"{len(result.drift)} drifted counters, repaired: {result.repaired}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,442 @@
+import asyncio
+import datetime as dt
+import logging
+from collections import defaultdict
+from typing import Callable, Optional
+
+import numpy as np
+from sqlalchemy import any_, bindparam, func, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.types import String
+
+from src.apps.inventory.models import InventoryCheckpoint
+from src.apps.inventory.schemas import (
+    InventoryDiffSchema,
+    InventorySnapshotSchema,
+    StockLocationChangeSchema,
+    StockLocationSchema,
+)
+from src.apps.rack_level_slots.models import RackLevelSlot
+from src.apps.rack_levels.models import RackLevel
+from src.apps.stocks.models import Stock, UserStock
+from src.apps.waiting_rooms.models import WaitingRoom
+from src.core.exceptions import DoesNotExist, ServiceException
+from src.core.utils.orm import if_exists
+from src.core.utils.time import get_current_time
+from src.database.db_connection import async_session
+from src.settings.inventory_settings import InventorySettings
+
+logger = logging.getLogger(__name__)
+
+# serializes checkpoint writers of every worker process
+CHECKPOINT_LOCK_KEY = 4_501_245
+
+
+def to_array(values: list[Optional[str]]) -> np.ndarray:
+    # missing locations become empty strings, so every array can be sorted
+    # and compared without falling back to python objects
+    return np.array([value or "" for value in values], dtype=np.str_)
+
+
+def from_array(values: np.ndarray) -> list[Optional[str]]:
+    return [value or None for value in values.tolist()]
+
+
+def get_location_mask(
+    waiting_room_ids: np.ndarray,
+    rack_level_slot_ids: np.ndarray,
+    waiting_room_id: Optional[str] = None,
+    rack_level_slot_scope: Optional[list[str]] = None,
+) -> np.ndarray:
+    if waiting_room_id is None and rack_level_slot_scope is None:
+        return np.ones(len(waiting_room_ids), dtype=bool)
+    mask = np.zeros(len(waiting_room_ids), dtype=bool)
+    if waiting_room_id is not None:
+        mask |= waiting_room_ids == waiting_room_id
+    if rack_level_slot_scope is not None:
+        mask |= np.isin(rack_level_slot_ids, to_array(rack_level_slot_scope))
+    return mask
+
+
+class StockLocations:
+    def __init__(
+        self,
+        stock_ids: np.ndarray,
+        waiting_room_ids: np.ndarray,
+        rack_level_slot_ids: np.ndarray,
+    ) -> None:
+        # aligned arrays sorted by stock id
+        self.stock_ids = stock_ids
+        self.waiting_room_ids = waiting_room_ids
+        self.rack_level_slot_ids = rack_level_slot_ids
+
+    def __len__(self) -> int:
+        return len(self.stock_ids)
+
+    @classmethod
+    def from_lists(
+        cls,
+        stock_ids: list[str],
+        waiting_room_ids: list[Optional[str]],
+        rack_level_slot_ids: list[Optional[str]],
+    ) -> "StockLocations":
+        return cls(
+            to_array(stock_ids),
+            to_array(waiting_room_ids),
+            to_array(rack_level_slot_ids),
+        )
+
+    def replay(
+        self,
+        stock_ids: list[str],
+        waiting_room_ids: list[Optional[str]],
+        rack_level_slot_ids: list[Optional[str]],
+    ) -> "StockLocations":
+        movements = StockLocations.from_lists(
+            stock_ids, waiting_room_ids, rack_level_slot_ids
+        )
+        if not len(movements):
+            return self
+        # movements are sorted by stock and time, so the last movement of
+        # every stock decides where it is
+        last = np.append(movements.stock_ids[1:] != movements.stock_ids[:-1], True)
+        # issued stocks have no location and leave the warehouse
+        placed = last & (
+            (movements.waiting_room_ids != "") | (movements.rack_level_slot_ids != "")
+        )
+        kept = ~np.isin(self.stock_ids, movements.stock_ids[last])
+
+        stock_ids = np.concatenate([self.stock_ids[kept], movements.stock_ids[placed]])
+        order = np.argsort(stock_ids, kind="stable")
+        return StockLocations(
+            stock_ids[order],
+            np.concatenate(
+                [self.waiting_room_ids[kept], movements.waiting_room_ids[placed]]
+            )[order],
+            np.concatenate(
+                [self.rack_level_slot_ids[kept], movements.rack_level_slot_ids[placed]]
+            )[order],
+        )
+
+    def locate(self, stock_ids: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        if not len(self):
+            return to_array([None] * len(stock_ids)), to_array([None] * len(stock_ids))
+        indexes = np.searchsorted(self.stock_ids, stock_ids)
+        indexes[indexes == len(self)] = 0
+        found = self.stock_ids[indexes] == stock_ids
+        return (
+            np.where(found, self.waiting_room_ids[indexes], ""),
+            np.where(found, self.rack_level_slot_ids[indexes], ""),
+        )
+
+    def filter(
+        self,
+        waiting_room_id: Optional[str] = None,
+        rack_level_slot_scope: Optional[list[str]] = None,
+    ) -> "StockLocations":
+        mask = get_location_mask(
+            self.waiting_room_ids,
+            self.rack_level_slot_ids,
+            waiting_room_id,
+            rack_level_slot_scope,
+        )
+        return StockLocations(
+            self.stock_ids[mask],
+            self.waiting_room_ids[mask],
+            self.rack_level_slot_ids[mask],
+        )
+
+    def diff(
+        self,
+        later: "StockLocations",
+        waiting_room_id: Optional[str] = None,
+        rack_level_slot_scope: Optional[list[str]] = None,
+    ) -> tuple[np.ndarray, ...]:
+        stock_ids = np.union1d(self.stock_ids, later.stock_ids)
+        before = self.locate(stock_ids)
+        after = later.locate(stock_ids)
+        changed = (before[0] != after[0]) | (before[1] != after[1])
+        # a stock is in scope when it was there at either end of the period
+        changed &= get_location_mask(
+            *before, waiting_room_id, rack_level_slot_scope
+        ) | get_location_mask(*after, waiting_room_id, rack_level_slot_scope)
+        return (
+            stock_ids[changed],
+            before[0][changed],
+            before[1][changed],
+            after[0][changed],
+            after[1][changed],
+        )
+
+
+def to_local_time(value: dt.datetime) -> dt.datetime:
+    # movements are stored as naive local timestamps
+    if value.tzinfo is not None:
+        return value.astimezone().replace(tzinfo=None)
+    return value
+
+
+async def load_checkpoint(
+    session: AsyncSession, as_of: dt.datetime
+) -> tuple[Optional[dt.datetime], StockLocations]:
+    result = await session.execute(
+        select(
+            InventoryCheckpoint.taken_at,
+            InventoryCheckpoint.stock_ids,
+            InventoryCheckpoint.waiting_room_ids,
+            InventoryCheckpoint.rack_level_slot_ids,
+        )
+        .where(InventoryCheckpoint.taken_at <= as_of)
+        .order_by(InventoryCheckpoint.taken_at.desc())
+        .limit(1)
+    )
+    if not (checkpoint := result.first()):
+        return None, StockLocations.from_lists([], [], [])
+    return checkpoint.taken_at, StockLocations.from_lists(*checkpoint[1:])
+
+
+async def replay_movements(
+    session: AsyncSession,
+    locations: StockLocations,
+    since: Optional[dt.datetime],
+    until: dt.datetime,
+) -> tuple[StockLocations, int]:
+    statement = select(
+        UserStock.stock_id,
+        UserStock.to_waiting_room_id,
+        UserStock.to_rack_level_slot_id,
+    ).where(UserStock.moved_at <= until)
+    if since is not None:
+        statement = statement.where(UserStock.moved_at > since)
+    result = await session.execute(
+        statement.order_by(UserStock.stock_id, UserStock.moved_at)
+    )
+    movements = result.all()
+    if not movements:
+        return locations, 0
+    return locations.replay(*zip(*movements)), len(movements)
+
+
+async def get_stock_locations(
+    session: AsyncSession, as_of: dt.datetime
+) -> tuple[StockLocations, Optional[dt.datetime], int]:
+    taken_at, locations = await load_checkpoint(session, as_of)
+    locations, replayed = await replay_movements(session, locations, taken_at, as_of)
+    return locations, taken_at, replayed
+
+
+async def get_rack_level_slot_scope(
+    session: AsyncSession,
+    waiting_room_id: Optional[str],
+    rack_level_id: Optional[str],
+) -> Optional[list[str]]:
+    if waiting_room_id is not None and not await if_exists(
+        WaitingRoom, "id", waiting_room_id, session
+    ):
+        raise DoesNotExist(WaitingRoom.__name__, "id", waiting_room_id)
+    if rack_level_id is None:
+        return None
+    if not await if_exists(RackLevel, "id", rack_level_id, session):
+        raise DoesNotExist(RackLevel.__name__, "id", rack_level_id)
+    result = await session.scalars(
+        select(RackLevelSlot.id).where(RackLevelSlot.rack_level_id == rack_level_id)
+    )
+    return result.all()
+
+
+async def get_stock_products(
+    session: AsyncSession, stock_ids: np.ndarray
+) -> dict[str, tuple[Optional[str], int]]:
+    products = defaultdict(lambda: (None, 0))
+    if not len(stock_ids):
+        return products
+    # a single array parameter instead of one parameter per stock
+    result = await session.execute(
+        select(Stock.id, Stock.product_id, Stock.product_count).where(
+            Stock.id
+            == any_(bindparam("stock_ids", stock_ids.tolist(), type_=ARRAY(String)))
+        )
+    )
+    for stock_id, product_id, product_count in result:
+        products[stock_id] = (product_id, product_count)
+    return products
+
+
+async def get_inventory_as_of(
+    session: AsyncSession,
+    as_of: dt.datetime,
+    waiting_room_id: Optional[str] = None,
+    rack_level_id: Optional[str] = None,
+) -> InventorySnapshotSchema:
+    as_of = to_local_time(as_of)
+    rack_level_slot_scope = await get_rack_level_slot_scope(
+        session, waiting_room_id, rack_level_id
+    )
+    locations, taken_at, replayed = await get_stock_locations(session, as_of)
+    locations = locations.filter(waiting_room_id, rack_level_slot_scope)
+
+    products = await get_stock_products(session, locations.stock_ids)
+    return InventorySnapshotSchema(
+        as_of=as_of,
+        checkpoint_taken_at=taken_at,
+        replayed_movements=replayed,
+        stocks=[
+            StockLocationSchema(
+                stock_id=stock_id,
+                product_id=products[stock_id][0],
+                product_count=products[stock_id][1],
+                waiting_room_id=stock_waiting_room_id,
+                rack_level_slot_id=stock_rack_level_slot_id,
+            )
+            for stock_id, stock_waiting_room_id, stock_rack_level_slot_id in zip(
+                locations.stock_ids.tolist(),
+                from_array(locations.waiting_room_ids),
+                from_array(locations.rack_level_slot_ids),
+            )
+        ],
+    )
+
+
+async def get_inventory_diff(
+    session: AsyncSession,
+    since: dt.datetime,
+    until: dt.datetime,
+    waiting_room_id: Optional[str] = None,
+    rack_level_id: Optional[str] = None,
+) -> InventoryDiffSchema:
+    since, until = to_local_time(since), to_local_time(until)
+    if since > until:
+        raise ServiceException("The start of the period must precede its end! ")
+    rack_level_slot_scope = await get_rack_level_slot_scope(
+        session, waiting_room_id, rack_level_id
+    )
+    before, _, _ = await get_stock_locations(session, since)
+    # the later state only needs the movements made within the period
+    after, _ = await replay_movements(session, before, since, until)
+    changes = before.diff(after, waiting_room_id, rack_level_slot_scope)
+
+    products = await get_stock_products(session, changes[0])
+    return InventoryDiffSchema(
+        since=since,
+        until=until,
+        changes=[
+            StockLocationChangeSchema(
+                stock_id=stock_id,
+                product_id=products[stock_id][0],
+                product_count=products[stock_id][1],
+                from_waiting_room_id=from_waiting_room_id,
+                from_rack_level_slot_id=from_rack_level_slot_id,
+                to_waiting_room_id=to_waiting_room_id,
+                to_rack_level_slot_id=to_rack_level_slot_id,
+            )
+            for (
+                stock_id,
+                from_waiting_room_id,
+                from_rack_level_slot_id,
+                to_waiting_room_id,
+                to_rack_level_slot_id,
+            ) in zip(changes[0].tolist(), *map(from_array, changes[1:]))
+        ],
+    )
+
+
+async def write_checkpoint(
+    session: AsyncSession, inventory_settings: InventorySettings
+) -> Optional[InventoryCheckpoint]:
+    await session.execute(select(func.pg_advisory_xact_lock(CHECKPOINT_LOCK_KEY)))
+    # movements are stamped before their transaction commits, so the
+    # checkpoint lags behind to let the late ones land first
+    taken_at = get_current_time() - dt.timedelta(
+        seconds=inventory_settings.INVENTORY_CHECKPOINT_LAG
+    )
+    last_taken_at = await session.scalar(select(func.max(InventoryCheckpoint.taken_at)))
+    if last_taken_at is not None and taken_at - last_taken_at < dt.timedelta(
+        seconds=inventory_settings.INVENTORY_CHECKPOINT_INTERVAL
+    ):
+        await session.commit()
+        return None
+
+    locations, _, _ = await get_stock_locations(session, taken_at)
+    checkpoint = InventoryCheckpoint(
+        taken_at=taken_at,
+        stock_ids=locations.stock_ids.tolist(),
+        waiting_room_ids=from_array(locations.waiting_room_ids),
+        rack_level_slot_ids=from_array(locations.rack_level_slot_ids),
+    )
+    session.add(checkpoint)
+    await session.commit()
+    return checkpoint
+
+
+class InventoryCheckpointWriter:
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        inventory_settings: InventorySettings,
+    ) -> None:
+        self.session_factory = session_factory
+        self.inventory_settings = inventory_settings
+        self.stopping = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+    async def run(self) -> None:
+        while not self.stopping.is_set():
+            try:
+                async with self.session_factory() as session:
+                    await write_checkpoint(session, self.inventory_settings)
+            except Exception:
+                logger.exception("Inventory checkpoint failed")
+            try:
+                await asyncio.wait_for(
+                    self.stopping.wait(),
+                    self.inventory_settings.INVENTORY_CHECKPOINT_INTERVAL,
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        self.stopping.clear()
+        self.task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        self.stopping.set()
+        if self.task is not None:
+            await self.task
+            self.task = None
+
+
+inventory_checkpoint_writer: Optional[InventoryCheckpointWriter] = None
+
+
+async def start_inventory_checkpoint_writer() -> None:
+    global inventory_checkpoint_writer
+    inventory_settings = InventorySettings()
+    if not inventory_settings.INVENTORY_CHECKPOINT_ENABLED:
+        return
+    inventory_checkpoint_writer = InventoryCheckpointWriter(
+        async_session, inventory_settings
+    )
+    inventory_checkpoint_writer.start()
+
+
+async def stop_inventory_checkpoint_writer() -> None:
+    global inventory_checkpoint_writer
+    if inventory_checkpoint_writer is not None:
+        await inventory_checkpoint_writer.stop()
+        inventory_checkpoint_writer = None
+
+
+async def main() -> None:
+    async with async_session() as session:
+        checkpoint = await write_checkpoint(session, InventorySettings())
+    if checkpoint is None:
+        print("The last checkpoint is recent enough, nothing was written")
+    else:
+        print(
+            f"Checkpoint of {len(checkpoint.stock_ids)} stocks at {checkpoint.taken_at}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,48 @@
+import datetime as dt
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from src.core.utils.utils import generate_uuid
+from src.database.db_connection import Base
+
+
+class ProductInventory(Base):
+    __tablename__ = "product_inventory"
+    product_id = Column(
+        String,
+        ForeignKey("product.id", ondelete="CASCADE", onupdate="cascade"),
+        primary_key=True,
+    )
+    on_hand_count = Column(Integer, nullable=False, server_default="0")
+    waiting_room_count = Column(Integer, nullable=False, server_default="0")
+    rack_count = Column(Integer, nullable=False, server_default="0")
+    updated_at = Column(DateTime, nullable=True)
+
+
+class ProductSectionInventory(Base):
+    __tablename__ = "product_section_inventory"
+    product_id = Column(
+        String,
+        ForeignKey("product.id", ondelete="CASCADE", onupdate="cascade"),
+        primary_key=True,
+    )
+    section_id = Column(
+        String,
+        ForeignKey("section.id", ondelete="CASCADE", onupdate="cascade"),
+        primary_key=True,
+    )
+    rack_count = Column(Integer, nullable=False, server_default="0")
+
+
+class InventoryCheckpoint(Base):
+    __tablename__ = "inventory_checkpoint"
+    id = Column(
+        String, primary_key=True, unique=True, nullable=False, default=generate_uuid
+    )
+    taken_at = Column(DateTime, nullable=False, index=True)
+    # aligned arrays sorted by stock id, issued stocks are left out
+    stock_ids = Column(ARRAY(String), nullable=False)
+    waiting_room_ids = Column(ARRAY(String), nullable=False)
+    rack_level_slot_ids = Column(ARRAY(String), nullable=False)
+    created_at = Column(DateTime, default=dt.datetime.now, nullable=True)
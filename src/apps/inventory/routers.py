@@ -0,0 +1,99 @@
+import datetime as dt
+from typing import Optional
+
+from fastapi import Depends, status
+from fastapi.routing import APIRouter
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.apps.inventory.capacity import reconcile_capacity
+from src.apps.inventory.history import get_inventory_as_of, get_inventory_diff
+from src.apps.inventory.schemas import (
+    CapacityReconciliationSchema,
+    InventoryDiffSchema,
+    InventoryReconciliationSchema,
+    InventorySnapshotSchema,
+    ProductAvailabilitySchema,
+)
+from src.apps.inventory.services import get_product_availability, reconcile_inventory
+from src.apps.users.models import User
+from src.core.permissions import check_if_staff, check_if_staff_or_has_permission
+from src.dependencies.get_db import get_db, get_read_db
+from src.dependencies.user import authenticate_user
+
+inventory_router = APIRouter(prefix="/inventory", tags=["inventory"])
+
+
+@inventory_router.get(
+    "/products/{product_id}",
+    response_model=ProductAvailabilitySchema,
+    status_code=status.HTTP_200_OK,
+)
+async def get_product_inventory(
+    product_id: str,
+    session: AsyncSession = Depends(get_read_db),
+    request_user: User = Depends(authenticate_user),
+) -> ProductAvailabilitySchema:
+    return await get_product_availability(session, product_id)
+
+
+@inventory_router.post(
+    "/reconciliation",
+    response_model=InventoryReconciliationSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def reconcile_inventory_counters(
+    repair: bool = False,
+    session: AsyncSession = Depends(get_db),
+    request_user: User = Depends(authenticate_user),
+) -> InventoryReconciliationSchema:
+    await check_if_staff(request_user)
+    return await reconcile_inventory(session, repair)
+
+
+@inventory_router.post(
+    "/capacity-reconciliation",
+    response_model=CapacityReconciliationSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def reconcile_capacity_counters(
+    repair: bool = False,
+    session: AsyncSession = Depends(get_db),
+    request_user: User = Depends(authenticate_user),
+) -> CapacityReconciliationSchema:
+    await check_if_staff(request_user)
+    return await reconcile_capacity(session, repair)
+
+
+@inventory_router.get(
+    "/as-of",
+    response_model=InventorySnapshotSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def get_inventory_snapshot(
+    at: dt.datetime,
+    waiting_room_id: Optional[str] = None,
+    rack_level_id: Optional[str] = None,
+    session: AsyncSession = Depends(get_read_db),
+    request_user: User = Depends(authenticate_user),
+) -> InventorySnapshotSchema:
+    await check_if_staff_or_has_permission(request_user, "can_move_stocks")
+    return await get_inventory_as_of(session, at, waiting_room_id, rack_level_id)
+
+
+@inventory_router.get(
+    "/diff",
+    response_model=InventoryDiffSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def get_inventory_changes(
+    since: dt.datetime,
+    until: dt.datetime,
+    waiting_room_id: Optional[str] = None,
+    rack_level_id: Optional[str] = None,
+    session: AsyncSession = Depends(get_read_db),
+    request_user: User = Depends(authenticate_user),
+) -> InventoryDiffSchema:
+    await check_if_staff_or_has_permission(request_user, "can_move_stocks")
+    return await get_inventory_diff(
+        session, since, until, waiting_room_id, rack_level_id
+    )
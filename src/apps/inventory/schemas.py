@@ -0,0 +1,76 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class SectionAvailabilitySchema(BaseModel):
+    section_id: str
+    section_name: str
+    rack_count: int
+
+
+class ProductAvailabilitySchema(BaseModel):
+    product_id: str
+    on_hand_count: int = 0
+    waiting_room_count: int = 0
+    rack_count: int = 0
+    sections: list[SectionAvailabilitySchema] = []
+
+
+class InventoryDriftSchema(BaseModel):
+    product_id: str
+    section_id: Optional[str]
+    counter: str
+    stored: int
+    actual: int
+
+
+class InventoryReconciliationSchema(BaseModel):
+    drift: list[InventoryDriftSchema]
+    repaired: bool
+
+
+class CapacityDriftSchema(BaseModel):
+    entity: str
+    entity_id: str
+    counter: str
+    stored: Decimal
+    actual: Decimal
+
+
+class CapacityReconciliationSchema(BaseModel):
+    drift: list[CapacityDriftSchema]
+    repaired: bool
+
+
+class StockLocationSchema(BaseModel):
+    stock_id: str
+    product_id: Optional[str]
+    product_count: int
+    waiting_room_id: Optional[str]
+    rack_level_slot_id: Optional[str]
+
+
+class InventorySnapshotSchema(BaseModel):
+    as_of: datetime
+    checkpoint_taken_at: Optional[datetime]
+    replayed_movements: int
+    stocks: list[StockLocationSchema]
+
+
+class StockLocationChangeSchema(BaseModel):
+    stock_id: str
+    product_id: Optional[str]
+    product_count: int
+    from_waiting_room_id: Optional[str]
+    from_rack_level_slot_id: Optional[str]
+    to_waiting_room_id: Optional[str]
+    to_rack_level_slot_id: Optional[str]
+
+
+class InventoryDiffSchema(BaseModel):
+    since: datetime
+    until: datetime
+    changes: list[StockLocationChangeSchema]
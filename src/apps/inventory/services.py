@@ -0,0 +1,369 @@
+import argparse
+import asyncio
+from collections import defaultdict
+from typing import Optional
+
+from sqlalchemy import func, join, or_, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.functions import FunctionElement
+
+from src.apps.inventory.models import ProductInventory, ProductSectionInventory
+from src.apps.inventory.schemas import (
+    InventoryDriftSchema,
+    InventoryReconciliationSchema,
+    ProductAvailabilitySchema,
+    SectionAvailabilitySchema,
+)
+from src.apps.products.models import Product
+from src.apps.rack_level_slots.models import RackLevelSlot
+from src.apps.rack_levels.models import RackLevel
+from src.apps.racks.models import Rack
+from src.apps.sections.models import Section
+from src.apps.stocks.models import Stock
+from src.core.exceptions import DoesNotExist
+from src.core.utils.orm import if_exists
+from src.core.utils.time import get_current_time
+from src.database.db_connection import async_session
+
+# (waiting_room_id, rack_level_slot_id) of a stock, both are None once issued
+Location = tuple[Optional[str], Optional[str]]
+
+PRODUCT_COUNTERS = ("on_hand_count", "waiting_room_count", "rack_count")
+SECTION_COUNTERS = ("rack_count",)
+
+
+class InventoryChanges:
+    def __init__(self) -> None:
+        self.deltas: list[tuple[str, int, Location]] = []
+
+    def add(
+        self, product_id: Optional[str], units: int, location: Location
+    ) -> "InventoryChanges":
+        if product_id is not None and units:
+            self.deltas.append((product_id, units, location))
+        return self
+
+    def remove(
+        self, product_id: Optional[str], units: int, location: Location
+    ) -> "InventoryChanges":
+        return self.add(product_id, -units, location)
+
+    def move(
+        self, product_id: Optional[str], units: int, source: Location, target: Location
+    ) -> "InventoryChanges":
+        return self.remove(product_id, units, source).add(product_id, units, target)
+
+    async def apply(self, session: AsyncSession) -> None:
+        if not self.deltas:
+            return
+
+        slot_sections = {}
+        if slot_ids := {location[1] for _, _, location in self.deltas if location[1]}:
+            result = await session.execute(
+                select(RackLevelSlot.id, Rack.section_id)
+                .join(RackLevel, RackLevel.id == RackLevelSlot.rack_level_id)
+                .join(Rack, Rack.id == RackLevel.rack_id)
+                .where(RackLevelSlot.id.in_(slot_ids))
+            )
+            slot_sections = dict(result.all())
+
+        product_deltas = defaultdict(lambda: dict.fromkeys(PRODUCT_COUNTERS, 0))
+        section_deltas = defaultdict(int)
+        for product_id, units, (waiting_room_id, rack_level_slot_id) in self.deltas:
+            counters = product_deltas[product_id]
+            counters["on_hand_count"] += units
+            if waiting_room_id:
+                counters["waiting_room_count"] += units
+            if rack_level_slot_id:
+                counters["rack_count"] += units
+                section_deltas[product_id, slot_sections[rack_level_slot_id]] += units
+        self.deltas = []
+
+        updated_at = get_current_time()
+        await upsert_counters(
+            session,
+            ProductInventory,
+            [ProductInventory.product_id],
+            [
+                {"product_id": product_id, "updated_at": updated_at, **counters}
+                for product_id, counters in sorted(product_deltas.items())
+                if any(counters.values())
+            ],
+            PRODUCT_COUNTERS,
+            increment=True,
+        )
+        await upsert_counters(
+            session,
+            ProductSectionInventory,
+            [ProductSectionInventory.product_id, ProductSectionInventory.section_id],
+            [
+                {
+                    "product_id": product_id,
+                    "section_id": section_id,
+                    "rack_count": units,
+                }
+                for (product_id, section_id), units in sorted(section_deltas.items())
+                if units
+            ],
+            SECTION_COUNTERS,
+            increment=True,
+        )
+
+
+async def upsert_counters(
+    session: AsyncSession,
+    table: type,
+    index_elements: list,
+    rows: list[dict],
+    counters: tuple[str, ...],
+    increment: bool,
+) -> None:
+    # rows come sorted by their key, so concurrent transactions lock the
+    # counters in the same order and the increments can not deadlock
+    if not rows:
+        return
+    statement = insert(table).values(rows)
+    values = {counter: getattr(statement.excluded, counter) for counter in counters}
+    if increment:
+        values = {
+            counter: getattr(table, counter) + value
+            for counter, value in values.items()
+        }
+    if hasattr(table, "updated_at"):
+        values["updated_at"] = statement.excluded.updated_at
+    await session.execute(
+        statement.on_conflict_do_update(index_elements=index_elements, set_=values)
+    )
+
+
+async def get_product_availability(
+    session: AsyncSession, product_id: str
+) -> ProductAvailabilitySchema:
+    if not await if_exists(Product, "id", product_id, session):
+        raise DoesNotExist(Product.__name__, "id", product_id)
+
+    # counters are read as plain rows, the upserts above bypass the identity map
+    counters = await session.execute(
+        select(
+            ProductInventory.on_hand_count,
+            ProductInventory.waiting_room_count,
+            ProductInventory.rack_count,
+        ).where(ProductInventory.product_id == product_id)
+    )
+    sections = await session.execute(
+        select(
+            Section.id.label("section_id"),
+            Section.section_name,
+            ProductSectionInventory.rack_count,
+        )
+        .join(Section, Section.id == ProductSectionInventory.section_id)
+        .where(
+            ProductSectionInventory.product_id == product_id,
+            ProductSectionInventory.rack_count != 0,
+        )
+        .order_by(Section.section_name)
+    )
+    counters = counters.first()
+    return ProductAvailabilitySchema(
+        product_id=product_id,
+        **(counters._mapping if counters else {}),
+        sections=[SectionAvailabilitySchema(**row._mapping) for row in sections],
+    )
+
+
+def count_units(*conditions) -> FunctionElement:
+    product_count = func.sum(Stock.product_count)
+    if conditions:
+        product_count = product_count.filter(*conditions)
+    return func.coalesce(product_count, 0)
+
+
+def get_product_counter_source() -> tuple:
+    actual = (
+        select(
+            Stock.product_id,
+            count_units().label("on_hand_count"),
+            count_units(Stock.waiting_room_id.isnot(None)).label("waiting_room_count"),
+            count_units(Stock.rack_level_slot_id.isnot(None)).label("rack_count"),
+        )
+        .where(Stock.is_issued == False, Stock.product_id.isnot(None))
+        .group_by(Stock.product_id)
+        .subquery()
+    )
+    stored = ProductInventory.__table__
+    return (
+        join(actual, stored, stored.c.product_id == actual.c.product_id, full=True),
+        [func.coalesce(actual.c.product_id, stored.c.product_id).label("product_id")],
+        actual,
+        stored,
+    )
+
+
+def get_section_counter_source() -> tuple:
+    actual = (
+        select(
+            Stock.product_id,
+            Rack.section_id,
+            count_units().label("rack_count"),
+        )
+        .join(RackLevelSlot, RackLevelSlot.id == Stock.rack_level_slot_id)
+        .join(RackLevel, RackLevel.id == RackLevelSlot.rack_level_id)
+        .join(Rack, Rack.id == RackLevel.rack_id)
+        .where(Stock.is_issued == False, Stock.product_id.isnot(None))
+        .group_by(Stock.product_id, Rack.section_id)
+        .subquery()
+    )
+    stored = ProductSectionInventory.__table__
+    return (
+        join(
+            actual,
+            stored,
+            (stored.c.product_id == actual.c.product_id)
+            & (stored.c.section_id == actual.c.section_id),
+            full=True,
+        ),
+        [
+            func.coalesce(actual.c.product_id, stored.c.product_id).label("product_id"),
+            func.coalesce(actual.c.section_id, stored.c.section_id).label("section_id"),
+        ],
+        actual,
+        stored,
+    )
+
+
+async def find_drift(
+    session: AsyncSession, counter_source: tuple, counters: tuple[str, ...]
+) -> list[dict]:
+    from_clause, key_columns, actual, stored = counter_source
+    stored_columns = [
+        func.coalesce(stored.c[counter], 0).label(f"stored_{counter}")
+        for counter in counters
+    ]
+    actual_columns = [
+        func.coalesce(actual.c[counter], 0).label(f"actual_{counter}")
+        for counter in counters
+    ]
+    result = await session.execute(
+        select(*key_columns, *stored_columns, *actual_columns)
+        .select_from(from_clause)
+        .where(
+            or_(
+                *[
+                    stored_column != actual_column
+                    for stored_column, actual_column in zip(
+                        stored_columns, actual_columns
+                    )
+                ]
+            )
+        )
+    )
+    return [dict(row._mapping) for row in result]
+
+
+def get_drift_output(
+    rows: list[dict], counters: tuple[str, ...]
+) -> list[InventoryDriftSchema]:
+    return [
+        InventoryDriftSchema(
+            product_id=row["product_id"],
+            section_id=row.get("section_id"),
+            counter=counter,
+            stored=row[f"stored_{counter}"],
+            actual=row[f"actual_{counter}"],
+        )
+        for row in rows
+        for counter in counters
+        if row[f"stored_{counter}"] != row[f"actual_{counter}"]
+    ]
+
+
+async def reconcile_inventory(
+    session: AsyncSession, repair: bool = False
+) -> InventoryReconciliationSchema:
+    if repair:
+        # writers holding counter rows are waited for, writers that have not
+        # reached their counters yet are blocked until the repair commits and
+        # then apply their increments on top of the recomputed totals
+        await session.execute(
+            text(
+                "LOCK TABLE product_inventory, product_section_inventory "
+                "IN SHARE ROW EXCLUSIVE MODE"
+            )
+        )
+
+    product_rows = await find_drift(
+        session, get_product_counter_source(), PRODUCT_COUNTERS
+    )
+    section_rows = await find_drift(
+        session, get_section_counter_source(), SECTION_COUNTERS
+    )
+
+    if repair:
+        updated_at = get_current_time()
+        await upsert_counters(
+            session,
+            ProductInventory,
+            [ProductInventory.product_id],
+            [
+                {
+                    "product_id": row["product_id"],
+                    "updated_at": updated_at,
+                    **{
+                        counter: row[f"actual_{counter}"]
+                        for counter in PRODUCT_COUNTERS
+                    },
+                }
+                for row in sorted(product_rows, key=lambda row: row["product_id"])
+            ],
+            PRODUCT_COUNTERS,
+            increment=False,
+        )
+        await upsert_counters(
+            session,
+            ProductSectionInventory,
+            [ProductSectionInventory.product_id, ProductSectionInventory.section_id],
+            [
+                {
+                    "product_id": row["product_id"],
+                    "section_id": row["section_id"],
+                    "rack_count": row["actual_rack_count"],
+                }
+                for row in sorted(
+                    section_rows, key=lambda row: (row["product_id"], row["section_id"])
+                )
+            ],
+            SECTION_COUNTERS,
+            increment=False,
+        )
+        await session.commit()
+
+    return InventoryReconciliationSchema(
+        drift=get_drift_output(product_rows, PRODUCT_COUNTERS)
+        + get_drift_output(section_rows, SECTION_COUNTERS),
+        repaired=repair,
+    )
+
+
+async def reconcile_inventory_counters(repair: bool) -> InventoryReconciliationSchema:
+    async with async_session() as session:
+        return await reconcile_inventory(session, repair)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Reconcile inventory counters")
+    parser.add_argument("--repair", action="store_true")
+    arguments = parser.parse_args()
+
+    result = asyncio.run(reconcile_inventory_counters(arguments.repair))
+    for drift in result.drift:
+        section = f" in section {drift.section_id}" if drift.section_id else ""
+        print(
+            f"{drift.product_id}{section}: {drift.counter} "
+            f"stored {drift.stored}, actual {drift.actual}"
+        )
+    print(f"{len(result.drift)} drifted counters, repaired: {result.repaired}")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,8 @@ from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql.sqltypes import DateTime
 
+from src.core.utils.search import trigram_index
+from src.core.utils.sync import change_index, change_xid_column, track_changes
 from src.core.utils.time import get_current_time
 from src.core.utils.utils import generate_uuid
 from src.database.db_connection import Base
@@ -44,4 +46,21 @@ class Issue(Base):
         foreign_keys="UserStock.issue_id",
         lazy="selectin",
     )
+    # set for documents created by a background job, a reclaimed job finds
+    # the document its lost attempt already committed
+    job_id = Column(
+        String,
+        ForeignKey("job.id", ondelete="SET NULL"),
+        nullable=True,
+        unique=True,
+    )
+    change_xid = change_xid_column()
     created_at = Column(DateTime, default=dt.datetime.now, nullable=True)
+
+    __table_args__ = (
+        trigram_index("issue", "description"),
+        change_index("issue"),
+    )
+
+
+track_changes(Issue.__table__)
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from fastapi import Depends, Request, Response, status
 from fastapi.routing import APIRouter
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -11,16 +13,19 @@ from src.apps.issues.schemas import (
 )
 from src.apps.issues.services import (
     create_issue,
+    create_issue_job,
     get_all_issues,
     get_single_issue,
     update_single_issue,
 )
+from src.apps.jobs.schemas import JobOutputSchema
 from src.apps.users.models import User
 from src.core.pagination.models import PageParams
 from src.core.pagination.schemas import PagedResponseSchema
 from src.core.permissions import check_if_staff_or_has_permission
-from src.dependencies.get_db import get_db
+from src.dependencies.get_db import get_db, get_read_db
 from src.dependencies.user import authenticate_user
+from src.dependencies.warehouse import get_warehouse_scope
 
 issue_router = APIRouter(prefix="/issues", tags=["issue"])
 
@@ -34,9 +39,27 @@ async def post_issue(
     issue_input: IssueInputSchema,
     session: AsyncSession = Depends(get_db),
     request_user: User = Depends(authenticate_user),
+    warehouse_id: Optional[str] = Depends(get_warehouse_scope),
 ) -> IssueOutputSchema:
     await check_if_staff_or_has_permission(request_user, "can_issue_stocks")
-    return await create_issue(session, issue_input, request_user.id)
+    return await create_issue(
+        session, issue_input, request_user.id, warehouse_id=warehouse_id
+    )
+
+
+@issue_router.post(
+    "/jobs",
+    response_model=JobOutputSchema,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def post_issue_job(
+    issue_input: IssueInputSchema,
+    session: AsyncSession = Depends(get_db),
+    request_user: User = Depends(authenticate_user),
+    warehouse_id: Optional[str] = Depends(get_warehouse_scope),
+) -> JobOutputSchema:
+    await check_if_staff_or_has_permission(request_user, "can_issue_stocks")
+    return await create_issue_job(session, issue_input, request_user.id, warehouse_id)
 
 
 @issue_router.get(
@@ -46,13 +69,17 @@ async def post_issue(
 )
 async def get_issues(
     request: Request,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     page_params: PageParams = Depends(),
     request_user: User = Depends(authenticate_user),
+    warehouse_id: Optional[str] = Depends(get_warehouse_scope),
 ) -> PagedResponseSchema[IssueBasicOutputSchema]:
     await check_if_staff_or_has_permission(request_user, "can_issue_stocks")
     return await get_all_issues(
-        session, page_params, query_params=request.query_params.multi_items()
+        session,
+        page_params,
+        query_params=request.query_params.multi_items(),
+        warehouse_id=warehouse_id,
     )
 
 
@@ -63,11 +90,12 @@ async def get_issues(
 )
 async def get_issue(
     issue_id: str,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     request_user: User = Depends(authenticate_user),
+    warehouse_id: Optional[str] = Depends(get_warehouse_scope),
 ) -> IssueOutputSchema:
     await check_if_staff_or_has_permission(request_user, "can_issue_stocks")
-    return await get_single_issue(session, issue_id)
+    return await get_single_issue(session, issue_id, warehouse_id)
 
 
 @issue_router.patch(
@@ -80,6 +108,7 @@ async def update_issue(
     issue_input: IssueUpdateSchema,
     session: AsyncSession = Depends(get_db),
     request_user: User = Depends(authenticate_user),
+    warehouse_id: Optional[str] = Depends(get_warehouse_scope),
 ) -> IssueOutputSchema:
     await check_if_staff_or_has_permission(request_user, "can_issue_stocks")
-    return await update_single_issue(session, issue_input, issue_id)
+    return await update_single_issue(session, issue_input, issue_id, warehouse_id)
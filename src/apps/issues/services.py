@@ -1,3 +1,6 @@
+import json
+from typing import Any, Optional
+
 from sqlalchemy import delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -8,6 +11,8 @@ from src.apps.issues.schemas import (
     IssueOutputSchema,
     IssueUpdateSchema,
 )
+from src.apps.jobs.schemas import JobOutputSchema
+from src.apps.jobs.services import JobProgress, enqueue_job, register_job_handler
 from src.apps.products.models import Product
 from src.apps.stocks.models import Stock
 from src.apps.stocks.services.stock_services import issue_stocks
@@ -17,12 +22,14 @@ from src.core.exceptions import (
     DoesNotExist,
     IsOccupied,
     MissingIssueDataException,
+    ResourceInAnotherWarehouseException,
     ServiceException,
 )
 from src.core.pagination.models import PageParams
 from src.core.pagination.schemas import PagedResponseSchema
 from src.core.pagination.services import paginate
 from src.core.utils.filter import filter_and_sort_instances
+from src.core.utils.locking import retry_on_lock_conflict
 from src.core.utils.orm import if_exists
 
 
@@ -31,6 +38,8 @@ async def base_create_issue(
     user_id: str,
     issue_input: IssueInputSchema = None,
     testing: bool = False,
+    job_id: Optional[str] = None,
+    warehouse_id: Optional[str] = None,
 ) -> Issue:
 
     if (
@@ -55,8 +64,14 @@ async def base_create_issue(
             raise ServiceException(
                 "Wrong stocks! Check if all requested stock are not issued!"
             )
+        if warehouse_id is not None and any(
+            stock.warehouse_id != warehouse_id for stock in stocks
+        ):
+            raise ResourceInAnotherWarehouseException(resource="stock")
 
-    new_issue = Issue(user_id=user_id, description=issue_input.get("description"))
+    new_issue = Issue(
+        user_id=user_id, description=issue_input.get("description"), job_id=job_id
+    )
 
     session.add(new_issue)
     await session.flush()
@@ -64,11 +79,19 @@ async def base_create_issue(
     return stocks, new_issue
 
 
+@retry_on_lock_conflict()
 async def create_issue(
-    session: AsyncSession, issue_input: IssueInputSchema, user_id: str
+    session: AsyncSession,
+    issue_input: IssueInputSchema,
+    user_id: str,
+    warehouse_id: Optional[str] = None,
+    job_id: Optional[str] = None,
+    progress: Optional[JobProgress] = None,
 ) -> IssueOutputSchema:
-    stocks, new_issue = await base_create_issue(session, user_id, issue_input)
-    await issue_stocks(session, stocks, new_issue.id, user_id)
+    stocks, new_issue = await base_create_issue(
+        session, user_id, issue_input, job_id=job_id, warehouse_id=warehouse_id
+    )
+    await issue_stocks(session, stocks, new_issue.id, user_id, progress=progress)
 
     await session.commit()
     await session.refresh(new_issue)
@@ -76,17 +99,74 @@ async def create_issue(
     return IssueOutputSchema.from_orm(new_issue)
 
 
-async def get_single_issue(session: AsyncSession, issue_id: int) -> IssueOutputSchema:
+ISSUE_JOB = "create_issue"
+
+
+async def create_issue_job(
+    session: AsyncSession,
+    issue_input: IssueInputSchema,
+    user_id: str,
+    warehouse_id: Optional[str] = None,
+) -> JobOutputSchema:
+    payload = {
+        "issue_input": json.loads(issue_input.json(exclude_unset=True)),
+        "user_id": user_id,
+        "warehouse_id": warehouse_id,
+    }
+    return await enqueue_job(session, ISSUE_JOB, payload, user_id)
+
+
+@register_job_handler(ISSUE_JOB)
+async def run_issue_job(
+    session: AsyncSession, payload: dict[str, Any], progress: JobProgress
+) -> dict[str, Any]:
+    # a job reclaimed after its lease ran out may have committed the issue in
+    # the lost attempt already
+    if issue_id := await session.scalar(
+        select(Issue.id).filter(Issue.job_id == progress.job_id)
+    ):
+        return {"issue_id": issue_id}
+
+    issue_input = IssueInputSchema(**payload["issue_input"])
+    await progress.update(0, len(issue_input.stock_ids))
+    issue = await create_issue(
+        session,
+        issue_input,
+        payload["user_id"],
+        payload.get("warehouse_id"),
+        job_id=progress.job_id,
+        progress=progress,
+    )
+    return {"issue_id": issue.id}
+
+
+def check_if_issue_in_warehouse(issue: Issue, warehouse_id: Optional[str]) -> None:
+    # an issue belongs to the warehouse its stocks were issued from
+    if warehouse_id is not None and not any(
+        stock.warehouse_id == warehouse_id for stock in issue.stocks
+    ):
+        raise ResourceInAnotherWarehouseException(resource="issue")
+
+
+async def get_single_issue(
+    session: AsyncSession, issue_id: int, warehouse_id: Optional[str] = None
+) -> IssueOutputSchema:
     if not (issue_object := await if_exists(Issue, "id", issue_id, session)):
         raise DoesNotExist(Issue.__name__, "id", issue_id)
 
+    check_if_issue_in_warehouse(issue_object, warehouse_id)
     return IssueOutputSchema.from_orm(issue_object)
 
 
 async def get_all_issues(
-    session: AsyncSession, page_params: PageParams, query_params: list[tuple] = None
+    session: AsyncSession,
+    page_params: PageParams,
+    query_params: list[tuple] = None,
+    warehouse_id: Optional[str] = None,
 ) -> PagedResponseSchema[IssueBasicOutputSchema]:
     query = select(Issue).join(User, Issue.user_id == User.id)
+    if warehouse_id is not None:
+        query = query.filter(Issue.stocks.any(Stock.warehouse_id == warehouse_id))
 
     if query_params:
         query = filter_and_sort_instances(query_params, query, Issue)
@@ -101,11 +181,16 @@ async def get_all_issues(
 
 
 async def update_single_issue(
-    session: AsyncSession, issue_input: IssueUpdateSchema, issue_id: int
+    session: AsyncSession,
+    issue_input: IssueUpdateSchema,
+    issue_id: int,
+    warehouse_id: Optional[str] = None,
 ) -> IssueOutputSchema:
     if not (issue_object := await if_exists(Issue, "id", issue_id, session)):
         raise DoesNotExist(Issue.__name__, "id", issue_id)
 
+    check_if_issue_in_warehouse(issue_object, warehouse_id)
+
     issue_data = issue_input.dict(exclude_unset=True)
 
     if issue_data:
@@ -0,0 +1,57 @@
+import datetime as dt
+
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql.sqltypes import DateTime
+
+from src.core.utils.utils import generate_uuid
+from src.database.db_connection import Base
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+
+class Job(Base):
+    __tablename__ = "job"
+    id = Column(
+        String,
+        primary_key=True,
+        unique=True,
+        nullable=False,
+        index=True,
+        default=generate_uuid,
+    )
+    kind = Column(String, nullable=False)
+    payload = Column(JSONB, nullable=False)
+    user_id = Column(String, ForeignKey("user.id", ondelete="SET NULL"), nullable=True)
+    status = Column(
+        String(length=10),
+        nullable=False,
+        default=JOB_PENDING,
+        server_default=JOB_PENDING,
+    )
+    progress_completed = Column(Integer, nullable=False, default=0, server_default="0")
+    progress_total = Column(Integer, nullable=True)
+    result = Column(JSONB, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    last_error = Column(String, nullable=True)
+    available_at = Column(DateTime, nullable=False, default=dt.datetime.now)
+    heartbeat_at = Column(DateTime, nullable=True)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=dt.datetime.now, nullable=True)
+
+    __table_args__ = (
+        Index(
+            "ix_job_pending",
+            "available_at",
+            postgresql_where=text(f"status = '{JOB_PENDING}'"),
+        ),
+        Index(
+            "ix_job_running",
+            "heartbeat_at",
+            postgresql_where=text(f"status = '{JOB_RUNNING}'"),
+        ),
+    )
@@ -0,0 +1,27 @@
+from fastapi import Depends, status
+from fastapi.routing import APIRouter
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.apps.jobs.schemas import JobOutputSchema
+from src.apps.jobs.services import get_single_job
+from src.apps.users.models import User
+from src.core.permissions import check_if_staff_or_owner
+from src.dependencies.get_db import get_db
+from src.dependencies.user import authenticate_user
+
+job_router = APIRouter(prefix="/jobs", tags=["job"])
+
+
+@job_router.get(
+    "/{job_id}",
+    response_model=JobOutputSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def get_job(
+    job_id: str,
+    session: AsyncSession = Depends(get_db),
+    request_user: User = Depends(authenticate_user),
+) -> JobOutputSchema:
+    job = await get_single_job(session, job_id)
+    await check_if_staff_or_owner(request_user, "id", job.user_id)
+    return job
@@ -0,0 +1,22 @@
+from datetime import datetime
+from typing import Any, Optional
+
+from pydantic import BaseModel
+
+
+class JobOutputSchema(BaseModel):
+    id: str
+    kind: str
+    user_id: Optional[str]
+    status: str
+    progress_completed: int
+    progress_total: Optional[int]
+    result: Optional[dict[str, Any]]
+    attempts: int
+    last_error: Optional[str]
+    created_at: Optional[datetime]
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+
+    class Config:
+        orm_mode = True
@@ -0,0 +1,89 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.apps.jobs.models import Job
+from src.apps.jobs.schemas import JobOutputSchema
+from src.core.exceptions import DoesNotExist
+from src.core.utils.orm import if_exists
+from src.core.utils.time import get_current_time
+
+
+class JobProgress:
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        job_id: str,
+        write_interval: float = 0.0,
+    ) -> None:
+        self.session_factory = session_factory
+        self.job_id = job_id
+        self.write_interval = write_interval
+        self.pending_values: dict[str, Any] = {}
+        self.written_at: Optional[float] = None
+        # the heartbeat and progress updates share a single connection
+        self.writing = asyncio.Lock()
+
+    async def write(self) -> None:
+        # progress is written in its own transaction, the job itself may keep
+        # its changes uncommitted until it finishes
+        async with self.writing:
+            values, self.pending_values = self.pending_values, {}
+            self.written_at = time.monotonic()
+            try:
+                async with self.session_factory() as session:
+                    await session.execute(
+                        update(Job)
+                        .where(Job.id == self.job_id)
+                        .values(heartbeat_at=get_current_time(), **values)
+                    )
+                    await session.commit()
+            except Exception:
+                self.pending_values = {**values, **self.pending_values}
+                raise
+
+    async def update(self, completed: int, total: Optional[int] = None) -> None:
+        self.pending_values["progress_completed"] = completed
+        if total is not None:
+            self.pending_values["progress_total"] = total
+        # updates in between are carried by the next write or heartbeat
+        if self.writing.locked() or (
+            self.written_at is not None
+            and time.monotonic() - self.written_at < self.write_interval
+        ):
+            return
+        await self.write()
+
+    async def beat(self) -> None:
+        await self.write()
+
+
+JobHandler = Callable[[AsyncSession, dict[str, Any], JobProgress], Awaitable[dict]]
+
+job_handlers: dict[str, JobHandler] = {}
+
+
+def register_job_handler(kind: str) -> Callable[[JobHandler], JobHandler]:
+    def decorator(handler: JobHandler) -> JobHandler:
+        job_handlers[kind] = handler
+        return handler
+
+    return decorator
+
+
+async def enqueue_job(
+    session: AsyncSession, kind: str, payload: dict[str, Any], user_id: str = None
+) -> JobOutputSchema:
+    job = Job(kind=kind, payload=payload, user_id=user_id)
+    session.add(job)
+    await session.commit()
+    return JobOutputSchema.from_orm(job)
+
+
+async def get_single_job(session: AsyncSession, job_id: str) -> JobOutputSchema:
+    if not (job_object := await if_exists(Job, "id", job_id, session)):
+        raise DoesNotExist(Job.__name__, "id", job_id)
+    return JobOutputSchema.from_orm(job_object)
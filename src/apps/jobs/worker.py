@@ -0,0 +1,206 @@
+import asyncio
+import datetime as dt
+import importlib
+import logging
+from typing import Callable, Optional
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.apps.jobs.models import (
+    JOB_FAILED,
+    JOB_PENDING,
+    JOB_RUNNING,
+    JOB_SUCCEEDED,
+    Job,
+)
+from src.apps.jobs.services import JobProgress, job_handlers
+from src.core.exceptions import ServiceException
+from src.core.utils.time import get_current_time
+from src.database.db_connection import async_session
+from src.settings.job_settings import JobSettings
+
+logger = logging.getLogger(__name__)
+
+# modules registering job handlers, imported by standalone workers
+JOB_HANDLER_MODULES = (
+    "src.apps.issues.services",
+    "src.apps.receptions.services",
+)
+
+
+def load_job_handlers() -> None:
+    for module in JOB_HANDLER_MODULES:
+        importlib.import_module(module)
+
+
+class JobWorker:
+    def __init__(
+        self, session_factory: Callable[[], AsyncSession], job_settings: JobSettings
+    ) -> None:
+        self.session_factory = session_factory
+        self.job_settings = job_settings
+        self.stopping = asyncio.Event()
+        self.tasks: list[asyncio.Task] = []
+
+    async def claim(self, session: AsyncSession) -> Optional[Job]:
+        # a running job whose heartbeat stopped belongs to a crashed worker
+        # and is claimed again once its lease runs out
+        now = get_current_time()
+        lease_expired_at = now - dt.timedelta(
+            seconds=self.job_settings.JOB_LEASE_TIMEOUT
+        )
+        job = await session.scalar(
+            select(Job)
+            .where(
+                or_(
+                    and_(Job.status == JOB_PENDING, Job.available_at <= now),
+                    and_(
+                        Job.status == JOB_RUNNING, Job.heartbeat_at < lease_expired_at
+                    ),
+                )
+            )
+            .order_by(Job.available_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        if job is None:
+            await session.commit()
+            return None
+
+        if job.attempts >= self.job_settings.JOB_MAX_ATTEMPTS:
+            job.status = JOB_FAILED
+            job.last_error = job.last_error or "The worker running the job was lost"
+            job.finished_at = now
+        else:
+            job.status = JOB_RUNNING
+            job.attempts += 1
+            job.started_at = job.heartbeat_at = now
+        session.add(job)
+        await session.commit()
+        return job if job.status == JOB_RUNNING else None
+
+    async def keep_alive(self, progress: JobProgress) -> None:
+        while True:
+            await asyncio.sleep(self.job_settings.JOB_HEARTBEAT_INTERVAL)
+            try:
+                await progress.beat()
+            except Exception:
+                logger.exception("Job heartbeat failed")
+
+    async def execute(self, job: Job) -> dict:
+        if (handler := job_handlers.get(job.kind)) is None:
+            raise ServiceException(f"Unknown job kind: {job.kind}")
+        progress = JobProgress(
+            self.session_factory, job.id, self.job_settings.JOB_PROGRESS_INTERVAL
+        )
+        heartbeat = asyncio.create_task(self.keep_alive(progress))
+        try:
+            async with self.session_factory() as session:
+                return await handler(session, job.payload, progress)
+        finally:
+            heartbeat.cancel()
+
+    async def process(self, job: Job) -> None:
+        values = {"finished_at": get_current_time()}
+        try:
+            result = await self.execute(job)
+        except ServiceException as error:
+            # business errors do not go away when the job is repeated
+            values.update(status=JOB_FAILED, last_error=str(error))
+        except Exception as error:
+            logger.exception("Job %s failed", job.id)
+            values.update(status=JOB_FAILED, last_error=str(error))
+            if job.attempts < self.job_settings.JOB_MAX_ATTEMPTS:
+                delay = self.job_settings.JOB_RETRY_DELAY * 2 ** (job.attempts - 1)
+                values.update(
+                    status=JOB_PENDING,
+                    finished_at=None,
+                    available_at=get_current_time() + dt.timedelta(seconds=delay),
+                )
+        else:
+            values.update(
+                status=JOB_SUCCEEDED,
+                result=result,
+                progress_completed=func.coalesce(
+                    Job.progress_total, Job.progress_completed
+                ),
+            )
+
+        async with self.session_factory() as session:
+            await session.execute(
+                update(Job)
+                .where(Job.id == job.id)
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+
+    async def run_next(self) -> bool:
+        async with self.session_factory() as session:
+            job = await self.claim(session)
+        if job is None:
+            return False
+        await self.process(job)
+        return True
+
+    async def run(self) -> None:
+        while not self.stopping.is_set():
+            try:
+                if await self.run_next():
+                    continue
+            except Exception:
+                logger.exception("Claiming a job failed")
+            try:
+                await asyncio.wait_for(
+                    self.stopping.wait(), self.job_settings.JOB_POLL_INTERVAL
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        self.stopping.clear()
+        self.tasks = [
+            asyncio.create_task(self.run())
+            for _ in range(self.job_settings.JOB_CONCURRENCY)
+        ]
+
+    async def stop(self) -> None:
+        # running jobs are finished before the worker stops
+        self.stopping.set()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+
+
+job_worker: Optional[JobWorker] = None
+
+
+async def start_job_worker() -> None:
+    global job_worker
+    job_settings = JobSettings()
+    if not job_settings.JOB_WORKER_ENABLED:
+        return
+    load_job_handlers()
+    job_worker = JobWorker(async_session, job_settings)
+    job_worker.start()
+
+
+async def stop_job_worker() -> None:
+    global job_worker
+    if job_worker is not None:
+        await job_worker.stop()
+        job_worker = None
+
+
+async def main() -> None:
+    load_job_handlers()
+    worker = JobWorker(async_session, JobSettings())
+    worker.start()
+    try:
+        await asyncio.gather(*worker.tasks)
+    finally:
+        await worker.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,49 @@
+from typing import Optional
+
+from fastapi import Depends, status
+from fastapi.routing import APIRouter
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.apps.layouts.schemas import LayoutSectionInputSchema, LayoutSectionOutputSchema
+from src.apps.layouts.services import provision_section_layout
+from src.apps.users.models import User
+from src.core.permissions import check_if_staff
+from src.dependencies.get_db import get_db
+from src.dependencies.user import authenticate_user
+from src.dependencies.warehouse import get_warehouse_scope
+
+layout_router = APIRouter(prefix="/layouts", tags=["layout"])
+
+
+@layout_router.post(
+    "/sections",
+    response_model=LayoutSectionOutputSchema,
+    status_code=status.HTTP_201_CREATED,
+)
+async def post_section_layout(
+    layout_input: LayoutSectionInputSchema,
+    session: AsyncSession = Depends(get_db),
+    request_user: User = Depends(authenticate_user),
+    warehouse_id: Optional[str] = Depends(get_warehouse_scope),
+) -> LayoutSectionOutputSchema:
+    await check_if_staff(request_user)
+    return await provision_section_layout(
+        session, layout_input, warehouse_id=warehouse_id
+    )
+
+
+@layout_router.post(
+    "/sections/validate",
+    response_model=LayoutSectionOutputSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def validate_section_layout(
+    layout_input: LayoutSectionInputSchema,
+    session: AsyncSession = Depends(get_db),
+    request_user: User = Depends(authenticate_user),
+    warehouse_id: Optional[str] = Depends(get_warehouse_scope),
+) -> LayoutSectionOutputSchema:
+    await check_if_staff(request_user)
+    return await provision_section_layout(
+        session, layout_input, dry_run=True, warehouse_id=warehouse_id
+    )
@@ -0,0 +1,72 @@
+from decimal import Decimal
+from typing import Optional
+
+from pydantic import BaseModel, Field, conint, validator
+
+
+class LayoutRackLevelTemplateSchema(BaseModel):
+    description: Optional[str] = Field(max_length=400)
+    max_weight: Decimal
+    max_slots: int
+    quantity: conint(ge=1) = 1
+
+    @validator("max_weight")
+    def validate_max_weight(cls, max_weight: Decimal) -> Decimal:
+        if max_weight is not None and max_weight <= 0:
+            raise ValueError("Max rack level weight must be positive!")
+        return max_weight
+
+    @validator("max_slots")
+    def validate_max_slots(cls, max_slots: int) -> int:
+        if max_slots is not None and max_slots <= 0:
+            raise ValueError("Max rack level slots must be positive!")
+        return max_slots
+
+
+class LayoutRackTemplateSchema(BaseModel):
+    rack_name: str = Field(max_length=400)
+    max_weight: Decimal
+    max_levels: int
+    quantity: conint(ge=1) = 1
+    rack_levels: list[LayoutRackLevelTemplateSchema] = []
+
+    @validator("max_weight")
+    def validate_max_weight(cls, max_weight: Decimal) -> Decimal:
+        if max_weight is not None and max_weight <= 0:
+            raise ValueError("Max rack weight must be positive!")
+        return max_weight
+
+    @validator("max_levels")
+    def validate_max_levels(cls, max_levels: int) -> int:
+        if max_levels is not None and max_levels <= 0:
+            raise ValueError("Max rack levels must be positive!")
+        return max_levels
+
+
+class LayoutSectionInputSchema(BaseModel):
+    section_name: str = Field(max_length=400)
+    max_weight: Decimal
+    max_racks: int
+    racks: list[LayoutRackTemplateSchema] = []
+
+    @validator("max_weight")
+    def validate_max_weight(cls, max_weight: Decimal) -> Decimal:
+        if max_weight is not None and max_weight <= 0:
+            raise ValueError("Max section weight must be positive!")
+        return max_weight
+
+    @validator("max_racks")
+    def validate_max_racks(cls, max_racks: int) -> int:
+        if max_racks is not None and max_racks <= 0:
+            raise ValueError("Max section racks must be positive!")
+        return max_racks
+
+
+class LayoutSectionOutputSchema(BaseModel):
+    section_id: Optional[str]
+    section_name: str
+    racks_amount: int
+    rack_levels_amount: int
+    rack_level_slots_amount: int
+    reserved_section_weight: Decimal
+    dry_run: bool
@@ -0,0 +1,203 @@
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.apps.layouts.schemas import (
+    LayoutRackTemplateSchema,
+    LayoutSectionInputSchema,
+    LayoutSectionOutputSchema,
+)
+from src.apps.rack_level_slots.models import RackLevelSlot
+from src.apps.rack_levels.models import RackLevel
+from src.apps.racks.models import Rack
+from src.apps.sections.models import Section
+from src.apps.warehouse.services import get_target_warehouse, manage_warehouse_state
+from src.core.exceptions import (
+    NotEnoughRackResourcesException,
+    NotEnoughSectionResourcesException,
+    NotEnoughWarehouseResourcesException,
+)
+from src.core.invalidation.bus import invalidation_bus
+from src.core.invalidation.events import LAYOUT_CHANGED
+from src.core.utils.utils import generate_uuid
+
+
+def validate_rack_template(rack_template: LayoutRackTemplateSchema) -> Decimal:
+    levels_amount = sum(level.quantity for level in rack_template.rack_levels)
+    if levels_amount > rack_template.max_levels:
+        raise NotEnoughRackResourcesException(
+            resource="levels",
+            reason=f"rack '{rack_template.rack_name}' template has {levels_amount} "
+            f"levels but allows only {rack_template.max_levels}",
+        )
+
+    reserved_weight = sum(
+        (level.max_weight * level.quantity for level in rack_template.rack_levels),
+        Decimal(0),
+    )
+    if reserved_weight > rack_template.max_weight:
+        raise NotEnoughRackResourcesException(
+            resource="rack weight",
+            reason=f"rack '{rack_template.rack_name}' levels reserve {reserved_weight} "
+            f"of {rack_template.max_weight} available weight",
+        )
+    return reserved_weight
+
+
+def validate_section_template(layout_input: LayoutSectionInputSchema) -> Decimal:
+    racks_amount = sum(rack.quantity for rack in layout_input.racks)
+    if racks_amount > layout_input.max_racks:
+        raise NotEnoughSectionResourcesException(
+            resource="racks",
+            reason=f"template has {racks_amount} racks but the section allows "
+            f"only {layout_input.max_racks}",
+        )
+
+    reserved_weight = sum(
+        (rack.max_weight * rack.quantity for rack in layout_input.racks), Decimal(0)
+    )
+    if reserved_weight > layout_input.max_weight:
+        raise NotEnoughSectionResourcesException(
+            resource="racks",
+            reason="available section weight to reserve exceeded",
+        )
+
+    for rack_template in layout_input.racks:
+        validate_rack_template(rack_template)
+
+    return reserved_weight
+
+
+def build_layout_rows(
+    layout_input: LayoutSectionInputSchema, warehouse_id: str
+) -> tuple[dict, list[dict], list[dict], list[dict]]:
+    section_id = generate_uuid()
+    section_reserved_weight = sum(
+        (rack.max_weight * rack.quantity for rack in layout_input.racks), Decimal(0)
+    )
+    racks_amount = sum(rack.quantity for rack in layout_input.racks)
+
+    section_row = {
+        "id": section_id,
+        "section_name": layout_input.section_name,
+        "max_weight": layout_input.max_weight,
+        "available_weight": layout_input.max_weight,
+        "occupied_weight": 0,
+        "reserved_weight": section_reserved_weight,
+        "weight_to_reserve": layout_input.max_weight - section_reserved_weight,
+        "max_racks": layout_input.max_racks,
+        "available_racks": layout_input.max_racks - racks_amount,
+        "occupied_racks": racks_amount,
+        "warehouse_id": warehouse_id,
+    }
+
+    rack_rows, rack_level_rows, rack_level_slot_rows = [], [], []
+    for rack_template in layout_input.racks:
+        levels_amount = sum(level.quantity for level in rack_template.rack_levels)
+        rack_reserved_weight = sum(
+            (level.max_weight * level.quantity for level in rack_template.rack_levels),
+            Decimal(0),
+        )
+
+        for rack_copy_number in range(1, rack_template.quantity + 1):
+            rack_id = generate_uuid()
+            rack_name = (
+                f"{rack_template.rack_name} #{rack_copy_number}"
+                if rack_template.quantity > 1
+                else rack_template.rack_name
+            )
+            rack_rows.append(
+                {
+                    "id": rack_id,
+                    "rack_name": rack_name,
+                    "max_weight": rack_template.max_weight,
+                    "available_weight": rack_template.max_weight,
+                    "occupied_weight": 0,
+                    "max_levels": rack_template.max_levels,
+                    "available_levels": rack_template.max_levels - levels_amount,
+                    "occupied_levels": levels_amount,
+                    "reserved_weight": rack_reserved_weight,
+                    "weight_to_reserve": rack_template.max_weight
+                    - rack_reserved_weight,
+                    "section_id": section_id,
+                }
+            )
+
+            rack_level_number = 0
+            for level_template in rack_template.rack_levels:
+                for _ in range(level_template.quantity):
+                    rack_level_number += 1
+                    rack_level_id = generate_uuid()
+                    rack_level_rows.append(
+                        {
+                            "id": rack_level_id,
+                            "rack_level_number": rack_level_number,
+                            "description": level_template.description,
+                            "max_weight": level_template.max_weight,
+                            "available_weight": level_template.max_weight,
+                            "occupied_weight": 0,
+                            "max_slots": level_template.max_slots,
+                            "available_slots": level_template.max_slots,
+                            "occupied_slots": 0,
+                            "active_slots": level_template.max_slots,
+                            "inactive_slots": 0,
+                            "rack_id": rack_id,
+                        }
+                    )
+                    rack_level_slot_rows.extend(
+                        {
+                            "id": generate_uuid(),
+                            "rack_level_slot_number": slot_number,
+                            "description": f"rack level {rack_level_number} | slot #{slot_number}",
+                            "is_active": True,
+                            "rack_level_id": rack_level_id,
+                            "warehouse_id": warehouse_id,
+                        }
+                        for slot_number in range(1, level_template.max_slots + 1)
+                    )
+
+    return section_row, rack_rows, rack_level_rows, rack_level_slot_rows
+
+
+async def provision_section_layout(
+    session: AsyncSession,
+    layout_input: LayoutSectionInputSchema,
+    dry_run: bool = False,
+    warehouse_id: Optional[str] = None,
+) -> LayoutSectionOutputSchema:
+    warehouse = await get_target_warehouse(session, warehouse_id)
+    if not warehouse.available_sections:
+        raise NotEnoughWarehouseResourcesException(resource="sections")
+
+    reserved_weight = validate_section_template(layout_input)
+    section_row, rack_rows, rack_level_rows, rack_level_slot_rows = build_layout_rows(
+        layout_input, warehouse.id
+    )
+
+    if not dry_run:
+        await session.execute(insert(Section), [section_row])
+        if rack_rows:
+            await session.execute(insert(Rack), rack_rows)
+        if rack_level_rows:
+            await session.execute(insert(RackLevel), rack_level_rows)
+        if rack_level_slot_rows:
+            await session.execute(insert(RackLevelSlot), rack_level_slot_rows)
+
+        warehouse = await manage_warehouse_state(
+            warehouse, adding_resources_to_warehouse=False, sections_involved=True
+        )
+        session.add(warehouse)
+        await invalidation_bus.publish(session, LAYOUT_CHANGED, section_row["id"])
+        await session.commit()
+
+    return LayoutSectionOutputSchema(
+        section_id=None if dry_run else section_row["id"],
+        section_name=layout_input.section_name,
+        racks_amount=len(rack_rows),
+        rack_levels_amount=len(rack_level_rows),
+        rack_level_slots_amount=len(rack_level_slot_rows),
+        reserved_section_weight=reserved_weight,
+        dry_run=dry_run,
+    )
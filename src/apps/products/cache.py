@@ -0,0 +1,277 @@
+import asyncio
+import unicodedata
+from collections import defaultdict
+from typing import Any, AsyncContextManager, Callable, Optional
+
+from pydantic import BaseModel
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.apps.products.models import Category, Product
+from src.apps.products.schemas.category_schemas import CategoryOutputSchema
+from src.apps.products.schemas.product_schemas import ProductOutputSchema
+from src.core.invalidation.bus import InvalidationBus, invalidation_bus
+from src.core.invalidation.events import (
+    ALL_CHANGED,
+    CATEGORY_CHANGED,
+    PRODUCT_CHANGED,
+    InvalidationEvent,
+)
+from src.core.utils.constants import PAGINATION_PARAMS_HEADERS, SORT_PARAMS_HEADER
+from src.database.db_connection import read_only_engine, read_only_session
+
+# query param keys answered from memory, mapped to the compared field, any
+# other key makes the list fall back to the database
+PRODUCT_FILTER_KEYS = {
+    "name": "name",
+    "name__eq": "name",
+    "categories__name__eq": "categories__name",
+}
+PRODUCT_SORT_FIELDS = {"name", "weight", "wholesale_price", "created_at"}
+CATEGORY_FILTER_KEYS = {"name": "name", "name__eq": "name"}
+CATEGORY_SORT_FIELDS = {"name", "created_at"}
+
+DATABASE_COLLATION_QUERY = (
+    "SELECT datcollate FROM pg_database WHERE datname = current_database()"
+)
+CODE_POINT_COLLATIONS = {"C", "POSIX", "C.UTF-8", "C.utf8"}
+
+
+class CatalogCacheMetrics(BaseModel):
+    hits: int
+    misses: int
+    loads: int
+    products: int
+    categories: int
+
+
+def parse_list_params(
+    query_params: Optional[list[tuple]], filter_keys: dict, sort_fields: set
+) -> Optional[tuple[list[tuple[str, set]], list[tuple[str, bool]]]]:
+    filters, sorts = [], []
+    for key, value in query_params or []:
+        if key in PAGINATION_PARAMS_HEADERS:
+            continue
+        if key == SORT_PARAMS_HEADER:
+            for criterion in value.split(","):
+                field, _, sorting_order = criterion.rpartition("__")
+                if field not in sort_fields:
+                    return None
+                sorts.append((field, sorting_order != "asc"))
+            continue
+        if key not in filter_keys:
+            return None
+        filters.append((filter_keys[key], set(value.split(","))))
+    return filters, sorts
+
+
+def get_field_values(item: BaseModel, field: str) -> set:
+    if field == "categories__name":
+        return {category.name for category in item.categories}
+    return {getattr(item, field)}
+
+
+def get_code_point_key(value: str) -> str:
+    return value
+
+
+def get_collation_key(value: str) -> tuple[str, str, str, str]:
+    # follows the linguistic collations databases are created with, accents
+    # and then case (lowercase first) only break ties, the last resort are
+    # code points as postgres compares them for deterministic collations
+    decomposed = unicodedata.normalize("NFKD", value)
+    base = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return base.casefold(), decomposed.casefold(), value.swapcase(), value
+
+
+def filter_and_sort_items(
+    items: list[BaseModel],
+    filters: list[tuple[str, set]],
+    sorts: list[tuple[str, bool]],
+    string_key: Callable[[str], Any] = get_collation_key,
+) -> list[BaseModel]:
+    def get_sort_key(item: BaseModel, field: str) -> tuple[bool, Any]:
+        value = getattr(item, field)
+        if isinstance(value, str):
+            value = string_key(value)
+        return value is None, value
+
+    for field, values in filters:
+        items = [item for item in items if get_field_values(item, field) & values]
+    # stable sorts applied from the last criterion, nulls ordered as postgres does
+    for field, descending in reversed(sorts):
+        items = sorted(
+            items, key=lambda item: get_sort_key(item, field), reverse=descending
+        )
+    return items
+
+
+class CatalogCache:
+    def __init__(
+        self,
+        bus: InvalidationBus,
+        session_factory: Callable[[], AsyncContextManager[AsyncSession]],
+    ) -> None:
+        self.bus = bus
+        self.session_factory = session_factory
+        self.products: Optional[dict[str, ProductOutputSchema]] = None
+        self.categories: Optional[dict[str, CategoryOutputSchema]] = None
+        self.product_ids_by_category: dict[str, set[str]] = defaultdict(set)
+        self.ordered_products: Optional[list[ProductOutputSchema]] = None
+        self.stale_product_ids: set[str] = set()
+        self.string_key: Optional[Callable[[str], Any]] = None
+        self.generation = 0
+        self.lock = asyncio.Lock()
+        self.hits = self.misses = self.loads = 0
+        bus.register(PRODUCT_CHANGED, self.handle_product_event)
+        bus.register(CATEGORY_CHANGED, self.handle_category_event)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self.products = self.categories = self.ordered_products = None
+        self.product_ids_by_category = defaultdict(set)
+        self.stale_product_ids = set()
+
+    def handle_product_event(self, invalidation: InvalidationEvent) -> None:
+        if invalidation.kind == ALL_CHANGED:
+            return self.clear()
+        self.stale_product_ids.update(invalidation.ids)
+
+    def handle_category_event(self, invalidation: InvalidationEvent) -> None:
+        if invalidation.kind == ALL_CHANGED:
+            return self.clear()
+        # products embed the names of their categories
+        self.generation += 1
+        self.categories = None
+        for category_id in invalidation.ids:
+            self.stale_product_ids |= self.product_ids_by_category.get(
+                category_id, set()
+            )
+
+    def store_product(self, product: Product) -> None:
+        self.products[product.id] = ProductOutputSchema.from_orm(product)
+        for category in product.categories:
+            self.product_ids_by_category[category.id].add(product.id)
+
+    def drop_product(self, product_id: str) -> None:
+        if product := self.products.pop(product_id, None):
+            for category in product.categories:
+                self.product_ids_by_category[category.id].discard(product_id)
+
+    async def load(self, session: AsyncSession) -> None:
+        if self.string_key is None:
+            collation = await session.scalar(text(DATABASE_COLLATION_QUERY))
+            self.string_key = get_collation_key
+            if collation in CODE_POINT_COLLATIONS:
+                self.string_key = get_code_point_key
+
+        generation = self.generation
+        if self.categories is None:
+            categories = await session.scalars(select(Category))
+            if generation != self.generation:
+                return
+            self.categories = {
+                category.id: CategoryOutputSchema.from_orm(category)
+                for category in categories.all()
+            }
+
+        if self.products is None:
+            products = await session.scalars(select(Product))
+            if generation != self.generation:
+                return
+            self.products = {}
+            for product in products.all():
+                self.store_product(product)
+            self.ordered_products = None
+            self.loads += 1
+
+        if stale_product_ids := self.stale_product_ids:
+            # ids invalidated meanwhile stay stale and are reloaded next time
+            self.stale_product_ids = set()
+            products = await session.scalars(
+                select(Product).where(Product.id.in_(stale_product_ids))
+            )
+            if generation != self.generation:
+                self.stale_product_ids |= stale_product_ids
+                return
+            for product_id in stale_product_ids:
+                self.drop_product(product_id)
+            for product in products.all():
+                self.store_product(product)
+            self.ordered_products = None
+
+    async def is_ready(self) -> bool:
+        if not self.bus.listening:
+            return False
+        if self.products is None or self.categories is None or self.stale_product_ids:
+            async with self.lock:
+                async with self.session_factory() as session:
+                    await self.load(session)
+        return (
+            self.products is not None
+            and self.categories is not None
+            and not self.stale_product_ids
+        )
+
+    def count(self, hit: bool) -> bool:
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return hit
+
+    async def get_product(self, product_id: str) -> Optional[ProductOutputSchema]:
+        if not await self.is_ready():
+            self.count(False)
+            return None
+        product = self.products.get(product_id)
+        self.count(product is not None)
+        return product
+
+    async def get_products(
+        self, get_legacy: bool, query_params: Optional[list[tuple]]
+    ) -> Optional[list[ProductOutputSchema]]:
+        list_params = parse_list_params(
+            query_params, PRODUCT_FILTER_KEYS, PRODUCT_SORT_FIELDS
+        )
+        if not self.count(list_params is not None and await self.is_ready()):
+            return None
+
+        if self.ordered_products is None:
+            self.ordered_products = sorted(
+                self.products.values(),
+                key=lambda product: self.string_key(product.name),
+            )
+        products = self.ordered_products
+        if not get_legacy:
+            products = [product for product in products if not product.legacy_product]
+        return filter_and_sort_items(products, *list_params, self.string_key)
+
+    async def get_categories(
+        self, query_params: Optional[list[tuple]]
+    ) -> Optional[list[CategoryOutputSchema]]:
+        list_params = parse_list_params(
+            query_params, CATEGORY_FILTER_KEYS, CATEGORY_SORT_FIELDS
+        )
+        if not self.count(list_params is not None and await self.is_ready()):
+            return None
+
+        categories = sorted(
+            self.categories.values(),
+            key=lambda category: self.string_key(category.name),
+        )
+        return filter_and_sort_items(categories, *list_params, self.string_key)
+
+    def get_metrics(self) -> CatalogCacheMetrics:
+        return CatalogCacheMetrics(
+            hits=self.hits,
+            misses=self.misses,
+            loads=self.loads,
+            products=len(self.products or ()),
+            categories=len(self.categories or ()),
+        )
+
+
+catalog_cache = CatalogCache(
+    invalidation_bus, lambda: read_only_session(bind=read_only_engine)
+)
@@ -14,6 +14,8 @@ from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql.sqltypes import DateTime
 
+from src.core.utils.search import trigram_index
+from src.core.utils.sync import change_index, change_xid_column, track_changes
 from src.core.utils.time import get_current_time
 from src.core.utils.utils import generate_uuid
 from src.database.db_connection import Base
@@ -50,8 +52,14 @@ class Category(Base):
         secondary=category_product_association_table,
         back_populates="categories",
     )
+    change_xid = change_xid_column()
     created_at = Column(DateTime, default=dt.datetime.now, nullable=True)
 
+    __table_args__ = (change_index("category"),)
+
+
+track_changes(Category.__table__)
+
 
 class Product(Base):
     __tablename__ = "product"
@@ -76,4 +84,14 @@ class Product(Base):
         lazy="selectin",
     )
     stocks = relationship("Stock", back_populates="product", lazy="noload")
+    change_xid = change_xid_column()
     created_at = Column(DateTime, default=dt.datetime.now, nullable=True)
+
+    __table_args__ = (
+        trigram_index("product", "name"),
+        trigram_index("product", "description"),
+        change_index("product"),
+    )
+
+
+track_changes(Product.__table__)
@@ -19,7 +19,7 @@ from src.apps.users.models import User
 from src.core.pagination.models import PageParams
 from src.core.pagination.schemas import PagedResponseSchema
 from src.core.permissions import check_if_staff
-from src.dependencies.get_db import get_db
+from src.dependencies.get_db import get_db, get_read_db
 from src.dependencies.user import authenticate_user
 
 category_router = APIRouter(prefix="/categories", tags=["category"])
@@ -46,7 +46,7 @@ async def post_category(
 )
 async def get_categories(
     request: Request,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     page_params: PageParams = Depends(),
     request_user: User = Depends(authenticate_user),
 ) -> PagedResponseSchema[CategoryOutputSchema]:
@@ -62,7 +62,7 @@ async def get_categories(
 )
 async def get_category(
     category_id: str,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     request_user: User = Depends(authenticate_user),
 ) -> CategoryOutputSchema:
     await check_if_staff(request_user)
@@ -1,10 +1,13 @@
-from typing import Union
+import codecs
+from typing import Literal, Optional, Union
 
-from fastapi import Depends, Request, Response, status
+from fastapi import Depends, Query, Request, Response, UploadFile, status
 from fastapi.responses import JSONResponse
 from fastapi.routing import APIRouter
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.apps.products.cache import CatalogCacheMetrics, catalog_cache
+from src.apps.products.schemas.import_schemas import ProductImportOutputSchema
 from src.apps.products.schemas.product_schemas import (
     ProductBasicOutputSchema,
     ProductInputSchema,
@@ -12,6 +15,10 @@ from src.apps.products.schemas.product_schemas import (
     ProductUpdateSchema,
     RemovedProductOutputSchema,
 )
+from src.apps.products.services.import_services import (
+    get_import_format,
+    import_products,
+)
 from src.apps.products.services.product_services import (
     create_product,
     get_all_available_products,
@@ -25,7 +32,7 @@ from src.apps.users.models import User
 from src.core.pagination.models import PageParams
 from src.core.pagination.schemas import PagedResponseSchema
 from src.core.permissions import check_if_staff
-from src.dependencies.get_db import get_db
+from src.dependencies.get_db import get_db, get_read_db
 from src.dependencies.user import authenticate_user
 
 product_router = APIRouter(prefix="/products", tags=["product"])
@@ -45,6 +52,25 @@ async def post_product(
     return await create_product(session, product_input)
 
 
+@product_router.post(
+    "/import",
+    response_model=ProductImportOutputSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def post_product_import(
+    file: UploadFile,
+    import_format: Optional[Literal["csv", "ndjson"]] = Query(None, alias="format"),
+    dry_run: bool = False,
+    session: AsyncSession = Depends(get_db),
+    request_user: User = Depends(authenticate_user),
+) -> ProductImportOutputSchema:
+    await check_if_staff(request_user)
+    import_format = import_format or get_import_format(file.filename)
+    # the spooled upload can not be wrapped in a TextIOWrapper before 3.11
+    lines = codecs.iterdecode(file.file, "utf-8-sig")
+    return await import_products(session, lines, import_format, dry_run)
+
+
 @product_router.get(
     "/",
     response_model=PagedResponseSchema[ProductBasicOutputSchema],
@@ -52,7 +78,7 @@ async def post_product(
 )
 async def get_available_products(
     request: Request,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     request_user: User = Depends(authenticate_user),
     page_params: PageParams = Depends(),
 ) -> PagedResponseSchema[ProductBasicOutputSchema]:
@@ -68,7 +94,7 @@ async def get_available_products(
 )
 async def get_products(
     request: Request,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     request_user: User = Depends(authenticate_user),
     page_params: PageParams = Depends(),
 ) -> PagedResponseSchema[ProductOutputSchema]:
@@ -78,6 +104,18 @@ async def get_products(
     )
 
 
+@product_router.get(
+    "/catalog-cache",
+    response_model=CatalogCacheMetrics,
+    status_code=status.HTTP_200_OK,
+)
+async def get_catalog_cache_metrics(
+    request_user: User = Depends(authenticate_user),
+) -> CatalogCacheMetrics:
+    await check_if_staff(request_user)
+    return catalog_cache.get_metrics()
+
+
 @product_router.get(
     "/all/{product_id}",
     response_model=ProductOutputSchema,
@@ -85,7 +123,7 @@ async def get_products(
 )
 async def get_product_as_staff(
     product_id: str,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     request_user: User = Depends(authenticate_user),
 ) -> ProductOutputSchema:
     await check_if_staff(request_user)
@@ -99,7 +137,7 @@ async def get_product_as_staff(
 )
 async def get_product(
     product_id: str,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     request_user: User = Depends(authenticate_user),
 ) -> Union[ProductBasicOutputSchema, RemovedProductOutputSchema]:
     return await get_available_single_product(session, product_id)
@@ -0,0 +1,25 @@
+from decimal import Decimal
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from src.apps.products.schemas.product_schemas import ProductBaseSchema
+
+
+class ProductImportRowSchema(ProductBaseSchema):
+    description: Optional[str] = Field(max_length=300)
+    wholesale_price: Decimal
+    categories: Optional[list[str]]
+
+
+class ProductImportErrorSchema(BaseModel):
+    line: int
+    name: Optional[str]
+    message: str
+
+
+class ProductImportOutputSchema(BaseModel):
+    created: int
+    updated: int
+    failed: int
+    errors: list[ProductImportErrorSchema]
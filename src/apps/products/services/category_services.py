@@ -1,6 +1,7 @@
 from sqlalchemy import delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.apps.products.cache import catalog_cache
 from src.apps.products.models import Category
 from src.apps.products.schemas.category_schemas import (
     CategoryInputSchema,
@@ -8,11 +9,14 @@ from src.apps.products.schemas.category_schemas import (
     CategoryUpdateSchema,
 )
 from src.core.exceptions import AlreadyExists, DoesNotExist, IsOccupied
+from src.core.invalidation.bus import invalidation_bus
+from src.core.invalidation.events import CATEGORY_CHANGED
 from src.core.pagination.models import PageParams
 from src.core.pagination.schemas import PagedResponseSchema
-from src.core.pagination.services import paginate
+from src.core.pagination.services import paginate, paginate_list
 from src.core.utils.filter import filter_and_sort_instances
 from src.core.utils.orm import if_exists
+from src.database.db_connection import ReadOnlySession
 
 
 async def create_category(
@@ -29,6 +33,8 @@ async def create_category(
 
     new_category = Category(**category_data)
     session.add(new_category)
+    await session.flush()
+    await invalidation_bus.publish(session, CATEGORY_CHANGED, new_category.id)
     await session.commit()
 
     return CategoryOutputSchema.from_orm(new_category)
@@ -46,6 +52,11 @@ async def get_single_category(
 async def get_all_categories(
     session: AsyncSession, page_params: PageParams, query_params: list[tuple] = None
 ) -> PagedResponseSchema[CategoryOutputSchema]:
+    if isinstance(session, ReadOnlySession):
+        categories = await catalog_cache.get_categories(query_params)
+        if categories is not None:
+            return paginate_list(categories, CategoryOutputSchema, page_params)
+
     query = select(Category)
 
     if query_params:
@@ -80,6 +91,7 @@ async def update_single_category(
         )
 
         await session.execute(statement)
+        await invalidation_bus.publish(session, CATEGORY_CHANGED, category_id)
         await session.commit()
         await session.refresh(category_object)
 
@@ -92,6 +104,7 @@ async def delete_single_category(session: AsyncSession, category_id: str):
 
     statement = delete(Category).filter(Category.id == category_id)
     result = await session.execute(statement)
+    await invalidation_bus.publish(session, CATEGORY_CHANGED, category_id)
     await session.commit()
 
     return result
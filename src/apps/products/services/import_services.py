@@ -0,0 +1,246 @@
+import argparse
+import asyncio
+import csv
+import json
+from pathlib import Path
+from typing import AsyncIterator, Iterable, Iterator, Union
+
+from pydantic import ValidationError
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.apps.products.schemas.import_schemas import (
+    ProductImportErrorSchema,
+    ProductImportOutputSchema,
+    ProductImportRowSchema,
+)
+from src.core.exceptions import ServiceException
+from src.core.invalidation.bus import invalidation_bus
+from src.core.invalidation.events import PRODUCT_CHANGED
+from src.database.db_connection import async_session
+
+IMPORT_FORMATS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+CSV_CATEGORY_SEPARATOR = "|"
+IMPORT_TABLE = "product_import"
+IMPORT_COLUMNS = (
+    "line",
+    "name",
+    "description",
+    "wholesale_price",
+    "weight",
+    "category_names",
+)
+CREATE_IMPORT_TABLE = text(f"""
+    CREATE TEMP TABLE {IMPORT_TABLE} (
+        line integer NOT NULL,
+        name varchar(75) NOT NULL,
+        description varchar(300),
+        wholesale_price numeric NOT NULL,
+        weight numeric NOT NULL,
+        category_names text[]
+    ) ON COMMIT DROP
+    """)
+# every rejected row is removed from the staging table and reported
+REJECT_DUPLICATED_ROWS = text(f"""
+    DELETE FROM {IMPORT_TABLE} AS staged USING {IMPORT_TABLE} AS later_staged
+    WHERE later_staged.name = staged.name AND later_staged.line > staged.line
+    RETURNING staged.line, staged.name,
+        'Overridden by line ' || later_staged.line || ' with the same name' AS message
+    """)
+REJECT_UNKNOWN_CATEGORIES = text(f"""
+    WITH unknown AS (
+        SELECT staged.line, array_agg(category_name) AS category_names
+        FROM {IMPORT_TABLE} AS staged, unnest(staged.category_names) AS category_name
+        WHERE NOT EXISTS (SELECT 1 FROM category WHERE category.name = category_name)
+        GROUP BY staged.line
+    )
+    DELETE FROM {IMPORT_TABLE} AS staged USING unknown
+    WHERE unknown.line = staged.line
+    RETURNING staged.line, staged.name,
+        'Unknown categories: ' || array_to_string(unknown.category_names, ', ')
+        AS message
+    """)
+REJECT_LEGACY_PRODUCTS = text(f"""
+    DELETE FROM {IMPORT_TABLE} AS staged USING product
+    WHERE product.name = staged.name AND product.legacy_product
+    RETURNING staged.line, staged.name,
+        'Legacy products can not be updated' AS message
+    """)
+UPSERT_PRODUCTS = text(f"""
+    INSERT INTO product (
+        id, name, description, wholesale_price, weight, amount_in_goods,
+        legacy_product, created_at
+    )
+    SELECT gen_random_uuid()::varchar, name, description, wholesale_price, weight,
+        0, false, LOCALTIMESTAMP
+    FROM {IMPORT_TABLE}
+    ON CONFLICT (name) DO UPDATE SET
+        description = EXCLUDED.description,
+        wholesale_price = EXCLUDED.wholesale_price
+    WHERE NOT product.legacy_product
+    RETURNING id, xmax = 0 AS created
+    """)
+# rows without a categories value keep the current categories of the product
+DELETE_CATEGORY_ASSOCIATIONS = text(f"""
+    DELETE FROM category_product_association_table AS association
+    USING {IMPORT_TABLE} AS staged, product
+    WHERE product.name = staged.name
+        AND association.product_id = product.id
+        AND staged.category_names IS NOT NULL
+    """)
+INSERT_CATEGORY_ASSOCIATIONS = text(f"""
+    INSERT INTO category_product_association_table (category_id, product_id)
+    SELECT DISTINCT category.id, product.id
+    FROM {IMPORT_TABLE} AS staged
+    JOIN product ON product.name = staged.name
+    CROSS JOIN LATERAL unnest(staged.category_names) AS category_name
+    JOIN category ON category.name = category_name
+    """)
+
+
+def get_import_format(filename: str) -> str:
+    if not (import_format := IMPORT_FORMATS.get(Path(filename).suffix.lower())):
+        raise ServiceException(
+            f"Unsupported import file, use one of: {', '.join(IMPORT_FORMATS)}"
+        )
+    return import_format
+
+
+def format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(loc) for loc in detail['loc'])}: {detail['msg']}"
+        for detail in error.errors()
+    )
+
+
+def read_csv_rows(lines: Iterable[str]) -> Iterator[tuple[int, dict]]:
+    reader = csv.DictReader(lines)
+    for row in reader:
+        if (category_names := row.get("categories")) is not None:
+            row["categories"] = [
+                category_name.strip()
+                for category_name in category_names.split(CSV_CATEGORY_SEPARATOR)
+                if category_name.strip()
+            ]
+        yield reader.line_num, row
+
+
+def read_ndjson_rows(lines: Iterable[str]) -> Iterator[tuple[int, Union[dict, str]]]:
+    for line, row in enumerate(lines, start=1):
+        if not row.strip():
+            continue
+        try:
+            yield line, json.loads(row)
+        except ValueError as error:
+            yield line, f"Invalid JSON: {error}"
+
+
+def parse_import_rows(
+    lines: Iterable[str], import_format: str
+) -> Iterator[tuple[int, Union[ProductImportRowSchema, ProductImportErrorSchema]]]:
+    reader = read_csv_rows if import_format == "csv" else read_ndjson_rows
+    for line, row in reader(lines):
+        if isinstance(row, str):
+            yield line, ProductImportErrorSchema(line=line, message=row)
+            continue
+        try:
+            yield line, ProductImportRowSchema.parse_obj(row)
+        except ValidationError as error:
+            yield line, ProductImportErrorSchema(
+                line=line,
+                name=row.get("name") if isinstance(row, dict) else None,
+                message=format_validation_error(error),
+            )
+
+
+async def stage_import_rows(
+    lines: Iterable[str],
+    import_format: str,
+    errors: list[ProductImportErrorSchema],
+) -> AsyncIterator[tuple]:
+    for line, row in parse_import_rows(lines, import_format):
+        if isinstance(row, ProductImportErrorSchema):
+            errors.append(row)
+            continue
+        yield (
+            line,
+            row.name,
+            row.description,
+            row.wholesale_price,
+            row.weight,
+            row.categories,
+        )
+
+
+async def import_products(
+    session: AsyncSession,
+    lines: Iterable[str],
+    import_format: str,
+    dry_run: bool = False,
+) -> ProductImportOutputSchema:
+    errors = []
+    # the statement starts the transaction the COPY below takes part in
+    await session.execute(CREATE_IMPORT_TABLE)
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    # rows are parsed while they are sent, the input is never held in memory
+    await raw_connection.driver_connection.copy_records_to_table(
+        IMPORT_TABLE,
+        records=stage_import_rows(lines, import_format, errors),
+        columns=IMPORT_COLUMNS,
+    )
+    await session.execute(text(f"ANALYZE {IMPORT_TABLE}"))
+
+    for statement in (
+        REJECT_DUPLICATED_ROWS,
+        REJECT_UNKNOWN_CATEGORIES,
+        REJECT_LEGACY_PRODUCTS,
+    ):
+        rejected_rows = await session.execute(statement)
+        errors += [ProductImportErrorSchema(**row._mapping) for row in rejected_rows]
+
+    products = (await session.execute(UPSERT_PRODUCTS)).all()
+    await session.execute(DELETE_CATEGORY_ASSOCIATIONS)
+    await session.execute(INSERT_CATEGORY_ASSOCIATIONS)
+    await session.execute(text(f"DROP TABLE {IMPORT_TABLE}"))
+
+    created = sum(product.created for product in products)
+    if dry_run:
+        await session.rollback()
+    else:
+        await invalidation_bus.publish(
+            session, PRODUCT_CHANGED, *(product.id for product in products)
+        )
+        await session.commit()
+
+    return ProductImportOutputSchema(
+        created=created,
+        updated=len(products) - created,
+        failed=len(errors),
+        errors=sorted(errors, key=lambda error: error.line),
+    )
+
+
+async def import_products_from_file(
+    path: Path, dry_run: bool = False
+) -> ProductImportOutputSchema:
+    import_format = get_import_format(path.name)
+    with path.open(encoding="utf-8-sig", newline="") as lines:
+        async with async_session() as session:
+            return await import_products(session, lines, import_format, dry_run)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import products from a file")
+    parser.add_argument("path", type=Path, help="CSV or NDJSON file")
+    parser.add_argument("--dry-run", action="store_true")
+    arguments = parser.parse_args()
+
+    result = asyncio.run(import_products_from_file(arguments.path, arguments.dry_run))
+    for error in result.errors:
+        print(f"line {error.line}: {error.message}")
+    print(f"{result.created} created, {result.updated} updated, {result.failed} failed")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ from sqlalchemy import delete, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import lazyload
 
+from src.apps.products.cache import catalog_cache
 from src.apps.products.models import (
     Category,
     Product,
@@ -25,11 +26,14 @@ from src.core.exceptions import (
     ProductIsAlreadyLegacyException,
     ServiceException,
 )
+from src.core.invalidation.bus import invalidation_bus
+from src.core.invalidation.events import PRODUCT_CHANGED
 from src.core.pagination.models import PageParams
 from src.core.pagination.schemas import PagedResponseSchema
-from src.core.pagination.services import paginate
+from src.core.pagination.services import paginate, paginate_list
 from src.core.utils.filter import filter_and_sort_instances
 from src.core.utils.orm import if_exists
+from src.database.db_connection import ReadOnlySession
 
 
 async def create_product(
@@ -62,6 +66,8 @@ async def create_product(
     new_product = Product(**product_data)
 
     session.add(new_product)
+    await session.flush()
+    await invalidation_bus.publish(session, PRODUCT_CHANGED, new_product.id)
     await session.commit()
     await session.refresh(new_product)
 
@@ -71,7 +77,14 @@ async def create_product(
 async def get_available_single_product(
     session: AsyncSession, product_id: str
 ) -> Union[ProductBasicOutputSchema, RemovedProductOutputSchema]:
-    if not (product_object := await if_exists(Product, "id", product_id, session)):
+    product_object = None
+    if isinstance(session, ReadOnlySession):
+        # only reads that tolerate a slightly stale catalog use the cache
+        product_object = await catalog_cache.get_product(product_id)
+
+    if not product_object and not (
+        product_object := await if_exists(Product, "id", product_id, session)
+    ):
         raise DoesNotExist(Product.__name__, "id", product_id)
 
     if product_object.legacy_product:
@@ -98,6 +111,11 @@ async def get_multiple_products(
     PagedResponseSchema[ProductBasicOutputSchema],
     PagedResponseSchema[ProductOutputSchema],
 ]:
+    if isinstance(session, ReadOnlySession):
+        products = await catalog_cache.get_products(get_legacy, query_params)
+        if products is not None:
+            return paginate_list(products, schema, page_params)
+
     query = select(Product)
     if not get_legacy:
         query = query.filter(Product.legacy_product == False)
@@ -193,6 +211,7 @@ async def update_single_product(
         product_was_updated += 1
 
     if product_was_updated:
+        await invalidation_bus.publish(session, PRODUCT_CHANGED, product_id)
         await session.commit()
         await session.refresh(product_object)
 
@@ -210,6 +229,7 @@ async def make_single_product_legacy(
 
     product_object.legacy_product = True
     session.add(product_object)
+    await invalidation_bus.publish(session, PRODUCT_CHANGED, product_id)
     await session.commit()
 
     return {"message": "Product has been changed into a legacy product"}
@@ -0,0 +1,35 @@
+from typing import Optional
+
+from fastapi import Depends, status
+from fastapi.routing import APIRouter
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.apps.putaway.schemas import (
+    PutawaySuggestionInputSchema,
+    PutawaySuggestionOutputSchema,
+)
+from src.apps.putaway.services import get_putaway_suggestions
+from src.apps.users.models import User
+from src.core.permissions import check_if_staff_or_has_permission
+from src.dependencies.get_db import get_db
+from src.dependencies.user import authenticate_user
+from src.dependencies.warehouse import get_warehouse_scope
+
+putaway_router = APIRouter(prefix="/putaway", tags=["putaway"])
+
+
+@putaway_router.post(
+    "/suggestions",
+    response_model=PutawaySuggestionOutputSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def post_putaway_suggestions(
+    suggestion_input: PutawaySuggestionInputSchema,
+    session: AsyncSession = Depends(get_db),
+    request_user: User = Depends(authenticate_user),
+    warehouse_id: Optional[str] = Depends(get_warehouse_scope),
+) -> PutawaySuggestionOutputSchema:
+    await check_if_staff_or_has_permission(request_user, "can_recept_stocks")
+    return await get_putaway_suggestions(
+        session, suggestion_input, warehouse_id=warehouse_id
+    )
@@ -0,0 +1,40 @@
+from decimal import Decimal
+from typing import Optional
+
+from pydantic import BaseModel, Field, conint, validator
+
+
+class PutawayStockInputSchema(BaseModel):
+    product_id: str
+    product_count: int
+
+    @validator("product_count")
+    def validate_product_count(cls, product_count: int) -> int:
+        if product_count <= 0:
+            raise ValueError("Product count must be positive!")
+        return product_count
+
+
+class PutawaySuggestionInputSchema(BaseModel):
+    stocks: list[PutawayStockInputSchema] = Field(min_items=1, max_items=1000)
+    limit: conint(ge=1, le=20) = 3
+
+
+class PutawayTargetSchema(BaseModel):
+    waiting_room_id: Optional[str]
+    rack_level_id: Optional[str]
+    score: float
+    available_weight: Decimal
+    available_slots: int
+
+
+class PutawayStockSuggestionSchema(BaseModel):
+    product_id: str
+    product_count: int
+    weight: Decimal
+    recommended: Optional[PutawayTargetSchema]
+    candidates: list[PutawayTargetSchema]
+
+
+class PutawaySuggestionOutputSchema(BaseModel):
+    suggestions: list[PutawayStockSuggestionSchema]
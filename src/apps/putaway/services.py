@@ -0,0 +1,609 @@
+import time
+from collections import Counter, defaultdict
+from decimal import Decimal
+from itertools import chain
+from typing import Any, Optional
+
+import numpy as np
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session
+from sqlalchemy.sql import Delete, Insert, Update
+
+from src.apps.products.models import Product
+from src.apps.putaway.schemas import (
+    PutawayStockSuggestionSchema,
+    PutawaySuggestionInputSchema,
+    PutawaySuggestionOutputSchema,
+    PutawayTargetSchema,
+)
+from src.apps.rack_level_slots.models import RackLevelSlot
+from src.apps.rack_levels.models import RackLevel
+from src.apps.racks.models import Rack
+from src.apps.sections.models import Section
+from src.apps.stocks.models import Stock
+from src.apps.waiting_rooms.models import WaitingRoom
+from src.core.exceptions import DoesNotExist
+from src.core.invalidation.bus import InvalidationBus, invalidation_bus
+from src.core.invalidation.events import (
+    LAYOUT_CHANGED,
+    RACK_LEVEL_CAPACITY_CHANGED,
+    InvalidationEvent,
+)
+
+BEST_FIT_WEIGHT = 0.5
+RACK_BALANCE_WEIGHT = 0.3
+PRODUCT_AFFINITY_WEIGHT = 0.2
+SECTION_AFFINITY = 0.5
+WAITING_ROOM_PENALTY = 0.1
+
+SNAPSHOT_MAX_AGE = 30.0
+
+RACK_LEVEL, WAITING_ROOM = 0, 1
+NO_INDEX = -1
+
+CAPACITY_CHANGES = "capacity_changes"
+STRUCTURE_CHANGED = ("structure",)
+CAPACITY_TABLES = {
+    model.__table__
+    for model in (Section, Rack, RackLevel, RackLevelSlot, WaitingRoom, Stock)
+}
+
+Location = tuple[Optional[str], Optional[str]]
+
+
+class CapacitySnapshot:
+    def __init__(
+        self,
+        racks: list[Any],
+        rack_levels: list[Any],
+        waiting_rooms: list[Any],
+        rack_level_slots: list[Any],
+        stocks: list[Any],
+    ) -> None:
+        self.rack_index = {rack.id: index for index, rack in enumerate(racks)}
+        self.rack_occupied_weight = np.array(
+            [rack.occupied_weight for rack in racks], dtype=np.float64
+        )
+        self.rack_max_weight = np.array(
+            [rack.max_weight for rack in racks], dtype=np.float64
+        )
+        section_ids = sorted({rack.section_id for rack in racks})
+        section_index = {
+            section_id: index for index, section_id in enumerate(section_ids)
+        }
+        rack_sections = [section_index[rack.section_id] for rack in racks]
+        rack_warehouses = {rack.id: rack.warehouse_id for rack in racks}
+
+        self.location_ids = [rack_level.id for rack_level in rack_levels] + [
+            waiting_room.id for waiting_room in waiting_rooms
+        ]
+        self.location_index = {
+            location_id: index for index, location_id in enumerate(self.location_ids)
+        }
+        self.kinds = np.array(
+            [RACK_LEVEL] * len(rack_levels) + [WAITING_ROOM] * len(waiting_rooms),
+            dtype=np.int8,
+        )
+        self.free_weight = np.array(
+            [rack_level.available_weight for rack_level in rack_levels]
+            + [waiting_room.available_stock_weight for waiting_room in waiting_rooms],
+            dtype=np.float64,
+        )
+        self.free_slots = np.array(
+            [rack_level.available_slots for rack_level in rack_levels]
+            + [waiting_room.available_slots for waiting_room in waiting_rooms],
+            dtype=np.int64,
+        )
+        self.max_weight = np.array(
+            [rack_level.max_weight for rack_level in rack_levels]
+            + [waiting_room.max_weight for waiting_room in waiting_rooms],
+            dtype=np.float64,
+        )
+        self.location_racks = np.array(
+            [self.rack_index[rack_level.rack_id] for rack_level in rack_levels]
+            + [NO_INDEX] * len(waiting_rooms),
+            dtype=np.int64,
+        )
+        self.location_sections = np.array(
+            [rack_sections[index] for index in self.location_racks[: len(rack_levels)]]
+            + [NO_INDEX] * len(waiting_rooms),
+            dtype=np.int64,
+        )
+
+        self.location_warehouses = np.array(
+            [rack_warehouses[rack_level.rack_id] for rack_level in rack_levels]
+            + [waiting_room.warehouse_id for waiting_room in waiting_rooms],
+            dtype=object,
+        )
+
+        self.slot_rack_levels = {
+            rack_level_slot.id: rack_level_slot.rack_level_id
+            for rack_level_slot in rack_level_slots
+        }
+        self.product_locations: dict[str, Counter] = defaultdict(Counter)
+        for stock in stocks:
+            self.move_product(
+                stock.product_id,
+                None,
+                (stock.waiting_room_id, stock.rack_level_slot_id),
+            )
+
+    def __len__(self) -> int:
+        return len(self.location_ids)
+
+    def locate(self, location: Optional[Location]) -> Optional[int]:
+        if location is None:
+            return None
+        waiting_room_id, rack_level_slot_id = location
+        if waiting_room_id:
+            return self.location_index.get(waiting_room_id)
+        return self.location_index.get(self.slot_rack_levels.get(rack_level_slot_id))
+
+    def set_location_products(self, index: int, product_ids: list[str]) -> None:
+        for locations in self.product_locations.values():
+            locations.pop(index, None)
+        for product_id in product_ids:
+            self.product_locations[product_id][index] += 1
+
+    def move_product(
+        self,
+        product_id: Optional[str],
+        old_location: Optional[Location],
+        new_location: Optional[Location],
+    ) -> None:
+        if product_id is None:
+            return
+        locations = self.product_locations[product_id]
+        old_index, new_index = self.locate(old_location), self.locate(new_location)
+        if old_index is not None and locations[old_index] > 0:
+            locations[old_index] -= 1
+        if new_index is not None:
+            locations[new_index] += 1
+
+    def apply_changes(self, changes: list[tuple]) -> bool:
+        for change in changes:
+            kind, *values = change
+            if kind == "rack_level":
+                rack_level_id, free_weight, free_slots, max_weight = values
+                index = self.location_index.get(rack_level_id)
+                if index is None:
+                    return False
+                self.free_weight[index] = free_weight
+                self.free_slots[index] = free_slots
+                self.max_weight[index] = max_weight
+            elif kind == "waiting_room":
+                waiting_room_id, free_weight, free_slots, max_weight = values
+                index = self.location_index.get(waiting_room_id)
+                if index is None:
+                    return False
+                self.free_weight[index] = free_weight
+                self.free_slots[index] = free_slots
+                self.max_weight[index] = max_weight
+            elif kind == "rack":
+                rack_id, occupied_weight, max_weight = values
+                index = self.rack_index.get(rack_id)
+                if index is None:
+                    return False
+                self.rack_occupied_weight[index] = occupied_weight
+                self.rack_max_weight[index] = max_weight
+            elif kind == "stock":
+                self.move_product(*values)
+            elif kind == "rack_level_products":
+                rack_level_id, product_ids = values
+                index = self.location_index.get(rack_level_id)
+                if index is None:
+                    return False
+                self.set_location_products(index, product_ids)
+            else:
+                return False
+        return True
+
+    def get_product_affinity(self, product_ids: list[str]) -> np.ndarray:
+        affinity = np.zeros((len(product_ids), len(self)), dtype=np.float64)
+        rows_by_product = defaultdict(list)
+        for row, product_id in enumerate(product_ids):
+            rows_by_product[product_id].append(row)
+
+        for product_id, rows in rows_by_product.items():
+            locations = [
+                index
+                for index, amount in self.product_locations.get(product_id, {}).items()
+                if amount > 0
+            ]
+            if not locations:
+                continue
+            product_affinity = np.zeros(len(self), dtype=np.float64)
+            sections = self.location_sections[locations]
+            sections = sections[sections != NO_INDEX]
+            product_affinity[np.isin(self.location_sections, sections)] = (
+                SECTION_AFFINITY
+            )
+            product_affinity[locations] = 1.0
+            affinity[rows] = product_affinity
+        return affinity
+
+    def score(
+        self,
+        weights: np.ndarray,
+        product_ids: list[str],
+        warehouse_id: Optional[str] = None,
+    ) -> np.ndarray:
+        demand = weights[:, np.newaxis]
+        feasible = (self.free_weight >= demand) & (self.free_slots > 0)
+        if warehouse_id is not None:
+            feasible &= self.location_warehouses == warehouse_id
+
+        max_weight = np.maximum(self.max_weight, np.finfo(np.float64).eps)
+        best_fit = 1 - np.clip((self.free_weight - demand) / max_weight, 0, 1)
+
+        in_rack = self.location_racks != NO_INDEX
+        rack_occupied_weight = np.zeros(len(self), dtype=np.float64)
+        rack_max_weight = np.ones(len(self), dtype=np.float64)
+        rack_occupied_weight[in_rack] = self.rack_occupied_weight[
+            self.location_racks[in_rack]
+        ]
+        rack_max_weight[in_rack] = np.maximum(
+            self.rack_max_weight[self.location_racks[in_rack]],
+            np.finfo(np.float64).eps,
+        )
+        rack_balance = np.where(
+            in_rack,
+            1 - np.clip((rack_occupied_weight + demand) / rack_max_weight, 0, 1),
+            0,
+        )
+
+        scores = (
+            BEST_FIT_WEIGHT * best_fit
+            + RACK_BALANCE_WEIGHT * rack_balance
+            + PRODUCT_AFFINITY_WEIGHT * self.get_product_affinity(product_ids)
+            - WAITING_ROOM_PENALTY * (self.kinds == WAITING_ROOM)
+        )
+        return np.where(feasible, scores, -np.inf)
+
+    def rank(self, scores: np.ndarray, limit: int) -> np.ndarray:
+        amount = min(limit, len(self))
+        if not amount:
+            return np.empty((scores.shape[0], 0), dtype=np.int64)
+        candidates = np.argpartition(-scores, amount - 1, axis=1)[:, :amount]
+        order = np.argsort(
+            -np.take_along_axis(scores, candidates, axis=1), axis=1, kind="stable"
+        )
+        return np.take_along_axis(candidates, order, axis=1)
+
+    def assign(self, scores: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        # heaviest stocks pick first, each pick reserves the capacity it uses
+        assignment = np.full(len(weights), NO_INDEX, dtype=np.int64)
+        if not len(self):
+            return assignment
+        free_weight = self.free_weight.copy()
+        free_slots = self.free_slots.copy()
+        for row in np.argsort(-weights, kind="stable"):
+            row_scores = np.where(
+                (free_weight >= weights[row]) & (free_slots > 0), scores[row], -np.inf
+            )
+            index = int(np.argmax(row_scores))
+            if np.isneginf(row_scores[index]):
+                continue
+            assignment[row] = index
+            free_weight[index] -= weights[row]
+            free_slots[index] -= 1
+        return assignment
+
+    def get_target(self, index: int, score: float) -> PutawayTargetSchema:
+        location_id = self.location_ids[index]
+        is_waiting_room = self.kinds[index] == WAITING_ROOM
+        return PutawayTargetSchema(
+            waiting_room_id=location_id if is_waiting_room else None,
+            rack_level_id=None if is_waiting_room else location_id,
+            score=round(float(score), 6),
+            available_weight=Decimal(str(self.free_weight[index])),
+            available_slots=int(self.free_slots[index]),
+        )
+
+
+async def load_capacity_snapshot(session: AsyncSession) -> CapacitySnapshot:
+    racks = await session.execute(
+        select(
+            Rack.id,
+            Rack.section_id,
+            Section.warehouse_id,
+            Rack.occupied_weight,
+            Rack.max_weight,
+        ).join(Section, Rack.section_id == Section.id)
+    )
+    rack_levels = await session.execute(
+        select(
+            RackLevel.id,
+            RackLevel.rack_id,
+            RackLevel.available_weight,
+            RackLevel.available_slots,
+            RackLevel.max_weight,
+        ).where(RackLevel.active_slots > 0)
+    )
+    waiting_rooms = await session.execute(
+        select(
+            WaitingRoom.id,
+            WaitingRoom.warehouse_id,
+            WaitingRoom.available_stock_weight,
+            WaitingRoom.available_slots,
+            WaitingRoom.max_weight,
+        )
+    )
+    rack_level_slots = await session.execute(
+        select(RackLevelSlot.id, RackLevelSlot.rack_level_id)
+    )
+    stocks = await session.execute(
+        select(Stock.product_id, Stock.waiting_room_id, Stock.rack_level_slot_id).where(
+            Stock.is_issued == False
+        )
+    )
+    return CapacitySnapshot(
+        racks.all(),
+        rack_levels.all(),
+        waiting_rooms.all(),
+        rack_level_slots.all(),
+        stocks.all(),
+    )
+
+
+async def load_rack_level_changes(
+    session: AsyncSession, snapshot: CapacitySnapshot, rack_level_ids: set[str]
+) -> list[tuple]:
+    rack_levels = await session.execute(
+        select(
+            RackLevel.id,
+            RackLevel.available_weight,
+            RackLevel.available_slots,
+            RackLevel.max_weight,
+            RackLevel.active_slots,
+            Rack.id.label("rack_id"),
+            Rack.occupied_weight.label("rack_occupied_weight"),
+            Rack.max_weight.label("rack_max_weight"),
+        )
+        .join(Rack, RackLevel.rack_id == Rack.id)
+        .where(RackLevel.id.in_(rack_level_ids))
+    )
+    stocks = await session.execute(
+        select(RackLevelSlot.rack_level_id, Stock.product_id)
+        .join(Stock, Stock.rack_level_slot_id == RackLevelSlot.id)
+        .where(
+            RackLevelSlot.rack_level_id.in_(rack_level_ids), Stock.is_issued == False
+        )
+    )
+    product_ids = defaultdict(list)
+    for stock in stocks:
+        product_ids[stock.rack_level_id].append(stock.product_id)
+
+    changes, found_ids = [], set()
+    for rack_level in rack_levels:
+        found_ids.add(rack_level.id)
+        # levels without active slots are not in the snapshot at all
+        if not rack_level.active_slots:
+            if rack_level.id in snapshot.location_index:
+                return [STRUCTURE_CHANGED]
+            continue
+        changes += [
+            (
+                "rack_level",
+                rack_level.id,
+                float(rack_level.available_weight),
+                rack_level.available_slots,
+                float(rack_level.max_weight),
+            ),
+            (
+                "rack",
+                rack_level.rack_id,
+                float(rack_level.rack_occupied_weight),
+                float(rack_level.rack_max_weight),
+            ),
+            ("rack_level_products", rack_level.id, product_ids[rack_level.id]),
+        ]
+    if any(id in snapshot.location_index for id in rack_level_ids - found_ids):
+        return [STRUCTURE_CHANGED]
+    return changes
+
+
+class CapacitySnapshotCache:
+    def __init__(self, bus: InvalidationBus, max_age: float = SNAPSHOT_MAX_AGE) -> None:
+        self.max_age = max_age
+        self.snapshot: Optional[CapacitySnapshot] = None
+        self.loaded_at = 0.0
+        self.generation = 0
+        self.stale_rack_level_ids: set[str] = set()
+        # changes committed by other workers only reach the cache over the bus
+        bus.register(RACK_LEVEL_CAPACITY_CHANGED, self.handle_capacity_event)
+        bus.register(LAYOUT_CHANGED, self.handle_capacity_event)
+
+    def invalidate(self) -> None:
+        self.snapshot = None
+        self.stale_rack_level_ids.clear()
+        self.generation += 1
+
+    def handle_capacity_event(self, invalidation: InvalidationEvent) -> None:
+        if invalidation.kind != RACK_LEVEL_CAPACITY_CHANGED:
+            self.invalidate()
+            return
+        # handlers can not query the database, the named rack levels are
+        # reloaded by the next request instead. A snapshot loaded meanwhile
+        # may already hold them, reloading them again is cheap
+        self.stale_rack_level_ids.update(invalidation.ids)
+
+    def apply_changes(self, changes: list[tuple]) -> None:
+        self.generation += 1
+        if self.snapshot is not None and not self.snapshot.apply_changes(changes):
+            self.snapshot = None
+
+    async def refresh(self, session: AsyncSession) -> Optional[CapacitySnapshot]:
+        snapshot, rack_level_ids = self.snapshot, self.stale_rack_level_ids
+        self.stale_rack_level_ids = set()
+        changes = await load_rack_level_changes(session, snapshot, rack_level_ids)
+        # the snapshot could have been dropped or replaced while loading
+        if snapshot is not self.snapshot:
+            self.stale_rack_level_ids |= rack_level_ids
+            return None
+        if not snapshot.apply_changes(changes):
+            self.invalidate()
+            return None
+        return snapshot
+
+    async def get(self, session: AsyncSession) -> CapacitySnapshot:
+        if (
+            self.snapshot is not None
+            and time.monotonic() - self.loaded_at < self.max_age
+        ):
+            if not self.stale_rack_level_ids:
+                return self.snapshot
+            if snapshot := await self.refresh(session):
+                return snapshot
+
+        generation = self.generation
+        snapshot = await load_capacity_snapshot(session)
+        # changes committed while loading are not in the snapshot, so it is
+        # used for this request only
+        if generation == self.generation:
+            self.snapshot, self.loaded_at = snapshot, time.monotonic()
+        return snapshot
+
+
+capacity_snapshot_cache = CapacitySnapshotCache(invalidation_bus)
+
+
+def get_previous_value(state: Any, key: str) -> Any:
+    history = state.attrs[key].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return None
+
+
+def get_capacity_change(instance: Any, is_new: bool = False) -> Optional[tuple]:
+    values = inspect(instance).dict
+    if isinstance(instance, RackLevel):
+        keys = ("id", "available_weight", "available_slots", "max_weight")
+    elif isinstance(instance, WaitingRoom):
+        keys = ("id", "available_stock_weight", "available_slots", "max_weight")
+    elif isinstance(instance, Rack):
+        keys = ("id", "occupied_weight", "max_weight")
+    else:
+        return None
+    if is_new or any(key not in values for key in keys):
+        return STRUCTURE_CHANGED
+    return (
+        instance.__tablename__,
+        values["id"],
+        *(float(values[key]) for key in keys[1:]),
+    )
+
+
+def get_stock_change(stock: Stock, is_new: bool = False) -> tuple:
+    state = inspect(stock)
+    values = state.dict
+    old_location = None
+    if not is_new and not get_previous_value(state, "is_issued"):
+        old_location = (
+            get_previous_value(state, "waiting_room_id"),
+            get_previous_value(state, "rack_level_slot_id"),
+        )
+    new_location = None
+    if not values.get("is_issued"):
+        new_location = (
+            values.get("waiting_room_id"),
+            values.get("rack_level_slot_id"),
+        )
+    return ("stock", values.get("product_id"), old_location, new_location)
+
+
+@event.listens_for(Session, "after_flush")
+def collect_capacity_changes(session: Session, flush_context: Any) -> None:
+    changes = []
+    for instance in chain(session.new, session.dirty):
+        is_new = instance in session.new
+        if isinstance(instance, Stock):
+            changes.append(get_stock_change(instance, is_new))
+        elif isinstance(instance, RackLevelSlot) and is_new:
+            changes.append(STRUCTURE_CHANGED)
+        elif change := get_capacity_change(instance, is_new):
+            changes.append(change)
+    if any(type(instance).__table__ in CAPACITY_TABLES for instance in session.deleted):
+        changes.append(STRUCTURE_CHANGED)
+    if changes:
+        session.info.setdefault(CAPACITY_CHANGES, []).extend(changes)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def collect_bulk_capacity_changes(orm_execute_state: ORMExecuteState) -> None:
+    statement = orm_execute_state.statement
+    if (
+        isinstance(statement, (Insert, Update, Delete))
+        and statement.table in CAPACITY_TABLES
+    ):
+        orm_execute_state.session.info.setdefault(CAPACITY_CHANGES, []).append(
+            STRUCTURE_CHANGED
+        )
+
+
+@event.listens_for(Session, "after_commit")
+def apply_capacity_changes(session: Session) -> None:
+    changes = session.info.pop(CAPACITY_CHANGES, None)
+    if changes:
+        capacity_snapshot_cache.apply_changes(changes)
+
+
+@event.listens_for(Session, "after_rollback")
+def discard_capacity_changes(session: Session) -> None:
+    session.info.pop(CAPACITY_CHANGES, None)
+
+
+async def get_putaway_suggestions(
+    session: AsyncSession,
+    suggestion_input: PutawaySuggestionInputSchema,
+    snapshot: Optional[CapacitySnapshot] = None,
+    warehouse_id: Optional[str] = None,
+) -> PutawaySuggestionOutputSchema:
+    stocks = suggestion_input.stocks
+    product_ids = {stock.product_id for stock in stocks}
+    products = await session.execute(
+        select(Product.id, Product.weight).where(Product.id.in_(product_ids))
+    )
+    product_weights = dict(products.all())
+    for product_id in product_ids:
+        if product_id not in product_weights:
+            raise DoesNotExist(Product.__name__, "id", product_id)
+
+    if snapshot is None:
+        snapshot = await capacity_snapshot_cache.get(session)
+
+    stock_weights = [
+        product_weights[stock.product_id] * stock.product_count for stock in stocks
+    ]
+    weights = np.array(stock_weights, dtype=np.float64)
+    scores = snapshot.score(
+        weights, [stock.product_id for stock in stocks], warehouse_id
+    )
+    ranking = snapshot.rank(scores, suggestion_input.limit)
+    assignment = snapshot.assign(scores, weights)
+
+    suggestions = []
+    for row, stock in enumerate(stocks):
+        candidates = [
+            snapshot.get_target(index, scores[row, index])
+            for index in ranking[row]
+            if not np.isneginf(scores[row, index])
+        ]
+        recommended = None
+        if assignment[row] != NO_INDEX:
+            recommended = snapshot.get_target(
+                assignment[row], scores[row, assignment[row]]
+            )
+        suggestions.append(
+            PutawayStockSuggestionSchema(
+                product_id=stock.product_id,
+                product_count=stock.product_count,
+                weight=stock_weights[row],
+                recommended=recommended,
+                candidates=candidates,
+            )
+        )
+    return PutawaySuggestionOutputSchema(suggestions=suggestions)
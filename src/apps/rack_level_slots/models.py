@@ -18,6 +18,8 @@ from src.core.utils.orm import (
     default_available_rack_level_slots,
     default_available_rack_level_weight,
 )
+from src.core.utils.search import trigram_index
+from src.core.utils.sync import change_index, change_xid_column, track_changes
 from src.core.utils.time import get_current_time
 from src.core.utils.utils import generate_uuid
 from src.database.db_connection import Base
@@ -48,4 +50,20 @@ class RackLevelSlot(Base):
     stock = relationship(
         "Stock", uselist=False, back_populates="rack_level_slot", lazy="selectin"
     )
+    # copied from the section, so slots are scoped without walking the layout
+    warehouse_id = Column(
+        String,
+        ForeignKey("warehouse.id", ondelete="CASCADE", onupdate="cascade"),
+        nullable=False,
+        index=True,
+    )
+    change_xid = change_xid_column()
     created_at = Column(DateTime, default=dt.datetime.now, nullable=True)
+
+    __table_args__ = (
+        trigram_index("rack_level_slot", "description"),
+        change_index("rack_level_slot"),
+    )
+
+
+track_changes(RackLevelSlot.__table__)
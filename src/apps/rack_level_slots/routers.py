@@ -25,7 +25,7 @@ from src.apps.users.models import User
 from src.core.pagination.models import PageParams
 from src.core.pagination.schemas import PagedResponseSchema
 from src.core.permissions import check_if_staff, check_if_staff_or_has_permission
-from src.dependencies.get_db import get_db
+from src.dependencies.get_db import get_db, get_read_db
 from src.dependencies.user import authenticate_user
 
 rack_level_slot_router = APIRouter(prefix="/rack-level-slots", tags=["rack_level_slot"])
@@ -41,7 +41,7 @@ rack_level_slot_router = APIRouter(prefix="/rack-level-slots", tags=["rack_level
 )
 async def get_rack_level_slots(
     request: Request,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     page_params: PageParams = Depends(),
     request_user: User = Depends(authenticate_user),
 ) -> Union[
@@ -60,7 +60,7 @@ async def get_rack_level_slots(
 )
 async def get_rack_level_slot(
     rack_level_slot_id: str,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     request_user: User = Depends(authenticate_user),
 ) -> Union[RackLevelSlotBaseOutputSchema, RackLevelSlotOutputSchema]:
     if request_user.is_staff or request_user.can_move_stocks:
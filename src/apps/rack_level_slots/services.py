@@ -5,6 +5,7 @@ from pydantic import BaseModel
 from sqlalchemy import delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.apps.inventory.services import InventoryChanges
 from src.apps.rack_level_slots.models import RackLevelSlot
 from src.apps.rack_level_slots.schemas import (
     RackLevelSlotBaseOutputSchema,
@@ -19,6 +20,8 @@ from src.apps.rack_levels.schemas import (
     RackLevelOutputSchema,
     RackLevelUpdateSchema,
 )
+from src.apps.racks.models import Rack
+from src.apps.sections.models import Section
 from src.apps.stocks.models import Stock
 from src.apps.stocks.schemas.stock_schemas import StockRackLevelSlotInputSchema
 from src.core.exceptions import (
@@ -33,14 +36,18 @@ from src.core.exceptions import (
     NoAvailableWeightInRackLevelException,
     NotEnoughRackLevelResourcesException,
     RackLevelSlotIsNotEmptyException,
+    ResourceInAnotherWarehouseException,
     ServiceException,
     StockAlreadyInRackLevelException,
     TooSmallInactiveSlotsQuantityException,
 )
+from src.core.invalidation.bus import invalidation_bus
+from src.core.invalidation.events import RACK_LEVEL_CAPACITY_CHANGED
 from src.core.pagination.models import PageParams
 from src.core.pagination.schemas import PagedResponseSchema
 from src.core.pagination.services import paginate
 from src.core.utils.filter import filter_and_sort_instances
+from src.core.utils.locking import LockSet, lock_stock_movement, retry_on_lock_conflict
 from src.core.utils.orm import if_exists
 
 
@@ -87,6 +94,11 @@ async def create_rack_level_slot(
             comment=("(in the requested rack level)"),
         )
 
+    rack_level_slot_data["warehouse_id"] = await session.scalar(
+        select(Section.warehouse_id)
+        .join(Rack, Rack.section_id == Section.id)
+        .filter(Rack.id == rack_level_object.rack_id)
+    )
     new_rack_level_slot = RackLevelSlot(**rack_level_slot_data)
     session.add(new_rack_level_slot)
     session.add(rack_level_object)
@@ -335,6 +347,7 @@ async def manage_old_rack_level_slot_state(
     return old_rack_level_slot_object
 
 
+@retry_on_lock_conflict()
 async def add_single_stock_to_rack_level_slot(
     session: AsyncSession,
     rack_level_slot_id: str,
@@ -358,12 +371,19 @@ async def add_single_stock_to_rack_level_slot(
     if not (stock_object := await if_exists(Stock, "id", stock_id, session)):
         raise DoesNotExist(Stock.__name__, "id", stock_id)
 
+    await lock_stock_movement(
+        session, [stock_object], LockSet().add_rack_level_slot(rack_level_slot_object)
+    )
+
     if stock_object.is_issued:
         raise CannotMoveIssuedStockException
 
     if rack_level_slot_object.stock:
         raise ServiceException("The slot is occupied! ")
 
+    if rack_level_slot_object.warehouse_id != stock_object.warehouse_id:
+        raise ResourceInAnotherWarehouseException(resource="rack level slot")
+
     if not rack_level_slot_object.rack_level.available_slots:
         raise NoAvailableSlotsInRackLevelException
 
@@ -412,6 +432,18 @@ async def add_single_stock_to_rack_level_slot(
 
     stock_object.rack_level_slot_id = rack_level_slot.id
     session.add(stock_object)
+    await InventoryChanges().move(
+        stock_object.product_id,
+        stock_object.product_count,
+        (_old_waiting_room_id, _old_rack_level_slot_id),
+        (None, rack_level_slot.id),
+    ).apply(session)
+    changed_rack_level_ids = {rack_level_slot.rack_level_id}
+    if old_rack_level_slot_object:
+        changed_rack_level_ids.add(old_rack_level_slot_object.rack_level_id)
+    await invalidation_bus.publish(
+        session, RACK_LEVEL_CAPACITY_CHANGED, *changed_rack_level_ids
+    )
     await session.commit()
 
     return {"message": "Stock was successfully added to the rack level slot! "}
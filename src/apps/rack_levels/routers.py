@@ -1,4 +1,4 @@
-from typing import Union
+from typing import Optional, Union
 
 from fastapi import Depends, Request, Response, status
 from fastapi.responses import JSONResponse
@@ -32,8 +32,9 @@ from src.apps.users.models import User
 from src.core.pagination.models import PageParams
 from src.core.pagination.schemas import PagedResponseSchema
 from src.core.permissions import check_if_staff, check_if_staff_or_has_permission
-from src.dependencies.get_db import get_db
+from src.dependencies.get_db import get_db, get_read_db
 from src.dependencies.user import authenticate_user
+from src.dependencies.versioning import get_expected_version
 
 rack_level_router = APIRouter(prefix="/rack_levels", tags=["rack_level"])
 
@@ -62,7 +63,7 @@ async def post_rack_level(
 )
 async def get_rack_levels(
     request: Request,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     page_params: PageParams = Depends(),
     request_user: User = Depends(authenticate_user),
 ) -> Union[
@@ -81,7 +82,7 @@ async def get_rack_levels(
 )
 async def get_rack_level(
     rack_level_id: str,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     request_user: User = Depends(authenticate_user),
 ) -> Union[RackLevelOutputSchema, RackLevelBaseOutputSchema]:
     if request_user.is_staff or request_user.can_move_stocks:
@@ -101,7 +102,7 @@ async def get_rack_level(
 )
 async def get_slots_in_the_rack_level(
     rack_level_id: str,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     page_params: PageParams = Depends(),
     request_user: User = Depends(authenticate_user),
 ) -> Union[
@@ -121,7 +122,7 @@ async def get_slots_in_the_rack_level(
 async def get_slot_from_the_rack_level(
     rack_level_id: str,
     rack_level_slot_id: str,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     request_user: User = Depends(authenticate_user),
 ) -> Union[RackLevelSlotOutputSchema, RackLevelSlotBaseOutputSchema]:
     if request_user.is_staff or request_user.can_move_stocks:
@@ -146,9 +147,12 @@ async def update_rack_level(
     rack_level_input: RackLevelUpdateSchema,
     session: AsyncSession = Depends(get_db),
     request_user: User = Depends(authenticate_user),
+    expected_version: Optional[int] = Depends(get_expected_version),
 ) -> RackLevelOutputSchema:
     await check_if_staff(request_user)
-    return await update_single_rack_level(session, rack_level_input, rack_level_id)
+    return await update_single_rack_level(
+        session, rack_level_input, rack_level_id, expected_version
+    )
 
 
 @rack_level_router.delete(
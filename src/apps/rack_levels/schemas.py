@@ -74,6 +74,7 @@ class RackLevelBaseOutputSchema(RackLevelBaseSchema):
 
 class RackLevelOutputSchema(RackLevelBaseOutputSchema):
     rack_level_slots: Optional[list[RackLevelSlotBaseOutputSchema]]
+    version_id: int
 
     class Config:
         orm_mode = True
@@ -1,10 +1,11 @@
 from decimal import Decimal
-from typing import Union
+from typing import Optional, Union
 
 from pydantic import BaseModel
 from sqlalchemy import delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.apps.inventory.services import InventoryChanges
 from src.apps.rack_level_slots.models import RackLevelSlot
 from src.apps.rack_level_slots.services import manage_old_rack_level_slot_state
 from src.apps.rack_levels.models import RackLevel
@@ -38,17 +39,21 @@ from src.core.exceptions import (
     NotEnoughRackResourcesException,
     NotEnoughSectionResourcesException,
     RackLevelIsNotEmptyException,
+    ResourceInAnotherWarehouseException,
     ServiceException,
     StockAlreadyInRackLevelException,
     TooLittleRackLevelSlotsAmountException,
     TooLittleWeightAmountException,
     WeightLimitExceededException,
 )
+from src.core.invalidation.bus import invalidation_bus
+from src.core.invalidation.events import RACK_LEVEL_CAPACITY_CHANGED
 from src.core.pagination.models import PageParams
 from src.core.pagination.schemas import PagedResponseSchema
 from src.core.pagination.services import paginate
 from src.core.utils.filter import filter_and_sort_instances
-from src.core.utils.orm import if_exists
+from src.core.utils.locking import LockSet, lock_stock_movement, retry_on_lock_conflict
+from src.core.utils.orm import check_object_version, if_exists, update_versioned_object
 
 
 async def create_rack_level(
@@ -227,7 +232,10 @@ async def manage_rack_level_state(
 
 
 async def update_single_rack_level(
-    session: AsyncSession, rack_level_input: RackLevelUpdateSchema, rack_level_id: str
+    session: AsyncSession,
+    rack_level_input: RackLevelUpdateSchema,
+    rack_level_id: str,
+    expected_version: Optional[int] = None,
 ) -> RackLevelOutputSchema:
     from src.apps.rack_level_slots.services import (
         manage_rack_level_slots_when_changing_rack_level_max_slots,
@@ -237,6 +245,7 @@ async def update_single_rack_level(
         rack_level_object := await if_exists(RackLevel, "id", rack_level_id, session)
     ):
         raise DoesNotExist(RackLevel.__name__, "id", rack_level_id)
+    check_object_version(rack_level_object, expected_version)
 
     if not (
         rack_object := await if_exists(Rack, "id", rack_level_object.rack_id, session)
@@ -293,15 +302,12 @@ async def update_single_rack_level(
     rack_level_object = await manage_rack_level_state(
         rack_level_object, new_max_weight, new_max_slots
     )
-    await session.flush()
+    await update_versioned_object(session, rack_level_object, rack_level_data)
 
     if rack_level_data:
-        statement = (
-            update(RackLevel)
-            .filter(RackLevel.id == rack_level_id)
-            .values(**rack_level_data)
+        await invalidation_bus.publish(
+            session, RACK_LEVEL_CAPACITY_CHANGED, rack_level_id
         )
-        await session.execute(statement)
         await session.commit()
         await session.refresh(rack_level_object)
 
@@ -333,11 +339,13 @@ async def delete_single_rack_level(session: AsyncSession, rack_level_id: str):
     )
     session.add(rack)
     result = await session.execute(statement)
+    await invalidation_bus.publish(session, RACK_LEVEL_CAPACITY_CHANGED, rack_level_id)
 
     await session.commit()
     return result
 
 
+@retry_on_lock_conflict()
 async def add_single_stock_to_rack_level(
     session: AsyncSession,
     rack_level_id: str,
@@ -358,6 +366,10 @@ async def add_single_stock_to_rack_level(
     if not (stock_object := await if_exists(Stock, "id", stock_id, session)):
         raise DoesNotExist(Stock.__name__, "id", stock_id)
 
+    await lock_stock_movement(
+        session, [stock_object], LockSet().add_rack_level(rack_level_object)
+    )
+
     if stock_object.is_issued:
         raise CannotMoveIssuedStockException
 
@@ -368,9 +380,7 @@ async def add_single_stock_to_rack_level(
     if not rack_level_object.available_slots:
         raise NoAvailableSlotsInRackLevelException
 
-    if (
-        rack_level_object.available_weight < stock_object.weight
-    ) and (
+    if (rack_level_object.available_weight < stock_object.weight) and (
         rack_level_object.id != stock_object.rack_level_slot.rack_level_id
     ):
         raise NoAvailableWeightInRackLevelException
@@ -400,6 +410,9 @@ async def add_single_stock_to_rack_level(
     if rack_level_slot_object.stock:
         raise ServiceException("The slot is occupied! ")
 
+    if rack_level_slot_object.warehouse_id != stock_object.warehouse_id:
+        raise ResourceInAnotherWarehouseException(resource="rack level")
+
     _new_rack_level_slot_object = rack_level_slot_object
 
     if old_waiting_room_object := stock_object.waiting_room:
@@ -440,6 +453,18 @@ async def add_single_stock_to_rack_level(
 
     stock_object.rack_level_slot_id = rack_level_slot.id
     session.add(stock_object)
+    await InventoryChanges().move(
+        stock_object.product_id,
+        stock_object.product_count,
+        (_old_waiting_room_id, _old_rack_level_slot_id),
+        (None, rack_level_slot.id),
+    ).apply(session)
+    changed_rack_level_ids = {rack_level_id}
+    if old_rack_level_slot_object:
+        changed_rack_level_ids.add(old_rack_level_slot_object.rack_level_id)
+    await invalidation_bus.publish(
+        session, RACK_LEVEL_CAPACITY_CHANGED, *changed_rack_level_ids
+    )
     await session.commit()
 
     return {"message": "Stock was successfully added to the rack level! "}
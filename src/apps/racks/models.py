@@ -18,6 +18,7 @@ from src.core.utils.orm import (
     default_available_rack_levels,
     default_available_rack_weight,
 )
+from src.core.utils.sync import change_index, change_xid_column, track_changes
 from src.core.utils.time import get_current_time
 from src.core.utils.utils import generate_uuid
 from src.database.db_connection import Base
@@ -59,4 +60,12 @@ class Rack(Base):
     )
     section = relationship("Section", back_populates="racks", lazy="selectin")
     rack_levels = relationship("RackLevel", back_populates="rack", lazy="selectin")
+    change_xid = change_xid_column()
     created_at = Column(DateTime, default=dt.datetime.now, nullable=True)
+    version_id = Column(Integer, nullable=False, default=1)
+
+    __table_args__ = (change_index("rack"),)
+    __mapper_args__ = {"version_id_col": version_id}
+
+
+track_changes(Rack.__table__)
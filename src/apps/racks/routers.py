@@ -1,4 +1,4 @@
-from typing import Union
+from typing import Optional, Union
 
 from fastapi import Depends, Request, Response, status
 from fastapi.routing import APIRouter
@@ -26,8 +26,9 @@ from src.apps.users.models import User
 from src.core.pagination.models import PageParams
 from src.core.pagination.schemas import PagedResponseSchema
 from src.core.permissions import check_if_staff
-from src.dependencies.get_db import get_db
+from src.dependencies.get_db import get_db, get_read_db
 from src.dependencies.user import authenticate_user
+from src.dependencies.versioning import get_expected_version
 
 rack_router = APIRouter(prefix="/racks", tags=["rack"])
 
@@ -56,7 +57,7 @@ async def post_rack(
 )
 async def get_racks(
     request: Request,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     page_params: PageParams = Depends(),
     request_user: User = Depends(authenticate_user),
 ) -> Union[
@@ -75,7 +76,7 @@ async def get_racks(
 )
 async def get_rack(
     rack_id: str,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     request_user: User = Depends(authenticate_user),
 ) -> Union[RackBaseOutputSchema, RackOutputSchema]:
     if request_user.is_staff or request_user.can_move_stocks:
@@ -93,7 +94,7 @@ async def get_rack(
 )
 async def get_rack_levels_in_the_rack(
     rack_id: str,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     page_params: PageParams = Depends(),
     request_user: User = Depends(authenticate_user),
 ) -> Union[
@@ -111,7 +112,7 @@ async def get_rack_levels_in_the_rack(
 async def get_rack_level_from_the_rack(
     rack_id: str,
     rack_level_id: str,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     request_user: User = Depends(authenticate_user),
 ) -> Union[RackLevelOutputSchema, RackLevelBaseOutputSchema]:
     if request_user.is_staff or request_user.can_move_stocks:
@@ -131,9 +132,10 @@ async def update_rack(
     rack_input: RackUpdateSchema,
     session: AsyncSession = Depends(get_db),
     request_user: User = Depends(authenticate_user),
+    expected_version: Optional[int] = Depends(get_expected_version),
 ) -> RackOutputSchema:
     await check_if_staff(request_user)
-    return await update_single_rack(session, rack_input, rack_id)
+    return await update_single_rack(session, rack_input, rack_id, expected_version)
 
 
 @rack_router.delete(
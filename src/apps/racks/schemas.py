@@ -67,6 +67,7 @@ class RackBaseOutputSchema(RackBaseSchema):
 
 class RackOutputSchema(RackBaseOutputSchema):
     rack_levels: list[RackLevelBaseOutputSchema]
+    version_id: int
 
     class Config:
         orm_mode = True
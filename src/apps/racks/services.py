@@ -1,5 +1,5 @@
 from decimal import Decimal
-from typing import Union
+from typing import Optional, Union
 
 from pydantic import BaseModel
 from sqlalchemy import delete, select, update
@@ -25,7 +25,6 @@ from src.core.exceptions import (
     TooLittleRackLevelsAmountException,
     TooLittleRacksAmountException,
     TooLittleWeightAmountException,
-    WarehouseAlreadyExistsException,
     WarehouseDoesNotExistException,
     WeightLimitExceededException,
 )
@@ -33,7 +32,7 @@ from src.core.pagination.models import PageParams
 from src.core.pagination.schemas import PagedResponseSchema
 from src.core.pagination.services import paginate
 from src.core.utils.filter import filter_and_sort_instances
-from src.core.utils.orm import if_exists
+from src.core.utils.orm import check_object_version, if_exists, update_versioned_object
 
 
 async def create_rack(
@@ -172,10 +171,14 @@ async def manage_rack_state(
 
 
 async def update_single_rack(
-    session: AsyncSession, rack_input: RackUpdateSchema, rack_id: str
+    session: AsyncSession,
+    rack_input: RackUpdateSchema,
+    rack_id: str,
+    expected_version: Optional[int] = None,
 ) -> RackOutputSchema:
     if not (rack_object := await if_exists(Rack, "id", rack_id, session)):
         raise DoesNotExist(Rack.__name__, "id", rack_id)
+    check_object_version(rack_object, expected_version)
 
     if not (
         section_object := await if_exists(
@@ -219,11 +222,9 @@ async def update_single_rack(
 
     rack_object = await manage_rack_state(rack_object, new_max_weight, new_max_levels)
     session.add(rack_object)
+    await update_versioned_object(session, rack_object, rack_data)
 
     if rack_data:
-        statement = update(Rack).filter(Rack.id == rack_id).values(**rack_data)
-
-        await session.execute(statement)
         await session.commit()
         await session.refresh(rack_object)
 
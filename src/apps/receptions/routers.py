@@ -1,7 +1,10 @@
+from typing import Optional
+
 from fastapi import Depends, Request, Response, status
 from fastapi.routing import APIRouter
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.apps.jobs.schemas import JobOutputSchema
 from src.apps.receptions.models import Reception
 from src.apps.receptions.schemas import (
     ReceptionBasicOutputSchema,
@@ -11,6 +14,7 @@ from src.apps.receptions.schemas import (
 )
 from src.apps.receptions.services import (
     create_reception,
+    create_reception_job,
     get_all_receptions,
     get_single_reception,
     update_single_reception,
@@ -19,8 +23,9 @@ from src.apps.users.models import User
 from src.core.pagination.models import PageParams
 from src.core.pagination.schemas import PagedResponseSchema
 from src.core.permissions import check_if_staff_or_has_permission
-from src.dependencies.get_db import get_db
+from src.dependencies.get_db import get_db, get_read_db
 from src.dependencies.user import authenticate_user
+from src.dependencies.warehouse import get_warehouse_scope
 
 reception_router = APIRouter(prefix="/receptions", tags=["reception"])
 
@@ -34,9 +39,29 @@ async def post_reception(
     reception_input: ReceptionInputSchema,
     session: AsyncSession = Depends(get_db),
     request_user: User = Depends(authenticate_user),
+    warehouse_id: Optional[str] = Depends(get_warehouse_scope),
 ) -> ReceptionOutputSchema:
     await check_if_staff_or_has_permission(request_user, "can_recept_stocks")
-    return await create_reception(session, reception_input, request_user.id)
+    return await create_reception(
+        session, reception_input, request_user.id, warehouse_id
+    )
+
+
+@reception_router.post(
+    "/jobs",
+    response_model=JobOutputSchema,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def post_reception_job(
+    reception_input: ReceptionInputSchema,
+    session: AsyncSession = Depends(get_db),
+    request_user: User = Depends(authenticate_user),
+    warehouse_id: Optional[str] = Depends(get_warehouse_scope),
+) -> JobOutputSchema:
+    await check_if_staff_or_has_permission(request_user, "can_recept_stocks")
+    return await create_reception_job(
+        session, reception_input, request_user.id, warehouse_id
+    )
 
 
 @reception_router.get(
@@ -46,13 +71,17 @@ async def post_reception(
 )
 async def get_receptions(
     request: Request,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     page_params: PageParams = Depends(),
     request_user: User = Depends(authenticate_user),
+    warehouse_id: Optional[str] = Depends(get_warehouse_scope),
 ) -> PagedResponseSchema[ReceptionBasicOutputSchema]:
     await check_if_staff_or_has_permission(request_user, "can_recept_stocks")
     return await get_all_receptions(
-        session, page_params, query_params=request.query_params.multi_items()
+        session,
+        page_params,
+        query_params=request.query_params.multi_items(),
+        warehouse_id=warehouse_id,
     )
 
 
@@ -63,11 +92,12 @@ async def get_receptions(
 )
 async def get_reception(
     reception_id: str,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     request_user: User = Depends(authenticate_user),
+    warehouse_id: Optional[str] = Depends(get_warehouse_scope),
 ) -> ReceptionOutputSchema:
     await check_if_staff_or_has_permission(request_user, "can_recept_stocks")
-    return await get_single_reception(session, reception_id)
+    return await get_single_reception(session, reception_id, warehouse_id)
 
 
 @reception_router.patch(
@@ -80,6 +110,9 @@ async def update_reception(
     reception_input: ReceptionUpdateSchema,
     session: AsyncSession = Depends(get_db),
     request_user: User = Depends(authenticate_user),
+    warehouse_id: Optional[str] = Depends(get_warehouse_scope),
 ) -> ReceptionOutputSchema:
     await check_if_staff_or_has_permission(request_user, "can_recept_stocks")
-    return await update_single_reception(session, reception_input, reception_id)
+    return await update_single_reception(
+        session, reception_input, reception_id, warehouse_id
+    )
@@ -1,6 +1,11 @@
+import json
+from typing import Any, Optional
+
 from sqlalchemy import delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.apps.jobs.schemas import JobOutputSchema
+from src.apps.jobs.services import JobProgress, enqueue_job, register_job_handler
 from src.apps.products.models import Product
 from src.apps.receptions.models import Reception
 from src.apps.receptions.schemas import (
@@ -16,12 +21,14 @@ from src.core.exceptions import (
     DoesNotExist,
     IsOccupied,
     MissingReceptionDataException,
+    ResourceInAnotherWarehouseException,
     ServiceException,
 )
 from src.core.pagination.models import PageParams
 from src.core.pagination.schemas import PagedResponseSchema
 from src.core.pagination.services import paginate
 from src.core.utils.filter import filter_and_sort_instances
+from src.core.utils.locking import retry_on_lock_conflict
 from src.core.utils.orm import if_exists
 
 
@@ -30,6 +37,7 @@ async def base_create_reception(
     user_id: str,
     reception_input: ReceptionInputSchema = None,
     testing: bool = False,
+    job_id: Optional[str] = None,
 ):
     if testing:
         new_reception = Reception(user_id=user_id)
@@ -66,7 +74,7 @@ async def base_create_reception(
     rack_level_ids = [product.get("rack_level_id", None) for product in products_data]
 
     new_reception = Reception(
-        user_id=user_id, description=reception_input.get("description")
+        user_id=user_id, description=reception_input.get("description"), job_id=job_id
     )
     session.add(new_reception)
     await session.flush()
@@ -80,8 +88,14 @@ async def base_create_reception(
     )
 
 
+@retry_on_lock_conflict()
 async def create_reception(
-    session: AsyncSession, reception_input: ReceptionInputSchema, user_id: str
+    session: AsyncSession,
+    reception_input: ReceptionInputSchema,
+    user_id: str,
+    warehouse_id: Optional[str] = None,
+    job_id: Optional[str] = None,
+    progress: Optional[JobProgress] = None,
 ) -> ReceptionOutputSchema:
     (
         products,
@@ -90,7 +104,7 @@ async def create_reception(
         waiting_room_ids,
         rack_level_slots_ids,
         rack_level_ids,
-    ) = await base_create_reception(session, user_id, reception_input)
+    ) = await base_create_reception(session, user_id, reception_input, job_id=job_id)
     stocks = await create_stocks(
         session,
         user_id,
@@ -99,7 +113,9 @@ async def create_reception(
         rack_level_ids,
         products,
         product_counts,
-        reception_id=new_reception.id
+        reception_id=new_reception.id,
+        warehouse_id=warehouse_id,
+        progress=progress,
     )
 
     await session.commit()
@@ -109,21 +125,78 @@ async def create_reception(
     return ReceptionOutputSchema.from_orm(new_reception)
 
 
+RECEPTION_JOB = "create_reception"
+
+
+async def create_reception_job(
+    session: AsyncSession,
+    reception_input: ReceptionInputSchema,
+    user_id: str,
+    warehouse_id: Optional[str] = None,
+) -> JobOutputSchema:
+    payload = {
+        "reception_input": json.loads(reception_input.json(exclude_unset=True)),
+        "user_id": user_id,
+        "warehouse_id": warehouse_id,
+    }
+    return await enqueue_job(session, RECEPTION_JOB, payload, user_id)
+
+
+@register_job_handler(RECEPTION_JOB)
+async def run_reception_job(
+    session: AsyncSession, payload: dict[str, Any], progress: JobProgress
+) -> dict[str, Any]:
+    # a job reclaimed after its lease ran out may have committed the reception
+    # in the lost attempt already
+    if reception_id := await session.scalar(
+        select(Reception.id).filter(Reception.job_id == progress.job_id)
+    ):
+        return {"reception_id": reception_id}
+
+    reception_input = ReceptionInputSchema(**payload["reception_input"])
+    await progress.update(0, len(reception_input.products_data))
+    reception = await create_reception(
+        session,
+        reception_input,
+        payload["user_id"],
+        payload.get("warehouse_id"),
+        job_id=progress.job_id,
+        progress=progress,
+    )
+    return {"reception_id": reception.id}
+
+
+def check_if_reception_in_warehouse(
+    reception: Reception, warehouse_id: Optional[str]
+) -> None:
+    # a reception belongs to the warehouse its stocks were received into
+    if warehouse_id is not None and not any(
+        stock.warehouse_id == warehouse_id for stock in reception.stocks
+    ):
+        raise ResourceInAnotherWarehouseException(resource="reception")
+
+
 async def get_single_reception(
-    session: AsyncSession, reception_id: str
+    session: AsyncSession, reception_id: str, warehouse_id: Optional[str] = None
 ) -> ReceptionOutputSchema:
     if not (
         reception_object := await if_exists(Reception, "id", reception_id, session)
     ):
         raise DoesNotExist(Reception.__name__, "id", reception_id)
 
+    check_if_reception_in_warehouse(reception_object, warehouse_id)
     return ReceptionOutputSchema.from_orm(reception_object)
 
 
 async def get_all_receptions(
-    session: AsyncSession, page_params: PageParams, query_params: list[tuple] = None
+    session: AsyncSession,
+    page_params: PageParams,
+    query_params: list[tuple] = None,
+    warehouse_id: Optional[str] = None,
 ) -> PagedResponseSchema[ReceptionBasicOutputSchema]:
     query = select(Reception)
+    if warehouse_id is not None:
+        query = query.filter(Reception.stocks.any(Stock.warehouse_id == warehouse_id))
 
     if query_params:
         query = filter_and_sort_instances(query_params, query, Reception)
@@ -138,13 +211,18 @@ async def get_all_receptions(
 
 
 async def update_single_reception(
-    session: AsyncSession, reception_input: ReceptionUpdateSchema, reception_id: str
+    session: AsyncSession,
+    reception_input: ReceptionUpdateSchema,
+    reception_id: str,
+    warehouse_id: Optional[str] = None,
 ) -> ReceptionOutputSchema:
     if not (
         reception_object := await if_exists(Reception, "id", reception_id, session)
     ):
         raise DoesNotExist(Reception.__name__, "id", reception_id)
 
+    check_if_reception_in_warehouse(reception_object, warehouse_id)
+
     reception_data = reception_input.dict(exclude_unset=True)
 
     if reception_data:
@@ -0,0 +1,34 @@
+from typing import Literal, Optional
+
+from fastapi import Depends, Query, status
+from fastapi.routing import APIRouter
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.apps.search.schemas import SearchOutputSchema
+from src.apps.search.services import search_objects
+from src.apps.users.models import User
+from src.dependencies.get_db import get_read_db
+from src.dependencies.user import authenticate_user
+from src.dependencies.warehouse import get_warehouse_scope
+
+search_router = APIRouter(prefix="/search", tags=["search"])
+
+
+@search_router.get(
+    "/",
+    response_model=SearchOutputSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def search(
+    q: str = Query(min_length=3, max_length=100),
+    object_types: Optional[
+        list[Literal["product", "reception", "issue", "rack_level_slot"]]
+    ] = Query(None, alias="type"),
+    limit: int = Query(20, ge=1, le=100),
+    session: AsyncSession = Depends(get_read_db),
+    request_user: User = Depends(authenticate_user),
+    warehouse_id: Optional[str] = Depends(get_warehouse_scope),
+) -> SearchOutputSchema:
+    return await search_objects(
+        session, request_user, q, object_types, limit, warehouse_id
+    )
@@ -0,0 +1,16 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class SearchResultSchema(BaseModel):
+    object_type: str
+    id: str
+    name: Optional[str]
+    description: Optional[str]
+    rank: float
+
+
+class SearchOutputSchema(BaseModel):
+    query: str
+    results: list[SearchResultSchema]
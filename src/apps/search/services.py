@@ -0,0 +1,111 @@
+from typing import Optional
+
+from sqlalchemy import func, literal, null, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.apps.issues.models import Issue
+from src.apps.products.models import Product
+from src.apps.rack_level_slots.models import RackLevelSlot
+from src.apps.receptions.models import Reception
+from src.apps.search.schemas import SearchOutputSchema, SearchResultSchema
+from src.apps.stocks.models import Stock
+from src.apps.users.models import User
+from src.core.exceptions import AuthorizationException
+from src.core.utils.search import contains_condition, search_condition, search_rank
+
+PRODUCT = "product"
+RECEPTION = "reception"
+ISSUE = "issue"
+RACK_LEVEL_SLOT = "rack_level_slot"
+
+# searched model, column returned as the name and the indexed text columns
+SEARCH_TARGETS = {
+    PRODUCT: (Product, Product.name, (Product.name, Product.description)),
+    RECEPTION: (Reception, None, (Reception.description,)),
+    ISSUE: (Issue, None, (Issue.description,)),
+    RACK_LEVEL_SLOT: (RackLevelSlot, None, (RackLevelSlot.description,)),
+}
+
+
+def can_search(request_user: User, object_type: str) -> bool:
+    if object_type == PRODUCT or request_user.is_staff:
+        return True
+    if object_type == RECEPTION:
+        return request_user.can_recept_stocks
+    if object_type == ISSUE:
+        return request_user.can_issue_stocks
+    return False
+
+
+def get_search_types(request_user: User, object_types: Optional[list[str]]) -> list:
+    if not object_types:
+        return [
+            object_type
+            for object_type in SEARCH_TARGETS
+            if can_search(request_user, object_type)
+        ]
+    if not all(can_search(request_user, object_type) for object_type in object_types):
+        raise AuthorizationException(
+            "You don't have permissions to search some of the requested objects!"
+        )
+    return object_types
+
+
+def build_search_query(
+    object_type: str,
+    query: str,
+    limit: int,
+    get_legacy: bool,
+    warehouse_id: Optional[str] = None,
+):
+    model, name_column, columns = SEARCH_TARGETS[object_type]
+    rank = func.greatest(*(search_rank(column, query) for column in columns))
+    statement = (
+        select(
+            literal(object_type).label("object_type"),
+            model.id,
+            (name_column if name_column is not None else null()).label("name"),
+            model.description,
+            rank.label("rank"),
+        )
+        # every condition can be answered by the trigram index of its column
+        .where(
+            or_(
+                *(search_condition(column, query) for column in columns),
+                *(contains_condition(column, query) for column in columns),
+            )
+        )
+        .order_by(rank.desc())
+        .limit(limit)
+    )
+    if model is Product and not get_legacy:
+        statement = statement.where(Product.legacy_product == False)
+    # products are shared by every warehouse
+    if warehouse_id is not None and model in (Reception, Issue):
+        statement = statement.where(
+            model.stocks.any(Stock.warehouse_id == warehouse_id)
+        )
+    if warehouse_id is not None and model is RackLevelSlot:
+        statement = statement.where(RackLevelSlot.warehouse_id == warehouse_id)
+    return statement
+
+
+async def search_objects(
+    session: AsyncSession,
+    request_user: User,
+    query: str,
+    object_types: Optional[list[str]] = None,
+    limit: int = 20,
+    warehouse_id: Optional[str] = None,
+) -> SearchOutputSchema:
+    results = []
+    for object_type in get_search_types(request_user, object_types):
+        rows = await session.execute(
+            build_search_query(
+                object_type, query, limit, request_user.is_staff, warehouse_id
+            )
+        )
+        results += [SearchResultSchema(**row._mapping) for row in rows]
+
+    results.sort(key=lambda result: result.rank, reverse=True)
+    return SearchOutputSchema(query=query, results=results[:limit])
@@ -18,6 +18,7 @@ from src.core.utils.orm import (
     default_available_section_racks,
     default_available_section_weight,
 )
+from src.core.utils.sync import change_index, change_xid_column, track_changes
 from src.core.utils.time import get_current_time
 from src.core.utils.utils import generate_uuid
 from src.database.db_connection import Base
@@ -61,4 +62,12 @@ class Section(Base):
     )
     warehouse = relationship("Warehouse", back_populates="sections", lazy="noload")
     racks = relationship("Rack", back_populates="section", lazy="selectin")
+    change_xid = change_xid_column()
     created_at = Column(DateTime, default=dt.datetime.now, nullable=True)
+    version_id = Column(Integer, nullable=False, default=1)
+
+    __table_args__ = (change_index("section"),)
+    __mapper_args__ = {"version_id_col": version_id}
+
+
+track_changes(Section.__table__)
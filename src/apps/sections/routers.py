@@ -1,4 +1,4 @@
-from typing import Union
+from typing import Optional, Union
 
 from fastapi import Depends, Request, Response, status
 from fastapi.routing import APIRouter
@@ -23,8 +23,10 @@ from src.apps.users.models import User
 from src.core.pagination.models import PageParams
 from src.core.pagination.schemas import PagedResponseSchema
 from src.core.permissions import check_if_staff
-from src.dependencies.get_db import get_db
+from src.dependencies.get_db import get_db, get_read_db
 from src.dependencies.user import authenticate_user
+from src.dependencies.versioning import get_expected_version
+from src.dependencies.warehouse import get_warehouse_scope
 
 section_router = APIRouter(prefix="/sections", tags=["section"])
 
@@ -38,9 +40,10 @@ async def post_section(
     section: SectionInputSchema,
     session: AsyncSession = Depends(get_db),
     request_user: User = Depends(authenticate_user),
+    warehouse_id: Optional[str] = Depends(get_warehouse_scope),
 ) -> SectionOutputSchema:
     await check_if_staff(request_user)
-    return await create_section(session, section)
+    return await create_section(session, section, warehouse_id)
 
 
 @section_router.get(
@@ -53,15 +56,19 @@ async def post_section(
 )
 async def get_sections(
     request: Request,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     page_params: PageParams = Depends(),
     request_user: User = Depends(authenticate_user),
+    warehouse_id: Optional[str] = Depends(get_warehouse_scope),
 ) -> Union[
     PagedResponseSchema[SectionOutputSchema],
     PagedResponseSchema[SectionBaseOutputSchema],
 ]:
     return await get_all_sections(
-        session, page_params, query_params=request.query_params.multi_items()
+        session,
+        page_params,
+        query_params=request.query_params.multi_items(),
+        warehouse_id=warehouse_id,
     )
 
 
@@ -72,7 +79,7 @@ async def get_sections(
 )
 async def get_section(
     section_id: str,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     request_user: User = Depends(authenticate_user),
 ) -> Union[SectionOutputSchema, SectionBaseOutputSchema]:
     if request_user.is_staff or request_user.can_move_stocks:
@@ -92,7 +99,7 @@ async def get_section(
 )
 async def get_section_racks(
     section_id: str,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     page_params: PageParams = Depends(),
     request_user: User = Depends(authenticate_user),
 ) -> Union[
@@ -110,7 +117,7 @@ async def get_section_racks(
 async def get_section_rack(
     section_id: str,
     rack_id: str,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     request_user: User = Depends(authenticate_user),
 ) -> Union[RackBaseOutputSchema, RackOutputSchema]:
     if request_user.is_staff or request_user.can_move_stocks:
@@ -130,9 +137,12 @@ async def update_section(
     section_input: SectionUpdateSchema,
     session: AsyncSession = Depends(get_db),
     request_user: User = Depends(authenticate_user),
+    expected_version: Optional[int] = Depends(get_expected_version),
 ) -> SectionOutputSchema:
     await check_if_staff(request_user)
-    return await update_single_section(session, section_input, section_id)
+    return await update_single_section(
+        session, section_input, section_id, expected_version
+    )
 
 
 @section_router.delete(
@@ -66,6 +66,7 @@ class SectionBaseOutputSchema(SectionBaseSchema):
 
 class SectionOutputSchema(SectionBaseOutputSchema):
     racks: list[RackBaseOutputSchema]
+    version_id: int
 
     class Config:
         orm_mode = True
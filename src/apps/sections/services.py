@@ -1,5 +1,5 @@
 from decimal import Decimal
-from typing import Union
+from typing import Optional, Union
 
 from pydantic import BaseModel
 from sqlalchemy import delete, select, update
@@ -13,7 +13,7 @@ from src.apps.sections.schemas import (
     SectionUpdateSchema,
 )
 from src.apps.warehouse.models import Warehouse
-from src.apps.warehouse.services import get_all_warehouses, manage_warehouse_state
+from src.apps.warehouse.services import get_target_warehouse, manage_warehouse_state
 from src.core.exceptions import (
     AlreadyExists,
     DoesNotExist,
@@ -24,27 +24,23 @@ from src.core.exceptions import (
     TooLittleRackLevelsAmountException,
     TooLittleRacksAmountException,
     TooLittleWeightAmountException,
-    WarehouseAlreadyExistsException,
-    WarehouseDoesNotExistException,
     WeightLimitExceededException,
 )
 from src.core.pagination.models import PageParams
 from src.core.pagination.schemas import PagedResponseSchema
 from src.core.pagination.services import paginate
 from src.core.utils.filter import filter_and_sort_instances
-from src.core.utils.orm import if_exists
+from src.core.utils.orm import check_object_version, if_exists, update_versioned_object
 
 
 async def create_section(
-    session: AsyncSession, section_input: SectionInputSchema
+    session: AsyncSession,
+    section_input: SectionInputSchema,
+    warehouse_id: Optional[str] = None,
 ) -> SectionOutputSchema:
     section_data = section_input.dict()
 
-    warehouses = await get_all_warehouses(session, PageParams())
-    if not warehouses.total:
-        raise WarehouseDoesNotExistException
-
-    warehouse = await if_exists(Warehouse, "id", warehouses.results[0].id, session)
+    warehouse = await get_target_warehouse(session, warehouse_id)
     if not warehouse.available_sections:
         raise NotEnoughWarehouseResourcesException(resource="sections")
 
@@ -78,11 +74,14 @@ async def get_all_sections(
     page_params: PageParams,
     output_schema: BaseModel = SectionBaseOutputSchema,
     query_params: list[tuple] = None,
+    warehouse_id: Optional[str] = None,
 ) -> Union[
     PagedResponseSchema[SectionOutputSchema],
     PagedResponseSchema[SectionBaseOutputSchema],
 ]:
     query = select(Section)
+    if warehouse_id is not None:
+        query = query.filter(Section.warehouse_id == warehouse_id)
 
     if query_params:
         query = filter_and_sort_instances(query_params, query, Section)
@@ -146,10 +145,14 @@ async def manage_section_state(
 
 
 async def update_single_section(
-    session: AsyncSession, section_input: SectionUpdateSchema, section_id: str
+    session: AsyncSession,
+    section_input: SectionUpdateSchema,
+    section_id: str,
+    expected_version: Optional[int] = None,
 ) -> SectionOutputSchema:
     if not (section_object := await if_exists(Section, "id", section_id, session)):
         raise DoesNotExist(Section.__name__, "id", section_id)
+    check_object_version(section_object, expected_version)
 
     section_data = section_input.dict(exclude_unset=True, exclude_none=True)
 
@@ -177,13 +180,9 @@ async def update_single_section(
         section_object = await manage_section_state(section_object, new_max_racks)
 
     session.add(section_object)
+    await update_versioned_object(session, section_object, section_data)
 
     if section_data:
-        statement = (
-            update(Section).filter(Section.id == section_id).values(**section_data)
-        )
-
-        await session.execute(statement)
         await session.commit()
         await session.refresh(section_object)
 
@@ -6,6 +6,7 @@ from sqlalchemy import (
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     Table,
@@ -15,6 +16,8 @@ from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from sqlalchemy.sql.sqltypes import DateTime
 
+from src.core.utils.partitioning import partition_by_warehouse
+from src.core.utils.sync import change_index, change_xid_column, track_changes
 from src.core.utils.time import get_current_time
 from src.core.utils.utils import generate_uuid
 from src.database.db_connection import Base
@@ -22,8 +25,13 @@ from src.database.db_connection import Base
 
 class UserStock(Base):
     __tablename__ = "user_stock"
-    id = Column(
-        String, primary_key=True, unique=True, nullable=False, default=generate_uuid
+    id = Column(String, primary_key=True, nullable=False, default=generate_uuid)
+    # part of the primary key, the history is partitioned by warehouse
+    warehouse_id = Column(
+        String,
+        ForeignKey("warehouse.id", ondelete="CASCADE"),
+        primary_key=True,
+        nullable=False,
     )
     user_id = Column(String, ForeignKey("user.id", ondelete="SET NULL"), nullable=False)
     user = relationship(
@@ -43,7 +51,9 @@ class UserStock(Base):
         lazy="selectin",
     )
 
-    moved_at = Column(DateTime, default=dt.datetime.now, onupdate=dt.datetime.now)
+    moved_at = Column(
+        DateTime, default=dt.datetime.now, onupdate=dt.datetime.now, index=True
+    )
 
     from_waiting_room_id = Column(
         String, ForeignKey("waiting_room.id", ondelete="SET NULL"), nullable=True
@@ -83,6 +93,11 @@ class UserStock(Base):
         "RackLevelSlot", foreign_keys=[from_rack_level_slot_id], lazy="selectin"
     )
 
+    __table_args__ = ({"postgresql_partition_by": "LIST (warehouse_id)"},)
+
+
+partition_by_warehouse(UserStock.__table__)
+
 
 class Stock(Base):
     __tablename__ = "stock"
@@ -131,4 +146,18 @@ class Stock(Base):
         ForeignKey("rack_level_slot.id", ondelete="SET NULL", onupdate="cascade"),
         nullable=True,
     )
+    warehouse_id = Column(
+        String,
+        ForeignKey("warehouse.id", ondelete="CASCADE", onupdate="cascade"),
+        nullable=False,
+    )
+    change_xid = change_xid_column()
     created_at = Column(DateTime, default=dt.datetime.now, nullable=True)
+
+    __table_args__ = (
+        change_index("stock"),
+        Index("ix_stock_warehouse_id_is_issued", "warehouse_id", "is_issued"),
+    )
+
+
+track_changes(Stock.__table__)
@@ -1,4 +1,4 @@
-from typing import Union
+from typing import Optional, Union
 
 from fastapi import Depends, Request, Response, status
 from fastapi.routing import APIRouter
@@ -7,9 +7,15 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from src.apps.stocks.models import Stock
 from src.apps.stocks.schemas.stock_schemas import (
     StockBasicOutputSchema,
+    StockBatchMoveInputSchema,
+    StockBatchMoveOutputSchema,
+    StockDrainInputSchema,
+    StockDrainOutputSchema,
     StockOutputSchema,
 )
 from src.apps.stocks.schemas.user_stock_schemas import UserStockOutputSchema
+from src.apps.stocks.services.stock_drain_services import drain_waiting_rooms
+from src.apps.stocks.services.stock_move_services import move_multiple_stocks
 from src.apps.stocks.services.stock_services import (
     get_all_available_stocks,
     get_every_stock,
@@ -22,8 +28,9 @@ from src.apps.users.models import User
 from src.core.pagination.models import PageParams
 from src.core.pagination.schemas import PagedResponseSchema
 from src.core.permissions import check_if_staff, check_if_staff_or_has_permission
-from src.dependencies.get_db import get_db
+from src.dependencies.get_db import get_db, get_read_db
 from src.dependencies.user import authenticate_user
+from src.dependencies.warehouse import get_warehouse_scope
 
 stock_router = APIRouter(prefix="/stocks", tags=["stock"])
 
@@ -35,12 +42,16 @@ stock_router = APIRouter(prefix="/stocks", tags=["stock"])
 )
 async def get_available_stocks(
     request: Request,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     request_user: User = Depends(authenticate_user),
     page_params: PageParams = Depends(),
+    warehouse_id: Optional[str] = Depends(get_warehouse_scope),
 ) -> PagedResponseSchema[StockBasicOutputSchema]:
     return await get_all_available_stocks(
-        session, page_params, query_params=request.query_params.multi_items()
+        session,
+        page_params,
+        query_params=request.query_params.multi_items(),
+        warehouse_id=warehouse_id,
     )
 
 
@@ -51,13 +62,17 @@ async def get_available_stocks(
 )
 async def get_all_stocks(
     request: Request,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     request_user: User = Depends(authenticate_user),
     page_params: PageParams = Depends(),
+    warehouse_id: Optional[str] = Depends(get_warehouse_scope),
 ) -> PagedResponseSchema[StockOutputSchema]:
     await check_if_staff(request_user)
     return await get_every_stock(
-        session, page_params, query_params=request.query_params.multi_items()
+        session,
+        page_params,
+        query_params=request.query_params.multi_items(),
+        warehouse_id=warehouse_id,
     )
 
 
@@ -68,11 +83,14 @@ async def get_all_stocks(
 )
 async def get_stock_as_staff(
     stock_id: str,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     request_user: User = Depends(authenticate_user),
+    warehouse_id: Optional[str] = Depends(get_warehouse_scope),
 ) -> StockOutputSchema:
     await check_if_staff(request_user)
-    return await get_single_stock(session, stock_id, can_get_issued=True)
+    return await get_single_stock(
+        session, stock_id, can_get_issued=True, warehouse_id=warehouse_id
+    )
 
 
 @stock_router.get(
@@ -83,7 +101,7 @@ async def get_stock_as_staff(
 async def get_stock_history(
     request: Request,
     stock_id: str,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     page_params: PageParams = Depends(),
     request_user: User = Depends(authenticate_user),
 ) -> PagedResponseSchema[UserStockOutputSchema]:
@@ -93,6 +111,40 @@ async def get_stock_history(
     )
 
 
+@stock_router.patch(
+    "/move",
+    response_model=StockBatchMoveOutputSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def move_stocks(
+    batch_move_input: StockBatchMoveInputSchema,
+    session: AsyncSession = Depends(get_db),
+    request_user: User = Depends(authenticate_user),
+    warehouse_id: Optional[str] = Depends(get_warehouse_scope),
+) -> StockBatchMoveOutputSchema:
+    await check_if_staff_or_has_permission(request_user, "can_move_stocks")
+    return await move_multiple_stocks(
+        session, batch_move_input, request_user.id, warehouse_id
+    )
+
+
+@stock_router.post(
+    "/drain",
+    response_model=StockDrainOutputSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def drain_stocks_from_waiting_rooms(
+    drain_input: StockDrainInputSchema,
+    session: AsyncSession = Depends(get_db),
+    request_user: User = Depends(authenticate_user),
+    warehouse_id: Optional[str] = Depends(get_warehouse_scope),
+) -> StockDrainOutputSchema:
+    await check_if_staff_or_has_permission(request_user, "can_move_stocks")
+    return await drain_waiting_rooms(
+        session, drain_input, request_user.id, warehouse_id
+    )
+
+
 @stock_router.get(
     "/{stock_id}",
     response_model=Union[StockOutputSchema, StockBasicOutputSchema],
@@ -100,9 +152,13 @@ async def get_stock_history(
 )
 async def get_stock(
     stock_id: str,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     request_user: User = Depends(authenticate_user),
+    warehouse_id: Optional[str] = Depends(get_warehouse_scope),
 ) -> Union[StockOutputSchema, StockBasicOutputSchema]:
     return await get_single_stock(
-        session, stock_id, output_schema=StockBasicOutputSchema
+        session,
+        stock_id,
+        output_schema=StockBasicOutputSchema,
+        warehouse_id=warehouse_id,
     )
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from fastapi import Depends, Request, Response, status
 from fastapi.routing import APIRouter
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -15,8 +17,9 @@ from src.apps.users.models import User
 from src.core.pagination.models import PageParams
 from src.core.pagination.schemas import PagedResponseSchema
 from src.core.permissions import check_if_staff, check_if_staff_or_has_permission
-from src.dependencies.get_db import get_db
+from src.dependencies.get_db import get_read_db
 from src.dependencies.user import authenticate_user
+from src.dependencies.warehouse import get_warehouse_scope
 
 user_stock_router = APIRouter(prefix="/user-stocks", tags=["user-stock"])
 
@@ -28,13 +31,17 @@ user_stock_router = APIRouter(prefix="/user-stocks", tags=["user-stock"])
 )
 async def get_user_stocks(
     request: Request,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     request_user: User = Depends(authenticate_user),
     page_params: PageParams = Depends(),
+    warehouse_id: Optional[str] = Depends(get_warehouse_scope),
 ) -> PagedResponseSchema[UserStockOutputSchema]:
     await check_if_staff_or_has_permission(request_user, "can_move_stocks")
     return await get_all_user_stocks(
-        session, page_params, query_params=request.query_params.multi_items()
+        session,
+        page_params,
+        query_params=request.query_params.multi_items(),
+        warehouse_id=warehouse_id,
     )
 
 
@@ -45,8 +52,8 @@ async def get_user_stocks(
 )
 async def get_user_stock(
     user_stock_id: str,
-    session: AsyncSession = Depends(get_db),
-    request_user: User = Depends(authenticate_user)
+    session: AsyncSession = Depends(get_read_db),
+    request_user: User = Depends(authenticate_user),
 ) -> UserStockOutputSchema:
     await check_if_staff_or_has_permission(request_user, "can_move_stocks")
     return await get_single_user_stock(session, user_stock_id)
@@ -89,6 +89,7 @@ class StockBasicOutputSchema(StockWithoutWaitingRoomOutputSchema):
 class StockOutputSchema(StockBasicOutputSchema):
     is_issued: bool
     updated_at: Optional[datetime]
+    warehouse_id: Optional[str]
     reception: Optional[ReceptionBasicOutputSchema]
     issue: Optional[IssueBasicOutputSchema]
 
@@ -115,3 +116,49 @@ class StockRackLevelSlotInputSchema(StockWaitingRoomInputSchema):
 
     class Config:
         orm_mode = True
+
+
+class StockMoveInputSchema(BaseModel):
+    stock_id: str
+    waiting_room_id: Optional[str]
+    rack_level_id: Optional[str]
+    rack_level_slot_id: Optional[str]
+
+
+class StockBatchMoveInputSchema(BaseModel):
+    moves: list[StockMoveInputSchema] = Field(min_items=1, max_items=1000)
+
+
+class StockMoveResultSchema(BaseModel):
+    stock_id: str
+    moved: bool
+    waiting_room_id: Optional[str]
+    rack_level_slot_id: Optional[str]
+    detail: Optional[str]
+
+
+class StockBatchMoveOutputSchema(BaseModel):
+    moved: int
+    failed: int
+    results: list[StockMoveResultSchema]
+
+
+class StockDrainInputSchema(BaseModel):
+    waiting_room_ids: list[str] = Field(min_items=1)
+    rack_level_ids: Optional[list[str]]
+    execute: bool = False
+
+
+class StockDrainAssignmentSchema(BaseModel):
+    stock_id: str
+    weight: Decimal
+    waiting_room_id: str
+    rack_level_id: str
+    rack_level_slot_id: str
+
+
+class StockDrainOutputSchema(BaseModel):
+    assignments: list[StockDrainAssignmentSchema]
+    unassigned_stock_ids: list[str]
+    executed: bool
+    move_results: Optional[StockBatchMoveOutputSchema]
@@ -5,10 +5,10 @@ from pydantic import BaseModel
 
 from src.apps.issues.schemas import IssueBasicOutputSchema
 from src.apps.rack_level_slots.schemas import RackLevelSlotBaseOutputSchema
+from src.apps.receptions.schemas import ReceptionBasicOutputSchema
 from src.apps.stocks.schemas.stock_schemas import StockBasicOutputSchema
 from src.apps.users.schemas import UserInfoOutputSchema
 from src.apps.waiting_rooms.schemas import WaitingRoomBasicOutputSchema
-from src.apps.receptions.schemas import ReceptionBasicOutputSchema
 
 
 class UserStockInputSchema(BaseModel):
@@ -33,6 +33,7 @@ class UserStockOutputSchema(BaseModel):
     issue: Optional[IssueBasicOutputSchema]
     reception: Optional[ReceptionBasicOutputSchema]
     moved_at: date
+    warehouse_id: str
 
     class Config:
         orm_mode = True
@@ -0,0 +1,202 @@
+from collections import defaultdict
+from typing import Any, Optional
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.apps.rack_level_slots.models import RackLevelSlot
+from src.apps.rack_levels.models import RackLevel
+from src.apps.racks.models import Rack
+from src.apps.sections.models import Section
+from src.apps.stocks.models import Stock
+from src.apps.stocks.schemas.stock_schemas import (
+    StockDrainAssignmentSchema,
+    StockDrainInputSchema,
+    StockDrainOutputSchema,
+    StockMoveInputSchema,
+)
+from src.apps.stocks.services.stock_move_services import execute_stock_moves
+from src.apps.waiting_rooms.models import WaitingRoom
+from src.core.exceptions import DoesNotExist, ResourceInAnotherWarehouseException
+from src.core.utils.locking import retry_on_lock_conflict
+
+
+def pack_stocks_into_rack_levels(
+    stocks: list[Any], rack_levels: list[Any], rack_level_slots: list[Any]
+) -> tuple[list[StockDrainAssignmentSchema], list[str]]:
+    free_slots = defaultdict(list)
+    for rack_level_slot in rack_level_slots:
+        free_slots[rack_level_slot.rack_level_id].append(rack_level_slot.id)
+
+    rack_level_ids = [rack_level.id for rack_level in rack_levels]
+    capacity = np.array(
+        [rack_level.available_weight for rack_level in rack_levels], dtype=np.float64
+    )
+    slots_left = np.array(
+        [
+            min(rack_level.available_slots, len(free_slots[rack_level.id]))
+            for rack_level in rack_levels
+        ],
+        dtype=np.int64,
+    )
+    capacity[slots_left <= 0] = -np.inf
+    next_slot = np.zeros(len(rack_levels), dtype=np.int64)
+
+    assignments, unassigned_stock_ids = [], []
+    # first fit decreasing: heaviest stocks go first into the first rack level
+    # (in rack and level order) that still has a free slot and enough weight
+    for stock in sorted(stocks, key=lambda stock: stock.weight, reverse=True):
+        fits = capacity >= float(stock.weight)
+        index = int(np.argmax(fits)) if len(fits) else 0
+        if not len(fits) or not fits[index]:
+            unassigned_stock_ids.append(stock.id)
+            continue
+
+        rack_level_id = rack_level_ids[index]
+        assignments.append(
+            StockDrainAssignmentSchema(
+                stock_id=stock.id,
+                weight=stock.weight,
+                waiting_room_id=stock.waiting_room_id,
+                rack_level_id=rack_level_id,
+                rack_level_slot_id=free_slots[rack_level_id][next_slot[index]],
+            )
+        )
+        next_slot[index] += 1
+        slots_left[index] -= 1
+        capacity[index] -= float(stock.weight)
+        if not slots_left[index]:
+            capacity[index] = -np.inf
+    return assignments, unassigned_stock_ids
+
+
+def group_by_warehouse(rows: list[Any]) -> defaultdict[str, list[Any]]:
+    grouped_rows = defaultdict(list)
+    for row in rows:
+        grouped_rows[row.warehouse_id].append(row)
+    return grouped_rows
+
+
+async def check_if_all_exist(
+    session: AsyncSession, model: Any, object_ids: Optional[list[str]]
+) -> None:
+    if not object_ids:
+        return
+    existing_ids = await session.scalars(
+        select(model.id).where(model.id.in_(object_ids))
+    )
+    existing_ids = set(existing_ids.all())
+    for object_id in object_ids:
+        if object_id not in existing_ids:
+            raise DoesNotExist(model.__name__, "id", object_id)
+
+
+async def plan_waiting_room_drain(
+    session: AsyncSession,
+    drain_input: StockDrainInputSchema,
+    warehouse_id: Optional[str] = None,
+) -> tuple[list[StockDrainAssignmentSchema], list[str]]:
+    await check_if_all_exist(session, WaitingRoom, drain_input.waiting_room_ids)
+    await check_if_all_exist(session, RackLevel, drain_input.rack_level_ids)
+    # stocks never leave their warehouse, so rack levels of other warehouses
+    # are skipped by the packing below
+    if warehouse_id is not None and await session.scalar(
+        select(WaitingRoom.id)
+        .where(
+            WaitingRoom.id.in_(drain_input.waiting_room_ids),
+            WaitingRoom.warehouse_id != warehouse_id,
+        )
+        .limit(1)
+    ):
+        raise ResourceInAnotherWarehouseException(resource="waiting room")
+
+    stocks = await session.execute(
+        select(Stock.id, Stock.weight, Stock.waiting_room_id, Stock.warehouse_id)
+        .where(
+            Stock.waiting_room_id.in_(drain_input.waiting_room_ids),
+            Stock.is_issued == False,
+        )
+        .order_by(Stock.id)
+    )
+
+    rack_levels_query = (
+        select(
+            RackLevel.id,
+            RackLevel.available_weight,
+            RackLevel.available_slots,
+            Section.warehouse_id,
+        )
+        .join(Rack, Rack.id == RackLevel.rack_id)
+        .join(Section, Section.id == Rack.section_id)
+        .where(RackLevel.available_slots > 0, RackLevel.available_weight > 0)
+        .order_by(RackLevel.rack_id, RackLevel.rack_level_number)
+    )
+    rack_level_slots_query = (
+        select(
+            RackLevelSlot.id, RackLevelSlot.rack_level_id, RackLevelSlot.warehouse_id
+        )
+        .outerjoin(Stock, Stock.rack_level_slot_id == RackLevelSlot.id)
+        .where(RackLevelSlot.is_active == True, Stock.id == None)
+        .order_by(RackLevelSlot.rack_level_id, RackLevelSlot.rack_level_slot_number)
+    )
+    if drain_input.rack_level_ids:
+        rack_levels_query = rack_levels_query.where(
+            RackLevel.id.in_(drain_input.rack_level_ids)
+        )
+        rack_level_slots_query = rack_level_slots_query.where(
+            RackLevelSlot.rack_level_id.in_(drain_input.rack_level_ids)
+        )
+    rack_levels = await session.execute(rack_levels_query)
+    rack_level_slots = await session.execute(rack_level_slots_query)
+
+    # stocks are only packed into rack levels of their own warehouse
+    rack_levels = group_by_warehouse(rack_levels.all())
+    rack_level_slots = group_by_warehouse(rack_level_slots.all())
+    assignments, unassigned_stock_ids = [], []
+    for warehouse_id, warehouse_stocks in group_by_warehouse(stocks.all()).items():
+        warehouse_assignments, warehouse_unassigned_ids = pack_stocks_into_rack_levels(
+            warehouse_stocks,
+            rack_levels[warehouse_id],
+            rack_level_slots[warehouse_id],
+        )
+        assignments.extend(warehouse_assignments)
+        unassigned_stock_ids.extend(warehouse_unassigned_ids)
+    return assignments, unassigned_stock_ids
+
+
+@retry_on_lock_conflict()
+async def drain_waiting_rooms(
+    session: AsyncSession,
+    drain_input: StockDrainInputSchema,
+    user_id: str,
+    warehouse_id: Optional[str] = None,
+) -> StockDrainOutputSchema:
+    assignments, unassigned_stock_ids = await plan_waiting_room_drain(
+        session, drain_input, warehouse_id
+    )
+    if not (drain_input.execute and assignments):
+        return StockDrainOutputSchema(
+            assignments=assignments,
+            unassigned_stock_ids=unassigned_stock_ids,
+            executed=False,
+        )
+
+    move_results = await execute_stock_moves(
+        session,
+        [
+            StockMoveInputSchema(
+                stock_id=assignment.stock_id,
+                rack_level_slot_id=assignment.rack_level_slot_id,
+            )
+            for assignment in assignments
+        ],
+        user_id,
+        warehouse_id,
+    )
+    return StockDrainOutputSchema(
+        assignments=assignments,
+        unassigned_stock_ids=unassigned_stock_ids,
+        executed=True,
+        move_results=move_results,
+    )
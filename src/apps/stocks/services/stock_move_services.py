@@ -0,0 +1,433 @@
+from typing import Optional
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.apps.inventory.services import InventoryChanges, Location
+from src.apps.rack_level_slots.models import RackLevelSlot
+from src.apps.rack_level_slots.services import manage_old_rack_level_slot_state
+from src.apps.rack_levels.models import RackLevel
+from src.apps.stocks.models import Stock, UserStock
+from src.apps.stocks.schemas.stock_schemas import (
+    StockBatchMoveInputSchema,
+    StockBatchMoveOutputSchema,
+    StockMoveInputSchema,
+    StockMoveResultSchema,
+)
+from src.apps.stocks.services.stock_services import (
+    manage_resources_state_when_managing_stocks,
+)
+from src.apps.waiting_rooms.models import WaitingRoom
+from src.apps.waiting_rooms.services import (
+    manage_old_waiting_room_state,
+    manage_waiting_room_state,
+)
+from src.core.exceptions import (
+    AmbiguousStockMoveTargetException,
+    CannotMoveIssuedStockException,
+    DoesNotExist,
+    NoAvailableRackLevelSlotException,
+    NoAvailableSlotsInRackLevelException,
+    NoAvailableSlotsInWaitingRoomException,
+    NoAvailableWeightInRackLevelException,
+    NoAvailableWeightInWaitingRoomException,
+    ResourceInAnotherWarehouseException,
+    ServiceException,
+    StockAlreadyInRackLevelException,
+    StockAlreadyInWaitingRoomException,
+)
+from src.core.invalidation.bus import invalidation_bus
+from src.core.invalidation.events import RACK_LEVEL_CAPACITY_CHANGED
+from src.core.utils.locking import LockSet, lock_stock_movement, retry_on_lock_conflict
+
+
+class StockMovePlanner:
+    def __init__(
+        self,
+        session: AsyncSession,
+        moves: list[StockMoveInputSchema],
+        user_id: str,
+        warehouse_id: Optional[str] = None,
+    ) -> None:
+        self.session = session
+        self.moves = moves
+        self.user_id = user_id
+        self.warehouse_id = warehouse_id
+        self.stocks: dict[str, Stock] = {}
+        self.waiting_rooms: dict[str, WaitingRoom] = {}
+        self.rack_levels: dict[str, RackLevel] = {}
+        self.rack_level_slots: dict[str, RackLevelSlot] = {}
+        self.slot_occupancy: dict[str, str] = {}
+        self.results: dict[int, StockMoveResultSchema] = {}
+        self.history_rows: list[dict] = []
+        self.inventory_changes = InventoryChanges()
+
+    async def load_snapshot(self) -> None:
+        stock_ids = {move.stock_id for move in self.moves}
+        stocks = await self.session.scalars(
+            select(Stock).where(Stock.id.in_(stock_ids))
+        )
+        self.stocks = {stock.id: stock for stock in stocks.unique().all()}
+
+        waiting_room_ids = {
+            move.waiting_room_id for move in self.moves if move.waiting_room_id
+        } | {stock.waiting_room_id for stock in self.stocks.values()}
+        waiting_room_ids.discard(None)
+        if waiting_room_ids:
+            waiting_rooms = await self.session.scalars(
+                select(WaitingRoom).where(WaitingRoom.id.in_(waiting_room_ids))
+            )
+            self.waiting_rooms = {
+                waiting_room.id: waiting_room
+                for waiting_room in waiting_rooms.unique().all()
+            }
+
+        rack_level_slot_ids = {
+            move.rack_level_slot_id for move in self.moves if move.rack_level_slot_id
+        } | {stock.rack_level_slot_id for stock in self.stocks.values()}
+        rack_level_slot_ids.discard(None)
+        rack_level_ids = {
+            move.rack_level_id for move in self.moves if move.rack_level_id
+        }
+        if rack_level_slot_ids:
+            rack_level_slots = await self.session.scalars(
+                select(RackLevelSlot).where(RackLevelSlot.id.in_(rack_level_slot_ids))
+            )
+            for rack_level_slot in rack_level_slots.unique().all():
+                self.rack_level_slots[rack_level_slot.id] = rack_level_slot
+                rack_level_ids.add(rack_level_slot.rack_level_id)
+
+        if rack_level_ids:
+            rack_levels = await self.session.scalars(
+                select(RackLevel).where(RackLevel.id.in_(rack_level_ids))
+            )
+            for rack_level in rack_levels.unique().all():
+                self.rack_levels[rack_level.id] = rack_level
+                for rack_level_slot in rack_level.rack_level_slots:
+                    self.rack_level_slots[rack_level_slot.id] = rack_level_slot
+
+        await self.lock_snapshot()
+
+        for rack_level_slot in self.rack_level_slots.values():
+            if rack_level_slot.stock:
+                self.slot_occupancy[rack_level_slot.id] = rack_level_slot.stock.id
+        for stock in self.stocks.values():
+            if stock.rack_level_slot_id:
+                self.slot_occupancy[stock.rack_level_slot_id] = stock.id
+
+    async def lock_snapshot(self) -> None:
+        targets = LockSet()
+        for waiting_room_id in self.waiting_rooms:
+            targets.add(WaitingRoom, waiting_room_id)
+        for rack_level in self.rack_levels.values():
+            targets.add_rack_level(rack_level)
+        for rack_level_slot in self.rack_level_slots.values():
+            targets.add_rack_level_slot(rack_level_slot)
+        await lock_stock_movement(self.session, list(self.stocks.values()), targets)
+
+        # stocks relocated before they were locked bring their new source rows
+        for stock in self.stocks.values():
+            if stock.waiting_room:
+                self.waiting_rooms.setdefault(stock.waiting_room_id, stock.waiting_room)
+            if rack_level_slot := stock.rack_level_slot:
+                self.rack_level_slots.setdefault(rack_level_slot.id, rack_level_slot)
+                self.rack_levels.setdefault(
+                    rack_level_slot.rack_level_id, rack_level_slot.rack_level
+                )
+
+    def validate_move(self, move: StockMoveInputSchema, requested_stocks: set) -> None:
+        targets = [move.waiting_room_id, move.rack_level_id, move.rack_level_slot_id]
+        if targets.count(None) != 2:
+            raise AmbiguousStockMoveTargetException
+
+        if not (stock_object := self.stocks.get(move.stock_id)):
+            raise DoesNotExist(Stock.__name__, "id", move.stock_id)
+
+        if move.stock_id in requested_stocks:
+            raise ServiceException(
+                "The stock was requested to be moved more than once! "
+            )
+
+        # targets are checked against the stock's warehouse further on
+        if self.warehouse_id not in (None, stock_object.warehouse_id):
+            raise ResourceInAnotherWarehouseException(resource="stock")
+
+        if stock_object.is_issued:
+            raise CannotMoveIssuedStockException
+
+        if move.waiting_room_id is not None:
+            if move.waiting_room_id not in self.waiting_rooms:
+                raise DoesNotExist(WaitingRoom.__name__, "id", move.waiting_room_id)
+            if stock_object.waiting_room_id == move.waiting_room_id:
+                raise StockAlreadyInWaitingRoomException
+            if (
+                self.waiting_rooms[move.waiting_room_id].warehouse_id
+                != stock_object.warehouse_id
+            ):
+                raise ResourceInAnotherWarehouseException(resource="waiting room")
+
+        if move.rack_level_id is not None:
+            if move.rack_level_id not in self.rack_levels:
+                raise DoesNotExist(RackLevel.__name__, "id", move.rack_level_id)
+            if stock_object.rack_level_slot_id and (
+                self.rack_level_slots[stock_object.rack_level_slot_id].rack_level_id
+                == move.rack_level_id
+            ):
+                raise StockAlreadyInRackLevelException
+
+        if move.rack_level_slot_id is not None:
+            if move.rack_level_slot_id not in self.rack_level_slots:
+                raise DoesNotExist(
+                    RackLevelSlot.__name__, "id", move.rack_level_slot_id
+                )
+            if stock_object.rack_level_slot_id == move.rack_level_slot_id:
+                raise ServiceException("The stock is already placed in this slot! ")
+
+    def resolve_target(self, move: StockMoveInputSchema, stock: Stock) -> Location:
+        if move.waiting_room_id is not None:
+            waiting_room_object = self.waiting_rooms[move.waiting_room_id]
+            if not waiting_room_object.available_slots:
+                raise NoAvailableSlotsInWaitingRoomException
+            if waiting_room_object.available_stock_weight < stock.weight:
+                raise NoAvailableWeightInWaitingRoomException
+            return waiting_room_object.id, None
+
+        if move.rack_level_id is not None:
+            rack_level_object = self.rack_levels[move.rack_level_id]
+            rack_level_slot_object = next(
+                (
+                    rack_level_slot
+                    for rack_level_slot in sorted(
+                        rack_level_object.rack_level_slots,
+                        key=lambda slot: slot.rack_level_slot_number,
+                    )
+                    if rack_level_slot.is_active
+                    and rack_level_slot.id not in self.slot_occupancy
+                ),
+                None,
+            )
+        else:
+            rack_level_slot_object = self.rack_level_slots[move.rack_level_slot_id]
+            if rack_level_slot_object.id in self.slot_occupancy:
+                raise ServiceException("The slot is occupied! ")
+            if not rack_level_slot_object.is_active:
+                raise ServiceException("Requested rack level slot is inactive! ")
+            rack_level_object = self.rack_levels[rack_level_slot_object.rack_level_id]
+
+        if not rack_level_object.available_slots:
+            raise NoAvailableSlotsInRackLevelException
+        if rack_level_object.available_weight < stock.weight:
+            raise NoAvailableWeightInRackLevelException
+        if rack_level_slot_object is None:
+            raise NoAvailableRackLevelSlotException(
+                stock.product.name, stock.product_count, stock.weight
+            )
+        if rack_level_slot_object.warehouse_id != stock.warehouse_id:
+            raise ResourceInAnotherWarehouseException(resource="rack level slot")
+        return None, rack_level_slot_object.id
+
+    async def release(self, stock: Stock) -> Location:
+        location = (stock.waiting_room_id, stock.rack_level_slot_id)
+        if stock.waiting_room_id:
+            await manage_old_waiting_room_state(
+                self.session,
+                stock,
+                self.waiting_rooms[stock.waiting_room_id],
+                old_waiting_room_id=None,
+            )
+        if stock.rack_level_slot_id:
+            self.slot_occupancy.pop(stock.rack_level_slot_id, None)
+            await manage_old_rack_level_slot_state(
+                self.session,
+                stock,
+                self.rack_level_slots[stock.rack_level_slot_id],
+                old_rack_level_slot_id=None,
+            )
+        return location
+
+    async def occupy(self, stock: Stock, location: Location) -> None:
+        waiting_room_id, rack_level_slot_id = location
+        if waiting_room_id:
+            waiting_room_object = await manage_waiting_room_state(
+                self.waiting_rooms[waiting_room_id],
+                stocks_involved=True,
+                stock_weight=stock.weight,
+            )
+            self.session.add(waiting_room_object)
+            stock.waiting_room_id = waiting_room_id
+        if rack_level_slot_id:
+            await manage_resources_state_when_managing_stocks(
+                self.session,
+                self.rack_level_slots[rack_level_slot_id],
+                stock.weight,
+                adding_resources=False,
+            )
+            stock.rack_level_slot_id = rack_level_slot_id
+            self.slot_occupancy[rack_level_slot_id] = stock.id
+        self.session.add(stock)
+
+    def record_move(
+        self, index: int, stock: Stock, source: Location, target: Location
+    ) -> None:
+        self.history_rows.append(
+            {
+                "user_id": self.user_id,
+                "stock_id": stock.id,
+                "warehouse_id": stock.warehouse_id,
+                "from_waiting_room_id": source[0],
+                "from_rack_level_slot_id": source[1],
+                "to_waiting_room_id": target[0],
+                "to_rack_level_slot_id": target[1],
+            }
+        )
+        self.inventory_changes.move(
+            stock.product_id, stock.product_count, source, target
+        )
+        self.results[index] = StockMoveResultSchema(
+            stock_id=stock.id,
+            moved=True,
+            waiting_room_id=target[0],
+            rack_level_slot_id=target[1],
+        )
+
+    def record_failure(self, index: int, exception: ServiceException) -> None:
+        self.results[index] = StockMoveResultSchema(
+            stock_id=self.moves[index].stock_id, moved=False, detail=str(exception)
+        )
+
+    async def try_move(self, index: int) -> None:
+        move = self.moves[index]
+        stock = self.stocks[move.stock_id]
+        source = await self.release(stock)
+        try:
+            target = self.resolve_target(move, stock)
+        except ServiceException:
+            await self.occupy(stock, source)
+            raise
+        await self.occupy(stock, target)
+        self.record_move(index, stock, source, target)
+
+    def find_cycle(self, pending: list[int]) -> list[int]:
+        pending_by_stock = {self.moves[index].stock_id: index for index in pending}
+        next_move = {}
+        for index in pending:
+            if rack_level_slot_id := self.moves[index].rack_level_slot_id:
+                occupant = self.slot_occupancy.get(rack_level_slot_id)
+                if occupant in pending_by_stock:
+                    next_move[index] = pending_by_stock[occupant]
+
+        for start in next_move:
+            path, index = [], start
+            while index in next_move and index not in path:
+                path.append(index)
+                index = next_move[index]
+            if index in path:
+                return path[path.index(index) :]
+        return []
+
+    async def move_cycle(self, cycle: list[int]) -> None:
+        stocks = [self.stocks[self.moves[index].stock_id] for index in cycle]
+        sources = [await self.release(stock) for stock in stocks]
+        placed = []
+        try:
+            for index, stock in zip(cycle, stocks):
+                target = self.resolve_target(self.moves[index], stock)
+                await self.occupy(stock, target)
+                placed.append((index, stock, target))
+        except ServiceException as exception:
+            for _, stock, _ in reversed(placed):
+                await self.release(stock)
+            for stock, source in zip(stocks, sources):
+                await self.occupy(stock, source)
+            for index in cycle:
+                self.record_failure(index, exception)
+            return
+
+        for (index, stock, target), source in zip(placed, sources):
+            self.record_move(index, stock, source, target)
+
+    async def plan(self) -> None:
+        pending, requested_stocks = [], set()
+        for index, move in enumerate(self.moves):
+            try:
+                self.validate_move(move, requested_stocks)
+            except ServiceException as exception:
+                self.record_failure(index, exception)
+                continue
+            requested_stocks.add(move.stock_id)
+            pending.append(index)
+
+        while pending:
+            errors, pending_amount = {}, len(pending)
+            for index in list(pending):
+                try:
+                    await self.try_move(index)
+                    pending.remove(index)
+                except ServiceException as exception:
+                    errors[index] = exception
+
+            if len(pending) < pending_amount:
+                continue
+
+            if cycle := self.find_cycle(pending):
+                await self.move_cycle(cycle)
+                pending = [index for index in pending if index not in cycle]
+                continue
+
+            for index in pending:
+                self.record_failure(index, errors[index])
+            break
+
+    def get_moved_rack_level_ids(self) -> set[str]:
+        return {
+            self.rack_level_slots[row[key]].rack_level_id
+            for row in self.history_rows
+            for key in ("from_rack_level_slot_id", "to_rack_level_slot_id")
+            if row[key]
+        }
+
+    async def apply(self) -> None:
+        if self.history_rows:
+            await self.session.execute(insert(UserStock), self.history_rows)
+            # waiting rooms have no event of their own, other workers pick up
+            # their capacity once the put-away snapshot expires
+            await invalidation_bus.publish(
+                self.session,
+                RACK_LEVEL_CAPACITY_CHANGED,
+                *self.get_moved_rack_level_ids(),
+            )
+        await self.inventory_changes.apply(self.session)
+        await self.session.commit()
+
+    def get_output(self) -> StockBatchMoveOutputSchema:
+        results = [self.results[index] for index in range(len(self.moves))]
+        moved = sum(1 for result in results if result.moved)
+        return StockBatchMoveOutputSchema(
+            moved=moved, failed=len(results) - moved, results=results
+        )
+
+
+async def execute_stock_moves(
+    session: AsyncSession,
+    moves: list[StockMoveInputSchema],
+    user_id: str,
+    warehouse_id: Optional[str] = None,
+) -> StockBatchMoveOutputSchema:
+    planner = StockMovePlanner(session, moves, user_id, warehouse_id)
+    await planner.load_snapshot()
+    await planner.plan()
+    await planner.apply()
+
+    return planner.get_output()
+
+
+@retry_on_lock_conflict()
+async def move_multiple_stocks(
+    session: AsyncSession,
+    batch_move_input: StockBatchMoveInputSchema,
+    user_id: str,
+    warehouse_id: Optional[str] = None,
+) -> StockBatchMoveOutputSchema:
+    return await execute_stock_moves(
+        session, batch_move_input.moves, user_id, warehouse_id
+    )
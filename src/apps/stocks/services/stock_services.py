@@ -1,10 +1,12 @@
 from decimal import Decimal
-from typing import Union
+from typing import Optional, Union
 
 from pydantic import BaseModel
 from sqlalchemy import delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.apps.inventory.services import InventoryChanges
+from src.apps.jobs.services import JobProgress
 from src.apps.products.models import Product
 from src.apps.rack_level_slots.models import RackLevelSlot
 from src.apps.rack_levels.models import RackLevel
@@ -20,6 +22,7 @@ from src.apps.stocks.schemas.stock_schemas import (
 from src.apps.stocks.services.user_stock_services import create_user_stock_object
 from src.apps.waiting_rooms.models import WaitingRoom
 from src.apps.waiting_rooms.services import manage_waiting_room_state
+from src.apps.warehouse.services import get_target_warehouse
 from src.core.exceptions import (
     AlreadyExists,
     AmbiguousStockStoragePlaceDuringReceptionException,
@@ -30,16 +33,73 @@ from src.core.exceptions import (
     NoAvailableRackLevelSlotException,
     NoAvailableWaitingRoomsException,
     NotEnoughRackLevelResourcesException,
+    ResourceInAnotherWarehouseException,
     ServiceException,
 )
+from src.core.invalidation.bus import invalidation_bus
+from src.core.invalidation.events import RACK_LEVEL_CAPACITY_CHANGED
 from src.core.pagination.models import PageParams
 from src.core.pagination.schemas import PagedResponseSchema
 from src.core.pagination.services import paginate
 from src.core.utils.filter import filter_and_sort_instances
+from src.core.utils.locking import LockSet, lock_rows, lock_stock_movement
 from src.core.utils.orm import if_exists
 from src.core.utils.time import get_current_time
 
 
+async def lock_stock_storage_places(
+    session: AsyncSession,
+    waiting_rooms_ids: list[str],
+    rack_level_slots_ids: list[str],
+    rack_level_ids: list[str],
+) -> None:
+    lock_set = LockSet()
+    for waiting_room_id in waiting_rooms_ids:
+        lock_set.add(WaitingRoom, waiting_room_id)
+
+    if requested_slot_ids := {
+        rack_level_slot_id
+        for rack_level_slot_id in rack_level_slots_ids
+        if rack_level_slot_id
+    }:
+        rack_level_slots = await session.scalars(
+            select(RackLevelSlot).where(RackLevelSlot.id.in_(requested_slot_ids))
+        )
+        for rack_level_slot in rack_level_slots.unique().all():
+            lock_set.add_rack_level_slot(rack_level_slot)
+
+    if requested_level_ids := {
+        rack_level_id for rack_level_id in rack_level_ids if rack_level_id
+    }:
+        rack_levels = await session.scalars(
+            select(RackLevel).where(RackLevel.id.in_(requested_level_ids))
+        )
+        for rack_level in rack_levels.unique().all():
+            lock_set.add_rack_level(rack_level)
+
+    await lock_rows(session, lock_set)
+
+
+async def get_location_warehouse_id(
+    session: AsyncSession,
+    waiting_room_id: str = None,
+    rack_level_slot_id: str = None,
+    warehouse_id: str = None,
+) -> str:
+    if waiting_room_id is not None:
+        return await session.scalar(
+            select(WaitingRoom.warehouse_id).filter(WaitingRoom.id == waiting_room_id)
+        )
+    if rack_level_slot_id is not None:
+        return await session.scalar(
+            select(RackLevelSlot.warehouse_id).filter(
+                RackLevelSlot.id == rack_level_slot_id
+            )
+        )
+    # a stock kept outside of any storage place belongs to the target warehouse
+    return (await get_target_warehouse(session, warehouse_id)).id
+
+
 async def create_stocks(
     session: AsyncSession,
     user_id: str,
@@ -51,22 +111,45 @@ async def create_stocks(
     reception_id: str = None,
     testing: bool = False,
     input_schemas: list[StockInputSchema] = None,
+    warehouse_id: str = None,
+    progress: Optional[JobProgress] = None,
 ) -> list[Stock]:
     stock_list = []
+    inventory_changes = InventoryChanges()
     if testing and input_schemas:
         for schema in input_schemas:
-            new_stock = Stock(**schema.dict())
+            new_stock = Stock(
+                **schema.dict(),
+                warehouse_id=await get_location_warehouse_id(
+                    session,
+                    schema.waiting_room_id,
+                    schema.rack_level_slot_id,
+                    warehouse_id,
+                ),
+            )
             session.add(new_stock)
             stock_list.append(new_stock)
+            inventory_changes.add(
+                schema.product_id,
+                schema.product_count,
+                (schema.waiting_room_id, schema.rack_level_slot_id),
+            )
+        await inventory_changes.apply(session)
         await session.commit()
         return stock_list
 
     if not (products or product_counts):
         raise MissingProductDataException
 
+    await lock_stock_storage_places(
+        session, waiting_rooms_ids, rack_level_slots_ids, rack_level_ids
+    )
+
     _rack_level_slot_id = None
     _waiting_room_id = None
     _rack_level_slot = None
+    _warehouse_id = None
+    changed_rack_level_ids = set()
 
     for (
         product,
@@ -94,6 +177,8 @@ async def create_stocks(
             WaitingRoom.available_slots >= 1,
             WaitingRoom.available_stock_weight >= stock_weight,
         )
+        if warehouse_id is not None:
+            statement = statement.filter(WaitingRoom.warehouse_id == warehouse_id)
 
         stock_input = StockInputSchema(
             weight=stock_weight,
@@ -103,6 +188,7 @@ async def create_stocks(
         )
 
         if entered_values_check == 3:
+            statement = statement.with_for_update(of=WaitingRoom, skip_locked=True)
             statement = statement.limit(1)
             available_waiting_room = await session.execute(statement)
             waiting_room = available_waiting_room.scalar()
@@ -117,10 +203,17 @@ async def create_stocks(
             session.add(waiting_room)
 
             _waiting_room_id = waiting_room.id
+            _warehouse_id = waiting_room.warehouse_id
 
         if waiting_room_id is not None:
-            if not (await if_exists(WaitingRoom, "id", waiting_room_id, session)):
+            if not (
+                waiting_room_object := await if_exists(
+                    WaitingRoom, "id", waiting_room_id, session
+                )
+            ):
                 raise DoesNotExist(WaitingRoom.__name__, "id", waiting_room_id)
+            if warehouse_id not in (None, waiting_room_object.warehouse_id):
+                raise ResourceInAnotherWarehouseException(resource="waiting room")
             statement = statement.where(WaitingRoom.id.in_([waiting_room_id])).limit(1)
             waiting_room = await session.execute(statement)
             waiting_room = waiting_room.scalar()
@@ -134,6 +227,7 @@ async def create_stocks(
             )
             session.add(waiting_room)
             _waiting_room_id = waiting_room_id
+            _warehouse_id = waiting_room.warehouse_id
 
         if rack_level_slot_id is not None:
             if not (
@@ -143,6 +237,9 @@ async def create_stocks(
             ):
                 raise DoesNotExist(RackLevelSlot.__name__, "id", rack_level_slot_id)
 
+            if warehouse_id not in (None, rack_level_slot_object.warehouse_id):
+                raise ResourceInAnotherWarehouseException(resource="rack level slot")
+
             if rack_level_slot_object.stock or (not rack_level_slot_object.is_active):
                 raise ServiceException(
                     "Requested rack level slot is occupied or inactive"
@@ -162,6 +259,7 @@ async def create_stocks(
 
             _rack_level_slot_id = rack_level_slot_id
             _rack_level_slot = rack_level_slot_object
+            _warehouse_id = rack_level_slot_object.warehouse_id
 
         if rack_level_id is not None:
             if not (
@@ -198,6 +296,9 @@ async def create_stocks(
                 raise NoAvailableRackLevelSlotException(
                     product.name, product_count, stock_weight
                 )
+            if warehouse_id not in (None, rack_level_slot_object.warehouse_id):
+                raise ResourceInAnotherWarehouseException(resource="rack level")
+
             stock_input.rack_level_slot_id = rack_level_slot_object.id
             await manage_resources_state_when_managing_stocks(
                 session, rack_level_slot_object, stock_weight, adding_resources=False
@@ -205,8 +306,9 @@ async def create_stocks(
 
             _rack_level_slot_id = rack_level_slot_object.id
             _rack_level_slot = rack_level_slot_object
+            _warehouse_id = rack_level_slot_object.warehouse_id
 
-        new_stock = Stock(**stock_input.dict())
+        new_stock = Stock(**stock_input.dict(), warehouse_id=_warehouse_id)
         session.add(new_stock)
         await session.flush()
 
@@ -219,6 +321,14 @@ async def create_stocks(
             reception_id=reception_id
         )
         stock_list.append(new_stock)
+        inventory_changes.add(
+            new_stock.product_id,
+            new_stock.product_count,
+            (new_stock.waiting_room_id, new_stock.rack_level_slot_id),
+        )
+
+        if new_stock.rack_level_slot_id:
+            changed_rack_level_ids.add(_rack_level_slot.rack_level_id)
 
         if _rack_level_slot:
             _rack_level_slot.stock_id = new_stock.id
@@ -227,6 +337,12 @@ async def create_stocks(
             await session.refresh(_rack_level_slot)
 
         await session.flush()
+        if progress is not None:
+            await progress.update(len(stock_list))
+    await inventory_changes.apply(session)
+    await invalidation_bus.publish(
+        session, RACK_LEVEL_CAPACITY_CHANGED, *changed_rack_level_ids
+    )
     return stock_list
 
 
@@ -235,10 +351,14 @@ async def get_single_stock(
     stock_id: int,
     can_get_issued: bool = False,
     output_schema: BaseModel = StockOutputSchema,
+    warehouse_id: Optional[str] = None,
 ) -> Union[StockOutputSchema, StockBasicOutputSchema]:
     if not (stock_object := await if_exists(Stock, "id", stock_id, session)):
         raise DoesNotExist(Stock.__name__, "id", stock_id)
 
+    if warehouse_id not in (None, stock_object.warehouse_id):
+        raise ResourceInAnotherWarehouseException(resource="stock")
+
     if (not can_get_issued) and stock_object.is_issued:
         raise CannotRetrieveIssuedStockException
     return output_schema.from_orm(stock_object)
@@ -250,11 +370,14 @@ async def get_multiple_stocks(
     schema: BaseModel = StockBasicOutputSchema,
     get_issued: bool = False,
     query_params: list[tuple] = None,
+    warehouse_id: Optional[str] = None,
 ) -> Union[
     PagedResponseSchema[StockBasicOutputSchema],
     PagedResponseSchema[StockOutputSchema],
 ]:
     query = select(Stock)
+    if warehouse_id is not None:
+        query = query.filter(Stock.warehouse_id == warehouse_id)
     if not get_issued:
         query = query.filter(Stock.is_issued == False)
 
@@ -271,7 +394,10 @@ async def get_multiple_stocks(
 
 
 async def get_every_stock(
-    session: AsyncSession, page_params: PageParams, query_params: list[tuple] = None
+    session: AsyncSession,
+    page_params: PageParams,
+    query_params: list[tuple] = None,
+    warehouse_id: Optional[str] = None,
 ) -> PagedResponseSchema[StockOutputSchema]:
     return await get_multiple_stocks(
         session,
@@ -279,19 +405,42 @@ async def get_every_stock(
         schema=StockOutputSchema,
         get_issued=True,
         query_params=query_params,
+        warehouse_id=warehouse_id,
     )
 
 
 async def get_all_available_stocks(
-    session: AsyncSession, page_params: PageParams, query_params: list[tuple] = None
+    session: AsyncSession,
+    page_params: PageParams,
+    query_params: list[tuple] = None,
+    warehouse_id: Optional[str] = None,
 ) -> PagedResponseSchema[StockBasicOutputSchema]:
-    return await get_multiple_stocks(session, page_params, query_params=query_params)
+    return await get_multiple_stocks(
+        session, page_params, query_params=query_params, warehouse_id=warehouse_id
+    )
 
 
 async def issue_stocks(
-    session: AsyncSession, stocks: list[Stock], issue_id: str, user_id: str
+    session: AsyncSession,
+    stocks: list[Stock],
+    issue_id: str,
+    user_id: str,
+    progress: Optional[JobProgress] = None,
 ) -> list[Stock]:
-    for stock in stocks:
+    await lock_stock_movement(session, stocks)
+    if any(stock.is_issued for stock in stocks):
+        raise ServiceException(
+            "Wrong stocks! Check if all requested stock are not issued!"
+        )
+
+    inventory_changes = InventoryChanges()
+    changed_rack_level_ids = set()
+    for index, stock in enumerate(stocks, start=1):
+        inventory_changes.remove(
+            stock.product_id,
+            stock.product_count,
+            (stock.waiting_room_id, stock.rack_level_slot_id),
+        )
         if stock.waiting_room:
             stock_waiting_room = await if_exists(
                 WaitingRoom, "id", stock.waiting_room_id, session
@@ -322,6 +471,7 @@ async def issue_stocks(
                 rack_level_slot,
                 stock.weight,
             )
+            changed_rack_level_ids.add(rack_level_slot.rack_level_id)
             user_stock_object = await create_user_stock_object(
                 session,
                 stock.id,
@@ -336,6 +486,12 @@ async def issue_stocks(
         stock.is_issued = True
         stock.updated_at = get_current_time()
         session.add(stock)
+        if progress is not None:
+            await progress.update(index)
+    await inventory_changes.apply(session)
+    await invalidation_bus.publish(
+        session, RACK_LEVEL_CAPACITY_CHANGED, *changed_rack_level_ids
+    )
     await session.flush()
     return stocks
 
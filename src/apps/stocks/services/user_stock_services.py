@@ -1,4 +1,4 @@
-from typing import Union
+from typing import Optional, Union
 
 from pydantic import BaseModel
 from sqlalchemy import delete, select, update
@@ -101,7 +101,9 @@ async def create_user_stock_object(
         reception_id=reception_id
     )
 
-    new_user_stock = UserStock(**input_schema.dict(exclude_none=True))
+    new_user_stock = UserStock(
+        **input_schema.dict(exclude_none=True), warehouse_id=stock_object.warehouse_id
+    )
     session.add(new_user_stock)
     await session.flush()
 
@@ -125,18 +127,25 @@ async def get_multiple_user_stocks(
     stock_id: str = None,
     user_id: str = None,
     query_params: list[tuple] = None,
+    warehouse_id: Optional[str] = None,
 ) -> PagedResponseSchema[UserStockOutputSchema]:
     query = select(UserStock)
     if stock_id is not None:
         if not (stock_object := await if_exists(Stock, "id", stock_id, session)):
             raise DoesNotExist(Stock.__name__, "id", stock_id)
         query = query.filter(UserStock.stock_id == stock_id)
+        # a stock never leaves its warehouse, so its history is in one partition
+        warehouse_id = warehouse_id or stock_object.warehouse_id
 
     if user_id is not None:
         if not (user_object := await if_exists(User, "id", user_id, session)):
             raise DoesNotExist(User.__name__, "id", user_id)
         query = query.filter(UserStock.user_id == user_id)
 
+    if warehouse_id is not None:
+        # lets the planner read the partition of the warehouse only
+        query = query.filter(UserStock.warehouse_id == warehouse_id)
+
     if query_params:
         query = filter_and_sort_instances(query_params, query, UserStock)
 
@@ -150,10 +159,13 @@ async def get_multiple_user_stocks(
 
 
 async def get_all_user_stocks(
-    session: AsyncSession, page_params: PageParams, query_params: list[tuple] = None
+    session: AsyncSession,
+    page_params: PageParams,
+    query_params: list[tuple] = None,
+    warehouse_id: Optional[str] = None,
 ) -> PagedResponseSchema[UserStockOutputSchema]:
     return await get_multiple_user_stocks(
-        session, page_params, query_params=query_params
+        session, page_params, query_params=query_params, warehouse_id=warehouse_id
     )
 
 
@@ -162,9 +174,14 @@ async def get_all_user_stocks_with_single_user_involvement(
     page_params: PageParams,
     user_id: str,
     query_params: list[tuple] = None,
+    warehouse_id: Optional[str] = None,
 ) -> PagedResponseSchema[UserStockOutputSchema]:
     return await get_multiple_user_stocks(
-        session, page_params, user_id=user_id, query_params=query_params
+        session,
+        page_params,
+        user_id=user_id,
+        query_params=query_params,
+        warehouse_id=warehouse_id,
     )
 
 
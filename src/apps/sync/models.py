@@ -0,0 +1,24 @@
+import datetime as dt
+
+from sqlalchemy import BigInteger, Column, Index, String
+from sqlalchemy.sql.sqltypes import DateTime
+
+from src.database.db_connection import Base
+
+
+class SyncTombstone(Base):
+    __tablename__ = "sync_tombstone"
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    resource = Column(String, nullable=False)
+    entity_id = Column(String, nullable=False)
+    change_xid = Column(BigInteger, nullable=False)
+    deleted_at = Column(DateTime, default=dt.datetime.now, nullable=False)
+
+    __table_args__ = (
+        Index(
+            "ix_sync_tombstone_resource_change_xid",
+            "resource",
+            "change_xid",
+            "entity_id",
+        ),
+    )
@@ -0,0 +1,28 @@
+from fastapi import Depends, Query, status
+from fastapi.routing import APIRouter
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.apps.sync.schemas import SyncPageSchema
+from src.apps.sync.services import SYNC_MAX_PAGE_SIZE, SYNC_PAGE_SIZE, get_changes_since
+from src.apps.users.models import User
+from src.core.permissions import check_if_staff
+from src.dependencies.get_db import get_read_db
+from src.dependencies.user import authenticate_user
+
+sync_router = APIRouter(prefix="/sync", tags=["sync"])
+
+
+@sync_router.get(
+    "/{resource}",
+    response_model=SyncPageSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def get_resource_changes(
+    resource: str,
+    since: str = "0",
+    limit: int = Query(SYNC_PAGE_SIZE, ge=1, le=SYNC_MAX_PAGE_SIZE),
+    session: AsyncSession = Depends(get_read_db),
+    request_user: User = Depends(authenticate_user),
+) -> SyncPageSchema:
+    await check_if_staff(request_user)
+    return await get_changes_since(session, resource, since, limit)
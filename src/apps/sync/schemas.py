@@ -0,0 +1,16 @@
+from typing import Any, Optional
+
+from pydantic import BaseModel
+
+
+class SyncChangeSchema(BaseModel):
+    id: str
+    deleted: bool
+    data: Optional[dict[str, Any]]
+
+
+class SyncPageSchema(BaseModel):
+    resource: str
+    changes: list[SyncChangeSchema]
+    next_since: str
+    has_more: bool
@@ -0,0 +1,122 @@
+from sqlalchemy import (
+    BigInteger,
+    String,
+    Table,
+    cast,
+    false,
+    func,
+    literal_column,
+    null,
+    select,
+    true,
+    tuple_,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.apps.issues.models import Issue
+from src.apps.products.models import Category, Product
+from src.apps.rack_level_slots.models import RackLevelSlot
+from src.apps.rack_levels.models import RackLevel
+from src.apps.racks.models import Rack
+from src.apps.receptions.models import Reception
+from src.apps.sections.models import Section
+from src.apps.stocks.models import Stock
+from src.apps.sync.models import SyncTombstone
+from src.apps.sync.schemas import SyncChangeSchema, SyncPageSchema
+from src.apps.waiting_rooms.models import WaitingRoom
+from src.apps.warehouse.models import Warehouse
+from src.core.exceptions import DoesNotExist, ServiceException
+
+SYNC_PAGE_SIZE = 500
+SYNC_MAX_PAGE_SIZE = 5000
+
+SYNC_RESOURCES = {
+    "categories": Category,
+    "products": Product,
+    "stocks": Stock,
+    "warehouses": Warehouse,
+    "sections": Section,
+    "racks": Rack,
+    "rack-levels": RackLevel,
+    "rack-level-slots": RackLevelSlot,
+    "waiting-rooms": WaitingRoom,
+    "receptions": Reception,
+    "issues": Issue,
+}
+
+
+def parse_sync_cursor(since: str) -> tuple[int, str]:
+    change_xid, _, entity_id = since.partition(":")
+    try:
+        return int(change_xid), entity_id
+    except ValueError:
+        raise ServiceException(f"Invalid sync cursor: {since}")
+
+
+def format_sync_cursor(change_xid: int, entity_id: str) -> str:
+    return f"{change_xid}:{entity_id}"
+
+
+def get_sync_horizon():
+    # transactions still running may commit later with lower ids than rows
+    # already visible, so a page never goes past the oldest of them
+    return select(
+        cast(
+            cast(func.pg_snapshot_xmin(func.pg_current_snapshot()), String),
+            BigInteger,
+        )
+    ).scalar_subquery()
+
+
+def get_changes_query(table: Table, cursor: tuple[int, str], horizon, limit: int):
+    rows = select(
+        table.c.id.label("id"),
+        table.c.change_xid.label("change_xid"),
+        false().label("deleted"),
+        func.to_jsonb(literal_column(table.name), type_=JSONB).label("data"),
+    ).where(
+        tuple_(table.c.change_xid, table.c.id) > tuple_(*cursor),
+        table.c.change_xid < horizon,
+    )
+    tombstones = select(
+        SyncTombstone.entity_id.label("id"),
+        SyncTombstone.change_xid.label("change_xid"),
+        true().label("deleted"),
+        cast(null(), JSONB).label("data"),
+    ).where(
+        SyncTombstone.resource == table.name,
+        tuple_(SyncTombstone.change_xid, SyncTombstone.entity_id) > tuple_(*cursor),
+        SyncTombstone.change_xid < horizon,
+    )
+    changes = union_all(rows, tombstones).subquery()
+    return select(changes).order_by(changes.c.change_xid, changes.c.id).limit(limit + 1)
+
+
+async def get_changes_since(
+    session: AsyncSession,
+    resource: str,
+    since: str = "0",
+    limit: int = SYNC_PAGE_SIZE,
+) -> SyncPageSchema:
+    if (model := SYNC_RESOURCES.get(resource)) is None:
+        raise DoesNotExist("Sync resource", "name", resource)
+    cursor = parse_sync_cursor(since)
+
+    query = get_changes_query(model.__table__, cursor, get_sync_horizon(), limit)
+    rows = (await session.execute(query)).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    return SyncPageSchema(
+        resource=resource,
+        changes=[
+            SyncChangeSchema(id=row.id, deleted=row.deleted, data=row.data)
+            for row in rows
+        ],
+        next_since=(
+            format_sync_cursor(rows[-1].change_xid, rows[-1].id) if rows else since
+        ),
+        has_more=has_more,
+    )
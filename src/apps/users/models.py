@@ -34,6 +34,9 @@ class User(Base):
     can_move_stocks = Column(Boolean, nullable=False, server_default="false")
     can_recept_stocks = Column(Boolean, nullable=False, server_default="false")
     can_issue_stocks = Column(Boolean, nullable=False, server_default="false")
+    warehouse_id = Column(
+        String, ForeignKey("warehouse.id", ondelete="SET NULL"), nullable=True
+    )
     issues = relationship("Issue", back_populates="user", lazy="noload")
     receptions = relationship("Reception", back_populates="user", lazy="noload")
     stock_user_history = relationship(
@@ -1,6 +1,6 @@
-from typing import Union
+from typing import Optional, Union
 
-from fastapi import BackgroundTasks, Depends, Request, Response, status
+from fastapi import Depends, Request, Response, status
 from fastapi.responses import JSONResponse
 from fastapi.routing import APIRouter
 from fastapi_jwt_auth import AuthJWT
@@ -33,8 +33,9 @@ from src.apps.users.services.user_services import (
 from src.core.pagination.models import PageParams
 from src.core.pagination.schemas import PagedResponseSchema
 from src.core.permissions import check_if_staff, check_if_staff_or_owner
-from src.dependencies.get_db import get_db
+from src.dependencies.get_db import get_db, get_read_db
 from src.dependencies.user import authenticate_user
+from src.dependencies.warehouse import get_warehouse_scope
 
 user_router = APIRouter(prefix="/users", tags=["users"])
 
@@ -44,12 +45,11 @@ user_router = APIRouter(prefix="/users", tags=["users"])
 )
 async def create_user(
     user: UserInputSchema,
-    background_tasks: BackgroundTasks,
     session: AsyncSession = Depends(get_db),
     request_user: User = Depends(authenticate_user),
 ) -> UserOutputSchema:
     await check_if_staff(request_user)
-    return await create_single_user(session, user, background_tasks)
+    return await create_single_user(session, user)
 
 
 @user_router.post(
@@ -70,7 +70,7 @@ async def login_user(
     response_model=UserOutputSchema,
 )
 async def get_logged_user(
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     request_user: User = Depends(authenticate_user),
 ) -> UserOutputSchema:
     return await get_single_user(session, request_user.id)
@@ -86,7 +86,7 @@ async def get_logged_user(
 )
 async def get_users(
     request: Request,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     page_params: PageParams = Depends(),
     request_user: User = Depends(authenticate_user),
 ) -> Union[
@@ -112,7 +112,7 @@ async def get_users(
 )
 async def get_every_user(
     request: Request,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     page_params: PageParams = Depends(),
     request_user: User = Depends(authenticate_user),
 ) -> PagedResponseSchema[UserOutputSchema]:
@@ -131,7 +131,7 @@ async def get_every_user(
 )
 async def get_user(
     user_id: str,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     request_user: User = Depends(authenticate_user),
 ) -> Union[UserInfoOutputSchema, UserOutputSchema]:
     if request_user.is_staff:
@@ -147,9 +147,10 @@ async def get_user(
 async def get_user_stocks_involvement_history(
     request: Request,
     user_id: str,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     page_params: PageParams = Depends(),
     request_user: User = Depends(authenticate_user),
+    warehouse_id: Optional[str] = Depends(get_warehouse_scope),
 ) -> PagedResponseSchema[UserStockOutputSchema]:
     user = await get_single_user(session, user_id)
     await check_if_staff_or_owner(request_user, "id", user.id)
@@ -158,6 +159,7 @@ async def get_user_stocks_involvement_history(
         page_params,
         user_id=user_id,
         query_params=request.query_params.multi_items(),
+        warehouse_id=warehouse_id,
     )
 
 
@@ -31,6 +31,7 @@ class UserInputSchema(UserBaseSchema):
     can_move_stocks: bool
     can_recept_stocks: bool
     can_issue_stocks: bool
+    warehouse_id: Optional[str]
 
     @validator("birth_date")
     def validate_birth_date(cls, birth_date: datetime.date) -> datetime.date:
@@ -65,6 +66,7 @@ class UserUpdateSchema(BaseModel):
     can_move_stocks: Optional[bool]
     can_recept_stocks: Optional[bool]
     can_issue_stocks: Optional[bool]
+    warehouse_id: Optional[str]
 
     @validator("employment_date")
     def validate_employment_date(
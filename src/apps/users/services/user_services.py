@@ -1,6 +1,5 @@
 from typing import Any, Union
 
-from fastapi import BackgroundTasks
 from fastapi_jwt_auth import AuthJWT
 from pydantic import BaseModel
 from sqlalchemy import delete, select, update
@@ -17,6 +16,7 @@ from src.apps.users.schemas import (
     UserOutputSchema,
     UserUpdateSchema,
 )
+from src.apps.warehouse.models import Warehouse
 from src.core.exceptions import (
     AccountAlreadyActivatedException,
     AccountAlreadyDeactivatedException,
@@ -27,10 +27,12 @@ from src.core.exceptions import (
     PasswordNotSetException,
     ServiceException,
 )
+from src.core.invalidation.bus import invalidation_bus
+from src.core.invalidation.events import USER_CHANGED
 from src.core.pagination.models import PageParams
 from src.core.pagination.schemas import PagedResponseSchema
 from src.core.pagination.services import paginate
-from src.core.utils.crypt import hash_user_password, passwd_context
+from src.core.utils.crypt import hash_user_password, verify_user_password
 from src.core.utils.filter import filter_and_sort_instances
 from src.core.utils.orm import if_exists
 
@@ -44,23 +46,25 @@ async def create_user_base(session: AsyncSession, user_input: UserInputSchema) -
     if email_check:
         raise AlreadyExists(User.__name__, "email", user_data["email"])
 
+    if (warehouse_id := user_data.get("warehouse_id")) and not (
+        await if_exists(Warehouse, "id", warehouse_id, session)
+    ):
+        raise DoesNotExist(Warehouse.__name__, "id", warehouse_id)
+
     new_user = User(**user_data)
     return new_user
 
 
 async def create_single_user(
-    session: AsyncSession,
-    user_input: UserInputSchema,
-    background_tasks: BackgroundTasks,
+    session: AsyncSession, user_input: UserInputSchema
 ) -> UserOutputSchema:
     new_user = await create_user_base(session, user_input)
 
     session.add(new_user)
+    await send_activation_email(new_user.email, session)
     await session.commit()
     await session.refresh(new_user)
 
-    await send_activation_email(new_user.email, session, background_tasks)
-
     return UserOutputSchema.from_orm(new_user)
 
 
@@ -86,7 +90,7 @@ async def authenticate(
         .filter(User.email == login_data["email"])
         .limit(1)
     )
-    if not (user and passwd_context.verify(login_data["password"], user.password)):
+    if not (user and await verify_user_password(login_data["password"], user.password)):
         raise AuthenticationException("Invalid Credentials")
     if not user.is_active:
         raise AccountNotActivatedException("email", login_data["email"])
@@ -153,10 +157,16 @@ async def update_single_user(
 
     user_data = user_input.dict(exclude_unset=True, exclude_none=True)
 
+    if (warehouse_id := user_data.get("warehouse_id")) and not (
+        await if_exists(Warehouse, "id", warehouse_id, session)
+    ):
+        raise DoesNotExist(Warehouse.__name__, "id", warehouse_id)
+
     if user_data:
         statement = update(User).filter(User.id == user_id).values(**user_data)
 
         await session.execute(statement)
+        await invalidation_bus.publish(session, USER_CHANGED, user_id)
         await session.commit()
 
     return await get_single_user(session, user_id=user_id)
@@ -168,6 +178,7 @@ async def delete_single_user(session: AsyncSession, user_id: str):
 
     statement = delete(User).filter(User.id == user_id)
     result = await session.execute(statement)
+    await invalidation_bus.publish(session, USER_CHANGED, user_id)
     await session.commit()
 
     return result
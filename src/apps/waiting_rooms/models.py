@@ -16,6 +16,7 @@ from sqlalchemy.sql.sqltypes import DateTime
 
 from src.apps.warehouse.models import Warehouse
 from src.core.utils.orm import default_available_slots, default_available_stock_weight
+from src.core.utils.sync import change_index, change_xid_column, track_changes
 from src.core.utils.time import get_current_time
 from src.core.utils.utils import generate_uuid
 from src.database.db_connection import Base
@@ -47,4 +48,12 @@ class WaitingRoom(Base):
         nullable=True,
     )
     warehouse = relationship("Warehouse", back_populates="waiting_rooms", lazy="noload")
+    change_xid = change_xid_column()
     created_at = Column(DateTime, default=dt.datetime.now, nullable=True)
+    version_id = Column(Integer, nullable=False, default=1)
+
+    __table_args__ = (change_index("waiting_room"),)
+    __mapper_args__ = {"version_id_col": version_id}
+
+
+track_changes(WaitingRoom.__table__)
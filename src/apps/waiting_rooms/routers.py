@@ -1,4 +1,4 @@
-from typing import Union
+from typing import Optional, Union
 
 from fastapi import Depends, Request, Response, status
 from fastapi.responses import JSONResponse
@@ -24,8 +24,10 @@ from src.apps.waiting_rooms.services import (
 from src.core.pagination.models import PageParams
 from src.core.pagination.schemas import PagedResponseSchema
 from src.core.permissions import check_if_staff, check_if_staff_or_has_permission
-from src.dependencies.get_db import get_db
+from src.dependencies.get_db import get_db, get_read_db
 from src.dependencies.user import authenticate_user
+from src.dependencies.versioning import get_expected_version
+from src.dependencies.warehouse import get_warehouse_scope
 
 waiting_room_router = APIRouter(prefix="/waiting_rooms", tags=["waiting_room"])
 
@@ -39,9 +41,10 @@ async def post_waiting_room(
     waiting_room: WaitingRoomInputSchema,
     session: AsyncSession = Depends(get_db),
     request_user: User = Depends(authenticate_user),
+    warehouse_id: Optional[str] = Depends(get_warehouse_scope),
 ) -> WaitingRoomOutputSchema:
     await check_if_staff(request_user)
-    return await create_waiting_room(session, waiting_room)
+    return await create_waiting_room(session, waiting_room, warehouse_id=warehouse_id)
 
 
 @waiting_room_router.get(
@@ -54,15 +57,19 @@ async def post_waiting_room(
 )
 async def get_waiting_rooms(
     request: Request,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     page_params: PageParams = Depends(),
     request_user: User = Depends(authenticate_user),
+    warehouse_id: Optional[str] = Depends(get_warehouse_scope),
 ) -> Union[
     PagedResponseSchema[WaitingRoomBasicOutputSchema],
     PagedResponseSchema[WaitingRoomOutputSchema],
 ]:
     return await get_all_waiting_rooms(
-        session, page_params, query_params=request.query_params.multi_items()
+        session,
+        page_params,
+        query_params=request.query_params.multi_items(),
+        warehouse_id=warehouse_id,
     )
 
 
@@ -73,7 +80,7 @@ async def get_waiting_rooms(
 )
 async def get_waiting_room(
     waiting_room_id: str,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     request_user: User = Depends(authenticate_user),
 ) -> Union[WaitingRoomOutputSchema, WaitingRoomBasicOutputSchema]:
     if await check_if_staff_or_has_permission(request_user, "can_move_stocks"):
@@ -93,10 +100,11 @@ async def update_waiting_room(
     waiting_room_input: WaitingRoomUpdateSchema,
     session: AsyncSession = Depends(get_db),
     request_user: User = Depends(authenticate_user),
+    expected_version: Optional[int] = Depends(get_expected_version),
 ) -> WaitingRoomOutputSchema:
     await check_if_staff(request_user)
     return await update_single_waiting_room(
-        session, waiting_room_input, waiting_room_id
+        session, waiting_room_input, waiting_room_id, expected_version
     )
 
 
@@ -73,6 +73,7 @@ class WaitingRoomBasicOutputSchema(WaitingRoomBaseSchema):
 
 class WaitingRoomOutputSchema(WaitingRoomBasicOutputSchema):
     stocks: list[StockWithoutWaitingRoomOutputSchema]
+    version_id: int
 
     class Config:
         orm_mode = True
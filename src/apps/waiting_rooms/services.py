@@ -1,10 +1,11 @@
 from decimal import Decimal
-from typing import Union
+from typing import Optional, Union
 
 from pydantic import BaseModel
 from sqlalchemy import delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.apps.inventory.services import InventoryChanges
 from src.apps.rack_level_slots.services import manage_old_rack_level_slot_state
 from src.apps.stocks.models import Stock
 from src.apps.stocks.schemas.stock_schemas import StockWaitingRoomInputSchema
@@ -16,7 +17,7 @@ from src.apps.waiting_rooms.schemas import (
     WaitingRoomUpdateSchema,
 )
 from src.apps.warehouse.models import Warehouse
-from src.apps.warehouse.services import get_all_warehouses, manage_warehouse_state
+from src.apps.warehouse.services import get_target_warehouse, manage_warehouse_state
 from src.core.exceptions import (
     AlreadyExists,
     CannotMoveIssuedStockException,
@@ -25,30 +26,30 @@ from src.core.exceptions import (
     NoAvailableSlotsInWaitingRoomException,
     NoAvailableWeightInWaitingRoomException,
     NotEnoughWarehouseResourcesException,
+    ResourceInAnotherWarehouseException,
     ServiceException,
     StockAlreadyInWaitingRoomException,
     TooLittleWaitingRoomSpaceException,
     TooLittleWaitingRoomWeightException,
     WaitingRoomIsNotEmptyException,
-    WarehouseDoesNotExistException,
 )
+from src.core.invalidation.bus import invalidation_bus
+from src.core.invalidation.events import RACK_LEVEL_CAPACITY_CHANGED
 from src.core.pagination.models import PageParams
 from src.core.pagination.schemas import PagedResponseSchema
 from src.core.pagination.services import paginate
 from src.core.utils.filter import filter_and_sort_instances
-from src.core.utils.orm import if_exists
+from src.core.utils.locking import LockSet, lock_stock_movement, retry_on_lock_conflict
+from src.core.utils.orm import check_object_version, if_exists, update_versioned_object
 
 
 async def create_waiting_room(
     session: AsyncSession,
     waiting_room_input: WaitingRoomInputSchema,
     testing: bool = False,
+    warehouse_id: Optional[str] = None,
 ) -> WaitingRoomOutputSchema:
-    warehouses = await get_all_warehouses(session, PageParams())
-    if not warehouses.total:
-        raise WarehouseDoesNotExistException
-
-    warehouse = await if_exists(Warehouse, "id", warehouses.results[0].id, session)
+    warehouse = await get_target_warehouse(session, warehouse_id)
 
     if not warehouse.available_waiting_rooms:
         raise NotEnoughWarehouseResourcesException(resource="waiting rooms")
@@ -98,11 +99,14 @@ async def get_all_waiting_rooms(
     page_params: PageParams,
     output_schema: BaseModel = WaitingRoomBasicOutputSchema,
     query_params: list[tuple] = None,
+    warehouse_id: Optional[str] = None,
 ) -> Union[
     PagedResponseSchema[WaitingRoomBasicOutputSchema],
     PagedResponseSchema[WaitingRoomOutputSchema],
 ]:
     query = select(WaitingRoom)
+    if warehouse_id is not None:
+        query = query.filter(WaitingRoom.warehouse_id == warehouse_id)
 
     if query_params:
         query = filter_and_sort_instances(query_params, query, WaitingRoom)
@@ -147,6 +151,7 @@ async def update_single_waiting_room(
     session: AsyncSession,
     waiting_room_input: WaitingRoomUpdateSchema,
     waiting_room_id: int,
+    expected_version: Optional[int] = None,
 ) -> WaitingRoomOutputSchema:
     if not (
         waiting_room_object := await if_exists(
@@ -154,6 +159,7 @@ async def update_single_waiting_room(
         )
     ):
         raise DoesNotExist(WaitingRoom.__name__, "id", waiting_room_id)
+    check_object_version(waiting_room_object, expected_version)
 
     waiting_room_data = waiting_room_input.dict(exclude_unset=True, exclude_none=True)
 
@@ -173,15 +179,9 @@ async def update_single_waiting_room(
         waiting_room_object, new_max_weight, new_max_stocks
     )
     session.add(waiting_room_object)
+    await update_versioned_object(session, waiting_room_object, waiting_room_data)
 
     if waiting_room_data:
-        statement = (
-            update(WaitingRoom)
-            .filter(WaitingRoom.id == waiting_room_id)
-            .values(**waiting_room_data)
-        )
-
-        await session.execute(statement)
         await session.commit()
         await session.refresh(waiting_room_object)
 
@@ -230,6 +230,7 @@ async def manage_old_waiting_room_state(
     return old_waiting_room_object
 
 
+@retry_on_lock_conflict()
 async def add_single_stock_to_waiting_room(
     session: AsyncSession,
     waiting_room_id: str,
@@ -252,12 +253,19 @@ async def add_single_stock_to_waiting_room(
     if not (stock_object := await if_exists(Stock, "id", stock_id, session)):
         raise DoesNotExist(Stock.__name__, "id", stock_id)
 
+    await lock_stock_movement(
+        session, [stock_object], LockSet().add(WaitingRoom, waiting_room_object.id)
+    )
+
     if stock_object.is_issued:
         raise CannotMoveIssuedStockException
 
     if stock_object.waiting_room_id == waiting_room_id:
         raise StockAlreadyInWaitingRoomException
 
+    if waiting_room_object.warehouse_id != stock_object.warehouse_id:
+        raise ResourceInAnotherWarehouseException(resource="waiting room")
+
     if not waiting_room_object.available_slots:
         raise NoAvailableSlotsInWaitingRoomException
 
@@ -302,6 +310,18 @@ async def add_single_stock_to_waiting_room(
 
     stock_object.waiting_room_id = waiting_room_object.id
     session.add(stock_object)
+    await InventoryChanges().move(
+        stock_object.product_id,
+        stock_object.product_count,
+        (_old_waiting_room_id, _old_rack_level_slot_id),
+        (waiting_room_object.id, None),
+    ).apply(session)
+    changed_rack_level_ids = set()
+    if old_rack_level_slot_object:
+        changed_rack_level_ids.add(old_rack_level_slot_object.rack_level_id)
+    await invalidation_bus.publish(
+        session, RACK_LEVEL_CAPACITY_CHANGED, *changed_rack_level_ids
+    )
     await session.commit()
 
     return {"message": "Stock was successfully added to the waiting room! "}
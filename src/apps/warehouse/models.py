@@ -19,6 +19,7 @@ from src.core.utils.orm import (
     default_available_sections,
     default_available_waiting_rooms,
 )
+from src.core.utils.sync import change_index, change_xid_column, track_changes
 from src.core.utils.time import get_current_time
 from src.core.utils.utils import generate_uuid
 from src.database.db_connection import Base
@@ -49,4 +50,12 @@ class Warehouse(Base):
     waiting_rooms = relationship(
         "WaitingRoom", back_populates="warehouse", lazy="selectin"
     )
+    change_xid = change_xid_column()
     created_at = Column(DateTime, default=dt.datetime.now, nullable=True)
+    version_id = Column(Integer, nullable=False, default=1)
+
+    __table_args__ = (change_index("warehouse"),)
+    __mapper_args__ = {"version_id_col": version_id}
+
+
+track_changes(Warehouse.__table__)
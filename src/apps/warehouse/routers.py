@@ -1,3 +1,5 @@
+from typing import Optional
+
 from fastapi import Depends, Request, Response, status
 from fastapi.routing import APIRouter
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -19,8 +21,9 @@ from src.apps.warehouse.services import (
 from src.core.pagination.models import PageParams
 from src.core.pagination.schemas import PagedResponseSchema
 from src.core.permissions import check_if_staff
-from src.dependencies.get_db import get_db
+from src.dependencies.get_db import get_db, get_read_db
 from src.dependencies.user import authenticate_user
+from src.dependencies.versioning import get_expected_version
 
 warehouse_router = APIRouter(prefix="/warehouse", tags=["warehouse"])
 
@@ -45,7 +48,7 @@ async def post_warehouse(
     status_code=status.HTTP_200_OK,
 )
 async def get_warehouses(
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     page_params: PageParams = Depends(),
     request_user: User = Depends(authenticate_user),
 ) -> PagedResponseSchema[WarehouseBaseOutputSchema]:
@@ -59,7 +62,7 @@ async def get_warehouses(
 )
 async def get_warehouse(
     warehouse_id: str,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     request_user: User = Depends(authenticate_user),
 ) -> WarehouseOutputSchema:
     await check_if_staff(request_user)
@@ -76,9 +79,12 @@ async def update_warehouse(
     warehouse_input: WarehouseUpdateSchema,
     session: AsyncSession = Depends(get_db),
     request_user: User = Depends(authenticate_user),
+    expected_version: Optional[int] = Depends(get_expected_version),
 ) -> WarehouseOutputSchema:
     await check_if_staff(request_user)
-    return await update_single_warehouse(session, warehouse_input, warehouse_id)
+    return await update_single_warehouse(
+        session, warehouse_input, warehouse_id, expected_version
+    )
 
 
 @warehouse_router.delete(
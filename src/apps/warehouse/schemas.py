@@ -68,6 +68,7 @@ class WarehouseBaseOutputSchema(WarehouseBaseSchema):
 class WarehouseOutputSchema(WarehouseBaseOutputSchema):
     sections: list[SectionBaseOutputSchema]
     waiting_rooms: list[WaitingRoomBasicOutputSchema]
+    version_id: int
 
     class Config:
         orm_mode = True
@@ -1,4 +1,5 @@
 from decimal import Decimal
+from typing import Optional
 
 from sqlalchemy import delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -17,13 +18,18 @@ from src.core.exceptions import (
     ServiceException,
     TooLittleSectionAmountException,
     TooLittleWaitingRoomAmountException,
-    WarehouseAlreadyExistsException,
+    WarehouseDoesNotExistException,
     WarehouseIsNotEmptyException,
+    WarehouseNotSpecifiedException,
 )
 from src.core.pagination.models import PageParams
 from src.core.pagination.schemas import PagedResponseSchema
 from src.core.pagination.services import paginate
-from src.core.utils.orm import if_exists
+from src.core.utils.orm import check_object_version, if_exists, update_versioned_object
+from src.core.utils.partitioning import (
+    create_warehouse_partitions,
+    drop_warehouse_partitions,
+)
 
 
 async def create_warehouse(
@@ -31,12 +37,10 @@ async def create_warehouse(
 ) -> WarehouseOutputSchema:
     warehouse_data = warehouse_input.dict()
 
-    warehouses = await get_all_warehouses(session, PageParams())
-    if warehouses.total:
-        raise WarehouseAlreadyExistsException
-
     new_warehouse = Warehouse(**warehouse_data)
     session.add(new_warehouse)
+    await session.flush()
+    await create_warehouse_partitions(session, new_warehouse.id)
     await session.commit()
     await session.refresh(new_warehouse)
 
@@ -54,6 +58,25 @@ async def get_single_warehouse(
     return WarehouseOutputSchema.from_orm(warehouse_object)
 
 
+async def get_target_warehouse(
+    session: AsyncSession, warehouse_id: Optional[str] = None
+) -> Warehouse:
+    if warehouse_id is not None:
+        if not (
+            warehouse_object := await if_exists(Warehouse, "id", warehouse_id, session)
+        ):
+            raise DoesNotExist(Warehouse.__name__, "id", warehouse_id)
+        return warehouse_object
+
+    # a deployment with a single warehouse does not need to name it
+    warehouses = (await session.scalars(select(Warehouse).limit(2))).all()
+    if not warehouses:
+        raise WarehouseDoesNotExistException
+    if len(warehouses) > 1:
+        raise WarehouseNotSpecifiedException
+    return warehouses[0]
+
+
 async def get_all_warehouses(
     session: AsyncSession, page_params: PageParams
 ) -> PagedResponseSchema[WarehouseBaseOutputSchema]:
@@ -99,12 +122,16 @@ async def manage_warehouse_state(
 
 
 async def update_single_warehouse(
-    session: AsyncSession, warehouse_input: WarehouseUpdateSchema, warehouse_id: str
+    session: AsyncSession,
+    warehouse_input: WarehouseUpdateSchema,
+    warehouse_id: str,
+    expected_version: Optional[int] = None,
 ) -> WarehouseOutputSchema:
     if not (
         warehouse_object := await if_exists(Warehouse, "id", warehouse_id, session)
     ):
         raise DoesNotExist(Warehouse.__name__, "id", warehouse_id)
+    check_object_version(warehouse_object, expected_version)
 
     warehouse_data = warehouse_input.dict(exclude_unset=True, exclude_none=True)
 
@@ -124,15 +151,9 @@ async def update_single_warehouse(
         warehouse_object, new_max_sections, new_max_waiting_rooms
     )
     session.add(warehouse_object)
+    await update_versioned_object(session, warehouse_object, warehouse_data)
 
     if warehouse_data:
-        statement = (
-            update(Warehouse)
-            .filter(Warehouse.id == warehouse_id)
-            .values(**warehouse_data)
-        )
-
-        await session.execute(statement)
         await session.commit()
         await session.refresh(warehouse_object)
 
@@ -151,6 +172,7 @@ async def delete_single_warehouse(session: AsyncSession, warehouse_id: str):
     if warehouse_object.waiting_rooms:
         raise WarehouseIsNotEmptyException(resource="waiting rooms")
 
+    await drop_warehouse_partitions(session, warehouse_id)
     statement = delete(Warehouse).filter(Warehouse.id == warehouse_id)
     result = await session.execute(statement)
     await session.commit()
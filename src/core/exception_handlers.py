@@ -0,0 +1,53 @@
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
+from fastapi_jwt_auth.exceptions import AuthJWTException
+
+from src.core.exceptions import (
+    AuthenticationException,
+    AuthorizationException,
+    ConcurrentStockMovementException,
+    DoesNotExist,
+    ServiceException,
+    StaleVersionException,
+)
+
+# every ServiceException subclass not listed here is answered with the status
+# code of its closest listed base class, which ends at 400 for ServiceException
+EXCEPTION_STATUS_CODES: dict[type[ServiceException], int] = {
+    ServiceException: status.HTTP_400_BAD_REQUEST,
+    DoesNotExist: status.HTTP_404_NOT_FOUND,
+    AuthenticationException: status.HTTP_401_UNAUTHORIZED,
+    AuthorizationException: status.HTTP_403_FORBIDDEN,
+    ConcurrentStockMovementException: status.HTTP_409_CONFLICT,
+    StaleVersionException: status.HTTP_409_CONFLICT,
+}
+
+
+def get_status_code(exception_class: type[ServiceException]) -> int:
+    for base_class in exception_class.__mro__:
+        if base_class in EXCEPTION_STATUS_CODES:
+            return EXCEPTION_STATUS_CODES[base_class]
+    return status.HTTP_500_INTERNAL_SERVER_ERROR
+
+
+async def handle_auth_jwt_exception(
+    request: Request, exception: AuthJWTException
+) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_401_UNAUTHORIZED, content={"detail": exception.message}
+    )
+
+
+async def handle_service_exception(
+    request: Request, exception: ServiceException
+) -> JSONResponse:
+    return JSONResponse(
+        status_code=get_status_code(type(exception)),
+        content={"detail": str(exception)},
+    )
+
+
+def register_exception_handlers(app: FastAPI) -> None:
+    app.add_exception_handler(AuthJWTException, handle_auth_jwt_exception)
+    for exception_class in EXCEPTION_STATUS_CODES:
+        app.add_exception_handler(exception_class, handle_service_exception)
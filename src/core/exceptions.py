@@ -168,13 +168,18 @@ class NoAvailableWaitingRoomsException(ServiceException):
         )
 
 
-class WarehouseAlreadyExistsException(ServiceException):
+class WarehouseNotSpecifiedException(ServiceException):
     def __init__(self) -> None:
         super().__init__(
-            f"The warehouses instance already exists and the second one cannot be created!"
+            f"There is more than one warehouse - the warehouse has to be specified! "
         )
 
 
+class ResourceInAnotherWarehouseException(ServiceException):
+    def __init__(self, resource: str) -> None:
+        super().__init__(f"The requested {resource} belongs to another warehouse! ")
+
+
 class WarehouseDoesNotExistException(ServiceException):
     def __init__(self) -> None:
         super().__init__(
@@ -370,3 +375,26 @@ class UnavailableSortFieldException(ServiceException):
 class NoSuchFieldException(ServiceException):
     def __init__(self, model_name: str, field: str) -> None:
         super().__init__(f"Object {model_name} does not have field={field} ! ")
+
+
+class AmbiguousStockMoveTargetException(ServiceException):
+    def __init__(self) -> None:
+        super().__init__(
+            "Stock move must point to exactly one of: waiting room, rack level or rack level slot! "
+        )
+
+
+class ConcurrentStockMovementException(ServiceException):
+    def __init__(self, attempts: int) -> None:
+        super().__init__(
+            f"Stock movement could not be completed after {attempts} attempts "
+            "because of concurrent changes! Try again later! "
+        )
+
+
+class StaleVersionException(ServiceException):
+    def __init__(self, class_name: str, value: Any) -> None:
+        super().__init__(
+            f"{class_name} with id={value} was modified by another request! "
+            "Fetch the current version and try again! "
+        )
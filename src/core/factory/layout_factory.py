@@ -0,0 +1,84 @@
+from decimal import Decimal
+from typing import Optional
+
+from src.apps.layouts.schemas import (
+    LayoutRackLevelTemplateSchema,
+    LayoutRackTemplateSchema,
+    LayoutSectionInputSchema,
+)
+from src.core.factory.core import SchemaFactory
+from src.core.utils.faker import (
+    set_rack_level_slots,
+    set_rack_level_weight,
+    set_rack_levels,
+    set_rack_weight,
+)
+
+
+class LayoutRackLevelTemplateSchemaFactory(SchemaFactory):
+    def __init__(self, schema_class=LayoutRackLevelTemplateSchema):
+        super().__init__(schema_class)
+
+    def generate(
+        self,
+        description: str = None,
+        max_weight: Decimal = None,
+        max_slots: int = None,
+        quantity: int = 1,
+    ) -> LayoutRackLevelTemplateSchema:
+        return self.schema_class(
+            description=description or self.faker.ecommerce_name(),
+            max_weight=max_weight or set_rack_level_weight(),
+            max_slots=max_slots or set_rack_level_slots(),
+            quantity=quantity,
+        )
+
+
+class LayoutRackTemplateSchemaFactory(SchemaFactory):
+    def __init__(self, schema_class=LayoutRackTemplateSchema):
+        super().__init__(schema_class)
+
+    def generate(
+        self,
+        rack_name: str = None,
+        max_weight: Decimal = None,
+        max_levels: int = None,
+        quantity: int = 1,
+        rack_levels: Optional[list[LayoutRackLevelTemplateSchema]] = None,
+    ) -> LayoutRackTemplateSchema:
+        max_levels = max_levels or set_rack_levels()
+        if rack_levels is None:
+            rack_levels = [
+                LayoutRackLevelTemplateSchemaFactory().generate(quantity=max_levels - 1)
+            ]
+        reserved_weight = sum(
+            level.max_weight * level.quantity for level in rack_levels
+        )
+        return self.schema_class(
+            rack_name=rack_name or self.faker.ecommerce_name(),
+            max_weight=max_weight or max(set_rack_weight(), reserved_weight),
+            max_levels=max_levels,
+            quantity=quantity,
+            rack_levels=rack_levels,
+        )
+
+
+class LayoutSectionInputSchemaFactory(SchemaFactory):
+    def __init__(self, schema_class=LayoutSectionInputSchema):
+        super().__init__(schema_class)
+
+    def generate(
+        self,
+        section_name: str = None,
+        max_weight: Decimal = None,
+        max_racks: int = None,
+        racks: Optional[list[LayoutRackTemplateSchema]] = None,
+    ) -> LayoutSectionInputSchema:
+        if racks is None:
+            racks = [LayoutRackTemplateSchemaFactory().generate(quantity=2)]
+        return self.schema_class(
+            section_name=section_name or self.faker.ecommerce_name(),
+            max_weight=max_weight or Decimal(100000),
+            max_racks=max_racks or sum(rack.quantity for rack in racks) + 1,
+            racks=racks,
+        )
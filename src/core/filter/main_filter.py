@@ -8,6 +8,10 @@ from sqlalchemy.orm import aliased
 from sqlalchemy.sql.expression import Select
 
 from src.core.exceptions import NoSuchFieldException, UnavailableFilterFieldException
+from src.core.utils.search import contains_condition, search_condition
+
+# operations without an operator module counterpart, backed by trigram indexes
+TEXT_SEARCH_OPERATIONS = ("contains", "search")
 
 
 class Filter(Select):
@@ -40,6 +44,18 @@ class Filter(Select):
     def __ne__(self, other):
         return self._apply_operator(operator.ne, other)
 
+    def contains(self, other):
+        return self._apply_text_search(contains_condition, other)
+
+    def search(self, other):
+        return self._apply_text_search(search_condition, other)
+
+    def _apply_text_search(self, condition, other):
+        attr_check = getattr(self.current_model, self.field)
+        if not isinstance(attr_check.type, String):
+            raise UnavailableFilterFieldException
+        return self.inst.filter(condition(attr_check, other))
+
     def _apply_operator_base(self, other):
         attr_check = getattr(self.current_model, self.field)
         if isinstance(attr_check.type, Boolean):
@@ -78,7 +94,10 @@ class Filter(Select):
             raise UnavailableFilterFieldException
 
         try:
-            inst = getattr(operator, operation)(self, value)
+            if operation in TEXT_SEARCH_OPERATIONS:
+                inst = getattr(self, operation)(value)
+            else:
+                inst = getattr(operator, operation)(self, value)
             result = Filter(self.main_model, inst, self.current_model)
             return result
         except AttributeError:
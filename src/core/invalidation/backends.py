@@ -0,0 +1,189 @@
+import asyncio
+import logging
+from typing import Callable, Optional
+
+import asyncpg
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.invalidation.events import ALL_CHANGED, InvalidationEvent
+
+logger = logging.getLogger(__name__)
+
+PENDING_EVENTS = "pending_invalidation_events"
+
+ChannelCallbacks = tuple[Callable[..., None], Callable[[], None]]
+
+
+class PostgresListener:
+    # every channel of a worker process is listened to over a single
+    # connection, which is opened again whenever it is lost
+    def __init__(self, dsn: str, reconnect_delay: float) -> None:
+        self.dsn = dsn
+        self.reconnect_delay = reconnect_delay
+        self.channels: dict[str, ChannelCallbacks] = {}
+        self.listened_channels: set[str] = set()
+        self.connection: Optional[asyncpg.Connection] = None
+        self.task: Optional[asyncio.Task] = None
+
+    async def add_channel(self, channel: str) -> None:
+        receive, resync = self.channels[channel]
+        await self.connection.add_listener(channel, receive)
+        self.listened_channels.add(channel)
+        # nothing was received while the channel had no listener
+        resync()
+
+    async def run(self) -> None:
+        while True:
+            try:
+                connection = await asyncpg.connect(self.dsn)
+            except (OSError, asyncpg.PostgresError):
+                logger.exception("Postgres listener could not connect")
+                await asyncio.sleep(self.reconnect_delay)
+                continue
+
+            lost = asyncio.Event()
+            connection.add_termination_listener(lambda connection: lost.set())
+            self.connection = connection
+            try:
+                for channel in list(self.channels):
+                    await self.add_channel(channel)
+                await lost.wait()
+                logger.warning("Postgres listener lost its connection")
+            finally:
+                self.listened_channels.clear()
+                self.connection = None
+                await connection.close()
+            await asyncio.sleep(self.reconnect_delay)
+
+    async def listen(
+        self,
+        channel: str,
+        receive: Callable[[str], None],
+        resync: Callable[[], None],
+    ) -> None:
+        # runs until it is cancelled, resync is called on every (re)connect
+        def receive_payload(connection, pid, channel, payload) -> None:
+            receive(payload)
+
+        self.channels[channel] = (receive_payload, resync)
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+        elif self.connection is not None:
+            await self.add_channel(channel)
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await self.remove_channel(channel)
+
+    async def remove_channel(self, channel: str) -> None:
+        receive, _ = self.channels.pop(channel)
+        if channel in self.listened_channels:
+            self.listened_channels.discard(channel)
+            await self.connection.remove_listener(channel, receive)
+        if not self.channels and self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+
+postgres_listeners: dict[str, PostgresListener] = {}
+
+
+def get_postgres_listener(dsn: str, reconnect_delay: float) -> PostgresListener:
+    if dsn not in postgres_listeners:
+        postgres_listeners[dsn] = PostgresListener(dsn, reconnect_delay)
+    return postgres_listeners[dsn]
+
+
+class PostgresInvalidationBackend:
+    def __init__(self, dsn: str, channel: str, reconnect_delay: float) -> None:
+        self.listener = get_postgres_listener(dsn, reconnect_delay)
+        self.channel = channel
+
+    @property
+    def listening(self) -> bool:
+        return self.channel in self.listener.listened_channels
+
+    async def publish(
+        self, session: AsyncSession, invalidation: InvalidationEvent
+    ) -> None:
+        # notifications are queued by the transaction and delivered on commit
+        # only, identical ones sent within a single transaction arrive once
+        await session.execute(select(func.pg_notify(self.channel, invalidation.json())))
+
+    async def listen(self, callback: Callable[[InvalidationEvent], None]) -> None:
+        await self.listener.listen(
+            self.channel,
+            lambda payload: callback(InvalidationEvent.parse_raw(payload)),
+            lambda: callback(InvalidationEvent(kind=ALL_CHANGED)),
+        )
+
+    async def close(self) -> None:
+        pass
+
+
+class RedisInvalidationBackend:
+    def __init__(self, url: str, channel: str, reconnect_delay: float) -> None:
+        from redis import asyncio as redis
+
+        self.redis = redis
+        self.client = redis.from_url(url)
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self.listening = False
+        self.sending: set[asyncio.Task] = set()
+
+    async def publish(
+        self, session: AsyncSession, invalidation: InvalidationEvent
+    ) -> None:
+        # redis knows nothing about the transaction, so events are held by the
+        # session until it commits and dropped when it rolls back
+        sync_session = session.sync_session
+        if PENDING_EVENTS not in sync_session.info:
+            sync_session.info[PENDING_EVENTS] = []
+            event.listen(sync_session, "after_commit", self.send_pending)
+            event.listen(sync_session, "after_rollback", self.drop_pending)
+        sync_session.info[PENDING_EVENTS].append(invalidation)
+
+    def send_pending(self, sync_session) -> None:
+        invalidations = sync_session.info[PENDING_EVENTS]
+        sync_session.info[PENDING_EVENTS] = []
+        if invalidations:
+            task = asyncio.get_running_loop().create_task(self.send(invalidations))
+            self.sending.add(task)
+            task.add_done_callback(self.sending.discard)
+
+    def drop_pending(self, sync_session) -> None:
+        sync_session.info[PENDING_EVENTS] = []
+
+    async def send(self, invalidations: list[InvalidationEvent]) -> None:
+        try:
+            for invalidation in invalidations:
+                await self.client.publish(self.channel, invalidation.json())
+        except (self.redis.RedisError, OSError):
+            logger.exception("Invalidation events could not be published")
+
+    async def listen(self, callback: Callable[[InvalidationEvent], None]) -> None:
+        while True:
+            pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.channel)
+                self.listening = True
+                callback(InvalidationEvent(kind=ALL_CHANGED))
+                async for message in pubsub.listen():
+                    callback(InvalidationEvent.parse_raw(message["data"]))
+            except (self.redis.RedisError, OSError):
+                logger.exception("Invalidation listener lost its connection")
+            finally:
+                self.listening = False
+                await pubsub.reset()
+            await asyncio.sleep(self.reconnect_delay)
+
+    async def close(self) -> None:
+        if self.sending:
+            await asyncio.gather(*self.sending)
+        await self.client.close()
@@ -0,0 +1,115 @@
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Any, Callable, Optional, Union
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.invalidation.backends import (
+    PostgresInvalidationBackend,
+    RedisInvalidationBackend,
+)
+from src.core.invalidation.events import ALL_CHANGED, InvalidationEvent
+from src.settings.db_settings import DatabaseSettings
+from src.settings.invalidation_settings import InvalidationSettings, settings
+
+logger = logging.getLogger(__name__)
+
+InvalidationBackend = Union[PostgresInvalidationBackend, RedisInvalidationBackend]
+
+
+class InvalidationBus:
+    def __init__(
+        self,
+        backend: InvalidationBackend,
+        max_ids: int = settings.INVALIDATION_EVENT_MAX_IDS,
+    ) -> None:
+        self.backend = backend
+        self.max_ids = max_ids
+        self.handlers: dict[str, list[Callable[[InvalidationEvent], None]]] = (
+            defaultdict(list)
+        )
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def listening(self) -> bool:
+        # while nothing listens, caches can not learn about changes
+        return self.task is not None and self.backend.listening
+
+    def register(self, kind: str, handler: Callable[[InvalidationEvent], None]) -> None:
+        # handlers also receive ALL_CHANGED events and run on the event loop,
+        # so they should only drop cache entries
+        InvalidationEvent(kind=kind)
+        self.handlers[kind].append(handler)
+
+    async def publish(self, session: AsyncSession, kind: str, *ids: Any) -> None:
+        ids = [str(id) for id in ids]
+        # large batches are split, so every event fits into a single
+        # notification, and nothing is sent when nothing changed
+        for index in range(0, len(ids), self.max_ids):
+            await self.backend.publish(
+                session,
+                InvalidationEvent(kind=kind, ids=ids[index : index + self.max_ids]),
+            )
+
+    def get_handlers(self, kind: str) -> list[Callable[[InvalidationEvent], None]]:
+        if kind != ALL_CHANGED:
+            return self.handlers[kind]
+        handlers = []
+        for kind_handlers in self.handlers.values():
+            handlers += [
+                handler for handler in kind_handlers if handler not in handlers
+            ]
+        return handlers
+
+    def dispatch(self, invalidation: InvalidationEvent) -> None:
+        for handler in self.get_handlers(invalidation.kind):
+            try:
+                handler(invalidation)
+            except Exception:
+                logger.exception("Invalidation handler %r failed", handler)
+
+    def start(self) -> None:
+        self.task = asyncio.create_task(self.backend.listen(self.dispatch))
+
+    async def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+        await self.backend.close()
+
+
+def build_invalidation_backend(
+    invalidation_settings: InvalidationSettings,
+) -> InvalidationBackend:
+    if invalidation_settings.INVALIDATION_BACKEND == "postgres":
+        return PostgresInvalidationBackend(
+            DatabaseSettings(ASYNC=False).postgres_url,
+            invalidation_settings.INVALIDATION_CHANNEL,
+            invalidation_settings.INVALIDATION_RECONNECT_DELAY,
+        )
+    if invalidation_settings.INVALIDATION_BACKEND == "redis":
+        return RedisInvalidationBackend(
+            invalidation_settings.INVALIDATION_REDIS_URL,
+            invalidation_settings.INVALIDATION_CHANNEL,
+            invalidation_settings.INVALIDATION_RECONNECT_DELAY,
+        )
+    raise ValueError(
+        f"Unknown invalidation backend: {invalidation_settings.INVALIDATION_BACKEND}"
+    )
+
+
+invalidation_bus = InvalidationBus(build_invalidation_backend(settings))
+
+
+async def start_invalidation_bus() -> None:
+    if settings.INVALIDATION_LISTENER_ENABLED:
+        invalidation_bus.start()
+
+
+async def stop_invalidation_bus() -> None:
+    await invalidation_bus.stop()
@@ -0,0 +1,30 @@
+from pydantic import BaseModel, validator
+
+CATEGORY_CHANGED = "category"
+PRODUCT_CHANGED = "product"
+USER_CHANGED = "user"
+LAYOUT_CHANGED = "layout"
+RACK_LEVEL_CAPACITY_CHANGED = "rack_level_capacity"
+# dispatched locally when notifications could have been missed (e.g. while
+# the listener reconnected), every handler has to drop all of its entries
+ALL_CHANGED = "all"
+
+EVENT_KINDS = {
+    CATEGORY_CHANGED,
+    PRODUCT_CHANGED,
+    USER_CHANGED,
+    LAYOUT_CHANGED,
+    RACK_LEVEL_CAPACITY_CHANGED,
+    ALL_CHANGED,
+}
+
+
+class InvalidationEvent(BaseModel):
+    kind: str
+    ids: list[str] = []
+
+    @validator("kind")
+    def validate_kind(cls, kind: str) -> str:
+        if kind not in EVENT_KINDS:
+            raise ValueError(f"Unknown invalidation event kind: {kind}")
+        return kind
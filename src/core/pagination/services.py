@@ -38,3 +38,24 @@ async def paginate(
         ],
         has_next_page=next_page_check,
     )
+
+
+def paginate_list(
+    items: list,
+    response_schema: BaseModel,
+    page_params: PageParams,
+) -> PagedResponseSchema[T]:
+    offset = (page_params.page - 1) * page_params.size
+    page_items = items[offset : offset + page_params.size]
+
+    return PagedResponseSchema(
+        total=len(items),
+        total_on_page=len(page_items),
+        page=page_params.page,
+        size=page_params.size,
+        results=[
+            item if type(item) is response_schema else response_schema.from_orm(item)
+            for item in page_items
+        ],
+        has_next_page=(len(items) - offset) > page_params.size,
+    )
@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Optional
 
 from src.apps.users.models import User
 from src.core.exceptions import AuthorizationException
@@ -44,3 +44,17 @@ async def check_if_owner(request_user: User, attribute: str, value: Any) -> bool
             "You don't have permissions to access the resource"
         )
     return True
+
+
+async def get_user_warehouse_id(
+    request_user: User, warehouse_id: Optional[str] = None
+) -> Optional[str]:
+    # users assigned to a warehouse work in it only, staff may switch to
+    # another one and unassigned users are not scoped unless they ask
+    if request_user.warehouse_id is None:
+        return warehouse_id
+    if not (warehouse_id in (None, request_user.warehouse_id) or request_user.is_staff):
+        raise AuthorizationException(
+            "You don't have permissions to access the warehouse"
+        )
+    return warehouse_id or request_user.warehouse_id
@@ -2,6 +2,8 @@ from copy import copy
 
 PAGINATION_PARAMS_HEADERS = ["page", "size"]
 SORT_PARAMS_HEADER = "sort"
+# resolved into the warehouse scope of the request instead of filtering
+SCOPE_PARAMS_HEADERS = ["warehouse_id"]
 FORBIDDEN_FIELDS = [
     "id",
     "password",
@@ -21,4 +23,6 @@ FORBIDDEN_FIELDS = [
 ]
 
 PAGINATION_PARAMS_HEADERS_COPY = copy(PAGINATION_PARAMS_HEADERS)
-PARAM_HEADERS_WITHOUT_FILTERS = PAGINATION_PARAMS_HEADERS_COPY + [SORT_PARAMS_HEADER]
+PARAM_HEADERS_WITHOUT_FILTERS = (
+    PAGINATION_PARAMS_HEADERS_COPY + SCOPE_PARAMS_HEADERS + [SORT_PARAMS_HEADER]
+)
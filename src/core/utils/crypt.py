@@ -1,7 +1,23 @@
+from typing import Optional
+
 from passlib.context import CryptContext
 
+from src.core.utils.offload import cpu_offloader
+
 passwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
-async def hash_user_password(password: str) -> str:
+def hash_password(password: str) -> str:
     return passwd_context.hash(password)
+
+
+def verify_password(password: str, password_hash: Optional[str]) -> bool:
+    return passwd_context.verify(password, password_hash)
+
+
+async def hash_user_password(password: str) -> str:
+    return await cpu_offloader.run(hash_password, password)
+
+
+async def verify_user_password(password: str, password_hash: Optional[str]) -> bool:
+    return await cpu_offloader.run(verify_password, password, password_hash)
@@ -0,0 +1,25 @@
+import argparse
+
+from src.database.db_connection import Base
+from src.settings.alembic import *
+
+DEFAULT_OUTPUT = "warehouse-ms-erd.png"
+
+
+def render_erd(output: str = DEFAULT_OUTPUT) -> None:
+    from eralchemy2 import render_er
+
+    render_er(Base, output)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Render the database ERD")
+    parser.add_argument("output", nargs="?", default=DEFAULT_OUTPUT)
+    arguments = parser.parse_args()
+
+    render_erd(arguments.output)
+    print(f"ERD saved to {arguments.output}")
+
+
+if __name__ == "__main__":
+    main()
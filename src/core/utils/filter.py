@@ -6,6 +6,7 @@ from src.core.utils.constants import (
     FORBIDDEN_FIELDS,
     PAGINATION_PARAMS_HEADERS,
     PARAM_HEADERS_WITHOUT_FILTERS,
+    SCOPE_PARAMS_HEADERS,
     SORT_PARAMS_HEADER,
 )
 from src.core.utils.sort import sort_instances
@@ -36,7 +37,9 @@ def filter_instances(query_params: list[tuple], instances, model):
 def filter_and_sort_instances(query_params: list[tuple], instances, model):
     params_keys = [param[0] for param in query_params]
     pagination_keys = [
-        param for param in params_keys if param in PAGINATION_PARAMS_HEADERS
+        param
+        for param in params_keys
+        if param in PAGINATION_PARAMS_HEADERS + SCOPE_PARAMS_HEADERS
     ]
     if pagination_keys == params_keys:
         return instances
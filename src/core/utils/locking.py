@@ -0,0 +1,146 @@
+import asyncio
+import random
+from collections import defaultdict
+from functools import wraps
+from typing import Any, Awaitable, Callable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
+
+from src.apps.rack_level_slots.models import RackLevelSlot
+from src.apps.rack_levels.models import RackLevel
+from src.apps.racks.models import Rack
+from src.apps.sections.models import Section
+from src.apps.stocks.models import Stock
+from src.apps.waiting_rooms.models import WaitingRoom
+from src.core.exceptions import ConcurrentStockMovementException
+
+# every movement locks the rows it touches in this order (parents first),
+# rows of a single table are locked in ascending id order
+LOCK_ORDER = (Section, Rack, RackLevel, RackLevelSlot, WaitingRoom, Stock)
+
+DEADLOCK_DETECTED = "40P01"
+SERIALIZATION_FAILURE = "40001"
+RETRYABLE_SQLSTATES = {DEADLOCK_DETECTED, SERIALIZATION_FAILURE}
+
+LOCK_RETRY_ATTEMPTS = 5
+LOCK_RETRY_BASE_DELAY = 0.05
+LOCK_RETRY_MAX_DELAY = 1.0
+
+
+class LockSet:
+    def __init__(self) -> None:
+        self.rows: dict[Any, set[str]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        return sum(len(ids) for ids in self.rows.values())
+
+    def add(self, model: Any, row_id: Optional[str]) -> "LockSet":
+        if row_id is not None:
+            self.rows[model].add(row_id)
+        return self
+
+    def update(self, other: "LockSet") -> "LockSet":
+        for model, row_ids in other.rows.items():
+            self.rows[model] |= row_ids
+        return self
+
+    def add_rack_level(self, rack_level: RackLevel) -> "LockSet":
+        self.add(RackLevel, rack_level.id)
+        self.add(Rack, rack_level.rack_id)
+        self.add(Section, rack_level.rack.section_id)
+        return self
+
+    def add_rack_level_slot(self, rack_level_slot: RackLevelSlot) -> "LockSet":
+        self.add(RackLevelSlot, rack_level_slot.id)
+        return self.add_rack_level(rack_level_slot.rack_level)
+
+    def add_stock(self, stock: Stock) -> "LockSet":
+        self.add(Stock, stock.id)
+        self.add(WaitingRoom, stock.waiting_room_id)
+        if stock.rack_level_slot:
+            self.add_rack_level_slot(stock.rack_level_slot)
+        return self
+
+    def ordered(self) -> list[tuple[Any, list[str]]]:
+        return [
+            (model, sorted(self.rows[model]))
+            for model in LOCK_ORDER
+            if self.rows.get(model)
+        ]
+
+
+async def lock_rows(session: AsyncSession, lock_set: LockSet) -> None:
+    for model, row_ids in lock_set.ordered():
+        statement = (
+            select(model)
+            .where(model.id.in_(row_ids))
+            .order_by(model.id)
+            .with_for_update(of=model)
+            .execution_options(populate_existing=True)
+        )
+        locked_rows = await session.scalars(statement)
+        locked_rows.unique().all()
+
+
+async def lock_stock_movement(
+    session: AsyncSession, stocks: list[Stock], targets: Optional[LockSet] = None
+) -> None:
+    for _ in range(LOCK_RETRY_ATTEMPTS):
+        lock_set = LockSet().update(targets) if targets else LockSet()
+        for stock in stocks:
+            lock_set.add_stock(stock)
+        sources = [
+            (stock.waiting_room_id, stock.rack_level_slot_id) for stock in stocks
+        ]
+
+        await lock_rows(session, lock_set)
+        # a concurrent movement could have relocated a stock before it was locked
+        if sources == [
+            (stock.waiting_room_id, stock.rack_level_slot_id) for stock in stocks
+        ]:
+            return
+    raise ConcurrentStockMovementException(LOCK_RETRY_ATTEMPTS)
+
+
+def is_retryable_error(exception: Exception) -> bool:
+    if isinstance(exception, StaleDataError):
+        return True
+    sqlstate = getattr(exception.orig, "sqlstate", None) or getattr(
+        exception.orig, "pgcode", None
+    )
+    return sqlstate in RETRYABLE_SQLSTATES
+
+
+def get_retry_delay(
+    attempt: int,
+    base_delay: float = LOCK_RETRY_BASE_DELAY,
+    max_delay: float = LOCK_RETRY_MAX_DELAY,
+) -> float:
+    return random.uniform(0, min(max_delay, base_delay * 2**attempt))
+
+
+def retry_on_lock_conflict(
+    attempts: int = LOCK_RETRY_ATTEMPTS,
+    base_delay: float = LOCK_RETRY_BASE_DELAY,
+    max_delay: float = LOCK_RETRY_MAX_DELAY,
+) -> Callable:
+    def decorator(service: Callable[..., Awaitable]) -> Callable[..., Awaitable]:
+        @wraps(service)
+        async def wrapper(session: AsyncSession, *args, **kwargs) -> Any:
+            for attempt in range(1, attempts + 1):
+                try:
+                    return await service(session, *args, **kwargs)
+                except (DBAPIError, StaleDataError) as exception:
+                    if not is_retryable_error(exception):
+                        raise
+                    await session.rollback()
+                    if attempt == attempts:
+                        raise ConcurrentStockMovementException(attempts) from exception
+                    await asyncio.sleep(get_retry_delay(attempt, base_delay, max_delay))
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,109 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+from weakref import WeakKeyDictionary
+
+from pydantic import BaseModel
+
+from src.settings.offload_settings import settings
+
+EXECUTOR_TYPES = {"thread": ThreadPoolExecutor, "process": ProcessPoolExecutor}
+
+
+class OffloadMetrics(BaseModel):
+    queued: int
+    running: int
+    completed: int
+    failed: int
+    peak_queued: int
+    peak_running: int
+    total_wait_time: float
+    total_run_time: float
+
+
+class CPUOffloader:
+    def __init__(
+        self, executor_type: str, max_workers: int, max_concurrency: int
+    ) -> None:
+        if executor_type not in EXECUTOR_TYPES:
+            raise ValueError(f"Unknown executor type: {executor_type}")
+        self.executor_type = executor_type
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency
+        self.executor: Optional[Executor] = None
+        self.semaphores: WeakKeyDictionary = WeakKeyDictionary()
+        self.reset_metrics()
+
+    def reset_metrics(self) -> None:
+        self.queued = self.running = self.completed = self.failed = 0
+        self.peak_queued = self.peak_running = 0
+        self.total_wait_time = self.total_run_time = 0.0
+
+    def get_executor(self) -> Executor:
+        if self.executor is None:
+            self.executor = EXECUTOR_TYPES[self.executor_type](
+                max_workers=self.max_workers
+            )
+        return self.executor
+
+    def get_semaphore(self, loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+        # a semaphore belongs to the loop it was first awaited on
+        if (semaphore := self.semaphores.get(loop)) is None:
+            semaphore = self.semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+    async def run(self, function: Callable, *args: Any, **kwargs: Any) -> Any:
+        # functions have to be picklable (module level) for the process executor
+        loop = asyncio.get_running_loop()
+        semaphore = self.get_semaphore(loop)
+        self.queued += 1
+        self.peak_queued = max(self.peak_queued, self.queued)
+        queued_at = time.perf_counter()
+        try:
+            await semaphore.acquire()
+        finally:
+            self.queued -= 1
+
+        started_at = time.perf_counter()
+        self.total_wait_time += started_at - queued_at
+        self.running += 1
+        self.peak_running = max(self.peak_running, self.running)
+        try:
+            result = await loop.run_in_executor(
+                self.get_executor(), partial(function, *args, **kwargs)
+            )
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.running -= 1
+            self.total_run_time += time.perf_counter() - started_at
+            semaphore.release()
+        self.completed += 1
+        return result
+
+    def get_metrics(self) -> OffloadMetrics:
+        return OffloadMetrics(
+            queued=self.queued,
+            running=self.running,
+            completed=self.completed,
+            failed=self.failed,
+            peak_queued=self.peak_queued,
+            peak_running=self.peak_running,
+            total_wait_time=self.total_wait_time,
+            total_run_time=self.total_run_time,
+        )
+
+    def shutdown(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+
+
+cpu_offloader = CPUOffloader(
+    settings.CPU_OFFLOAD_EXECUTOR,
+    settings.CPU_OFFLOAD_WORKERS,
+    settings.CPU_OFFLOAD_MAX_CONCURRENCY,
+)
@@ -1,8 +1,11 @@
 import uuid
-from typing import Any
+from typing import Any, Optional
 
 from sqlalchemy import Table, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
+
+from src.core.exceptions import StaleVersionException
 
 
 async def if_exists(model_class: Table, field: str, value: Any, session: AsyncSession):
@@ -11,6 +14,24 @@ async def if_exists(model_class: Table, field: str, value: Any, session: AsyncSe
     )
 
 
+def check_object_version(instance: Any, expected_version: Optional[int]) -> None:
+    if expected_version is not None and instance.version_id != expected_version:
+        raise StaleVersionException(type(instance).__name__, instance.id)
+
+
+async def update_versioned_object(
+    session: AsyncSession, instance: Any, values: dict
+) -> None:
+    # the flush writes the values together with the state changes made
+    # before, in a single UPDATE guarded and bumped by the version column
+    for field, value in values.items():
+        setattr(instance, field, value)
+    try:
+        await session.flush()
+    except StaleDataError:
+        raise StaleVersionException(type(instance).__name__, instance.id)
+
+
 def default_available_slots(context):
     return context.get_current_parameters()["max_stocks"]
 
@@ -0,0 +1,42 @@
+import uuid
+
+from sqlalchemy import DDL, Table, event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# tables list-partitioned by warehouse_id, every warehouse gets its own
+# partition when it is created and rows of the others are pruned away
+warehouse_partitioned_tables: list[str] = []
+
+
+def partition_by_warehouse(table: Table) -> None:
+    warehouse_partitioned_tables.append(table.name)
+    # rows of a warehouse without its own partition land here instead of failing
+    event.listen(
+        table,
+        "after_create",
+        DDL(f"CREATE TABLE {table.name}_default PARTITION OF {table.name} DEFAULT"),
+    )
+
+
+def get_partition_name(table_name: str, warehouse_id: str) -> str:
+    return f"{table_name}_{uuid.UUID(warehouse_id).hex}"
+
+
+def get_partition_statements(warehouse_id: str) -> list[str]:
+    # the uuid check in get_partition_name keeps the literal safe
+    return [
+        f"CREATE TABLE IF NOT EXISTS {get_partition_name(table_name, warehouse_id)} "
+        f"PARTITION OF {table_name} FOR VALUES IN ('{warehouse_id}')"
+        for table_name in warehouse_partitioned_tables
+    ]
+
+
+async def create_warehouse_partitions(session: AsyncSession, warehouse_id: str) -> None:
+    for statement in get_partition_statements(warehouse_id):
+        await session.execute(text(statement))
+
+
+async def drop_warehouse_partitions(session: AsyncSession, warehouse_id: str) -> None:
+    for table_name in warehouse_partitioned_tables:
+        partition_name = get_partition_name(table_name, warehouse_id)
+        await session.execute(text(f"DROP TABLE IF EXISTS {partition_name}"))
@@ -0,0 +1,31 @@
+from sqlalchemy import Index, func
+
+TRIGRAM_OPERATOR_CLASS = "gin_trgm_ops"
+
+
+def trigram_index(table_name: str, column_name: str) -> Index:
+    # serves ILIKE '%...%' as well as the trigram similarity operators
+    return Index(
+        f"ix_{table_name}_{column_name}_trgm",
+        column_name,
+        postgresql_using="gin",
+        postgresql_ops={column_name: TRIGRAM_OPERATOR_CLASS},
+    )
+
+
+def escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def contains_condition(column, value: str):
+    return column.ilike(f"%{escape_like(value)}%")
+
+
+def search_condition(column, value: str):
+    # true when word_similarity(value, column) exceeds
+    # pg_trgm.word_similarity_threshold, tolerates typos in the searched words
+    return column.op("%>")(value)
+
+
+def search_rank(column, value: str):
+    return func.coalesce(func.word_similarity(value, column), 0)
@@ -0,0 +1,54 @@
+from sqlalchemy import DDL, BigInteger, Column, FetchedValue, Index, Table, event
+
+from src.database.db_connection import Base
+
+# every row is stamped with the 64-bit id of the transaction that wrote it,
+# deleted rows leave a tombstone stamped the same way
+CHANGE_TRACKING_FUNCTIONS = """
+CREATE OR REPLACE FUNCTION stamp_change_xid() RETURNS trigger AS $$
+BEGIN
+    NEW.change_xid := pg_current_xact_id()::text::bigint;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION record_sync_tombstone() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO sync_tombstone (resource, entity_id, change_xid, deleted_at)
+    VALUES (TG_TABLE_NAME, OLD.id, pg_current_xact_id()::text::bigint, now());
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+event.listen(Base.metadata, "before_create", DDL(CHANGE_TRACKING_FUNCTIONS))
+
+
+def change_xid_column() -> Column:
+    # written by the triggers only, so raw SQL and bulk statements are
+    # tracked just like the ORM
+    return Column(
+        BigInteger,
+        nullable=False,
+        server_default=FetchedValue(),
+        server_onupdate=FetchedValue(),
+    )
+
+
+def change_index(table_name: str) -> Index:
+    return Index(f"ix_{table_name}_change_xid", "change_xid", "id")
+
+
+def track_changes(table: Table) -> None:
+    event.listen(
+        table,
+        "after_create",
+        DDL(
+            f"CREATE TRIGGER {table.name}_stamp_change "
+            f"BEFORE INSERT OR UPDATE ON {table.name} "
+            f"FOR EACH ROW EXECUTE FUNCTION stamp_change_xid();"
+            f"CREATE TRIGGER {table.name}_sync_tombstone "
+            f"AFTER DELETE ON {table.name} "
+            f"FOR EACH ROW EXECUTE FUNCTION record_sync_tombstone();"
+        ),
+    )
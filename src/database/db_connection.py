@@ -1,12 +1,71 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from typing import Any
+
+from sqlalchemy import DDL, event
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
+from src.database.replica import ReplicaLagMonitor
 from src.settings.db_settings import settings
 
 engine = create_async_engine(
     settings.postgres_url, echo=True, future=True, pool_size=15, max_overflow=64
 )
+# statements of read-only sessions run outside of a transaction block, so they
+# do not pay for BEGIN and COMMIT round trips
+read_only_engine = engine.execution_options(isolation_level="AUTOCOMMIT")
+
+replica_engine = replica_read_only_engine = replica_monitor = None
+if settings.replica_url:
+    replica_engine = create_async_engine(
+        settings.replica_url, future=True, pool_size=15, max_overflow=64
+    )
+    replica_read_only_engine = replica_engine.execution_options(
+        isolation_level="AUTOCOMMIT"
+    )
+    replica_monitor = ReplicaLagMonitor(
+        replica_engine,
+        settings.REPLICA_MAX_LAG,
+        settings.REPLICA_LAG_CHECK_INTERVAL,
+        settings.REPLICA_LAG_CHECK_TIMEOUT,
+    )
+
+
+class ReadOnlySyncSession(Session):
+    pass
+
+
+@event.listens_for(ReadOnlySyncSession, "before_flush")
+def prevent_read_only_flush(session: Session, flush_context: Any, instances: Any):
+    if session.new or session.deleted or session.dirty:
+        raise InvalidRequestError("Read-only session cannot flush changes")
+
+
+@event.listens_for(Session, "after_flush")
+def track_feed_changes(session: Session, flush_context: Any):
+    # imported on use, the feed depends on the models built on top of this module
+    from src.apps.feed.tracking import publish_feed_changes
+
+    publish_feed_changes(session)
+
+
+class ReadOnlySession(AsyncSession):
+    # the connection is checked out on the first statement and given back to the
+    # pool as soon as its result is buffered, loaded objects stay in the session
+
+    async def execute(self, *args: Any, **kwargs: Any) -> Any:
+        try:
+            return await super().execute(*args, **kwargs)
+        finally:
+            await self.commit()
+
+    async def get(self, *args: Any, **kwargs: Any) -> Any:
+        try:
+            return await super().get(*args, **kwargs)
+        finally:
+            await self.commit()
+
 
 async_session = sessionmaker(
     autocommit=False,
@@ -16,4 +75,29 @@ async_session = sessionmaker(
     class_=AsyncSession,
 )
 
+read_only_session = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    bind=read_only_engine,
+    expire_on_commit=False,
+    class_=ReadOnlySession,
+    sync_session_class=ReadOnlySyncSession,
+)
+
+
+async def get_read_only_engine(write_intent: bool = False) -> AsyncEngine:
+    # reads of requests that also write stay on the primary, so they see their
+    # own changes, and so do all reads while the replica lags behind too much
+    if write_intent or replica_monitor is None:
+        return read_only_engine
+    if not await replica_monitor.is_fresh():
+        return read_only_engine
+    return replica_read_only_engine
+
+
 Base = declarative_base()
+
+# trigram indexes of the searchable text columns need the extension
+event.listen(
+    Base.metadata, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+)
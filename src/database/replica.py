@@ -0,0 +1,61 @@
+import asyncio
+import time
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# a replica that replayed everything it received is up to date even if the
+# last replayed transaction is old, but only while its WAL receiver streams -
+# a disconnected standby has nothing left to replay and looks fresh forever.
+# Roles without pg_read_all_stats see a null status, an existing receiver
+# process is trusted then. A primary has no lag at all.
+REPLICA_LAG_QUERY = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN NOT EXISTS (
+            SELECT 1 FROM pg_stat_wal_receiver
+            WHERE COALESCE(status, 'streaming') = 'streaming'
+        ) THEN NULL
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(
+            EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0
+        )
+    END
+    """)
+
+
+class ReplicaLagMonitor:
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        max_lag: float,
+        check_interval: float,
+        check_timeout: float = 0.5,
+    ) -> None:
+        self.engine = engine
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.check_timeout = check_timeout
+        self.lag: Optional[float] = None
+        self.checked_at = float("-inf")
+
+    async def fetch_lag(self) -> Optional[float]:
+        async with self.engine.connect() as connection:
+            lag = await connection.scalar(REPLICA_LAG_QUERY)
+        return None if lag is None else float(lag)
+
+    async def check_lag(self) -> Optional[float]:
+        # an unreachable replica must not stall the request checking it
+        try:
+            return await asyncio.wait_for(self.fetch_lag(), self.check_timeout)
+        except (DBAPIError, OSError, asyncio.TimeoutError):
+            return None
+
+    async def is_fresh(self) -> bool:
+        if time.monotonic() - self.checked_at >= self.check_interval:
+            # concurrent requests keep using the previous result meanwhile
+            self.checked_at = time.monotonic()
+            self.lag = await self.check_lag()
+        return self.lag is not None and self.lag <= self.max_lag
@@ -1,9 +1,23 @@
+from fastapi import Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database.db_connection import async_session
+from src.database.db_connection import (
+    async_session,
+    get_read_only_engine,
+    read_only_session,
+)
 
 
-async def get_db() -> AsyncSession:
+async def get_db(request: Request) -> AsyncSession:
+    request.state.write_intent = True
     async with async_session() as session:
         yield session
         await session.commit()
+
+
+async def get_read_db(request: Request) -> AsyncSession:
+    bind = await get_read_only_engine(
+        write_intent=getattr(request.state, "write_intent", False)
+    )
+    async with read_only_session(bind=bind) as session:
+        yield session
@@ -10,15 +10,11 @@ from src.core.exceptions import (
     AuthenticationException,
     PasswordNotSetException,
 )
-from src.dependencies.get_db import get_db
+from src.dependencies.get_db import get_read_db
 from src.settings.jwt_settings import AuthJWTSettings
 
 
-async def authenticate_user(
-    auth_jwt: AuthJWT = Depends(), session: AsyncSession = Depends(get_db)
-) -> User:
-    auth_jwt.jwt_required()
-    jwt_subject = auth_jwt.get_jwt_subject()
+async def get_authenticated_user(session: AsyncSession, jwt_subject: str) -> User:
     user = await session.scalar(
         select(User)
         .options(
@@ -31,6 +27,7 @@ async def authenticate_user(
                 User.can_move_stocks,
                 User.can_issue_stocks,
                 User.can_recept_stocks,
+                User.warehouse_id,
             )
         )
         .filter(User.email == jwt_subject)
@@ -46,6 +43,13 @@ async def authenticate_user(
     return user
 
 
+async def authenticate_user(
+    auth_jwt: AuthJWT = Depends(), session: AsyncSession = Depends(get_read_db)
+) -> User:
+    auth_jwt.jwt_required()
+    return await get_authenticated_user(session, auth_jwt.get_jwt_subject())
+
+
 @AuthJWT.load_config
 def get_config():
     return AuthJWTSettings()
@@ -0,0 +1,17 @@
+from typing import Optional
+
+from fastapi import Header
+
+from src.core.exceptions import ServiceException
+
+
+async def get_expected_version(
+    if_match: Optional[str] = Header(default=None),
+) -> Optional[int]:
+    if if_match is None or if_match.strip() == "*":
+        return None
+
+    version = if_match.strip().removeprefix("W/").strip('"')
+    if not version.isdigit():
+        raise ServiceException("If-Match header must contain the object version! ")
+    return int(version)
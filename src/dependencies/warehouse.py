@@ -0,0 +1,14 @@
+from typing import Optional
+
+from fastapi import Depends
+
+from src.apps.users.models import User
+from src.core.permissions import get_user_warehouse_id
+from src.dependencies.user import authenticate_user
+
+
+async def get_warehouse_scope(
+    warehouse_id: Optional[str] = None,
+    request_user: User = Depends(authenticate_user),
+) -> Optional[str]:
+    return await get_user_warehouse_id(request_user, warehouse_id)
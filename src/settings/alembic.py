@@ -1,4 +1,7 @@
+from src.apps.emails.models import *
+from src.apps.inventory.models import *
 from src.apps.issues.models import *
+from src.apps.jobs.models import *
 from src.apps.products.models import *
 from src.apps.rack_level_slots.models import *
 from src.apps.rack_levels.models import *
@@ -6,6 +9,7 @@ from src.apps.racks.models import *
 from src.apps.receptions.models import *
 from src.apps.sections.models import *
 from src.apps.stocks.models import *
+from src.apps.sync.models import *
 from src.apps.users.models import *
 from src.apps.waiting_rooms.models import *
 from src.apps.warehouse.models import *
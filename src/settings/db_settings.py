@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseSettings
 
 
@@ -8,19 +10,42 @@ class DatabaseSettings(BaseSettings):
     POSTGRES_PASSWORD: str
     POSTGRES_PORT: int
     TEST_POSTGRES_DB: str
+    POSTGRES_REPLICA_DB: Optional[str] = None
+    POSTGRES_REPLICA_HOST: Optional[str] = None
+    POSTGRES_REPLICA_PORT: Optional[int] = None
+    TEST_POSTGRES_REPLICA_DB: Optional[str] = None
+    REPLICA_MAX_LAG: float = 5.0
+    REPLICA_LAG_CHECK_INTERVAL: float = 1.0
+    REPLICA_LAG_CHECK_TIMEOUT: float = 0.5
     ASYNC: bool = True
     TESTING: bool = False
 
     class Config:
         env_file = ".env"
 
-    @property
-    def postgres_url(self) -> str:
-        db_name = self.TEST_POSTGRES_DB if self.TESTING else self.POSTGRES_DB
+    def build_url(self, host: str, port: int, db_name: str) -> str:
         db_driver = "postgresql+asyncpg" if self.ASYNC else "postgresql"
         return (
             f"{db_driver}://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@"
-            f"{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{db_name}"
+            f"{host}:{port}/{db_name}"
+        )
+
+    @property
+    def postgres_url(self) -> str:
+        db_name = self.TEST_POSTGRES_DB if self.TESTING else self.POSTGRES_DB
+        return self.build_url(self.POSTGRES_HOST, self.POSTGRES_PORT, db_name)
+
+    @property
+    def replica_url(self) -> Optional[str]:
+        db_name = (
+            self.TEST_POSTGRES_REPLICA_DB if self.TESTING else self.POSTGRES_REPLICA_DB
+        )
+        if not db_name:
+            return None
+        return self.build_url(
+            self.POSTGRES_REPLICA_HOST or self.POSTGRES_HOST,
+            self.POSTGRES_REPLICA_PORT or self.POSTGRES_PORT,
+            db_name,
         )
 
 
@@ -0,0 +1,16 @@
+from pydantic import BaseSettings
+
+
+class FeedSettings(BaseSettings):
+    FEED_ENABLED: bool = True
+    FEED_CHANNEL: str = "live_feed"
+    FEED_RECONNECT_DELAY: float = 1.0
+    FEED_QUEUE_SIZE: int = 256
+    FEED_KEEPALIVE_INTERVAL: float = 15.0
+    FEED_EVENT_MAX_IDS: int = 100
+
+    class Config:
+        env_file = ".env"
+
+
+settings = FeedSettings()
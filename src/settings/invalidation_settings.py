@@ -0,0 +1,17 @@
+from pydantic import BaseSettings
+
+
+class InvalidationSettings(BaseSettings):
+    INVALIDATION_LISTENER_ENABLED: bool = True
+    INVALIDATION_BACKEND: str = "postgres"
+    INVALIDATION_CHANNEL: str = "cache_invalidation"
+    INVALIDATION_REDIS_URL: str = "redis://localhost:6379/0"
+    INVALIDATION_RECONNECT_DELAY: float = 1.0
+    # a notification payload is limited to 8000 bytes
+    INVALIDATION_EVENT_MAX_IDS: int = 100
+
+    class Config:
+        env_file = ".env"
+
+
+settings = InvalidationSettings()
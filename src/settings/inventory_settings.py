@@ -0,0 +1,17 @@
+from pydantic import BaseSettings
+
+
+class InventorySettings(BaseSettings):
+    INVENTORY_CHECKPOINT_ENABLED: bool = True
+    INVENTORY_CHECKPOINT_INTERVAL: float = 21600.0
+    INVENTORY_CHECKPOINT_LAG: float = 300.0
+    CAPACITY_RECONCILIATION_ENABLED: bool = True
+    CAPACITY_RECONCILIATION_INTERVAL: float = 3600.0
+    CAPACITY_RECONCILIATION_REPAIR: bool = False
+    CAPACITY_REPAIR_BATCH_SIZE: int = 100
+
+    class Config:
+        env_file = ".env"
+
+
+settings = InventorySettings()
@@ -0,0 +1,15 @@
+from pydantic import BaseSettings
+
+
+class JobSettings(BaseSettings):
+    JOB_WORKER_ENABLED: bool = True
+    JOB_CONCURRENCY: int = 2
+    JOB_POLL_INTERVAL: float = 1.0
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_RETRY_DELAY: float = 10.0
+    JOB_HEARTBEAT_INTERVAL: float = 10.0
+    JOB_PROGRESS_INTERVAL: float = 2.0
+    JOB_LEASE_TIMEOUT: float = 60.0
+
+    class Config:
+        env_file = ".env"
@@ -0,0 +1,15 @@
+import os
+
+from pydantic import BaseSettings
+
+
+class OffloadSettings(BaseSettings):
+    CPU_OFFLOAD_EXECUTOR: str = "thread"
+    CPU_OFFLOAD_WORKERS: int = os.cpu_count() or 1
+    CPU_OFFLOAD_MAX_CONCURRENCY: int = os.cpu_count() or 1
+
+    class Config:
+        env_file = ".env"
+
+
+settings = OffloadSettings()
@@ -0,0 +1,15 @@
+from pydantic import BaseSettings
+
+
+class OutboxSettings(BaseSettings):
+    OUTBOX_WORKER_ENABLED: bool = True
+    OUTBOX_BATCH_SIZE: int = 50
+    OUTBOX_RATE_LIMIT: float = 10.0
+    OUTBOX_MAX_ATTEMPTS: int = 5
+    OUTBOX_RETRY_DELAY: float = 30.0
+    OUTBOX_POLL_INTERVAL: float = 2.0
+    OUTBOX_IDLE_TIMEOUT: float = 60.0
+    OUTBOX_LEASE_TIMEOUT: float = 300.0
+
+    class Config:
+        env_file = ".env"
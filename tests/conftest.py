@@ -11,7 +11,7 @@ from sqlalchemy.pool import NullPool
 
 from main import app
 from src.database.db_connection import Base
-from src.dependencies.get_db import get_db
+from src.dependencies.get_db import get_db, get_read_db
 from src.settings.alembic import *
 from src.settings.db_settings import DatabaseSettings
 
@@ -64,5 +64,7 @@ def async_client(async_session: AsyncSession) -> AsyncClient:
         yield async_session
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     yield AsyncClient(app=app, base_url="http://localhost:8000/api/")
     del app.dependency_overrides[get_db]
+    del app.dependency_overrides[get_read_db]
@@ -0,0 +1,122 @@
+import asyncpg
+import pytest
+import pytest_asyncio
+
+from benchmarks.seed_warehouse import WarehouseSeeder, WarehouseSeedScale
+from src.settings.db_settings import DatabaseSettings
+
+TINY_SCALE = WarehouseSeedScale(
+    stocks=200,
+    rack_level_slots=300,
+    movements=1_000,
+    products=20,
+    categories=3,
+    users=5,
+    waiting_rooms=3,
+)
+
+
+@pytest_asyncio.fixture
+async def seeded_warehouse() -> tuple[asyncpg.Connection, dict[str, int]]:
+    seeder = WarehouseSeeder(TINY_SCALE, seed=0)
+    seeder.build()
+    connection = await asyncpg.connect(
+        DatabaseSettings(ASYNC=False, TESTING=True).postgres_url
+    )
+    transaction = connection.transaction()
+    await transaction.start()
+    try:
+        yield connection, await seeder.copy_tables(connection)
+    finally:
+        await transaction.rollback()
+        await connection.close()
+
+
+@pytest.mark.asyncio
+async def test_if_tiny_warehouse_is_seeded(
+    seeded_warehouse: tuple[asyncpg.Connection, dict[str, int]],
+):
+    _, loaded = seeded_warehouse
+
+    assert loaded["stock"] == TINY_SCALE.stocks
+    assert loaded["rack_level_slot"] == TINY_SCALE.rack_level_slots
+    assert loaded["user_stock"] >= TINY_SCALE.stocks
+
+
+@pytest.mark.asyncio
+async def test_if_seeded_counters_match_stored_stocks(
+    seeded_warehouse: tuple[asyncpg.Connection, dict[str, int]],
+):
+    connection, _ = seeded_warehouse
+    drifted_rack_levels = await connection.fetchval(
+        "SELECT count(*) FROM rack_level WHERE occupied_slots <> ("
+        "SELECT count(*) FROM stock "
+        "JOIN rack_level_slot ON rack_level_slot.id = stock.rack_level_slot_id "
+        "WHERE rack_level_slot.rack_level_id = rack_level.id)"
+    )
+    drifted_waiting_rooms = await connection.fetchval(
+        "SELECT count(*) FROM waiting_room WHERE occupied_slots <> ("
+        "SELECT count(*) FROM stock WHERE stock.waiting_room_id = waiting_room.id)"
+    )
+
+    assert drifted_rack_levels == 0
+    assert drifted_waiting_rooms == 0
+
+
+@pytest.mark.asyncio
+async def test_if_seeded_history_ends_where_stocks_are(
+    seeded_warehouse: tuple[asyncpg.Connection, dict[str, int]],
+):
+    connection, _ = seeded_warehouse
+    misplaced_stocks = await connection.fetchval(
+        "SELECT count(*) FROM stock JOIN LATERAL ("
+        "SELECT to_waiting_room_id, to_rack_level_slot_id FROM user_stock "
+        "WHERE user_stock.stock_id = stock.id ORDER BY moved_at DESC LIMIT 1"
+        ") last_movement ON true "
+        "WHERE last_movement.to_waiting_room_id "
+        "IS DISTINCT FROM stock.waiting_room_id "
+        "OR last_movement.to_rack_level_slot_id "
+        "IS DISTINCT FROM stock.rack_level_slot_id"
+    )
+
+    assert misplaced_stocks == 0
+
+
+@pytest.mark.asyncio
+async def test_if_seeded_inventory_counters_match_stored_stocks(
+    seeded_warehouse: tuple[asyncpg.Connection, dict[str, int]],
+):
+    connection, loaded = seeded_warehouse
+    drifted_products = await connection.fetchval(
+        "SELECT count(*) FROM ("
+        "SELECT product_id, sum(product_count) AS on_hand_count, "
+        "sum(product_count) FILTER (WHERE waiting_room_id IS NOT NULL) "
+        "AS waiting_room_count, "
+        "sum(product_count) FILTER (WHERE rack_level_slot_id IS NOT NULL) "
+        "AS rack_count "
+        "FROM stock WHERE NOT is_issued GROUP BY product_id"
+        ") actual FULL JOIN product_inventory USING (product_id) "
+        "WHERE COALESCE(actual.on_hand_count, 0) "
+        "<> COALESCE(product_inventory.on_hand_count, 0) "
+        "OR COALESCE(actual.waiting_room_count, 0) "
+        "<> COALESCE(product_inventory.waiting_room_count, 0) "
+        "OR COALESCE(actual.rack_count, 0) "
+        "<> COALESCE(product_inventory.rack_count, 0)"
+    )
+    drifted_sections = await connection.fetchval(
+        "SELECT count(*) FROM ("
+        "SELECT stock.product_id, rack.section_id, "
+        "sum(stock.product_count) AS rack_count FROM stock "
+        "JOIN rack_level_slot ON rack_level_slot.id = stock.rack_level_slot_id "
+        "JOIN rack_level ON rack_level.id = rack_level_slot.rack_level_id "
+        "JOIN rack ON rack.id = rack_level.rack_id "
+        "WHERE NOT stock.is_issued GROUP BY stock.product_id, rack.section_id"
+        ") actual FULL JOIN product_section_inventory "
+        "USING (product_id, section_id) "
+        "WHERE COALESCE(actual.rack_count, 0) "
+        "<> COALESCE(product_section_inventory.rack_count, 0)"
+    )
+
+    assert loaded["product_inventory"] > 0
+    assert drifted_products == 0
+    assert drifted_sections == 0
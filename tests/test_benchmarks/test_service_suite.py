@@ -0,0 +1,26 @@
+from benchmarks.service_suite import SCENARIOS, compare_results
+
+
+def build_results(wall_time: float, statements: int) -> dict:
+    return {
+        "scenarios": {
+            name: {
+                "wall_time": wall_time,
+                "peak_memory": 1024,
+                "statements": statements,
+            }
+            for name in SCENARIOS
+        }
+    }
+
+
+def test_if_results_within_threshold_are_not_reported():
+    assert compare_results(build_results(1.0, 10), build_results(1.1, 10), 0.2) == []
+
+
+def test_if_slower_scenarios_and_extra_statements_are_reported():
+    regressions = compare_results(build_results(1.0, 10), build_results(1.5, 11), 0.2)
+
+    assert len(regressions) == 2 * len(SCENARIOS)
+    assert any("wall_time" in regression for regression in regressions)
+    assert any("statements" in regression for regression in regressions)
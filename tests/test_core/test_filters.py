@@ -120,6 +120,35 @@ async def test_if_objects_can_be_filtered_by_multiple_values_in_the_single_crite
     """
 
 
+@pytest.mark.parametrize(
+    "query_string",
+    ["name__contains=ss warehouse TROL", "name__search=warehouse trolly"],
+)
+@pytest.mark.asyncio
+async def test_if_objects_can_be_filtered_by_partial_or_misspelled_text(
+    async_client: AsyncClient,
+    db_staff_user: UserOutputSchema,
+    staff_auth_headers: dict[str, str],
+    db_products: PagedResponseSchema[ProductOutputSchema],
+    query_string: str,
+):
+    product_data = ProductInputSchemaFactory().generate(
+        name="Stainless Warehouse Trolley"
+    )
+    response = await async_client.post(
+        "products/", content=product_data.json(), headers=staff_auth_headers
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+
+    response = await async_client.get(
+        f"products/?{query_string}", headers=staff_auth_headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert [product["name"] for product in response.json()["results"]] == [
+        product_data.name
+    ]
+
+
 @pytest.mark.asyncio
 async def test_raise_exception_when_using_restricted_field_when_filtering(
     async_client: AsyncClient,
@@ -152,3 +181,14 @@ async def test_raise_exception_when_model_does_not_contain_requested_filter_fiel
             PageParams(),
             query_params=[("no_such_field__eq", "some_value")],
         )
+
+
+@pytest.mark.asyncio
+async def test_raise_exception_when_searching_in_non_text_field(
+    async_session: AsyncSession,
+    db_products: PagedResponseSchema[ProductOutputSchema],
+):
+    with pytest.raises(UnavailableFilterFieldException):
+        await get_all_products(
+            async_session, PageParams(), query_params=[("weight__contains", "1")]
+        )
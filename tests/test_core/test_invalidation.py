@@ -0,0 +1,153 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from src.apps.feed.broadcaster import FeedBroadcaster
+from src.apps.feed.schemas import RESYNC, STOCK_MOVED, FeedEvent, FeedFilter
+from src.core.invalidation.backends import PostgresInvalidationBackend
+from src.core.invalidation.bus import InvalidationBus
+from src.core.invalidation.events import (
+    ALL_CHANGED,
+    CATEGORY_CHANGED,
+    PRODUCT_CHANGED,
+    InvalidationEvent,
+)
+from src.core.utils.utils import generate_uuid
+from src.settings.db_settings import DatabaseSettings
+from src.settings.feed_settings import FeedSettings
+
+
+class RecordingHandler:
+    def __init__(self) -> None:
+        self.events = asyncio.Queue()
+
+    def __call__(self, invalidation: InvalidationEvent) -> None:
+        self.events.put_nowait(invalidation)
+
+    async def next_event(self) -> InvalidationEvent:
+        return await asyncio.wait_for(self.events.get(), timeout=5)
+
+
+@pytest_asyncio.fixture
+async def invalidation_bus() -> InvalidationBus:
+    bus = InvalidationBus(
+        PostgresInvalidationBackend(
+            DatabaseSettings(ASYNC=False, TESTING=True).postgres_url,
+            "test_cache_invalidation",
+            reconnect_delay=0.1,
+        )
+    )
+    yield bus
+    await bus.stop()
+
+
+@pytest_asyncio.fixture
+async def product_handler(invalidation_bus: InvalidationBus) -> RecordingHandler:
+    handler = RecordingHandler()
+    invalidation_bus.register(PRODUCT_CHANGED, handler)
+    invalidation_bus.start()
+    # sent once the listener is connected
+    assert (await handler.next_event()).kind == ALL_CHANGED
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_if_committed_invalidation_is_dispatched(
+    async_engine: AsyncEngine,
+    invalidation_bus: InvalidationBus,
+    product_handler: RecordingHandler,
+):
+    async with AsyncSession(async_engine) as session:
+        await invalidation_bus.publish(session, PRODUCT_CHANGED, "product-id")
+        await session.commit()
+
+    invalidation = await product_handler.next_event()
+
+    assert invalidation.kind == PRODUCT_CHANGED
+    assert invalidation.ids == ["product-id"]
+
+
+@pytest.mark.asyncio
+async def test_if_rolled_back_invalidation_is_not_dispatched(
+    async_engine: AsyncEngine,
+    invalidation_bus: InvalidationBus,
+    product_handler: RecordingHandler,
+):
+    async with AsyncSession(async_engine) as session:
+        await invalidation_bus.publish(session, PRODUCT_CHANGED, "rolled-back")
+        await session.rollback()
+        await invalidation_bus.publish(session, CATEGORY_CHANGED, 1)
+        await invalidation_bus.publish(session, PRODUCT_CHANGED, "committed")
+        await session.commit()
+
+    invalidation = await product_handler.next_event()
+
+    assert invalidation.ids == ["committed"]
+    assert product_handler.events.empty()
+
+
+@pytest.mark.asyncio
+async def test_if_large_invalidation_is_split_into_fitting_notifications(
+    async_engine: AsyncEngine,
+    invalidation_bus: InvalidationBus,
+    product_handler: RecordingHandler,
+):
+    # far above the 8000 bytes a single notification may carry
+    product_ids = [generate_uuid() for _ in range(500)]
+    async with AsyncSession(async_engine) as session:
+        await invalidation_bus.publish(session, PRODUCT_CHANGED)
+        await invalidation_bus.publish(session, PRODUCT_CHANGED, *product_ids)
+        await session.commit()
+
+    invalidations = [
+        await product_handler.next_event()
+        for _ in range(0, len(product_ids), invalidation_bus.max_ids)
+    ]
+
+    assert [id for invalidation in invalidations for id in invalidation.ids] == (
+        product_ids
+    )
+    assert product_handler.events.empty()
+
+
+@pytest.mark.asyncio
+async def test_if_feed_shares_the_listener_connection_of_the_bus(
+    async_engine: AsyncEngine,
+    invalidation_bus: InvalidationBus,
+    product_handler: RecordingHandler,
+):
+    listener = invalidation_bus.backend.listener
+    connection = listener.connection
+    broadcaster = FeedBroadcaster(
+        DatabaseSettings(ASYNC=False, TESTING=True).postgres_url,
+        FeedSettings(FEED_CHANNEL="test_live_feed"),
+    )
+
+    with broadcaster.subscribe(FeedFilter()) as subscription:
+        broadcaster.start()
+        # sent once the channel is listened to
+        assert (await asyncio.wait_for(subscription.get(), timeout=5)).kind == RESYNC
+        async with AsyncSession(async_engine) as session:
+            await session.execute(
+                select(
+                    func.pg_notify(
+                        "test_live_feed",
+                        FeedEvent(kind=STOCK_MOVED, ids=["stock-id"]).json(),
+                    )
+                )
+            )
+            await session.commit()
+        event = await asyncio.wait_for(subscription.get(), timeout=5)
+        await broadcaster.stop()
+
+    assert event.ids == ["stock-id"]
+    assert listener.connection is connection
+    assert invalidation_bus.listening
+
+
+def test_raise_exception_when_event_kind_is_unknown():
+    with pytest.raises(ValueError):
+        InvalidationEvent(kind="warehouse")
@@ -0,0 +1,156 @@
+import re
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from src.apps.rack_level_slots.models import RackLevelSlot
+from src.apps.sections.models import Section
+from src.apps.stocks.models import Stock
+from src.apps.stocks.schemas.stock_schemas import StockOutputSchema
+from src.apps.waiting_rooms.models import WaitingRoom
+from src.core.exceptions import ConcurrentStockMovementException
+from src.core.pagination.schemas import PagedResponseSchema
+from src.core.utils.locking import (
+    DEADLOCK_DETECTED,
+    LOCK_ORDER,
+    LockSet,
+    get_retry_delay,
+    lock_stock_movement,
+    retry_on_lock_conflict,
+)
+from src.core.utils.orm import if_exists
+from tests.test_products.conftest import db_categories, db_products
+from tests.test_sections.conftest import db_sections
+from tests.test_stocks.conftest import db_stocks
+from tests.test_users.conftest import db_staff_user
+from tests.test_warehouse.conftest import db_warehouse
+
+
+class DatabaseError(Exception):
+    def __init__(self, sqlstate: str) -> None:
+        self.sqlstate = sqlstate
+
+
+class RollbackCounter:
+    def __init__(self) -> None:
+        self.rollbacks = 0
+
+    async def rollback(self) -> None:
+        self.rollbacks += 1
+
+
+def raise_database_error(sqlstate: str):
+    raise DBAPIError("SELECT 1", {}, DatabaseError(sqlstate))
+
+
+def test_if_lock_set_is_ordered_canonically():
+    lock_set = (
+        LockSet()
+        .add(Stock, "b")
+        .add(WaitingRoom, "z")
+        .add(Stock, "a")
+        .add(Section, "c")
+        .add(RackLevelSlot, None)
+    )
+
+    ordered = lock_set.ordered()
+
+    assert [model for model, _ in ordered] == [Section, WaitingRoom, Stock]
+    assert [LOCK_ORDER.index(model) for model, _ in ordered] == sorted(
+        LOCK_ORDER.index(model) for model, _ in ordered
+    )
+    assert ordered[-1] == (Stock, ["a", "b"])
+    assert len(lock_set) == 4
+
+
+def test_if_retry_delay_is_jittered_within_bounds():
+    delays = [get_retry_delay(attempt, 0.1, 0.5) for attempt in range(1, 10)]
+
+    assert all(0 <= delay <= 0.5 for delay in delays)
+
+
+@pytest.mark.asyncio
+async def test_if_deadlocked_service_is_retried_until_it_succeeds():
+    calls = []
+
+    @retry_on_lock_conflict(attempts=3, base_delay=0)
+    async def service(session):
+        calls.append(session)
+        if len(calls) < 3:
+            raise_database_error(DEADLOCK_DETECTED)
+        return "moved"
+
+    session = RollbackCounter()
+
+    assert await service(session) == "moved"
+    assert session.rollbacks == 2
+
+
+@pytest.mark.asyncio
+async def test_if_retries_are_limited():
+    @retry_on_lock_conflict(attempts=2, base_delay=0)
+    async def service(session):
+        raise_database_error(DEADLOCK_DETECTED)
+
+    session = RollbackCounter()
+
+    with pytest.raises(ConcurrentStockMovementException):
+        await service(session)
+    assert session.rollbacks == 2
+
+
+@pytest.mark.asyncio
+async def test_if_other_database_errors_are_not_retried():
+    @retry_on_lock_conflict(attempts=3, base_delay=0)
+    async def service(session):
+        raise_database_error("23505")
+
+    session = RollbackCounter()
+
+    with pytest.raises(DBAPIError):
+        await service(session)
+    assert session.rollbacks == 0
+
+
+@pytest.mark.asyncio
+async def test_if_stock_movement_rows_are_locked(
+    async_engine: AsyncEngine,
+    async_session: AsyncSession,
+    db_stocks: PagedResponseSchema[StockOutputSchema],
+):
+    stocks = [
+        await if_exists(Stock, "id", stock.id, async_session)
+        for stock in db_stocks.results
+        if not stock.is_issued
+    ]
+    lock_set = LockSet()
+    for stock in stocks:
+        lock_set.add_stock(stock)
+    locking_statements = []
+
+    def record_locking_statement(conn, cursor, statement, *args):
+        if "FOR UPDATE" in statement:
+            locking_statements.append(statement)
+
+    # the fixture rows are not committed, so another connection could not see
+    # them - the locking statements are inspected instead
+    event.listen(
+        async_engine.sync_engine, "before_cursor_execute", record_locking_statement
+    )
+    try:
+        await lock_stock_movement(async_session, stocks)
+    finally:
+        event.remove(
+            async_engine.sync_engine,
+            "before_cursor_execute",
+            record_locking_statement,
+        )
+
+    locked_tables = [
+        re.search(r"FOR UPDATE OF (\w+)", statement).group(1)
+        for statement in locking_statements
+    ]
+    assert locked_tables == [model.__tablename__ for model, _ in lock_set.ordered()]
+    assert locked_tables[-1] == Stock.__tablename__
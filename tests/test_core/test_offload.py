@@ -0,0 +1,58 @@
+import asyncio
+import time
+
+import pytest
+
+from src.core.utils.crypt import hash_user_password, verify_user_password
+from src.core.utils.offload import CPUOffloader
+
+
+def block(seconds: float) -> float:
+    time.sleep(seconds)
+    return seconds
+
+
+def fail() -> None:
+    raise ValueError("offloaded failure")
+
+
+@pytest.mark.asyncio
+async def test_if_offloaded_work_respects_concurrency_cap():
+    offloader = CPUOffloader("thread", max_workers=4, max_concurrency=2)
+
+    results = await asyncio.gather(*(offloader.run(block, 0.02) for _ in range(6)))
+    metrics = offloader.get_metrics()
+    offloader.shutdown()
+
+    assert results == [0.02] * 6
+    assert metrics.peak_running == 2
+    assert metrics.peak_queued >= 4
+    assert metrics.completed == 6
+    assert metrics.queued == metrics.running == 0
+    assert metrics.total_wait_time > 0
+
+
+@pytest.mark.asyncio
+async def test_if_offloaded_exception_is_raised_to_the_caller():
+    offloader = CPUOffloader("thread", max_workers=1, max_concurrency=1)
+
+    with pytest.raises(ValueError):
+        await offloader.run(fail)
+    metrics = offloader.get_metrics()
+    offloader.shutdown()
+
+    assert metrics.failed == 1
+    assert metrics.completed == 0
+
+
+@pytest.mark.asyncio
+async def test_if_offloaded_password_hash_can_be_verified():
+    password_hash = await hash_user_password("password")
+
+    assert await verify_user_password("password", password_hash) is True
+    assert await verify_user_password("wrong password", password_hash) is False
+
+
+def test_raise_exception_when_executor_type_is_unknown():
+    with pytest.raises(ValueError):
+        CPUOffloader("greenlet", max_workers=1, max_concurrency=1)
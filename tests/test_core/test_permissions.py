@@ -0,0 +1,32 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.core.exceptions import AuthorizationException
+from src.core.permissions import get_user_warehouse_id
+
+
+@pytest.mark.asyncio
+async def test_if_user_is_scoped_to_the_assigned_warehouse():
+    user = SimpleNamespace(warehouse_id="a", is_staff=False)
+
+    assert await get_user_warehouse_id(user) == "a"
+    assert await get_user_warehouse_id(user, "a") == "a"
+
+
+@pytest.mark.asyncio
+async def test_raise_exception_when_user_asks_for_another_warehouse():
+    user = SimpleNamespace(warehouse_id="a", is_staff=False)
+
+    with pytest.raises(AuthorizationException):
+        await get_user_warehouse_id(user, "b")
+
+
+@pytest.mark.asyncio
+async def test_if_staff_and_unassigned_users_can_ask_for_any_warehouse():
+    staff_user = SimpleNamespace(warehouse_id="a", is_staff=True)
+    unassigned_user = SimpleNamespace(warehouse_id=None, is_staff=False)
+
+    assert await get_user_warehouse_id(staff_user, "b") == "b"
+    assert await get_user_warehouse_id(unassigned_user, "b") == "b"
+    assert await get_user_warehouse_id(unassigned_user) is None
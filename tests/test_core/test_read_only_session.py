@@ -0,0 +1,39 @@
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.apps.products.models import Category
+from src.database.db_connection import ReadOnlySession, ReadOnlySyncSession
+
+
+@pytest_asyncio.fixture
+async def read_only_session(async_engine: AsyncEngine) -> ReadOnlySession:
+    async with ReadOnlySession(
+        bind=async_engine.execution_options(isolation_level="AUTOCOMMIT"),
+        expire_on_commit=False,
+        sync_session_class=ReadOnlySyncSession,
+    ) as session:
+        yield session
+
+
+@pytest.mark.asyncio
+async def test_if_connection_is_released_after_each_statement(
+    read_only_session: ReadOnlySession,
+):
+    assert await read_only_session.scalar(select(1)) == 1
+    assert not read_only_session.in_transaction()
+
+    assert (await read_only_session.execute(select(2))).scalar() == 2
+    assert not read_only_session.in_transaction()
+
+
+@pytest.mark.asyncio
+async def test_raise_exception_when_read_only_session_flushes_changes(
+    read_only_session: ReadOnlySession,
+):
+    read_only_session.add(Category(name="read only"))
+
+    with pytest.raises(InvalidRequestError):
+        await read_only_session.flush()
@@ -0,0 +1,96 @@
+import socket
+import time
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from src.database import db_connection
+from src.database.replica import ReplicaLagMonitor
+from src.settings.db_settings import DatabaseSettings
+
+settings = DatabaseSettings(TESTING=True)
+
+requires_replica = pytest.mark.skipif(
+    settings.replica_url is None, reason="TEST_POSTGRES_REPLICA_DB is not set"
+)
+
+
+@pytest_asyncio.fixture
+async def replica_engine() -> AsyncEngine:
+    engine = create_async_engine(settings.replica_url, poolclass=NullPool)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def replica_routing(monkeypatch, replica_engine: AsyncEngine) -> AsyncEngine:
+    monitor = ReplicaLagMonitor(replica_engine, max_lag=5, check_interval=0)
+    monkeypatch.setattr(db_connection, "replica_monitor", monitor)
+    monkeypatch.setattr(db_connection, "replica_read_only_engine", replica_engine)
+    return monitor
+
+
+@requires_replica
+@pytest.mark.asyncio
+async def test_if_reads_are_routed_to_fresh_replica(
+    replica_routing: ReplicaLagMonitor, replica_engine: AsyncEngine
+):
+    assert await db_connection.get_read_only_engine() is replica_engine
+    assert replica_routing.lag == 0
+
+
+@requires_replica
+@pytest.mark.asyncio
+async def test_if_reads_are_routed_to_primary_when_replica_lags(
+    replica_routing: ReplicaLagMonitor,
+):
+    replica_routing.max_lag = -1
+
+    assert await db_connection.get_read_only_engine() is db_connection.read_only_engine
+
+
+@requires_replica
+@pytest.mark.asyncio
+async def test_if_reads_after_write_are_routed_to_primary(
+    replica_routing: ReplicaLagMonitor,
+):
+    assert (
+        await db_connection.get_read_only_engine(write_intent=True)
+        is db_connection.read_only_engine
+    )
+
+
+@pytest.mark.asyncio
+async def test_if_unreachable_replica_is_not_fresh():
+    engine = create_async_engine(
+        settings.build_url("127.0.0.1", 1, "replica"), poolclass=NullPool
+    )
+    monitor = ReplicaLagMonitor(engine, max_lag=5, check_interval=60)
+
+    assert await monitor.is_fresh() is False
+    assert monitor.lag is None
+
+
+@pytest.mark.asyncio
+async def test_if_lag_check_gives_up_on_silent_replica():
+    # the socket accepts connections but never answers the startup message
+    with socket.socket() as silent_socket:
+        silent_socket.bind(("127.0.0.1", 0))
+        silent_socket.listen()
+        engine = create_async_engine(
+            settings.build_url("127.0.0.1", silent_socket.getsockname()[1], "replica"),
+            poolclass=NullPool,
+        )
+        monitor = ReplicaLagMonitor(
+            engine, max_lag=5, check_interval=0, check_timeout=0.2
+        )
+
+        start = time.monotonic()
+        lag = await monitor.check_lag()
+        elapsed = time.monotonic() - start
+        await engine.dispose()
+
+    assert lag is None
+    assert elapsed < 2
@@ -0,0 +1,71 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi import status
+
+from src.core.exception_handlers import EXCEPTION_STATUS_CODES, get_status_code
+from src.core.exceptions import (
+    AccountNotActivatedException,
+    DoesNotExist,
+    ServiceException,
+    StaleVersionException,
+)
+
+# the amount of loaded modules tracks cold start cost without depending on
+# the speed of the machine, the budget leaves room for a few new packages
+IMPORT_MODULE_BUDGET = int(os.getenv("IMPORT_MODULE_BUDGET", 2500))
+PROJECT_ROOT = Path(__file__).parents[2]
+IMPORT_APP = "import json, sys\nimport main\nprint(json.dumps(sorted(sys.modules)))\n"
+# the ERD renderer and graphviz behind it are only loaded when a diagram is drawn
+DEFERRED_MODULES = ("eralchemy2", "pygraphviz", "graphviz")
+
+
+def get_heaviest_imports(import_profile: str, limit: int = 10) -> list[str]:
+    # lines of -X importtime look like: "import time: self | cumulative | module"
+    imports = []
+    for line in import_profile.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:") :].split("|")
+        imports.append((int(cumulative), module.strip()))
+    heaviest = sorted(imports, reverse=True)[:limit]
+    return [f"{module}: {time / 1000:.0f}ms" for time, module in heaviest]
+
+
+def test_if_app_import_stays_within_module_budget():
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", IMPORT_APP],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = json.loads(result.stdout.splitlines()[-1])
+
+    assert len(modules) < IMPORT_MODULE_BUDGET, get_heaviest_imports(result.stderr)
+    assert not [
+        module for module in modules if module.split(".")[0] in DEFERRED_MODULES
+    ]
+
+
+@pytest.mark.parametrize(
+    "exception_class, status_code",
+    [
+        (ServiceException, status.HTTP_400_BAD_REQUEST),
+        (AccountNotActivatedException, status.HTTP_400_BAD_REQUEST),
+        (DoesNotExist, status.HTTP_404_NOT_FOUND),
+        (StaleVersionException, status.HTTP_409_CONFLICT),
+    ],
+)
+def test_if_service_exceptions_are_mapped_to_status_codes(
+    exception_class: type[ServiceException], status_code: int
+):
+    assert get_status_code(exception_class) == status_code
+    assert all(
+        issubclass(exception_class, ServiceException)
+        for exception_class in EXCEPTION_STATUS_CODES
+    )
@@ -0,0 +1,148 @@
+import datetime as dt
+import socket
+
+import pytest
+from aiosmtpd.controller import Controller
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.apps.emails.models import EMAIL_FAILED, EMAIL_PENDING, EMAIL_SENT, EmailOutbox
+from src.apps.emails.outbox import EmailOutboxWorker
+from src.apps.emails.schemas import EmailSchema
+from src.apps.emails.services import enqueue_email
+from src.apps.jwt.schemas import ConfirmationTokenSchema
+from src.apps.users.services.user_services import create_single_user
+from src.core.factory.user_factory import UserInputSchemaFactory
+from src.settings.email_settings import EmailSettings
+from src.settings.outbox_settings import OutboxSettings
+
+
+class RecordingHandler:
+    def __init__(self) -> None:
+        self.messages = []
+        self.peers = set()
+
+    async def handle_DATA(self, server, session, envelope) -> str:
+        self.messages.append(envelope)
+        self.peers.add(session.peer)
+        return "250 Message accepted for delivery"
+
+
+def get_free_port() -> int:
+    with socket.socket() as free_socket:
+        free_socket.bind(("127.0.0.1", 0))
+        return free_socket.getsockname()[1]
+
+
+def build_worker(port: int, **outbox_settings) -> EmailOutboxWorker:
+    email_settings = EmailSettings(
+        MAIL_SERVER="127.0.0.1",
+        MAIL_PORT=port,
+        MAIL_SSL=False,
+        MAIL_TLS=False,
+        USE_CREDENTIALS=False,
+    )
+    outbox_settings = OutboxSettings(OUTBOX_RATE_LIMIT=1000, **outbox_settings)
+    return EmailOutboxWorker(None, email_settings, outbox_settings)
+
+
+async def enqueue_activation_emails(
+    async_session: AsyncSession, amount: int
+) -> list[EmailOutbox]:
+    return [
+        await enqueue_email(
+            async_session,
+            EmailSchema(
+                email_subject="Activate your account",
+                receivers=(f"outbox.user.{number}@warehouse.ms",),
+                template_name="account_activation_email.html",
+            ),
+            ConfirmationTokenSchema(token=f"token-{number}"),
+        )
+        for number in range(amount)
+    ]
+
+
+@pytest.fixture
+def smtp_server() -> Controller:
+    controller = Controller(
+        RecordingHandler(), hostname="127.0.0.1", port=get_free_port()
+    )
+    controller.start()
+    yield controller
+    controller.stop()
+
+
+@pytest.mark.asyncio
+async def test_if_activation_email_is_stored_in_outbox(async_session: AsyncSession):
+    user_input = UserInputSchemaFactory().generate()
+
+    await create_single_user(async_session, user_input)
+    email = await async_session.scalar(
+        select(EmailOutbox).where(EmailOutbox.recipients.any(user_input.email))
+    )
+
+    assert email.status == EMAIL_PENDING
+    assert email.template_name == "account_activation_email.html"
+    assert email.template_body["token"]
+
+
+@pytest.mark.asyncio
+async def test_if_pending_emails_are_sent_over_single_connection(
+    async_session: AsyncSession, smtp_server: Controller
+):
+    emails = await enqueue_activation_emails(async_session, 3)
+    worker = build_worker(smtp_server.port)
+
+    processed = await worker.process_batch(async_session)
+    await worker.connection.close()
+
+    assert processed == 3
+    assert len(smtp_server.handler.messages) == 3
+    assert len(smtp_server.handler.peers) == 1
+    assert [message.rcpt_tos for message in smtp_server.handler.messages] == [
+        [email.recipients[0]] for email in emails
+    ]
+    for email in emails:
+        await async_session.refresh(email)
+        assert email.status == EMAIL_SENT
+        assert email.sent_at is not None
+
+
+@pytest.mark.asyncio
+async def test_if_failed_delivery_is_retried_later(async_session: AsyncSession):
+    [email] = await enqueue_activation_emails(async_session, 1)
+    worker = build_worker(get_free_port(), OUTBOX_MAX_ATTEMPTS=2)
+
+    await worker.process_batch(async_session)
+    await async_session.refresh(email)
+
+    assert email.status == EMAIL_PENDING
+    assert email.attempts == 1
+    assert email.last_error
+    assert email.available_at > dt.datetime.now()
+
+    email.available_at = dt.datetime.now()
+    async_session.add(email)
+    await async_session.commit()
+    await worker.process_batch(async_session)
+    await async_session.refresh(email)
+
+    assert email.status == EMAIL_FAILED
+    assert email.attempts == 2
+
+
+@pytest.mark.asyncio
+async def test_if_claimed_emails_are_leased_while_they_are_sent(
+    async_session: AsyncSession,
+):
+    [email] = await enqueue_activation_emails(async_session, 1)
+    worker = build_worker(get_free_port())
+
+    claimed = await worker.claim_batch(async_session)
+    await async_session.refresh(email)
+
+    assert [claimed_email.id for claimed_email in claimed] == [email.id]
+    assert email.status == EMAIL_PENDING
+    assert email.available_at > dt.datetime.now()
+    assert await worker.claim_batch(async_session) == []
@@ -0,0 +1,10 @@
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+
+
+@pytest.mark.asyncio
+async def test_anonymous_user_cannot_subscribe_to_feed(async_client: AsyncClient):
+    response = await async_client.get("feed/events")
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
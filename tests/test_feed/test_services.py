@@ -0,0 +1,96 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.apps.feed.broadcaster import FeedBroadcaster, FeedSubscription
+from src.apps.feed.schemas import (
+    CAPACITY_CHANGED,
+    RESYNC,
+    STOCK_MOVED,
+    FeedEvent,
+    FeedFilter,
+)
+from src.apps.feed.tracking import collect_feed_changes, get_feed_events
+from src.apps.stocks.models import Stock
+from src.apps.stocks.schemas.stock_schemas import StockOutputSchema
+from src.core.pagination.schemas import PagedResponseSchema
+from src.settings.feed_settings import FeedSettings
+from tests.test_products.conftest import db_categories, db_products
+from tests.test_sections.conftest import db_sections
+from tests.test_stocks.conftest import db_stocks
+from tests.test_users.conftest import db_staff_user
+from tests.test_warehouse.conftest import db_warehouse
+
+
+def test_if_filter_matches_events_of_subscribed_scopes_only():
+    feed_filter = FeedFilter(section_ids=["section"], waiting_room_ids=["room"])
+
+    assert feed_filter.matches(FeedEvent(kind=STOCK_MOVED, section_id="section"))
+    assert feed_filter.matches(FeedEvent(kind=STOCK_MOVED, waiting_room_id="room"))
+    assert not feed_filter.matches(FeedEvent(kind=STOCK_MOVED, section_id="other"))
+    assert feed_filter.matches(FeedEvent(kind=RESYNC))
+    assert FeedFilter().matches(FeedEvent(kind=CAPACITY_CHANGED, section_id="other"))
+
+
+@pytest.mark.asyncio
+async def test_if_lagging_subscription_drops_its_backlog_for_resync():
+    subscription = FeedSubscription(FeedFilter(), queue_size=2)
+
+    for index in range(3):
+        subscription.push(FeedEvent(kind=STOCK_MOVED, ids=[str(index)]))
+
+    assert (await subscription.get()).kind == RESYNC
+    assert subscription.queue.empty()
+
+
+@pytest.mark.asyncio
+async def test_if_subscription_stays_in_its_warehouse_scope():
+    subscription = FeedSubscription(FeedFilter(), queue_size=5, warehouse_id="a")
+
+    subscription.push(FeedEvent(kind=STOCK_MOVED, warehouse_id="b"))
+    subscription.feed_filter = FeedFilter(warehouse_ids=["b"])
+    subscription.push(FeedEvent(kind=STOCK_MOVED, warehouse_id="b"))
+    subscription.push(FeedEvent(kind=RESYNC))
+
+    assert subscription.queue.qsize() == 1
+    assert (await subscription.get()).kind == RESYNC
+
+
+@pytest.mark.asyncio
+async def test_if_broadcaster_fans_out_to_matching_subscriptions():
+    broadcaster = FeedBroadcaster("", FeedSettings())
+
+    with broadcaster.subscribe(FeedFilter(warehouse_ids=["a"])) as first:
+        with broadcaster.subscribe(FeedFilter(warehouse_ids=["b"])) as second:
+            broadcaster.dispatch(FeedEvent(kind=STOCK_MOVED, warehouse_id="a"))
+
+            assert first.queue.qsize() == 1
+            assert second.queue.empty()
+
+    assert broadcaster.subscriptions == set()
+
+
+@pytest.mark.asyncio
+async def test_if_moved_stock_is_announced_in_source_and_target_scope(
+    async_session: AsyncSession,
+    db_stocks: PagedResponseSchema[StockOutputSchema],
+):
+    slot_stock = next(stock for stock in db_stocks.results if stock.rack_level_slot_id)
+    waiting_room_id = next(
+        stock.waiting_room_id for stock in db_stocks.results if stock.waiting_room_id
+    )
+    stock = await async_session.get(Stock, slot_stock.id)
+    stock.waiting_room_id, stock.rack_level_slot_id = waiting_room_id, None
+
+    events = await async_session.run_sync(
+        lambda session: get_feed_events(
+            session.connection(), collect_feed_changes(session), max_ids=100
+        )
+    )
+
+    moved = [event for event in events if event.kind == STOCK_MOVED]
+    assert len(moved) == 2
+    assert all(event.ids == [stock.id] for event in moved)
+    assert [event.waiting_room_id for event in moved if event.waiting_room_id] == [
+        waiting_room_id
+    ]
+    assert len([event for event in moved if event.section_id]) == 1
@@ -0,0 +1,50 @@
+import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.apps.inventory.capacity import find_capacity_drift, reconcile_capacity
+from src.apps.stocks.schemas.stock_schemas import StockOutputSchema
+from src.apps.waiting_rooms.models import WaitingRoom
+from src.core.pagination.schemas import PagedResponseSchema
+from tests.test_products.conftest import db_categories, db_products
+from tests.test_sections.conftest import db_sections
+from tests.test_stocks.conftest import db_stocks
+from tests.test_users.conftest import db_staff_user
+from tests.test_warehouse.conftest import db_warehouse
+
+
+@pytest.mark.asyncio
+async def test_if_capacity_drift_is_detected_and_repaired(
+    async_session: AsyncSession,
+    db_stocks: PagedResponseSchema[StockOutputSchema],
+):
+    waiting_room_id = next(
+        stock.waiting_room_id for stock in db_stocks.results if stock.waiting_room_id
+    )
+    stocks = [
+        stock
+        for stock in db_stocks.results
+        if stock.waiting_room_id == waiting_room_id and not stock.is_issued
+    ]
+    await async_session.execute(
+        update(WaitingRoom)
+        .where(WaitingRoom.id == waiting_room_id)
+        .values(occupied_slots=len(stocks) + 3)
+    )
+
+    result = await reconcile_capacity(async_session)
+
+    drift = {
+        drift.counter: drift
+        for drift in result.drift
+        if drift.entity_id == waiting_room_id
+    }
+    assert drift["occupied_slots"].entity == WaitingRoom.__tablename__
+    assert drift["occupied_slots"].stored == len(stocks) + 3
+    assert drift["occupied_slots"].actual == len(stocks)
+    assert result.repaired is False
+
+    assert (await reconcile_capacity(async_session, repair=True)).repaired is True
+    assert (
+        await find_capacity_drift(async_session, WaitingRoom, [waiting_room_id]) == []
+    )
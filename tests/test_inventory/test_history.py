@@ -0,0 +1,114 @@
+import datetime as dt
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.apps.inventory.history import (
+    StockLocations,
+    from_array,
+    get_inventory_as_of,
+    get_inventory_diff,
+    write_checkpoint,
+)
+from src.apps.stocks.schemas.stock_schemas import (
+    StockBatchMoveInputSchema,
+    StockMoveInputSchema,
+    StockOutputSchema,
+)
+from src.apps.stocks.services.stock_move_services import move_multiple_stocks
+from src.apps.users.schemas import UserOutputSchema
+from src.core.exceptions import ServiceException
+from src.core.pagination.schemas import PagedResponseSchema
+from src.settings.inventory_settings import InventorySettings
+from tests.test_products.conftest import db_categories, db_products
+from tests.test_sections.conftest import db_sections
+from tests.test_stocks.conftest import db_stocks
+from tests.test_users.conftest import db_staff_user
+from tests.test_warehouse.conftest import db_warehouse
+
+
+def test_if_last_movement_of_every_stock_is_replayed():
+    locations = StockLocations.from_lists(
+        ["a", "b", "c"], ["room", None, None], [None, "slot-1", "slot-2"]
+    )
+
+    locations = locations.replay(
+        ["a", "a", "c", "d"],
+        [None, None, None, "room"],
+        ["slot-3", None, "slot-1", None],
+    )
+
+    assert locations.stock_ids.tolist() == ["b", "c", "d"]
+    assert from_array(locations.waiting_room_ids) == [None, None, "room"]
+    assert from_array(locations.rack_level_slot_ids) == ["slot-1", "slot-1", None]
+
+
+def test_if_diff_reports_only_moved_stocks_in_scope():
+    before = StockLocations.from_lists(
+        ["a", "b", "c"], ["room", None, None], [None, "slot-1", "slot-2"]
+    )
+    after = before.replay(["a", "c"], [None, "room"], ["slot-1", None])
+
+    stock_ids, *locations = before.diff(after, rack_level_slot_scope=["slot-1"])
+
+    assert stock_ids.tolist() == ["a"]
+    assert [from_array(location) for location in locations] == [
+        ["room"],
+        [None],
+        [None],
+        ["slot-1"],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_if_inventory_is_reconstructed_as_of_past_moment(
+    async_session: AsyncSession,
+    db_stocks: PagedResponseSchema[StockOutputSchema],
+    db_staff_user: UserOutputSchema,
+):
+    slot_stock = next(stock for stock in db_stocks.results if stock.rack_level_slot_id)
+    waiting_room_id = next(
+        stock.waiting_room_id for stock in db_stocks.results if stock.waiting_room_id
+    )
+    await write_checkpoint(async_session, InventorySettings(INVENTORY_CHECKPOINT_LAG=0))
+    before_move = dt.datetime.now()
+
+    await move_multiple_stocks(
+        async_session,
+        StockBatchMoveInputSchema(
+            moves=[
+                StockMoveInputSchema(
+                    stock_id=slot_stock.id, waiting_room_id=waiting_room_id
+                )
+            ]
+        ),
+        db_staff_user.id,
+    )
+    after_move = dt.datetime.now()
+
+    past = await get_inventory_as_of(
+        async_session, before_move, waiting_room_id=waiting_room_id
+    )
+    present = await get_inventory_as_of(
+        async_session, after_move, waiting_room_id=waiting_room_id
+    )
+    diff = await get_inventory_diff(async_session, before_move, after_move)
+
+    assert past.checkpoint_taken_at is not None
+    assert slot_stock.id not in {stock.stock_id for stock in past.stocks}
+    assert slot_stock.id in {stock.stock_id for stock in present.stocks}
+    assert present.replayed_movements >= 1
+    assert [
+        (change.stock_id, change.from_rack_level_slot_id, change.to_waiting_room_id)
+        for change in diff.changes
+    ] == [(slot_stock.id, slot_stock.rack_level_slot_id, waiting_room_id)]
+
+
+@pytest.mark.asyncio
+async def test_raise_exception_when_diff_period_is_reversed(
+    async_session: AsyncSession,
+):
+    now = dt.datetime.now()
+
+    with pytest.raises(ServiceException):
+        await get_inventory_diff(async_session, now, now - dt.timedelta(days=1))
@@ -0,0 +1,112 @@
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+
+from src.apps.products.schemas.product_schemas import ProductOutputSchema
+from src.apps.stocks.schemas.stock_schemas import StockOutputSchema
+from src.apps.users.schemas import UserOutputSchema
+from src.core.pagination.schemas import PagedResponseSchema
+from src.core.utils.utils import generate_uuid
+from tests.test_products.conftest import db_categories, db_products
+from tests.test_sections.conftest import db_sections
+from tests.test_stocks.conftest import db_stocks
+from tests.test_users.conftest import (
+    auth_headers,
+    db_staff_user,
+    db_user,
+    staff_auth_headers,
+)
+from tests.test_warehouse.conftest import db_warehouse
+
+
+@pytest.mark.asyncio
+async def test_authenticated_user_can_get_product_availability(
+    async_client: AsyncClient,
+    db_user: UserOutputSchema,
+    auth_headers: dict[str, str],
+    db_products: PagedResponseSchema[ProductOutputSchema],
+    db_stocks: PagedResponseSchema[StockOutputSchema],
+):
+    product_id = db_products.results[0].id
+    response = await async_client.get(
+        f"inventory/products/{product_id}", headers=auth_headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["product_id"] == product_id
+    assert response.json()["on_hand_count"] == sum(
+        stock.product_count
+        for stock in db_stocks.results
+        if stock.product.id == product_id and not stock.is_issued
+    )
+
+
+@pytest.mark.asyncio
+async def test_raise_exception_when_getting_availability_of_nonexistent_product(
+    async_client: AsyncClient,
+    db_user: UserOutputSchema,
+    auth_headers: dict[str, str],
+):
+    response = await async_client.get(
+        f"inventory/products/{generate_uuid()}", headers=auth_headers
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.parametrize(
+    "user, user_headers, status_code",
+    [
+        (
+            pytest.lazy_fixture("db_user"),
+            pytest.lazy_fixture("auth_headers"),
+            status.HTTP_403_FORBIDDEN,
+        ),
+        (
+            pytest.lazy_fixture("db_staff_user"),
+            pytest.lazy_fixture("staff_auth_headers"),
+            status.HTTP_200_OK,
+        ),
+    ],
+)
+@pytest.mark.asyncio
+async def test_only_staff_can_reconcile_inventory(
+    async_client: AsyncClient,
+    user: UserOutputSchema,
+    user_headers: dict[str, str],
+    status_code: int,
+    db_stocks: PagedResponseSchema[StockOutputSchema],
+):
+    response = await async_client.post("inventory/reconciliation", headers=user_headers)
+    assert response.status_code == status_code
+    if status_code == status.HTTP_200_OK:
+        assert response.json() == {"drift": [], "repaired": False}
+
+
+@pytest.mark.parametrize(
+    "user, user_headers, status_code",
+    [
+        (
+            pytest.lazy_fixture("db_user"),
+            pytest.lazy_fixture("auth_headers"),
+            status.HTTP_403_FORBIDDEN,
+        ),
+        (
+            pytest.lazy_fixture("db_staff_user"),
+            pytest.lazy_fixture("staff_auth_headers"),
+            status.HTTP_200_OK,
+        ),
+    ],
+)
+@pytest.mark.asyncio
+async def test_only_staff_can_reconcile_capacity(
+    async_client: AsyncClient,
+    user: UserOutputSchema,
+    user_headers: dict[str, str],
+    status_code: int,
+    db_stocks: PagedResponseSchema[StockOutputSchema],
+):
+    response = await async_client.post(
+        "inventory/capacity-reconciliation", headers=user_headers
+    )
+    assert response.status_code == status_code
+    if status_code == status.HTTP_200_OK:
+        assert response.json()["repaired"] is False
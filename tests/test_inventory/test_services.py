@@ -0,0 +1,122 @@
+import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.apps.inventory.models import ProductInventory
+from src.apps.inventory.services import get_product_availability, reconcile_inventory
+from src.apps.products.schemas.product_schemas import ProductOutputSchema
+from src.apps.stocks.schemas.stock_schemas import (
+    StockBatchMoveInputSchema,
+    StockMoveInputSchema,
+    StockOutputSchema,
+)
+from src.apps.stocks.services.stock_move_services import move_multiple_stocks
+from src.apps.users.schemas import UserOutputSchema
+from src.core.exceptions import DoesNotExist
+from src.core.pagination.schemas import PagedResponseSchema
+from src.core.utils.utils import generate_uuid
+from tests.test_products.conftest import db_categories, db_products
+from tests.test_sections.conftest import db_sections
+from tests.test_stocks.conftest import db_stocks
+from tests.test_users.conftest import db_staff_user
+from tests.test_warehouse.conftest import db_warehouse
+
+
+def get_available_stocks(
+    db_stocks: PagedResponseSchema[StockOutputSchema], product_id: str
+) -> list[StockOutputSchema]:
+    return [
+        stock
+        for stock in db_stocks.results
+        if stock.product.id == product_id and not stock.is_issued
+    ]
+
+
+@pytest.mark.asyncio
+async def test_if_counters_follow_received_and_issued_stocks(
+    async_session: AsyncSession,
+    db_products: PagedResponseSchema[ProductOutputSchema],
+    db_stocks: PagedResponseSchema[StockOutputSchema],
+):
+    product_id = db_products.results[0].id
+    stocks = get_available_stocks(db_stocks, product_id)
+
+    availability = await get_product_availability(async_session, product_id)
+
+    assert availability.on_hand_count == sum(stock.product_count for stock in stocks)
+    assert availability.waiting_room_count == sum(
+        stock.product_count for stock in stocks if stock.waiting_room_id
+    )
+    assert availability.rack_count == sum(
+        stock.product_count for stock in stocks if stock.rack_level_slot_id
+    )
+    assert sum(section.rack_count for section in availability.sections) == (
+        availability.rack_count
+    )
+    assert (await reconcile_inventory(async_session)).drift == []
+
+
+@pytest.mark.asyncio
+async def test_if_moved_stock_changes_location_buckets_only(
+    async_session: AsyncSession,
+    db_stocks: PagedResponseSchema[StockOutputSchema],
+    db_staff_user: UserOutputSchema,
+):
+    slot_stock = next(stock for stock in db_stocks.results if stock.rack_level_slot_id)
+    waiting_room_id = next(
+        stock.waiting_room_id for stock in db_stocks.results if stock.waiting_room_id
+    )
+    before = await get_product_availability(async_session, slot_stock.product.id)
+
+    await move_multiple_stocks(
+        async_session,
+        StockBatchMoveInputSchema(
+            moves=[
+                StockMoveInputSchema(
+                    stock_id=slot_stock.id, waiting_room_id=waiting_room_id
+                )
+            ]
+        ),
+        db_staff_user.id,
+    )
+    after = await get_product_availability(async_session, slot_stock.product.id)
+
+    assert after.on_hand_count == before.on_hand_count
+    assert after.rack_count == before.rack_count - slot_stock.product_count
+    assert after.waiting_room_count == (
+        before.waiting_room_count + slot_stock.product_count
+    )
+    assert (await reconcile_inventory(async_session)).drift == []
+
+
+@pytest.mark.asyncio
+async def test_if_reconciliation_detects_and_repairs_drift(
+    async_session: AsyncSession,
+    db_products: PagedResponseSchema[ProductOutputSchema],
+    db_stocks: PagedResponseSchema[StockOutputSchema],
+):
+    product_id = db_products.results[0].id
+    await async_session.execute(
+        update(ProductInventory)
+        .where(ProductInventory.product_id == product_id)
+        .values(on_hand_count=ProductInventory.on_hand_count + 5)
+    )
+
+    result = await reconcile_inventory(async_session)
+
+    assert [(drift.product_id, drift.counter) for drift in result.drift] == [
+        (product_id, "on_hand_count")
+    ]
+    assert result.drift[0].stored == result.drift[0].actual + 5
+    assert result.repaired is False
+
+    assert (await reconcile_inventory(async_session, repair=True)).repaired is True
+    assert (await reconcile_inventory(async_session)).drift == []
+
+
+@pytest.mark.asyncio
+async def test_raise_exception_when_getting_availability_of_nonexistent_product(
+    async_session: AsyncSession,
+):
+    with pytest.raises(DoesNotExist):
+        await get_product_availability(async_session, generate_uuid())
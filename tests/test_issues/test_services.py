@@ -12,17 +12,20 @@ from src.apps.issues.services import (
 from src.apps.stocks.schemas.stock_schemas import StockOutputSchema
 from src.apps.stocks.services.stock_services import get_every_stock, issue_stocks
 from src.apps.users.schemas import UserOutputSchema
+from src.apps.warehouse.services import create_warehouse
 from src.core.exceptions import (
     AlreadyExists,
     DoesNotExist,
     IsOccupied,
     MissingIssueDataException,
+    ResourceInAnotherWarehouseException,
     ServiceException,
 )
 from src.core.factory.issue_factory import (
     IssueInputSchemaFactory,
     IssueUpdateSchemaFactory,
 )
+from src.core.factory.warehouse_factory import WarehouseInputSchemaFactory
 from src.core.pagination.models import PageParams
 from src.core.pagination.schemas import PagedResponseSchema
 from src.core.utils.utils import generate_uuid
@@ -100,6 +103,26 @@ async def test_if_multiple_issues_were_returned(
     assert issues.total == db_issues.total
 
 
+@pytest.mark.asyncio
+async def test_if_issues_of_another_warehouse_are_not_returned(
+    async_session: AsyncSession,
+    db_issues: PagedResponseSchema[IssueOutputSchema],
+    db_staff_user: UserOutputSchema,
+):
+    warehouse = await create_warehouse(
+        async_session, WarehouseInputSchemaFactory().generate()
+    )
+    issues = await get_all_issues(
+        async_session, PageParams(page=1, size=5), warehouse_id=warehouse.id
+    )
+    assert issues.total == 0
+
+    with pytest.raises(ResourceInAnotherWarehouseException):
+        await get_single_issue(
+            async_session, db_issues.results[0].id, warehouse_id=warehouse.id
+        )
+
+
 @pytest.mark.asyncio
 async def test_raise_exception_while_updating_nonexistent_issue(
     async_session: AsyncSession,
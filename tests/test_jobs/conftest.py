@@ -0,0 +1,17 @@
+from contextlib import asynccontextmanager
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.apps.jobs.worker import JobWorker, load_job_handlers
+from src.settings.job_settings import JobSettings
+
+
+@pytest.fixture
+def job_worker(async_session: AsyncSession) -> JobWorker:
+    @asynccontextmanager
+    async def session_factory() -> AsyncSession:
+        yield async_session
+
+    load_job_handlers()
+    return JobWorker(session_factory, JobSettings(JOB_MAX_ATTEMPTS=2))
@@ -0,0 +1,65 @@
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+
+from src.apps.jobs.models import JOB_PENDING
+from src.apps.products.schemas.product_schemas import ProductOutputSchema
+from src.apps.users.schemas import UserOutputSchema
+from src.core.factory.reception_factory import (
+    ReceptionInputSchemaFactory,
+    ReceptionProductInputSchemaFactory,
+)
+from src.core.pagination.schemas import PagedResponseSchema
+from tests.test_products.conftest import db_categories, db_products
+from tests.test_sections.conftest import db_sections
+from tests.test_users.conftest import (
+    auth_headers,
+    db_staff_user,
+    db_user,
+    staff_auth_headers,
+)
+from tests.test_warehouse.conftest import db_warehouse
+
+
+@pytest.mark.asyncio
+async def test_if_reception_job_is_accepted_and_visible_to_its_owner_only(
+    async_client: AsyncClient,
+    db_user: UserOutputSchema,
+    db_staff_user: UserOutputSchema,
+    auth_headers: dict[str, str],
+    staff_auth_headers: dict[str, str],
+    db_products: PagedResponseSchema[ProductOutputSchema],
+):
+    reception_data = ReceptionInputSchemaFactory().generate(
+        products_data=[
+            ReceptionProductInputSchemaFactory().generate(db_products.results[0].id, 5)
+        ]
+    )
+    response = await async_client.post(
+        "receptions/jobs", headers=staff_auth_headers, content=reception_data.json()
+    )
+
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert response.json()["status"] == JOB_PENDING
+    assert response.json()["user_id"] == db_staff_user.id
+    job_id = response.json()["id"]
+
+    response = await async_client.get(f"jobs/{job_id}", headers=staff_auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["id"] == job_id
+
+    response = await async_client.get(f"jobs/{job_id}", headers=auth_headers)
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.asyncio
+async def test_only_user_with_proper_permission_can_create_issue_job(
+    async_client: AsyncClient,
+    db_user: UserOutputSchema,
+    auth_headers: dict[str, str],
+):
+    response = await async_client.post(
+        "issues/jobs", headers=auth_headers, content='{"stock_ids": []}'
+    )
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
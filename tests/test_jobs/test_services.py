@@ -0,0 +1,159 @@
+import datetime as dt
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.apps.jobs.models import (
+    JOB_FAILED,
+    JOB_PENDING,
+    JOB_RUNNING,
+    JOB_SUCCEEDED,
+    Job,
+)
+from src.apps.jobs.services import JobProgress, enqueue_job, get_single_job
+from src.apps.jobs.worker import JobWorker
+from src.apps.products.schemas.product_schemas import ProductOutputSchema
+from src.apps.receptions.models import Reception
+from src.apps.receptions.services import create_reception_job, get_single_reception
+from src.apps.stocks.schemas.stock_schemas import StockOutputSchema
+from src.apps.users.schemas import UserOutputSchema
+from src.core.exceptions import DoesNotExist
+from src.core.factory.reception_factory import (
+    ReceptionInputSchemaFactory,
+    ReceptionProductInputSchemaFactory,
+)
+from src.core.pagination.schemas import PagedResponseSchema
+from src.core.utils.time import get_current_time
+from src.core.utils.utils import generate_uuid
+from tests.test_jobs.conftest import job_worker
+from tests.test_products.conftest import db_categories, db_products
+from tests.test_sections.conftest import db_sections
+from tests.test_stocks.conftest import db_stocks
+from tests.test_users.conftest import db_staff_user
+from tests.test_warehouse.conftest import db_warehouse
+
+
+class RecordingSession:
+    def __init__(self, statements: list) -> None:
+        self.statements = statements
+
+    async def __aenter__(self) -> "RecordingSession":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        pass
+
+    async def execute(self, statement) -> None:
+        self.statements.append(statement.compile().params)
+
+    async def commit(self) -> None:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_if_job_progress_writes_are_throttled_into_the_heartbeat():
+    writes = []
+    progress = JobProgress(lambda: RecordingSession(writes), "job", write_interval=60)
+
+    await progress.update(0, 100)
+    for completed in range(1, 101):
+        await progress.update(completed)
+    assert len(writes) == 1
+
+    await progress.beat()
+
+    assert len(writes) == 2
+    assert writes[0]["progress_total"] == 100
+    assert writes[1]["progress_completed"] == 100
+    assert progress.pending_values == {}
+
+
+@pytest.mark.asyncio
+async def test_if_reception_job_is_processed_by_worker(
+    async_session: AsyncSession,
+    job_worker: JobWorker,
+    db_products: PagedResponseSchema[ProductOutputSchema],
+    db_staff_user: UserOutputSchema,
+    db_stocks: PagedResponseSchema[StockOutputSchema],
+):
+    reception_input = ReceptionInputSchemaFactory().generate(
+        products_data=[
+            ReceptionProductInputSchemaFactory().generate(
+                db_products.results[0].id, product_count=3
+            )
+        ]
+    )
+    job = await create_reception_job(async_session, reception_input, db_staff_user.id)
+    assert job.status == JOB_PENDING
+
+    assert await job_worker.run_next() is True
+    job = await get_single_job(async_session, job.id)
+
+    assert job.status == JOB_SUCCEEDED
+    assert job.attempts == 1
+    assert job.progress_completed == job.progress_total == 1
+    reception = await get_single_reception(async_session, job.result["reception_id"])
+    assert reception.user.id == db_staff_user.id
+    assert await job_worker.run_next() is False
+
+
+@pytest.mark.asyncio
+async def test_if_reclaimed_reception_job_does_not_repeat_the_reception(
+    async_session: AsyncSession,
+    job_worker: JobWorker,
+    db_products: PagedResponseSchema[ProductOutputSchema],
+    db_staff_user: UserOutputSchema,
+    db_stocks: PagedResponseSchema[StockOutputSchema],
+):
+    reception_input = ReceptionInputSchemaFactory().generate(
+        products_data=[
+            ReceptionProductInputSchemaFactory().generate(
+                db_products.results[0].id, product_count=3
+            )
+        ]
+    )
+    job = await create_reception_job(async_session, reception_input, db_staff_user.id)
+    assert await job_worker.run_next() is True
+
+    # the worker is lost after committing the reception, before the job result
+    await async_session.execute(
+        update(Job)
+        .where(Job.id == job.id)
+        .values(
+            status=JOB_RUNNING,
+            heartbeat_at=get_current_time() - dt.timedelta(hours=1),
+        )
+    )
+    await async_session.commit()
+    assert await job_worker.run_next() is True
+    job = await get_single_job(async_session, job.id)
+    receptions = await async_session.scalars(
+        select(Reception.id).filter(Reception.job_id == job.id)
+    )
+
+    assert job.status == JOB_SUCCEEDED
+    assert job.attempts == 2
+    assert receptions.all() == [job.result["reception_id"]]
+
+
+@pytest.mark.asyncio
+async def test_if_job_of_unknown_kind_fails_without_retry(
+    async_session: AsyncSession, job_worker: JobWorker
+):
+    job = await enqueue_job(async_session, "unknown", {})
+
+    await job_worker.run_next()
+    job = await get_single_job(async_session, job.id)
+
+    assert job.status == JOB_FAILED
+    assert job.attempts == 1
+    assert "unknown" in job.last_error
+
+
+@pytest.mark.asyncio
+async def test_raise_exception_while_getting_nonexistent_job(
+    async_session: AsyncSession,
+):
+    with pytest.raises(DoesNotExist):
+        await get_single_job(async_session, generate_uuid())
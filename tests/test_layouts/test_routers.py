@@ -0,0 +1,83 @@
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+
+from src.apps.users.schemas import UserOutputSchema
+from src.apps.warehouse.schemas import WarehouseOutputSchema
+from src.core.factory.layout_factory import LayoutSectionInputSchemaFactory
+from src.core.pagination.schemas import PagedResponseSchema
+from tests.test_users.conftest import (
+    auth_headers,
+    db_staff_user,
+    db_user,
+    staff_auth_headers,
+)
+from tests.test_warehouse.conftest import db_warehouse
+
+
+@pytest.mark.parametrize(
+    "user, user_headers, status_code",
+    [
+        (
+            pytest.lazy_fixture("db_user"),
+            pytest.lazy_fixture("auth_headers"),
+            status.HTTP_403_FORBIDDEN,
+        ),
+        (
+            pytest.lazy_fixture("db_staff_user"),
+            pytest.lazy_fixture("staff_auth_headers"),
+            status.HTTP_201_CREATED,
+        ),
+    ],
+)
+@pytest.mark.asyncio
+async def test_only_staff_can_provision_section_layout(
+    async_client: AsyncClient,
+    db_warehouse: PagedResponseSchema[WarehouseOutputSchema],
+    user: UserOutputSchema,
+    user_headers: dict[str, str],
+    status_code: int,
+):
+    layout_input = LayoutSectionInputSchemaFactory().generate()
+    response = await async_client.post(
+        "layouts/sections", headers=user_headers, content=layout_input.json()
+    )
+    assert response.status_code == status_code
+
+    if status_code == status.HTTP_201_CREATED:
+        assert response.json()["section_name"] == layout_input.section_name
+        assert response.json()["dry_run"] is False
+
+
+@pytest.mark.parametrize(
+    "user, user_headers, status_code",
+    [
+        (
+            pytest.lazy_fixture("db_user"),
+            pytest.lazy_fixture("auth_headers"),
+            status.HTTP_403_FORBIDDEN,
+        ),
+        (
+            pytest.lazy_fixture("db_staff_user"),
+            pytest.lazy_fixture("staff_auth_headers"),
+            status.HTTP_200_OK,
+        ),
+    ],
+)
+@pytest.mark.asyncio
+async def test_only_staff_can_validate_section_layout(
+    async_client: AsyncClient,
+    db_warehouse: PagedResponseSchema[WarehouseOutputSchema],
+    user: UserOutputSchema,
+    user_headers: dict[str, str],
+    status_code: int,
+):
+    layout_input = LayoutSectionInputSchemaFactory().generate()
+    response = await async_client.post(
+        "layouts/sections/validate", headers=user_headers, content=layout_input.json()
+    )
+    assert response.status_code == status_code
+
+    if status_code == status.HTTP_200_OK:
+        assert response.json()["dry_run"] is True
+        assert response.json()["section_id"] is None
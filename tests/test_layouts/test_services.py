@@ -0,0 +1,141 @@
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.apps.layouts.services import provision_section_layout
+from src.apps.rack_level_slots.models import RackLevelSlot
+from src.apps.rack_levels.models import RackLevel
+from src.apps.racks.models import Rack
+from src.apps.sections.models import Section
+from src.apps.warehouse.models import Warehouse
+from src.apps.warehouse.schemas import WarehouseOutputSchema
+from src.core.exceptions import (
+    NotEnoughRackResourcesException,
+    NotEnoughSectionResourcesException,
+    WarehouseDoesNotExistException,
+)
+from src.core.factory.layout_factory import (
+    LayoutRackLevelTemplateSchemaFactory,
+    LayoutRackTemplateSchemaFactory,
+    LayoutSectionInputSchemaFactory,
+)
+from src.core.pagination.schemas import PagedResponseSchema
+from src.core.utils.orm import if_exists
+from tests.test_warehouse.conftest import db_warehouse
+
+
+@pytest.mark.asyncio
+async def test_raise_exception_when_layout_provisioned_with_no_warehouse_object(
+    async_session: AsyncSession,
+):
+    layout_input = LayoutSectionInputSchemaFactory().generate()
+
+    with pytest.raises(WarehouseDoesNotExistException):
+        await provision_section_layout(async_session, layout_input)
+
+
+@pytest.mark.asyncio
+async def test_if_layout_is_provisioned_with_precomputed_counters(
+    async_session: AsyncSession,
+    db_warehouse: PagedResponseSchema[WarehouseOutputSchema],
+):
+    level_template = LayoutRackLevelTemplateSchemaFactory().generate(
+        max_weight=100, max_slots=3, quantity=4
+    )
+    rack_template = LayoutRackTemplateSchemaFactory().generate(
+        max_weight=1000, max_levels=5, quantity=3, rack_levels=[level_template]
+    )
+    layout_input = LayoutSectionInputSchemaFactory().generate(
+        max_weight=5000, max_racks=4, racks=[rack_template]
+    )
+
+    result = await provision_section_layout(async_session, layout_input)
+
+    assert result.racks_amount == 3
+    assert result.rack_levels_amount == 12
+    assert result.rack_level_slots_amount == 36
+
+    section = await if_exists(Section, "id", result.section_id, async_session)
+    assert section.occupied_racks == 3
+    assert section.available_racks == 1
+    assert section.reserved_weight == Decimal(3000)
+    assert section.weight_to_reserve == Decimal(2000)
+
+    rack = section.racks[0]
+    assert rack.occupied_levels == 4
+    assert rack.available_levels == 1
+    assert rack.reserved_weight == Decimal(400)
+    assert rack.weight_to_reserve == Decimal(600)
+
+    rack_level = rack.rack_levels[0]
+    assert rack_level.available_slots == rack_level.active_slots == 3
+    assert len(rack_level.rack_level_slots) == 3
+
+    warehouse = await if_exists(
+        Warehouse, "id", db_warehouse.results[0].id, async_session
+    )
+    assert warehouse.occupied_sections == db_warehouse.results[0].occupied_sections + 1
+
+
+@pytest.mark.asyncio
+async def test_if_dry_run_does_not_create_any_objects(
+    async_session: AsyncSession,
+    db_warehouse: PagedResponseSchema[WarehouseOutputSchema],
+):
+    layout_input = LayoutSectionInputSchemaFactory().generate()
+
+    result = await provision_section_layout(async_session, layout_input, dry_run=True)
+
+    assert result.dry_run is True
+    assert result.section_id is None
+    assert result.rack_level_slots_amount > 0
+    for model in (Section, Rack, RackLevel, RackLevelSlot):
+        assert not await async_session.scalar(select(func.count()).select_from(model))
+
+
+@pytest.mark.asyncio
+async def test_raise_exception_when_layout_racks_exceed_section_limits(
+    async_session: AsyncSession,
+    db_warehouse: PagedResponseSchema[WarehouseOutputSchema],
+):
+    rack_template = LayoutRackTemplateSchemaFactory().generate(quantity=3)
+    layout_input = LayoutSectionInputSchemaFactory().generate(
+        max_racks=2, racks=[rack_template]
+    )
+
+    with pytest.raises(NotEnoughSectionResourcesException):
+        await provision_section_layout(async_session, layout_input, dry_run=True)
+
+    layout_input = LayoutSectionInputSchemaFactory().generate(
+        max_weight=rack_template.max_weight, racks=[rack_template]
+    )
+
+    with pytest.raises(NotEnoughSectionResourcesException):
+        await provision_section_layout(async_session, layout_input, dry_run=True)
+
+
+@pytest.mark.asyncio
+async def test_raise_exception_when_layout_levels_exceed_rack_limits(
+    async_session: AsyncSession,
+    db_warehouse: PagedResponseSchema[WarehouseOutputSchema],
+):
+    level_template = LayoutRackLevelTemplateSchemaFactory().generate(
+        max_weight=100, quantity=3
+    )
+    rack_template = LayoutRackTemplateSchemaFactory().generate(
+        max_weight=1000, max_levels=2, rack_levels=[level_template]
+    )
+    layout_input = LayoutSectionInputSchemaFactory().generate(racks=[rack_template])
+
+    with pytest.raises(NotEnoughRackResourcesException):
+        await provision_section_layout(async_session, layout_input)
+
+    rack_template = LayoutRackTemplateSchemaFactory().generate(
+        max_weight=250, max_levels=3, rack_levels=[level_template]
+    )
+    layout_input = LayoutSectionInputSchemaFactory().generate(racks=[rack_template])
+
+    with pytest.raises(NotEnoughRackResourcesException):
+        await provision_section_layout(async_session, layout_input)
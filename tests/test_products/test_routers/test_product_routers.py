@@ -235,3 +235,43 @@ async def test_only_staff_user_can_make_single_product_legacy(
         f"products/{db_products.results[0].id}/legacy", headers=user_headers
     )
     assert response.status_code == status_code
+
+
+@pytest.mark.parametrize(
+    "user, user_headers, status_code",
+    [
+        (
+            pytest.lazy_fixture("db_user"),
+            pytest.lazy_fixture("auth_headers"),
+            status.HTTP_403_FORBIDDEN,
+        ),
+        (
+            pytest.lazy_fixture("db_staff_user"),
+            pytest.lazy_fixture("staff_auth_headers"),
+            status.HTTP_200_OK,
+        ),
+    ],
+)
+@pytest.mark.asyncio
+async def test_only_staff_user_can_import_products_from_csv_file(
+    async_client: AsyncClient,
+    user: UserOutputSchema,
+    user_headers: dict[str, str],
+    status_code: int,
+    db_categories: PagedResponseSchema[CategoryOutputSchema],
+):
+    category = db_categories.results[0]
+    content = (
+        "\ufeffname,description,wholesale_price,weight,categories\r\n"
+        f"Półka regałowa,Steel shelf,12.50,3.2,{category.name}\r\n"
+    ).encode()
+
+    response = await async_client.post(
+        "products/import",
+        files={"file": ("products.csv", content, "text/csv")},
+        headers=user_headers,
+    )
+
+    assert response.status_code == status_code
+    if status_code == status.HTTP_200_OK:
+        assert (response.json()["created"], response.json()["failed"]) == (1, 0)
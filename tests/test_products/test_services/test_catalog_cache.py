@@ -0,0 +1,174 @@
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.apps.products.cache import CatalogCache, filter_and_sort_items
+from src.apps.products.schemas.category_schemas import CategoryOutputSchema
+from src.apps.products.schemas.product_schemas import (
+    ProductOutputSchema,
+    ProductUpdateSchema,
+)
+from src.apps.products.services.category_services import update_single_category
+from src.apps.products.services.product_services import (
+    get_all_products,
+    update_single_product,
+)
+from src.core.factory.category_factory import CategoryUpdateSchemaFactory
+from src.core.invalidation.backends import PostgresInvalidationBackend
+from src.core.invalidation.bus import InvalidationBus
+from src.core.invalidation.events import (
+    CATEGORY_CHANGED,
+    PRODUCT_CHANGED,
+    InvalidationEvent,
+)
+from src.core.pagination.models import PageParams
+from src.core.pagination.schemas import PagedResponseSchema
+from src.settings.db_settings import DatabaseSettings
+from tests.test_products.conftest import db_categories, db_products
+
+
+@pytest_asyncio.fixture
+async def invalidation_bus() -> InvalidationBus:
+    bus = InvalidationBus(
+        PostgresInvalidationBackend(
+            DatabaseSettings(ASYNC=False, TESTING=True).postgres_url,
+            "test_catalog_invalidation",
+            reconnect_delay=0.1,
+        )
+    )
+    bus.start()
+    while not bus.listening:
+        await asyncio.sleep(0.01)
+    yield bus
+    await bus.stop()
+
+
+@pytest.fixture
+def catalog_cache(
+    async_session: AsyncSession, invalidation_bus: InvalidationBus
+) -> CatalogCache:
+    @asynccontextmanager
+    async def session_factory() -> AsyncSession:
+        yield async_session
+
+    return CatalogCache(invalidation_bus, session_factory)
+
+
+@pytest.mark.asyncio
+async def test_if_catalog_is_loaded_once_and_served_from_memory(
+    catalog_cache: CatalogCache,
+    db_products: PagedResponseSchema[ProductOutputSchema],
+):
+    for product in db_products.results:
+        assert await catalog_cache.get_product(product.id) == product
+    products = await catalog_cache.get_products(get_legacy=True, query_params=[])
+
+    assert {product.id for product in products} == {
+        product.id for product in db_products.results
+    }
+    assert catalog_cache.get_metrics().loads == 1
+    assert catalog_cache.get_metrics().hits == len(db_products.results) + 1
+
+
+@pytest.mark.asyncio
+async def test_if_only_changed_product_is_reloaded(
+    async_session: AsyncSession,
+    catalog_cache: CatalogCache,
+    invalidation_bus: InvalidationBus,
+    db_products: PagedResponseSchema[ProductOutputSchema],
+):
+    product, other_product = db_products.results[:2]
+    cached_other_product = await catalog_cache.get_product(other_product.id)
+
+    await update_single_product(
+        async_session, ProductUpdateSchema(name="cached product"), product.id
+    )
+    invalidation_bus.dispatch(InvalidationEvent(kind=PRODUCT_CHANGED, ids=[product.id]))
+
+    assert (await catalog_cache.get_product(product.id)).name == "cached product"
+    assert await catalog_cache.get_product(other_product.id) is cached_other_product
+    assert catalog_cache.get_metrics().loads == 1
+
+
+@pytest.mark.asyncio
+async def test_if_category_change_reloads_its_products(
+    async_session: AsyncSession,
+    catalog_cache: CatalogCache,
+    invalidation_bus: InvalidationBus,
+    db_products: PagedResponseSchema[ProductOutputSchema],
+):
+    product = db_products.results[0]
+    category = product.categories[0]
+    await catalog_cache.get_product(product.id)
+
+    category_input = CategoryUpdateSchemaFactory().generate(name="cached category")
+    await update_single_category(async_session, category_input, category.id)
+    invalidation_bus.dispatch(
+        InvalidationEvent(kind=CATEGORY_CHANGED, ids=[category.id])
+    )
+    categories = await catalog_cache.get_categories(query_params=[])
+
+    assert (await catalog_cache.get_product(product.id)).categories[
+        0
+    ].name == category_input.name
+    assert category_input.name in {category.name for category in categories}
+
+
+@pytest.mark.asyncio
+async def test_if_cached_list_matches_database_list(
+    async_session: AsyncSession,
+    catalog_cache: CatalogCache,
+    db_categories: PagedResponseSchema[CategoryOutputSchema],
+    db_products: PagedResponseSchema[ProductOutputSchema],
+):
+    category_names = ",".join(category.name for category in db_categories.results[:2])
+    query_params = [("categories__name__eq", category_names), ("sort", "name__desc")]
+
+    products = await catalog_cache.get_products(True, query_params)
+    db_products = await get_all_products(async_session, PageParams(), query_params)
+
+    assert [product.id for product in products] == [
+        product.id for product in db_products.results
+    ]
+
+
+@pytest.mark.asyncio
+async def test_if_cached_names_are_sorted_as_database_sorts_them(
+    async_session: AsyncSession,
+    catalog_cache: CatalogCache,
+    db_products: PagedResponseSchema[ProductOutputSchema],
+):
+    names = ["banana", "Apple", "éclair", "apple", "Eclair", "Zebra", "eclair", "b"]
+    database_names = await async_session.scalars(
+        text(
+            "SELECT name FROM unnest(CAST(:names AS varchar[])) AS name "
+            "ORDER BY name DESC"
+        ),
+        {"names": names},
+    )
+
+    assert await catalog_cache.is_ready()
+    items = filter_and_sort_items(
+        [SimpleNamespace(name=name) for name in names],
+        [],
+        [("name", True)],
+        catalog_cache.string_key,
+    )
+
+    assert [item.name for item in items] == database_names.all()
+
+
+@pytest.mark.asyncio
+async def test_if_unsupported_list_params_fall_back_to_database(
+    catalog_cache: CatalogCache,
+    db_products: PagedResponseSchema[ProductOutputSchema],
+):
+    products = await catalog_cache.get_products(True, [("weight__gt", "1")])
+
+    assert products is None
+    assert catalog_cache.get_metrics().misses == 1
@@ -0,0 +1,95 @@
+import io
+import json
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.apps.products.models import Product
+from src.apps.products.schemas.category_schemas import CategoryOutputSchema
+from src.apps.products.schemas.product_schemas import ProductOutputSchema
+from src.apps.products.services.import_services import import_products
+from src.apps.products.services.product_services import get_single_product
+from src.core.pagination.schemas import PagedResponseSchema
+from tests.test_products.conftest import db_categories, db_products
+
+
+@pytest.mark.asyncio
+async def test_if_csv_import_creates_and_updates_products(
+    async_session: AsyncSession,
+    db_categories: PagedResponseSchema[CategoryOutputSchema],
+    db_products: PagedResponseSchema[ProductOutputSchema],
+):
+    category, other_category = db_categories.results[:2]
+    existing_product = db_products.results[0]
+    lines = io.StringIO(
+        "name,description,wholesale_price,weight,categories\n"
+        f"Imported Shelf,Steel shelf,12.50,3.2,{category.name}|{other_category.name}\n"
+        f"{existing_product.name},Updated description,99.99,1.0,{other_category.name}\n"
+    )
+
+    result = await import_products(async_session, lines, "csv")
+    # the import bypasses the identity map of the session
+    async_session.expire_all()
+    imported_product = await async_session.scalar(
+        select(Product).filter(Product.name == "Imported Shelf")
+    )
+    updated_product = await get_single_product(async_session, existing_product.id)
+
+    assert (result.created, result.updated, result.failed) == (1, 1, 0)
+    assert {category.name for category in imported_product.categories} == {
+        category.name,
+        other_category.name,
+    }
+    assert updated_product.description == "Updated description"
+    assert str(updated_product.wholesale_price) == "99.99"
+    assert updated_product.weight == existing_product.weight
+    assert [category.id for category in updated_product.categories] == [
+        other_category.id
+    ]
+
+
+@pytest.mark.asyncio
+async def test_if_rejected_rows_are_reported_per_line(
+    async_session: AsyncSession,
+    db_categories: PagedResponseSchema[CategoryOutputSchema],
+):
+    rows = [
+        {"name": "Pallet", "wholesale_price": "1", "weight": "1"},
+        {"name": "Pallet", "wholesale_price": "2", "weight": "1"},
+        {"name": "Crate", "wholesale_price": "3", "weight": "1", "categories": ["?"]},
+        {"name": "Box", "weight": "1"},
+    ]
+    lines = io.StringIO(
+        "\n".join([*(json.dumps(row) for row in rows), "{not json"]) + "\n"
+    )
+
+    result = await import_products(async_session, lines, "ndjson")
+    pallet = await async_session.scalar(
+        select(Product).filter(Product.name == "Pallet")
+    )
+
+    assert (result.created, result.updated, result.failed) == (1, 0, 4)
+    assert [error.line for error in result.errors] == [1, 3, 4, 5]
+    assert "Overridden by line 2" in result.errors[0].message
+    assert "Unknown categories: ?" in result.errors[1].message
+    assert "wholesale_price" in result.errors[2].message
+    assert "Invalid JSON" in result.errors[3].message
+    assert str(pallet.wholesale_price) == "2"
+
+
+@pytest.mark.asyncio
+async def test_if_dry_run_import_does_not_store_products(
+    async_session: AsyncSession,
+):
+    lines = io.StringIO(
+        "name,description,wholesale_price,weight\nDry Run Product,,1,1\n"
+    )
+
+    result = await import_products(async_session, lines, "csv", dry_run=True)
+    product = await async_session.scalar(
+        select(Product).filter(Product.name == "Dry Run Product")
+    )
+
+    assert result.created == 1
+    assert product is None
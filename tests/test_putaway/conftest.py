@@ -0,0 +1,11 @@
+import pytest
+
+from src.apps.putaway.services import capacity_snapshot_cache
+
+
+@pytest.fixture(autouse=True)
+def reset_capacity_snapshot_cache():
+    # test transactions are rolled back, so a cached snapshot would outlive them
+    capacity_snapshot_cache.invalidate()
+    yield
+    capacity_snapshot_cache.invalidate()
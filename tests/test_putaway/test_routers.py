@@ -0,0 +1,63 @@
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+
+from src.apps.products.schemas.product_schemas import ProductOutputSchema
+from src.apps.putaway.schemas import (
+    PutawayStockInputSchema,
+    PutawaySuggestionInputSchema,
+)
+from src.apps.stocks.schemas.stock_schemas import StockOutputSchema
+from src.apps.users.schemas import UserOutputSchema
+from src.core.pagination.schemas import PagedResponseSchema
+from tests.test_products.conftest import db_categories, db_products
+from tests.test_sections.conftest import db_sections
+from tests.test_stocks.conftest import db_stocks
+from tests.test_users.conftest import (
+    auth_headers,
+    db_staff_user,
+    db_user,
+    staff_auth_headers,
+)
+from tests.test_warehouse.conftest import db_warehouse
+
+
+@pytest.mark.parametrize(
+    "user, user_headers, status_code",
+    [
+        (
+            pytest.lazy_fixture("db_user"),
+            pytest.lazy_fixture("auth_headers"),
+            status.HTTP_403_FORBIDDEN,
+        ),
+        (
+            pytest.lazy_fixture("db_staff_user"),
+            pytest.lazy_fixture("staff_auth_headers"),
+            status.HTTP_200_OK,
+        ),
+    ],
+)
+@pytest.mark.asyncio
+async def test_only_staff_or_user_with_permission_can_get_putaway_suggestions(
+    async_client: AsyncClient,
+    db_stocks: PagedResponseSchema[StockOutputSchema],
+    db_products: PagedResponseSchema[ProductOutputSchema],
+    user: UserOutputSchema,
+    user_headers: dict[str, str],
+    status_code: int,
+):
+    suggestion_input = PutawaySuggestionInputSchema(
+        stocks=[
+            PutawayStockInputSchema(product_id=product.id, product_count=1)
+            for product in db_products.results
+        ]
+    )
+    response = await async_client.post(
+        "putaway/suggestions", headers=user_headers, content=suggestion_input.json()
+    )
+    assert response.status_code == status_code
+
+    if status_code == status.HTTP_200_OK:
+        suggestions = response.json()["suggestions"]
+        assert len(suggestions) == len(db_products.results)
+        assert all(suggestion["recommended"] for suggestion in suggestions)
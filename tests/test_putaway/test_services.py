@@ -0,0 +1,248 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.apps.products.schemas.product_schemas import ProductOutputSchema
+from src.apps.putaway.schemas import (
+    PutawayStockInputSchema,
+    PutawaySuggestionInputSchema,
+)
+from src.apps.putaway.services import (
+    RACK_LEVEL,
+    CapacitySnapshot,
+    CapacitySnapshotCache,
+    get_putaway_suggestions,
+    load_capacity_snapshot,
+)
+from src.apps.rack_levels.models import RackLevel
+from src.apps.stocks.schemas.stock_schemas import StockOutputSchema
+from src.core.exceptions import DoesNotExist
+from src.core.invalidation.backends import PostgresInvalidationBackend
+from src.core.invalidation.bus import InvalidationBus
+from src.core.invalidation.events import (
+    ALL_CHANGED,
+    LAYOUT_CHANGED,
+    RACK_LEVEL_CAPACITY_CHANGED,
+    InvalidationEvent,
+)
+from src.core.pagination.schemas import PagedResponseSchema
+from src.core.utils.utils import generate_uuid
+from src.settings.db_settings import DatabaseSettings
+from tests.test_products.conftest import db_categories, db_products
+from tests.test_sections.conftest import db_sections
+from tests.test_stocks.conftest import db_stocks
+from tests.test_users.conftest import db_staff_user
+from tests.test_warehouse.conftest import db_warehouse
+
+
+def build_snapshot() -> CapacitySnapshot:
+    racks = [
+        SimpleNamespace(
+            id="rack-a",
+            section_id="section",
+            warehouse_id="warehouse",
+            occupied_weight=0,
+            max_weight=100,
+        ),
+        SimpleNamespace(
+            id="rack-b",
+            section_id="section",
+            warehouse_id="warehouse",
+            occupied_weight=0,
+            max_weight=100,
+        ),
+    ]
+    rack_levels = [
+        SimpleNamespace(
+            id=rack_level_id,
+            rack_id=rack_id,
+            available_weight=50,
+            available_slots=1,
+            max_weight=50,
+        )
+        for rack_level_id, rack_id in (("level-a", "rack-a"), ("level-b", "rack-b"))
+    ]
+    waiting_rooms = [
+        SimpleNamespace(
+            id="waiting-room",
+            warehouse_id="warehouse",
+            available_stock_weight=50,
+            available_slots=5,
+            max_weight=50,
+        )
+    ]
+    rack_level_slots = [SimpleNamespace(id="slot-b", rack_level_id="level-b")]
+    stocks = [
+        SimpleNamespace(
+            product_id="product", waiting_room_id=None, rack_level_slot_id="slot-b"
+        )
+    ]
+    return CapacitySnapshot(racks, rack_levels, waiting_rooms, rack_level_slots, stocks)
+
+
+def test_if_stocks_of_the_same_product_are_kept_together():
+    snapshot = build_snapshot()
+
+    scores = snapshot.score(np.array([10.0, 10.0]), ["product", "other product"])
+    ranking = snapshot.rank(scores, limit=3)
+
+    assert snapshot.location_ids[ranking[0][0]] == "level-b"
+    assert scores[0, 1] > scores[0, 0]
+    assert scores[1, 1] == scores[1, 0]
+    assert scores[:, 2].max() < scores[:, :2].min()
+
+
+def test_if_locations_without_capacity_are_not_suggested():
+    snapshot = build_snapshot()
+
+    scores = snapshot.score(np.array([60.0]), ["product"])
+    ranking = snapshot.rank(scores, limit=3)
+
+    assert np.isneginf(scores).all()
+    assert ranking.shape == (1, 3)
+
+
+def test_if_locations_of_another_warehouse_are_not_suggested():
+    snapshot = build_snapshot()
+    snapshot.location_warehouses[1] = "other-warehouse"
+
+    scores = snapshot.score(np.array([10.0]), ["product"], "warehouse")
+    other_scores = snapshot.score(np.array([10.0]), ["product"], "other-warehouse")
+
+    assert np.isneginf(scores[0, 1])
+    assert not np.isneginf(scores[0, [0, 2]]).any()
+    assert np.isneginf(other_scores[0, [0, 2]]).all()
+    assert not np.isneginf(other_scores[0, 1])
+
+
+def test_if_recommended_targets_reserve_capacity():
+    snapshot = build_snapshot()
+    weights = np.array([10.0, 20.0, 30.0])
+
+    scores = snapshot.score(weights, ["product", "product", "product"])
+    assignment = snapshot.assign(scores, weights)
+
+    assert sorted(snapshot.location_ids[index] for index in assignment[1:]) == [
+        "level-a",
+        "level-b",
+    ]
+    assert snapshot.location_ids[assignment[0]] == "waiting-room"
+    assert snapshot.free_slots.tolist() == [1, 1, 5]
+
+
+def test_if_snapshot_is_refreshed_from_capacity_changes():
+    snapshot = build_snapshot()
+
+    refreshed = snapshot.apply_changes(
+        [
+            ("rack_level", "level-a", 5.0, 0, 50.0),
+            ("rack", "rack-b", 90.0, 100.0),
+            ("stock", "product", (None, "slot-b"), ("waiting-room", None)),
+        ]
+    )
+
+    assert refreshed is True
+    assert snapshot.free_weight[0] == 5.0
+    assert snapshot.free_slots[0] == 0
+    assert snapshot.rack_occupied_weight[1] == 90.0
+    assert snapshot.product_locations["product"][1] == 0
+    assert snapshot.product_locations["product"][2] == 1
+    assert snapshot.apply_changes([("rack_level", "unknown", 1.0, 1, 1.0)]) is False
+    assert snapshot.apply_changes([("structure",)]) is False
+
+
+def build_cache() -> tuple[InvalidationBus, CapacitySnapshotCache]:
+    bus = InvalidationBus(
+        PostgresInvalidationBackend(
+            DatabaseSettings(ASYNC=False, TESTING=True).postgres_url,
+            "test_capacity_invalidation",
+            reconnect_delay=0.1,
+        )
+    )
+    return bus, CapacitySnapshotCache(bus)
+
+
+@pytest.mark.parametrize("kind", [LAYOUT_CHANGED, ALL_CHANGED])
+def test_if_cached_snapshot_is_dropped_on_layout_events(kind: str):
+    bus, cache = build_cache()
+    cache.snapshot = build_snapshot()
+
+    bus.dispatch(InvalidationEvent(kind=kind, ids=["level-a"]))
+
+    assert cache.snapshot is None
+    assert cache.generation == 1
+
+
+@pytest.mark.asyncio
+async def test_if_cached_snapshot_reloads_rack_levels_of_capacity_events(
+    async_session: AsyncSession,
+    db_stocks: PagedResponseSchema[StockOutputSchema],
+):
+    bus, cache = build_cache()
+    snapshot = await cache.get(async_session)
+    rack_level_id = next(
+        snapshot.location_ids[index]
+        for index in range(len(snapshot))
+        if snapshot.kinds[index] == RACK_LEVEL
+    )
+    index = snapshot.location_index[rack_level_id]
+    await async_session.execute(
+        update(RackLevel)
+        .where(RackLevel.id == rack_level_id)
+        .values(available_weight=0, available_slots=0)
+    )
+
+    bus.dispatch(
+        InvalidationEvent(kind=RACK_LEVEL_CAPACITY_CHANGED, ids=[rack_level_id])
+    )
+    refreshed = await cache.get(async_session)
+
+    assert refreshed is snapshot
+    assert refreshed.free_weight[index] == 0
+    assert refreshed.free_slots[index] == 0
+    assert cache.stale_rack_level_ids == set()
+
+
+@pytest.mark.asyncio
+async def test_if_putaway_suggestions_fit_the_incoming_stocks(
+    async_session: AsyncSession,
+    db_stocks: PagedResponseSchema[StockOutputSchema],
+    db_products: PagedResponseSchema[ProductOutputSchema],
+):
+    suggestion_input = PutawaySuggestionInputSchema(
+        stocks=[
+            PutawayStockInputSchema(product_id=product.id, product_count=1)
+            for product in db_products.results
+        ],
+        limit=5,
+    )
+    snapshot = await load_capacity_snapshot(async_session)
+
+    result = await get_putaway_suggestions(async_session, suggestion_input, snapshot)
+
+    assert len(result.suggestions) == len(db_products.results)
+    for suggestion in result.suggestions:
+        scores = [candidate.score for candidate in suggestion.candidates]
+        assert suggestion.recommended is not None
+        assert scores == sorted(scores, reverse=True)
+        assert all(
+            candidate.available_weight >= suggestion.weight
+            and candidate.available_slots > 0
+            and (candidate.waiting_room_id is None) != (candidate.rack_level_id is None)
+            for candidate in suggestion.candidates
+        )
+
+
+@pytest.mark.asyncio
+async def test_raise_exception_when_suggesting_putaway_for_nonexistent_product(
+    async_session: AsyncSession,
+    db_stocks: PagedResponseSchema[StockOutputSchema],
+):
+    suggestion_input = PutawaySuggestionInputSchema(
+        stocks=[PutawayStockInputSchema(product_id=generate_uuid(), product_count=1)]
+    )
+    with pytest.raises(DoesNotExist):
+        await get_putaway_suggestions(async_session, suggestion_input)
@@ -0,0 +1,71 @@
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+
+from src.apps.products.schemas.product_schemas import ProductOutputSchema
+from src.apps.users.schemas import UserOutputSchema
+from src.core.factory.product_factory import ProductInputSchemaFactory
+from src.core.pagination.schemas import PagedResponseSchema
+from tests.test_products.conftest import db_categories, db_products
+from tests.test_users.conftest import (
+    auth_headers,
+    db_staff_user,
+    db_user,
+    staff_auth_headers,
+)
+
+
+@pytest.mark.asyncio
+async def test_if_search_results_are_ranked_by_similarity(
+    async_client: AsyncClient,
+    db_staff_user: UserOutputSchema,
+    staff_auth_headers: dict[str, str],
+    db_products: PagedResponseSchema[ProductOutputSchema],
+):
+    for name in ("Pallet Jack", "Hand Pallet Truck"):
+        product_data = ProductInputSchemaFactory().generate(
+            name=name, description="Used in the loading bay"
+        )
+        response = await async_client.post(
+            "products/", content=product_data.json(), headers=staff_auth_headers
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+
+    response = await async_client.get(
+        "search/?q=palet jack&type=product", headers=staff_auth_headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    results = response.json()["results"]
+    ranks = [result["rank"] for result in results]
+    assert results[0]["name"] == "Pallet Jack"
+    assert ranks == sorted(ranks, reverse=True)
+    assert {result["object_type"] for result in results} == {"product"}
+
+
+@pytest.mark.parametrize(
+    "user, user_headers, status_code",
+    [
+        (
+            pytest.lazy_fixture("db_user"),
+            pytest.lazy_fixture("auth_headers"),
+            status.HTTP_403_FORBIDDEN,
+        ),
+        (
+            pytest.lazy_fixture("db_staff_user"),
+            pytest.lazy_fixture("staff_auth_headers"),
+            status.HTTP_200_OK,
+        ),
+    ],
+)
+@pytest.mark.asyncio
+async def test_only_staff_or_user_with_permission_can_search_receptions(
+    async_client: AsyncClient,
+    user: UserOutputSchema,
+    user_headers: dict[str, str],
+    status_code: int,
+):
+    response = await async_client.get(
+        "search/?q=pallet&type=reception", headers=user_headers
+    )
+    assert response.status_code == status_code
@@ -0,0 +1,51 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.apps.receptions.services import get_all_receptions
+from src.apps.search.services import search_objects
+from src.apps.stocks.schemas.stock_schemas import StockOutputSchema
+from src.apps.users.models import User
+from src.apps.users.schemas import UserOutputSchema
+from src.apps.warehouse.schemas import WarehouseOutputSchema
+from src.apps.warehouse.services import create_warehouse
+from src.core.factory.warehouse_factory import WarehouseInputSchemaFactory
+from src.core.pagination.models import PageParams
+from src.core.pagination.schemas import PagedResponseSchema
+from src.core.utils.orm import if_exists
+from tests.test_products.conftest import db_categories, db_products
+from tests.test_sections.conftest import db_sections
+from tests.test_stocks.conftest import db_stocks
+from tests.test_users.conftest import db_staff_user
+from tests.test_warehouse.conftest import db_warehouse
+
+
+@pytest.mark.asyncio
+async def test_if_search_is_limited_to_the_given_warehouse(
+    async_session: AsyncSession,
+    db_stocks: PagedResponseSchema[StockOutputSchema],
+    db_staff_user: UserOutputSchema,
+    db_warehouse: PagedResponseSchema[WarehouseOutputSchema],
+):
+    request_user = await if_exists(User, "id", db_staff_user.id, async_session)
+    reception = (await get_all_receptions(async_session, PageParams())).results[0]
+    warehouse = await create_warehouse(
+        async_session, WarehouseInputSchemaFactory().generate()
+    )
+
+    own_results = await search_objects(
+        async_session,
+        request_user,
+        reception.description,
+        ["reception"],
+        warehouse_id=db_warehouse.results[0].id,
+    )
+    other_results = await search_objects(
+        async_session,
+        request_user,
+        reception.description,
+        ["reception", "issue", "rack_level_slot"],
+        warehouse_id=warehouse.id,
+    )
+
+    assert reception.id in {result.id for result in own_results.results}
+    assert other_results.results == []
@@ -7,7 +7,12 @@ from src.apps.issues.schemas import IssueOutputSchema
 from src.apps.products.schemas.product_schemas import ProductOutputSchema
 from src.apps.receptions.schemas import ReceptionOutputSchema
 from src.apps.sections.schemas import SectionOutputSchema
-from src.apps.stocks.schemas.stock_schemas import StockOutputSchema
+from src.apps.stocks.schemas.stock_schemas import (
+    StockBatchMoveInputSchema,
+    StockDrainInputSchema,
+    StockMoveInputSchema,
+    StockOutputSchema,
+)
 from src.apps.users.schemas import UserOutputSchema
 from src.core.pagination.schemas import PagedResponseSchema
 from tests.test_issues.conftest import db_issues
@@ -180,3 +185,91 @@ async def test_only_authenticated_user_can_get_basic_data_about_single_stock(
 
     assert response.status_code == status_code
     assert available_stocks[0].id == response.json()["id"]
+
+
+@pytest.mark.parametrize(
+    "user, user_headers, status_code",
+    [
+        (
+            pytest.lazy_fixture("db_user"),
+            pytest.lazy_fixture("auth_headers"),
+            status.HTTP_403_FORBIDDEN,
+        ),
+        (
+            pytest.lazy_fixture("db_staff_user"),
+            pytest.lazy_fixture("staff_auth_headers"),
+            status.HTTP_200_OK,
+        ),
+    ],
+)
+@pytest.mark.asyncio
+async def test_only_staff_or_user_with_permission_can_move_multiple_stocks(
+    async_client: AsyncClient,
+    user: UserOutputSchema,
+    user_headers: dict[str, str],
+    status_code: int,
+    db_stocks: PagedResponseSchema[StockOutputSchema],
+):
+    slot_stock = next(stock for stock in db_stocks.results if stock.rack_level_slot_id)
+    waiting_room_id = next(
+        stock.waiting_room_id for stock in db_stocks.results if stock.waiting_room_id
+    )
+    move_input = StockBatchMoveInputSchema(
+        moves=[
+            StockMoveInputSchema(
+                stock_id=slot_stock.id, waiting_room_id=waiting_room_id
+            )
+        ]
+    )
+
+    response = await async_client.patch(
+        "stocks/move", content=move_input.json(), headers=user_headers
+    )
+
+    assert response.status_code == status_code
+    if status_code == status.HTTP_200_OK:
+        assert response.json()["moved"] == 1
+
+
+@pytest.mark.parametrize(
+    "user, user_headers, status_code",
+    [
+        (
+            pytest.lazy_fixture("db_user"),
+            pytest.lazy_fixture("auth_headers"),
+            status.HTTP_403_FORBIDDEN,
+        ),
+        (
+            pytest.lazy_fixture("db_staff_user"),
+            pytest.lazy_fixture("staff_auth_headers"),
+            status.HTTP_200_OK,
+        ),
+    ],
+)
+@pytest.mark.asyncio
+async def test_only_staff_or_user_with_permission_can_drain_waiting_rooms(
+    async_client: AsyncClient,
+    user: UserOutputSchema,
+    user_headers: dict[str, str],
+    status_code: int,
+    db_stocks: PagedResponseSchema[StockOutputSchema],
+):
+    waiting_room_stock = next(
+        stock
+        for stock in db_stocks.results
+        if stock.waiting_room_id and not stock.is_issued
+    )
+    drain_input = StockDrainInputSchema(
+        waiting_room_ids=[waiting_room_stock.waiting_room_id]
+    )
+
+    response = await async_client.post(
+        "stocks/drain", content=drain_input.json(), headers=user_headers
+    )
+
+    assert response.status_code == status_code
+    if status_code == status.HTTP_200_OK:
+        assert response.json()["executed"] is False
+        assert [
+            assignment["stock_id"] for assignment in response.json()["assignments"]
+        ] == [waiting_room_stock.id]
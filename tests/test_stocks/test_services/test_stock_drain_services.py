@@ -0,0 +1,124 @@
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.apps.stocks.models import Stock
+from src.apps.stocks.schemas.stock_schemas import (
+    StockDrainInputSchema,
+    StockOutputSchema,
+)
+from src.apps.stocks.services.stock_drain_services import (
+    drain_waiting_rooms,
+    pack_stocks_into_rack_levels,
+)
+from src.apps.stocks.services.user_stock_services import get_all_user_stocks
+from src.apps.users.schemas import UserOutputSchema
+from src.core.exceptions import DoesNotExist
+from src.core.pagination.models import PageParams
+from src.core.pagination.schemas import PagedResponseSchema
+from src.core.utils.orm import if_exists
+from src.core.utils.utils import generate_uuid
+from tests.test_products.conftest import db_categories, db_products
+from tests.test_sections.conftest import db_sections
+from tests.test_stocks.conftest import db_stocks
+from tests.test_users.conftest import db_staff_user
+from tests.test_warehouse.conftest import db_warehouse
+
+
+def test_if_stocks_are_packed_first_fit_decreasing():
+    stocks = [
+        SimpleNamespace(
+            id=f"stock-{weight}", weight=Decimal(weight), waiting_room_id="room"
+        )
+        for weight in (10, 40, 30, 60)
+    ]
+    rack_levels = [
+        SimpleNamespace(id="level-a", available_weight=Decimal(70), available_slots=2),
+        SimpleNamespace(id="level-b", available_weight=Decimal(50), available_slots=1),
+    ]
+    rack_level_slots = [
+        SimpleNamespace(id="slot-a1", rack_level_id="level-a"),
+        SimpleNamespace(id="slot-a2", rack_level_id="level-a"),
+        SimpleNamespace(id="slot-b1", rack_level_id="level-b"),
+    ]
+
+    assignments, unassigned_stock_ids = pack_stocks_into_rack_levels(
+        stocks, rack_levels, rack_level_slots
+    )
+
+    assert [
+        (assignment.stock_id, assignment.rack_level_slot_id)
+        for assignment in assignments
+    ] == [("stock-60", "slot-a1"), ("stock-40", "slot-b1"), ("stock-10", "slot-a2")]
+    assert unassigned_stock_ids == ["stock-30"]
+
+
+@pytest.mark.asyncio
+async def test_if_waiting_room_drain_is_only_planned_by_default(
+    async_session: AsyncSession,
+    db_stocks: PagedResponseSchema[StockOutputSchema],
+    db_staff_user: UserOutputSchema,
+):
+    waiting_room_stock = next(
+        stock
+        for stock in db_stocks.results
+        if stock.waiting_room_id and not stock.is_issued
+    )
+
+    result = await drain_waiting_rooms(
+        async_session,
+        StockDrainInputSchema(waiting_room_ids=[waiting_room_stock.waiting_room_id]),
+        db_staff_user.id,
+    )
+    stock = await if_exists(Stock, "id", waiting_room_stock.id, async_session)
+
+    assert result.executed is False
+    assert result.move_results is None
+    assert [assignment.stock_id for assignment in result.assignments] == [stock.id]
+    assert stock.waiting_room_id == waiting_room_stock.waiting_room_id
+
+
+@pytest.mark.asyncio
+async def test_if_waiting_room_is_drained_into_rack_level_slots(
+    async_session: AsyncSession,
+    db_stocks: PagedResponseSchema[StockOutputSchema],
+    db_staff_user: UserOutputSchema,
+):
+    waiting_room_stock = next(
+        stock
+        for stock in db_stocks.results
+        if stock.waiting_room_id and not stock.is_issued
+    )
+    user_stocks_before = await get_all_user_stocks(async_session, PageParams())
+
+    result = await drain_waiting_rooms(
+        async_session,
+        StockDrainInputSchema(
+            waiting_room_ids=[waiting_room_stock.waiting_room_id], execute=True
+        ),
+        db_staff_user.id,
+    )
+    stock = await if_exists(Stock, "id", waiting_room_stock.id, async_session)
+    user_stocks_after = await get_all_user_stocks(async_session, PageParams())
+
+    assert result.executed is True
+    assert result.move_results.moved == 1
+    assert stock.waiting_room_id is None
+    assert stock.rack_level_slot_id == result.assignments[0].rack_level_slot_id
+    assert user_stocks_after.total == user_stocks_before.total + 1
+
+
+@pytest.mark.asyncio
+async def test_raise_exception_when_draining_nonexistent_waiting_room(
+    async_session: AsyncSession,
+    db_stocks: PagedResponseSchema[StockOutputSchema],
+    db_staff_user: UserOutputSchema,
+):
+    with pytest.raises(DoesNotExist):
+        await drain_waiting_rooms(
+            async_session,
+            StockDrainInputSchema(waiting_room_ids=[generate_uuid()]),
+            db_staff_user.id,
+        )
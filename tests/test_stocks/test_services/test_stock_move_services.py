@@ -0,0 +1,234 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.apps.rack_level_slots.models import RackLevelSlot
+from src.apps.rack_levels.models import RackLevel
+from src.apps.stocks.models import Stock
+from src.apps.stocks.schemas.stock_schemas import (
+    StockBatchMoveInputSchema,
+    StockMoveInputSchema,
+    StockOutputSchema,
+)
+from src.apps.stocks.services.stock_move_services import move_multiple_stocks
+from src.apps.stocks.services.user_stock_services import get_all_user_stocks
+from src.apps.users.schemas import UserOutputSchema
+from src.apps.waiting_rooms.models import WaitingRoom
+from src.apps.waiting_rooms.services import create_waiting_room
+from src.apps.warehouse.services import create_warehouse
+from src.core.factory.waiting_room_factory import WaitingRoomInputSchemaFactory
+from src.core.factory.warehouse_factory import WarehouseInputSchemaFactory
+from src.core.pagination.models import PageParams
+from src.core.pagination.schemas import PagedResponseSchema
+from src.core.utils.orm import if_exists
+from src.core.utils.utils import generate_uuid
+from tests.test_products.conftest import db_categories, db_products
+from tests.test_sections.conftest import db_sections
+from tests.test_stocks.conftest import db_stocks
+from tests.test_users.conftest import db_staff_user
+from tests.test_warehouse.conftest import db_warehouse
+
+
+@pytest.mark.asyncio
+async def test_if_multiple_stocks_are_moved_in_one_batch(
+    async_session: AsyncSession,
+    db_stocks: PagedResponseSchema[StockOutputSchema],
+    db_staff_user: UserOutputSchema,
+):
+    slot_stock = next(stock for stock in db_stocks.results if stock.rack_level_slot_id)
+    waiting_room_stock = next(
+        stock
+        for stock in db_stocks.results
+        if stock.waiting_room_id and not stock.is_issued
+    )
+    rack_level_slot = await if_exists(
+        RackLevelSlot, "id", slot_stock.rack_level_slot_id, async_session
+    )
+    rack_level = await if_exists(
+        RackLevel, "id", rack_level_slot.rack_level_id, async_session
+    )
+    waiting_room = await if_exists(
+        WaitingRoom, "id", waiting_room_stock.waiting_room_id, async_session
+    )
+    waiting_room_occupied_slots = waiting_room.occupied_slots
+    rack_level_occupied_slots = rack_level.occupied_slots
+    user_stocks_before = await get_all_user_stocks(async_session, PageParams())
+
+    result = await move_multiple_stocks(
+        async_session,
+        StockBatchMoveInputSchema(
+            moves=[
+                StockMoveInputSchema(
+                    stock_id=slot_stock.id, waiting_room_id=waiting_room.id
+                ),
+                StockMoveInputSchema(
+                    stock_id=waiting_room_stock.id, rack_level_id=rack_level.id
+                ),
+            ]
+        ),
+        db_staff_user.id,
+    )
+    moved_slot_stock = await if_exists(Stock, "id", slot_stock.id, async_session)
+    moved_waiting_room_stock = await if_exists(
+        Stock, "id", waiting_room_stock.id, async_session
+    )
+    user_stocks_after = await get_all_user_stocks(async_session, PageParams())
+
+    assert result.moved == 2
+    assert result.failed == 0
+    assert moved_slot_stock.waiting_room_id == waiting_room.id
+    assert moved_slot_stock.rack_level_slot_id is None
+    assert moved_waiting_room_stock.waiting_room_id is None
+    assert moved_waiting_room_stock.rack_level_slot.rack_level_id == rack_level.id
+    assert waiting_room.occupied_slots == waiting_room_occupied_slots
+    assert rack_level.occupied_slots == rack_level_occupied_slots
+    assert user_stocks_after.total == user_stocks_before.total + 2
+
+
+@pytest.mark.asyncio
+async def test_if_stocks_can_swap_their_rack_level_slots(
+    async_session: AsyncSession,
+    db_stocks: PagedResponseSchema[StockOutputSchema],
+    db_staff_user: UserOutputSchema,
+):
+    first_stock, second_stock = [
+        stock for stock in db_stocks.results if stock.rack_level_slot_id
+    ][:2]
+
+    result = await move_multiple_stocks(
+        async_session,
+        StockBatchMoveInputSchema(
+            moves=[
+                StockMoveInputSchema(
+                    stock_id=first_stock.id,
+                    rack_level_slot_id=second_stock.rack_level_slot_id,
+                ),
+                StockMoveInputSchema(
+                    stock_id=second_stock.id,
+                    rack_level_slot_id=first_stock.rack_level_slot_id,
+                ),
+            ]
+        ),
+        db_staff_user.id,
+    )
+    swapped_first_stock = await if_exists(Stock, "id", first_stock.id, async_session)
+    swapped_second_stock = await if_exists(Stock, "id", second_stock.id, async_session)
+
+    assert result.moved == 2
+    assert swapped_first_stock.rack_level_slot_id == second_stock.rack_level_slot_id
+    assert swapped_second_stock.rack_level_slot_id == first_stock.rack_level_slot_id
+
+
+@pytest.mark.asyncio
+async def test_if_invalid_moves_are_reported_without_blocking_the_batch(
+    async_session: AsyncSession,
+    db_stocks: PagedResponseSchema[StockOutputSchema],
+    db_staff_user: UserOutputSchema,
+):
+    issued_stock = next(stock for stock in db_stocks.results if stock.is_issued)
+    slot_stock = next(stock for stock in db_stocks.results if stock.rack_level_slot_id)
+    waiting_room_id = issued_stock.waiting_room_id or next(
+        stock.waiting_room_id for stock in db_stocks.results if stock.waiting_room_id
+    )
+
+    result = await move_multiple_stocks(
+        async_session,
+        StockBatchMoveInputSchema(
+            moves=[
+                StockMoveInputSchema(
+                    stock_id=issued_stock.id, waiting_room_id=waiting_room_id
+                ),
+                StockMoveInputSchema(
+                    stock_id=generate_uuid(), waiting_room_id=waiting_room_id
+                ),
+                StockMoveInputSchema(
+                    stock_id=slot_stock.id,
+                    waiting_room_id=waiting_room_id,
+                    rack_level_slot_id=slot_stock.rack_level_slot_id,
+                ),
+                StockMoveInputSchema(
+                    stock_id=slot_stock.id, waiting_room_id=waiting_room_id
+                ),
+            ]
+        ),
+        db_staff_user.id,
+    )
+
+    assert result.moved == 1
+    assert result.failed == 3
+    assert [move_result.moved for move_result in result.results] == [
+        False,
+        False,
+        False,
+        True,
+    ]
+    assert all(move_result.detail for move_result in result.results[:3])
+
+
+@pytest.mark.asyncio
+async def test_if_stock_cannot_be_moved_to_another_warehouse(
+    async_session: AsyncSession,
+    db_stocks: PagedResponseSchema[StockOutputSchema],
+    db_staff_user: UserOutputSchema,
+):
+    slot_stock = next(stock for stock in db_stocks.results if stock.rack_level_slot_id)
+    warehouse = await create_warehouse(
+        async_session, WarehouseInputSchemaFactory().generate()
+    )
+    waiting_room = await create_waiting_room(
+        async_session,
+        WaitingRoomInputSchemaFactory().generate(),
+        warehouse_id=warehouse.id,
+    )
+
+    result = await move_multiple_stocks(
+        async_session,
+        StockBatchMoveInputSchema(
+            moves=[
+                StockMoveInputSchema(
+                    stock_id=slot_stock.id, waiting_room_id=waiting_room.id
+                )
+            ]
+        ),
+        db_staff_user.id,
+    )
+    stock = await if_exists(Stock, "id", slot_stock.id, async_session)
+
+    assert result.failed == 1
+    assert "another warehouse" in result.results[0].detail
+    assert stock.rack_level_slot_id == slot_stock.rack_level_slot_id
+
+
+@pytest.mark.asyncio
+async def test_if_stock_of_another_warehouse_cannot_be_moved(
+    async_session: AsyncSession,
+    db_stocks: PagedResponseSchema[StockOutputSchema],
+    db_staff_user: UserOutputSchema,
+):
+    slot_stock = next(stock for stock in db_stocks.results if stock.rack_level_slot_id)
+    waiting_room_stock = next(
+        stock
+        for stock in db_stocks.results
+        if stock.waiting_room_id and not stock.is_issued
+    )
+    warehouse = await create_warehouse(
+        async_session, WarehouseInputSchemaFactory().generate()
+    )
+
+    result = await move_multiple_stocks(
+        async_session,
+        StockBatchMoveInputSchema(
+            moves=[
+                StockMoveInputSchema(
+                    stock_id=slot_stock.id,
+                    waiting_room_id=waiting_room_stock.waiting_room_id,
+                )
+            ]
+        ),
+        db_staff_user.id,
+        warehouse_id=warehouse.id,
+    )
+    stock = await if_exists(Stock, "id", slot_stock.id, async_session)
+
+    assert result.failed == 1
+    assert "another warehouse" in result.results[0].detail
+    assert stock.rack_level_slot_id == slot_stock.rack_level_slot_id
@@ -26,6 +26,7 @@ from src.apps.waiting_rooms.models import WaitingRoom
 from src.apps.waiting_rooms.schemas import WaitingRoomOutputSchema
 from src.apps.waiting_rooms.services import create_waiting_room
 from src.apps.warehouse.schemas import WarehouseOutputSchema
+from src.apps.warehouse.services import create_warehouse
 from src.core.exceptions import (
     AlreadyExists,
     AmbiguousStockStoragePlaceDuringReceptionException,
@@ -36,6 +37,7 @@ from src.core.exceptions import (
     NoAvailableRackLevelSlotException,
     NoAvailableWaitingRoomsException,
     NotEnoughRackLevelResourcesException,
+    ResourceInAnotherWarehouseException,
     ServiceException,
 )
 from src.core.factory.issue_factory import IssueInputSchemaFactory
@@ -43,6 +45,7 @@ from src.core.factory.rack_factory import RackInputSchemaFactory
 from src.core.factory.rack_level_factory import RackLevelInputSchemaFactory
 from src.core.factory.stock_factory import StockInputSchemaFactory
 from src.core.factory.waiting_room_factory import WaitingRoomInputSchemaFactory
+from src.core.factory.warehouse_factory import WarehouseInputSchemaFactory
 from src.core.pagination.models import PageParams
 from src.core.pagination.schemas import PagedResponseSchema
 from src.core.utils.orm import if_exists
@@ -64,6 +67,7 @@ from tests.test_warehouse.conftest import db_warehouse
 @pytest.mark.asyncio
 async def test_if_stocks_were_created_correctly(
     async_session: AsyncSession,
+    db_warehouse: PagedResponseSchema[WarehouseOutputSchema],
     db_products: PagedResponseSchema[ProductOutputSchema],
     db_staff_user: UserOutputSchema,
 ):
@@ -282,6 +286,19 @@ async def test_raise_exception_while_getting_issued_stock(
         await get_single_stock(async_session, issued_stocks[0].id)
 
 
+@pytest.mark.asyncio
+async def test_raise_exception_while_getting_stock_of_another_warehouse(
+    async_session: AsyncSession, db_stocks: PagedResponseSchema[StockOutputSchema]
+):
+    warehouse = await create_warehouse(
+        async_session, WarehouseInputSchemaFactory().generate()
+    )
+    with pytest.raises(ResourceInAnotherWarehouseException):
+        await get_single_stock(
+            async_session, db_stocks.results[0].id, warehouse_id=warehouse.id
+        )
+
+
 @pytest.mark.asyncio
 async def test_if_all_available_stocks_were_returned(
     async_session: AsyncSession, db_stocks: PagedResponseSchema[StockOutputSchema]
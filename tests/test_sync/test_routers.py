@@ -0,0 +1,51 @@
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+
+from src.apps.users.schemas import UserOutputSchema
+from tests.test_users.conftest import (
+    auth_headers,
+    db_staff_user,
+    db_user,
+    staff_auth_headers,
+)
+
+
+@pytest.mark.parametrize(
+    "user, user_headers, status_code",
+    [
+        (
+            pytest.lazy_fixture("db_user"),
+            pytest.lazy_fixture("auth_headers"),
+            status.HTTP_403_FORBIDDEN,
+        ),
+        (
+            pytest.lazy_fixture("db_staff_user"),
+            pytest.lazy_fixture("staff_auth_headers"),
+            status.HTTP_200_OK,
+        ),
+    ],
+)
+@pytest.mark.asyncio
+async def test_only_staff_can_get_resource_changes(
+    async_client: AsyncClient,
+    user: UserOutputSchema,
+    user_headers: dict[str, str],
+    status_code: int,
+):
+    response = await async_client.get(
+        "sync/stocks", params={"since": "0"}, headers=user_headers
+    )
+
+    assert response.status_code == status_code
+
+
+@pytest.mark.asyncio
+async def test_if_unknown_resource_is_not_found(
+    async_client: AsyncClient,
+    db_staff_user: UserOutputSchema,
+    staff_auth_headers: dict[str, str],
+):
+    response = await async_client.get("sync/users", headers=staff_auth_headers)
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,85 @@
+import pytest
+from sqlalchemy import BigInteger, String, cast, func, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.apps.products.models import Category
+from src.apps.products.schemas.category_schemas import CategoryOutputSchema
+from src.apps.products.services.category_services import delete_single_category
+from src.apps.sync.services import (
+    format_sync_cursor,
+    get_changes_query,
+    get_changes_since,
+    parse_sync_cursor,
+)
+from src.core.exceptions import DoesNotExist, ServiceException
+from src.core.pagination.schemas import PagedResponseSchema
+from tests.test_products.conftest import db_categories
+
+
+def test_if_sync_cursor_is_parsed_back_from_its_format():
+    assert parse_sync_cursor(format_sync_cursor(12, "id")) == (12, "id")
+    assert parse_sync_cursor("0") == (0, "")
+
+    with pytest.raises(ServiceException):
+        parse_sync_cursor("not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_if_written_rows_and_deletes_are_returned_after_cursor(
+    async_session: AsyncSession,
+    db_categories: PagedResponseSchema[CategoryOutputSchema],
+):
+    current_xid = await async_session.scalar(
+        select(cast(cast(func.pg_current_xact_id(), String), BigInteger))
+    )
+    deleted_category = db_categories.results[0]
+    await delete_single_category(async_session, deleted_category.id)
+
+    stamped = await async_session.scalars(select(Category.change_xid))
+    # the rows of the running test transaction are below an explicit horizon
+    changes = (
+        await async_session.execute(
+            get_changes_query(
+                Category.__table__, (0, ""), literal(current_xid + 1), 100
+            )
+        )
+    ).all()
+    last_change = changes[-1]
+    later_changes = (
+        await async_session.execute(
+            get_changes_query(
+                Category.__table__,
+                (last_change.change_xid, last_change.id),
+                literal(current_xid + 1),
+                100,
+            )
+        )
+    ).all()
+
+    assert set(stamped.all()) == {current_xid}
+    assert {change.id for change in changes if not change.deleted} == {
+        category.id for category in db_categories.results[1:]
+    }
+    assert [change.id for change in changes if change.deleted] == [deleted_category.id]
+    assert all(change.data["name"] for change in changes if not change.deleted)
+    assert later_changes == []
+
+
+@pytest.mark.asyncio
+async def test_if_changes_of_running_transactions_are_not_returned(
+    async_session: AsyncSession,
+    db_categories: PagedResponseSchema[CategoryOutputSchema],
+):
+    page = await get_changes_since(async_session, "categories")
+
+    assert page.changes == []
+    assert page.next_since == "0"
+    assert not page.has_more
+
+
+@pytest.mark.asyncio
+async def test_raise_exception_when_sync_resource_is_unknown(
+    async_session: AsyncSession,
+):
+    with pytest.raises(DoesNotExist):
+        await get_changes_since(async_session, "users")
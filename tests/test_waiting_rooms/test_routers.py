@@ -234,3 +234,33 @@ async def test_only_user_with_proper_permission_can_add_stock_to_waiting_room(
         content=stock_data.json(),
     )
     assert response.status_code == status_code
+
+
+@pytest.mark.asyncio
+async def test_if_waiting_room_update_with_stale_version_returns_conflict(
+    async_client: AsyncClient,
+    db_staff_user: UserOutputSchema,
+    staff_auth_headers: dict[str, str],
+    db_waiting_rooms: PagedResponseSchema[WaitingRoomOutputSchema],
+):
+    waiting_room_id = db_waiting_rooms.results[1].id
+    response = await async_client.get(
+        f"waiting_rooms/{waiting_room_id}", headers=staff_auth_headers
+    )
+    version = response.json()["version_id"]
+    update_data = WaitingRoomUpdateSchemaFactory().generate(max_stocks=1111)
+
+    response = await async_client.patch(
+        f"waiting_rooms/{waiting_room_id}",
+        headers={**staff_auth_headers, "If-Match": f'"{version}"'},
+        content=update_data.json(),
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["version_id"] == version + 1
+
+    response = await async_client.patch(
+        f"waiting_rooms/{waiting_room_id}",
+        headers={**staff_auth_headers, "If-Match": f'"{version}"'},
+        content=update_data.json(),
+    )
+    assert response.status_code == status.HTTP_409_CONFLICT
@@ -37,6 +37,7 @@ from src.core.exceptions import (
     NoAvailableWeightInWaitingRoomException,
     NotEnoughWarehouseResourcesException,
     ServiceException,
+    StaleVersionException,
     StockAlreadyInWaitingRoomException,
     TooLittleWaitingRoomSpaceException,
     TooLittleWaitingRoomWeightException,
@@ -529,3 +530,25 @@ async def test_check_if_stock_from_rack_level_slot_is_added_to_the_waiting_room_
     assert old_rack_level_slot.stock_id == None
     assert stock.rack_level_slot_id == None
     assert stock.waiting_room_id == waiting_room_1.id
+
+
+@pytest.mark.asyncio
+async def test_if_waiting_room_is_updated_only_with_its_current_version(
+    async_session: AsyncSession,
+    db_waiting_rooms: PagedResponseSchema[WaitingRoomOutputSchema],
+):
+    waiting_room = await get_single_waiting_room(
+        async_session, db_waiting_rooms.results[0].id
+    )
+    update_data = WaitingRoomUpdateSchemaFactory().generate(name="versioned")
+
+    updated_waiting_room = await update_single_waiting_room(
+        async_session, update_data, waiting_room.id, waiting_room.version_id
+    )
+
+    assert updated_waiting_room.name == update_data.name
+    assert updated_waiting_room.version_id == waiting_room.version_id + 1
+    with pytest.raises(StaleVersionException):
+        await update_single_waiting_room(
+            async_session, update_data, waiting_room.id, waiting_room.version_id
+        )
@@ -1,4 +1,5 @@
 import pytest
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.apps.products.schemas.product_schemas import ProductOutputSchema
@@ -17,6 +18,7 @@ from src.apps.warehouse.services import (
     create_warehouse,
     delete_single_warehouse,
     get_single_warehouse,
+    get_target_warehouse,
     manage_warehouse_state,
     update_single_warehouse,
 )
@@ -24,8 +26,8 @@ from src.core.exceptions import (
     DoesNotExist,
     ServiceException,
     TooLittleSectionAmountException,
-    WarehouseAlreadyExistsException,
     WarehouseIsNotEmptyException,
+    WarehouseNotSpecifiedException,
 )
 from src.core.factory.section_factory import SectionInputSchemaFactory
 from src.core.factory.stock_factory import StockInputSchemaFactory
@@ -37,6 +39,7 @@ from src.core.factory.warehouse_factory import (
 from src.core.pagination.models import PageParams
 from src.core.pagination.schemas import PagedResponseSchema
 from src.core.utils.orm import if_exists
+from src.core.utils.partitioning import get_partition_name
 from src.core.utils.utils import generate_uuid
 from tests.test_products.conftest import db_categories, db_products
 from tests.test_stocks.conftest import db_stocks
@@ -50,14 +53,53 @@ from tests.test_warehouse.conftest import db_warehouse
 
 
 @pytest.mark.asyncio
-async def test_raise_exception_when_another_warehouse_is_requested_to_be_created(
+async def test_if_another_warehouse_can_be_created(
     async_session: AsyncSession,
     db_warehouse: PagedResponseSchema[WarehouseOutputSchema],
 ):
     warehouse_input = WarehouseInputSchemaFactory().generate()
+    warehouse = await create_warehouse(async_session, warehouse_input)
+
+    assert warehouse.id != db_warehouse.results[0].id
+    assert warehouse.warehouse_name == warehouse_input.warehouse_name
+
+
+@pytest.mark.asyncio
+async def test_if_history_partition_is_created_with_the_warehouse(
+    async_session: AsyncSession,
+    db_warehouse: PagedResponseSchema[WarehouseOutputSchema],
+):
+    warehouse = await create_warehouse(
+        async_session, WarehouseInputSchemaFactory().generate()
+    )
+    partition = await async_session.scalar(
+        text("SELECT to_regclass(:name)::text"),
+        {"name": get_partition_name("user_stock", warehouse.id)},
+    )
+
+    assert partition == get_partition_name("user_stock", warehouse.id)
+
+
+@pytest.mark.asyncio
+async def test_if_only_warehouse_is_targeted_when_none_is_specified(
+    async_session: AsyncSession,
+    db_warehouse: PagedResponseSchema[WarehouseOutputSchema],
+):
+    warehouse = await get_target_warehouse(async_session)
+
+    assert warehouse.id == db_warehouse.results[0].id
+
+
+@pytest.mark.asyncio
+async def test_raise_exception_when_warehouse_is_not_specified_among_many(
+    async_session: AsyncSession,
+    db_warehouse: PagedResponseSchema[WarehouseOutputSchema],
+):
+    warehouse_input = WarehouseInputSchemaFactory().generate()
+    await create_warehouse(async_session, warehouse_input)
 
-    with pytest.raises(WarehouseAlreadyExistsException):
-        await create_warehouse(async_session, warehouse_input)
+    with pytest.raises(WarehouseNotSpecifiedException):
+        await get_target_warehouse(async_session)
 
 
 @pytest.mark.asyncio